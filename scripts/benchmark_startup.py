@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Benchmark Punie CLI startup time.
+
+Every `punie` invocation imports punie.cli, so its import cost is paid by
+quick commands like `punie ask` and `punie stop-all`. This script runs each
+import in a fresh interpreter several times and reports the median wall
+time, plus which heavy dependencies got loaded along the way.
+
+The "agent" row is the cost the CLI used to pay up front, before heavy
+imports were deferred to the commands that need them.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 10]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pydantic_ai", "libcst", "starlette", "uvicorn", "httpx")
+
+TARGETS = {
+    "cli": "import punie.cli",
+    "ask": "import punie.cli; import punie.client.ask_client",
+    "agent": "import punie.agent.adapter; import punie.http.app",
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, runs: int) -> tuple[float, list[str]]:
+    """Median import time of statement across fresh interpreters."""
+    samples = []
+    loaded: list[str] = []
+    for _ in range(runs):
+        probe = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+        output = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output)
+        samples.append(result["seconds"])
+        loaded = result["loaded"]
+    return statistics.median(samples), loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Interpreter launches per target")
+    args = parser.parse_args()
+
+    print(f"{'target':<8} {'median':>9}  heavy modules loaded")
+    for name, statement in TARGETS.items():
+        seconds, loaded = measure(statement, args.runs)
+        print(f"{name:<8} {seconds * 1000:>7.0f}ms  {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
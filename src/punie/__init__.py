@@ -5,12 +5,36 @@ This package provides:
 - Pydantic AI agent adapter for ACP protocol
 - HTTP server support for dual-protocol operation
 - Testing utilities for ACP protocol development
+
+Exports are imported on first access, so ``import punie`` (and with it every
+CLI invocation) does not pay for pydantic_ai, starlette or uvicorn until they
+are actually used.
 """
 
-from punie.acp import Agent, Client
-from punie.agent import ACPDeps, ACPToolset, PunieAgent, create_pydantic_agent
-from punie.http import create_app, run_dual
-from punie.testing import FakeAgent, FakeClient, LoopbackServer
+from typing import TYPE_CHECKING
+
+from punie._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from punie.acp import Agent, Client
+    from punie.agent import ACPDeps, ACPToolset, PunieAgent, create_pydantic_agent
+    from punie.http import create_app, run_dual
+    from punie.testing import FakeAgent, FakeClient, LoopbackServer
+
+# Export name → module that defines it
+_LAZY_EXPORTS = {
+    "Agent": "punie.acp",
+    "Client": "punie.acp",
+    "ACPDeps": "punie.agent",
+    "ACPToolset": "punie.agent",
+    "PunieAgent": "punie.agent",
+    "create_pydantic_agent": "punie.agent",
+    "create_app": "punie.http",
+    "run_dual": "punie.http",
+    "FakeAgent": "punie.testing",
+    "FakeClient": "punie.testing",
+    "LoopbackServer": "punie.testing",
+}
 
 __all__ = [
     # ACP Protocol
@@ -30,3 +54,5 @@ __all__ = [
     "LoopbackServer",
 ]
 __version__ = "0.1.0"
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
@@ -0,0 +1,36 @@
+"""PEP 562 lazy exports shared by punie's packages.
+
+A package lists which submodule defines each export and installs the
+returned function as its module ``__getattr__``; the submodule is imported
+on first access and the value cached in the package namespace.
+
+Example:
+    __getattr__ = lazy_exports(__name__, {"PunieAgent": "punie.agent.adapter"})
+"""
+
+import sys
+from collections.abc import Callable, Mapping
+from importlib import import_module
+from typing import Any
+
+
+def lazy_exports(module_name: str, exports: Mapping[str, str]) -> Callable[[str], Any]:
+    """Build a module ``__getattr__`` that imports exports on first access.
+
+    Args:
+        module_name: ``__name__`` of the package installing the hook
+        exports: Export name → module that defines it
+
+    Returns:
+        Function to assign to the package's ``__getattr__``
+    """
+
+    def __getattr__(name: str) -> Any:
+        source = exports.get(name)
+        if source is None:
+            raise AttributeError(f"module {module_name} has no attribute {name}")
+        value = getattr(import_module(source), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    return __getattr__
@@ -6,7 +6,7 @@ import copy
 import inspect
 import json
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -16,6 +16,8 @@ from pydantic import BaseModel, ValidationError
 from .exceptions import RequestError
 from .task import (
     DefaultMessageDispatcher,
+    DispatchLimits,
+    DispatchStats,
     InMemoryMessageQueue,
     InMemoryMessageStateStore,
     MessageDispatcher,
@@ -27,6 +29,7 @@ from .task import (
     RpcTask,
     RpcTaskKind,
     SenderFactory,
+    SenderStats,
     TaskSupervisor,
 )
 from .telemetry import span_context
@@ -35,7 +38,14 @@ JsonValue = Any
 MethodHandler = Callable[[str, JsonValue | None, bool], Awaitable[JsonValue | None]]
 
 
-__all__ = ["Connection", "JsonValue", "MethodHandler", "StreamDirection", "StreamEvent"]
+__all__ = [
+    "Connection",
+    "JsonValue",
+    "MethodHandler",
+    "StreamDirection",
+    "StreamEvent",
+    "StreamObserver",
+]
 
 
 DispatcherFactory = Callable[
@@ -55,10 +65,102 @@ class StreamDirection(str, Enum):
     OUTGOING = "outgoing"
 
 
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _ReadOnlyDict(value)
+    if isinstance(value, list):
+        return _ReadOnlyList(value)
+    return value
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, _ReadOnlyDict | _ReadOnlyList):
+        return value._data
+    return value
+
+
+class _ReadOnlyDict(Mapping[str, Any]):
+    """Read-only view of a JSON object; nested values are wrapped on access.
+
+    >>> view = _ReadOnlyDict({"params": {"paths": ["a.py"]}})
+    >>> view["params"]["paths"][0]
+    'a.py'
+    >>> view == {"params": {"paths": ["a.py"]}}
+    True
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return _freeze(self._data[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        return self._data == _unwrap(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+
+class _ReadOnlyList(Sequence[Any]):
+    """Read-only view of a JSON array."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list[Any]) -> None:
+        self._data = data
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return _ReadOnlyList(self._data[index])
+        return _freeze(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        return self._data == _unwrap(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+
 @dataclass(frozen=True, slots=True)
 class StreamEvent:
+    """A JSON-RPC message seen by a stream observer.
+
+    ``message`` is a read-only view of the message the connection is
+    processing, not a copy, so observing costs nothing per payload byte
+    unless the observer reads it. Use ``to_dict()`` for a private mutable
+    copy and ``serialized()`` for the wire bytes.
+    """
+
     direction: StreamDirection
-    message: dict[str, Any]
+    message: Mapping[str, Any]
+    method: str | None = None
+    """Method of the message, or of the request a response answers."""
+    raw: bytes | None = None
+    """Bytes as read from the wire (incoming messages only)."""
+
+    def serialized(self) -> bytes:
+        if self.raw is not None:
+            return self.raw
+        return json.dumps(_unwrap(self.message), separators=(",", ":")).encode("utf-8")
+
+    def to_dict(self) -> dict[str, Any]:
+        return copy.deepcopy(_unwrap(self.message))
 
 
 StreamObserver = Callable[[StreamEvent], Awaitable[None] | None]
@@ -79,8 +181,10 @@ class Connection:
         sender_factory: SenderFactory | None = None,
         observers: list[StreamObserver] | None = None,
         listening: bool = True,
+        limits: DispatchLimits | None = None,
     ) -> None:
         self._handler = handler
+        self._limits = limits
         self._writer = writer
         self._reader = reader
         self._next_request_id = 0
@@ -109,13 +213,17 @@ class Connection:
             self._run_notification,
         )
         self._dispatcher.start()
-        self._observers: list[StreamObserver] = list(observers or [])
+        self._observers: list[tuple[StreamObserver, frozenset[str] | None]] = [
+            (observer, None) for observer in observers or []
+        ]
+        self._request_methods: dict[int, str] = {}
 
     async def close(self) -> None:
         """Stop the receive loop and cancel any in-flight handler tasks."""
         if self._closed:
             return
         self._closed = True
+        self._request_methods.clear()
         await self._dispatcher.stop()
         await self._sender.close()
         await self._tasks.shutdown()
@@ -135,14 +243,35 @@ class Connection:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.close()
 
-    def add_observer(self, observer: StreamObserver) -> None:
-        """Register a callback that receives every raw JSON-RPC message."""
-        self._observers.append(observer)
+    def add_observer(
+        self, observer: StreamObserver, methods: Iterable[str] | None = None
+    ) -> None:
+        """Register a callback that receives JSON-RPC messages.
+
+        With ``methods``, the observer only receives requests and notifications
+        for those methods and the responses to such requests.
+        """
+        self._observers.append(
+            (observer, frozenset(methods) if methods is not None else None)
+        )
+
+    @property
+    def sender_stats(self) -> SenderStats:
+        """Outgoing queue depth and flush counters."""
+        return self._sender.stats
+
+    @property
+    def dispatch_stats(self) -> DispatchStats | None:
+        """In-flight and queued incoming requests (default dispatcher only)."""
+        if isinstance(self._dispatcher, DefaultMessageDispatcher):
+            return self._dispatcher.stats
+        return None
 
     async def send_request(self, method: str, params: JsonValue | None = None) -> Any:
         request_id = self._next_request_id
         self._next_request_id += 1
         future = self._state.register_outgoing(request_id, method)
+        self._request_methods[request_id] = method
         payload = {
             "jsonrpc": "2.0",
             "id": request_id,
@@ -150,15 +279,15 @@ class Connection:
             "params": params,
         }
         await self._sender.send(payload)
-        self._notify_observers(StreamDirection.OUTGOING, payload)
+        self._notify_observers(StreamDirection.OUTGOING, payload, method)
         return await future
 
     async def send_notification(
         self, method: str, params: JsonValue | None = None
     ) -> None:
         payload = {"jsonrpc": "2.0", "method": method, "params": params}
-        await self._sender.send(payload)
-        self._notify_observers(StreamDirection.OUTGOING, payload)
+        await self._sender.send(payload, wait=False)
+        self._notify_observers(StreamDirection.OUTGOING, payload, method)
 
     async def _receive_loop(self) -> None:
         try:
@@ -171,7 +300,13 @@ class Connection:
                 except Exception:
                     logging.exception("Error parsing JSON-RPC message")
                     continue
-                self._notify_observers(StreamDirection.INCOMING, message)
+                if self._observers:
+                    method = message.get("method")
+                    if method is None and "id" in message:
+                        method = self._request_methods.get(message["id"])
+                    self._notify_observers(
+                        StreamDirection.INCOMING, message, method, raw=line
+                    )
                 await self._process_message(message)
         except asyncio.CancelledError:
             return
@@ -189,13 +324,20 @@ class Connection:
             await self._handle_response(message)
 
     def _notify_observers(
-        self, direction: StreamDirection, message: dict[str, Any]
+        self,
+        direction: StreamDirection,
+        message: dict[str, Any],
+        method: str | None,
+        raw: bytes | None = None,
     ) -> None:
         if not self._observers:
             return
-        snapshot = copy.deepcopy(message)
-        event = StreamEvent(direction, snapshot)
-        for observer in list(self._observers):
+        event: StreamEvent | None = None
+        for observer, methods in list(self._observers):
+            if methods is not None and method not in methods:
+                continue
+            if event is None:
+                event = StreamEvent(direction, _ReadOnlyDict(message), method, raw)
             try:
                 result = observer(event)
             except Exception:
@@ -229,18 +371,18 @@ class Connection:
                     )
                 payload["result"] = result if result is not None else None
                 await self._sender.send(payload)
-                self._notify_observers(StreamDirection.OUTGOING, payload)
+                self._notify_observers(StreamDirection.OUTGOING, payload, method)
                 return payload.get("result")
             except RequestError as exc:
                 payload["error"] = exc.to_error_obj()
                 await self._sender.send(payload)
-                self._notify_observers(StreamDirection.OUTGOING, payload)
+                self._notify_observers(StreamDirection.OUTGOING, payload, method)
                 raise
             except ValidationError as exc:
                 err = RequestError.invalid_params({"errors": exc.errors()})
                 payload["error"] = err.to_error_obj()
                 await self._sender.send(payload)
-                self._notify_observers(StreamDirection.OUTGOING, payload)
+                self._notify_observers(StreamDirection.OUTGOING, payload, method)
                 raise err from None
             except Exception as exc:
                 try:
@@ -250,9 +392,17 @@ class Connection:
                 err = RequestError.internal_error(data)
                 payload["error"] = err.to_error_obj()
                 await self._sender.send(payload)
-                self._notify_observers(StreamDirection.OUTGOING, payload)
+                self._notify_observers(StreamDirection.OUTGOING, payload, method)
                 raise err from None
 
+    async def _reject_request(
+        self, message: dict[str, Any], error: RequestError
+    ) -> None:
+        payload = {"jsonrpc": "2.0", "id": message["id"], "error": error.to_error_obj()}
+        logging.warning("Rejecting %s request: %s", message.get("method"), error.data)
+        await self._sender.send(payload, wait=False)
+        self._notify_observers(StreamDirection.OUTGOING, payload, message.get("method"))
+
     async def _run_notification(self, message: dict[str, Any]) -> None:
         method = message["method"]
         with (
@@ -263,6 +413,7 @@ class Connection:
 
     async def _handle_response(self, message: dict[str, Any]) -> None:
         request_id = message["id"]
+        self._request_methods.pop(request_id, None)
         result = message.get("result")
         if "result" in message:
             self._state.resolve_outgoing(request_id, result)
@@ -301,6 +452,8 @@ class Connection:
             store=state,
             request_runner=request_runner,
             notification_runner=notification_runner,
+            limits=self._limits,
+            reject_runner=self._reject_request,
         )
 
     def _default_sender_factory(
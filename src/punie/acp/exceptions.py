@@ -37,6 +37,10 @@ class RequestError(Exception):
     def auth_required(cls, data: dict[str, Any] | None = None) -> RequestError:
         return cls(-32000, "Authentication required", data)
 
+    @classmethod
+    def server_busy(cls, data: dict[str, Any] | None = None) -> RequestError:
+        return cls(-32001, "Server busy", data)
+
     @classmethod
     def resource_not_found(cls, uri: str | None = None) -> RequestError:
         data = {"uri": uri} if uri is not None else None
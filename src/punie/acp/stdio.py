@@ -80,6 +80,16 @@ class _StdoutTransport(asyncio.BaseTransport):
         except Exception:
             logging.exception("Error writing to stdout")
 
+    def writelines(self, list_of_data) -> None:
+        if self._is_closing:
+            return
+        try:
+            for data in list_of_data:
+                sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        except Exception:
+            logging.exception("Error writing to stdout")
+
     def can_write_eof(self) -> bool:
         return False
 
@@ -20,17 +20,22 @@ class RpcTask:
 
 from .dispatcher import (  # noqa: E402
     DefaultMessageDispatcher,
+    DispatchLimits,
+    DispatchStats,
     MessageDispatcher,
     NotificationRunner,
+    RequestRejecter,
     RequestRunner,
 )
 from .queue import InMemoryMessageQueue, MessageQueue  # noqa: E402
-from .sender import MessageSender, SenderFactory  # noqa: E402
+from .sender import MessageSender, SenderFactory, SenderStats  # noqa: E402
 from .state import InMemoryMessageStateStore, MessageStateStore  # noqa: E402
 from .supervisor import TaskSupervisor  # noqa: E402
 
 __all__ += [
     "DefaultMessageDispatcher",
+    "DispatchLimits",
+    "DispatchStats",
     "InMemoryMessageQueue",
     "InMemoryMessageStateStore",
     "MessageDispatcher",
@@ -38,7 +43,9 @@ __all__ += [
     "MessageSender",
     "MessageStateStore",
     "NotificationRunner",
+    "RequestRejecter",
     "RequestRunner",
     "SenderFactory",
+    "SenderStats",
     "TaskSupervisor",
 ]
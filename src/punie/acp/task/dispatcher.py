@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable, Mapping
 from contextlib import suppress
+from dataclasses import dataclass, field
 from typing import Any, Protocol
 
+from ..exceptions import RequestError
 from . import RpcTaskKind
 from .queue import MessageQueue
 from .state import MessageStateStore
@@ -12,14 +15,50 @@ from .supervisor import TaskSupervisor
 
 __all__ = [
     "DefaultMessageDispatcher",
+    "DispatchLimits",
+    "DispatchStats",
     "MessageDispatcher",
     "NotificationRunner",
+    "RequestRejecter",
     "RequestRunner",
 ]
 
 
 RequestRunner = Callable[[dict[str, Any]], Awaitable[Any]]
 NotificationRunner = Callable[[dict[str, Any]], Awaitable[None]]
+RequestRejecter = Callable[[dict[str, Any], RequestError], Awaitable[None]]
+
+DEFAULT_MAX_CONCURRENT = 32
+DEFAULT_MAX_QUEUED = 64
+# Prompts all run against the same model, so few of them can make progress at once
+DEFAULT_METHOD_LIMITS: Mapping[str, int] = {"session/prompt": 4}
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchLimits:
+    """Concurrency limits for incoming requests on one connection.
+
+    Requests over a limit wait (up to ``max_queued`` of them) for a running
+    request to finish; beyond that they are rejected with a "Server busy"
+    error. Notifications are never limited, so ``session/cancel`` always
+    gets through.
+    """
+
+    max_concurrent: int | None = DEFAULT_MAX_CONCURRENT
+    max_queued: int = DEFAULT_MAX_QUEUED
+    method_limits: Mapping[str, int] = field(
+        default_factory=lambda: dict(DEFAULT_METHOD_LIMITS)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchStats:
+    """Snapshot of request dispatch counters."""
+
+    in_flight: int
+    queued: int
+    rejected: int
+    in_flight_by_method: Mapping[str, int]
 
 
 class MessageDispatcher(Protocol):
@@ -39,13 +78,29 @@ class DefaultMessageDispatcher(MessageDispatcher):
         store: MessageStateStore,
         request_runner: RequestRunner,
         notification_runner: NotificationRunner,
+        limits: DispatchLimits | None = None,
+        reject_runner: RequestRejecter | None = None,
     ) -> None:
         self._queue = queue
         self._supervisor = supervisor
         self._store = store
         self._request_runner = request_runner
         self._notification_runner = notification_runner
+        self._limits = limits or DispatchLimits()
+        self._reject_runner = reject_runner
         self._task: asyncio.Task[None] | None = None
+        self._in_flight: Counter[str] = Counter()
+        self._waiting: deque[dict[str, Any]] = deque()
+        self._rejected = 0
+
+    @property
+    def stats(self) -> DispatchStats:
+        return DispatchStats(
+            in_flight=self._in_flight.total(),
+            queued=len(self._waiting),
+            rejected=self._rejected,
+            in_flight_by_method={m: n for m, n in self._in_flight.items() if n},
+        )
 
     def start(self) -> None:
         if self._task is not None:
@@ -72,11 +127,28 @@ class DefaultMessageDispatcher(MessageDispatcher):
             with suppress(asyncio.CancelledError):
                 await self._task
             self._task = None
+        self._waiting.clear()
 
     async def _dispatch_request(self, message: dict[str, Any]) -> None:
-        record = self._store.begin_incoming(
-            message.get("method", ""), message.get("params")
-        )
+        method = message.get("method", "")
+        if self._has_capacity(method):
+            self._start_request(message)
+        elif len(self._waiting) < self._limits.max_queued:
+            self._waiting.append(message)
+        else:
+            await self._reject(message)
+
+    def _has_capacity(self, method: str) -> bool:
+        max_concurrent = self._limits.max_concurrent
+        if max_concurrent is not None and self._in_flight.total() >= max_concurrent:
+            return False
+        method_limit = self._limits.method_limits.get(method)
+        return method_limit is None or self._in_flight[method] < method_limit
+
+    def _start_request(self, message: dict[str, Any]) -> None:
+        method = message.get("method", "")
+        record = self._store.begin_incoming(method, message.get("params"))
+        self._in_flight[method] += 1
 
         async def runner() -> None:
             try:
@@ -86,9 +158,36 @@ class DefaultMessageDispatcher(MessageDispatcher):
                 raise
             else:
                 self._store.complete_incoming(record, result)
+            finally:
+                self._release(method)
 
         self._supervisor.create(runner(), name="acp.Dispatcher.request")
 
+    def _release(self, method: str) -> None:
+        self._in_flight[method] -= 1
+        if not self._waiting:
+            return
+        still_waiting: deque[dict[str, Any]] = deque()
+        while self._waiting:
+            message = self._waiting.popleft()
+            if self._has_capacity(message.get("method", "")):
+                self._start_request(message)
+            else:
+                still_waiting.append(message)
+        self._waiting = still_waiting
+
+    async def _reject(self, message: dict[str, Any]) -> None:
+        self._rejected += 1
+        error = RequestError.server_busy(
+            {
+                "method": message.get("method", ""),
+                "inFlight": self._in_flight.total(),
+                "queued": len(self._waiting),
+            }
+        )
+        if self._reject_runner is not None:
+            await self._reject_runner(message, error)
+
     async def _dispatch_notification(self, message: dict[str, Any]) -> None:
         async def runner() -> None:
             await self._notification_runner(message)
@@ -9,6 +9,9 @@ from . import RpcTask
 
 __all__ = ["InMemoryMessageQueue", "MessageQueue"]
 
+# Bounded so a flooding peer blocks the receive loop instead of growing memory
+DEFAULT_MAXSIZE = 1024
+
 
 class MessageQueue(Protocol):
     async def publish(self, task: RpcTask) -> None: ...
@@ -25,7 +28,7 @@ class MessageQueue(Protocol):
 class InMemoryMessageQueue:
     """Simple in-memory broker for RPC task dispatch."""
 
-    def __init__(self, *, maxsize: int = 0) -> None:
+    def __init__(self, *, maxsize: int = DEFAULT_MAXSIZE) -> None:
         self._queue: asyncio.Queue[RpcTask | None] = asyncio.Queue(maxsize=maxsize)
         self._closed = False
 
@@ -44,6 +47,9 @@ class InMemoryMessageQueue:
     async def join(self) -> None:
         await self._queue.join()
 
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
     def task_done(self) -> None:
         with suppress(ValueError):
             self._queue.task_done()
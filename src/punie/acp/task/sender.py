@@ -4,68 +4,191 @@ import asyncio
 import contextlib
 import json
 import logging
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
 from .supervisor import TaskSupervisor
 
-__all__ = ["MessageSender", "SenderFactory"]
+__all__ = ["MessageSender", "SenderFactory", "SenderStats"]
 
 
 SenderFactory = Callable[[asyncio.StreamWriter, TaskSupervisor], "MessageSender"]
 
+DEFAULT_HIGH_WATER = 1024 * 1024
+DEFAULT_LOW_WATER = 256 * 1024
+DEFAULT_MAX_BATCH_BYTES = 256 * 1024
+
 
 @dataclass(slots=True)
 class _PendingSend:
     payload: bytes
-    future: asyncio.Future[None]
+    future: asyncio.Future[None] | None
+
+
+@dataclass(frozen=True, slots=True)
+class SenderStats:
+    """Snapshot of MessageSender queue and flush counters."""
+
+    queue_depth: int
+    queued_bytes: int
+    flushes: int
+    messages_sent: int
+    bytes_sent: int
+    last_flush_bytes: int
+    max_flush_bytes: int
+
+    @property
+    def bytes_per_flush(self) -> float:
+        return self.bytes_sent / self.flushes if self.flushes else 0.0
 
 
 class MessageSender:
+    """Serialize JSON-RPC payloads and write them from a single task.
+
+    Frames queued while a write is in flight are coalesced into one
+    ``writelines`` + ``drain``, so bursts of notifications cost one syscall
+    and one event-loop round trip instead of one each. ``send(wait=False)``
+    returns as soon as the frame is queued.
+
+    The queue is bounded by bytes: once ``high_water`` bytes are waiting,
+    senders block until the writer has flushed down to ``low_water``.
+    """
+
     def __init__(
-        self, writer: asyncio.StreamWriter, supervisor: TaskSupervisor
+        self,
+        writer: asyncio.StreamWriter,
+        supervisor: TaskSupervisor,
+        *,
+        high_water: int = DEFAULT_HIGH_WATER,
+        low_water: int = DEFAULT_LOW_WATER,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
     ) -> None:
+        if low_water > high_water:
+            msg = f"low_water ({low_water}) must not exceed high_water ({high_water})"
+            raise ValueError(msg)
         self._writer = writer
-        self._queue: asyncio.Queue[_PendingSend | None] = asyncio.Queue()
+        self._high_water = high_water
+        self._low_water = low_water
+        self._max_batch_bytes = max_batch_bytes
+        self._pending: deque[_PendingSend] = deque()
+        self._queued_bytes = 0
+        self._wakeup = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
         self._closed = False
+        self._error: BaseException | None = None
+        self._flushes = 0
+        self._messages_sent = 0
+        self._bytes_sent = 0
+        self._last_flush_bytes = 0
+        self._max_flush_bytes = 0
         self._task = supervisor.create(
             self._loop(), name="acp.Sender.loop", on_error=self._on_error
         )
 
-    async def send(self, payload: dict[str, Any]) -> None:
+    @property
+    def stats(self) -> SenderStats:
+        return SenderStats(
+            queue_depth=len(self._pending),
+            queued_bytes=self._queued_bytes,
+            flushes=self._flushes,
+            messages_sent=self._messages_sent,
+            bytes_sent=self._bytes_sent,
+            last_flush_bytes=self._last_flush_bytes,
+            max_flush_bytes=self._max_flush_bytes,
+        )
+
+    async def send(self, payload: dict[str, Any], *, wait: bool = True) -> None:
+        """Queue a payload for writing.
+
+        With ``wait=True`` (the default) return once the frame has been
+        written and drained, raising if the write failed. With ``wait=False``
+        return once it is queued; write errors are logged by the send loop.
+        """
         data = (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
-        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
-        await self._queue.put(_PendingSend(data, future))
-        await future
+        while not self._writable.is_set():
+            await self._writable.wait()
+        if self._error is not None:
+            msg = "Message sender stopped after a write error"
+            raise ConnectionError(msg) from self._error
+        if self._closed:
+            msg = "Message sender is closed"
+            raise ConnectionError(msg)
+        future = asyncio.get_running_loop().create_future() if wait else None
+        self._pending.append(_PendingSend(data, future))
+        self._queued_bytes += len(data)
+        if self._queued_bytes >= self._high_water:
+            self._writable.clear()
+        self._wakeup.set()
+        if future is not None:
+            await future
 
     async def close(self) -> None:
+        """Flush queued frames, then stop the send loop."""
         if self._closed:
             return
         self._closed = True
-        await self._queue.put(None)
+        self._wakeup.set()
         if self._task is not None:
-            with contextlib.suppress(asyncio.CancelledError):
+            with contextlib.suppress(asyncio.CancelledError, Exception):
                 await self._task
+        self._writable.set()
 
     async def _loop(self) -> None:
         try:
             while True:
-                item = await self._queue.get()
-                if item is None:
-                    return
+                if not self._pending:
+                    if self._closed:
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                batch = self._take_batch()
+                frames = [item.payload for item in batch]
+                size = sum(len(frame) for frame in frames)
                 try:
-                    self._writer.write(item.payload)
+                    self._writer.writelines(frames)
                     await self._writer.drain()
                 except Exception as exc:
-                    if not item.future.done():
-                        item.future.set_exception(exc)
+                    self._fail(exc, batch)
                     raise
-                else:
-                    if not item.future.done():
+                self._record_flush(len(batch), size)
+                for item in batch:
+                    if item.future is not None and not item.future.done():
                         item.future.set_result(None)
         except asyncio.CancelledError:
+            self._fail(ConnectionError("Message sender was cancelled"), [])
             return
 
+    def _take_batch(self) -> list[_PendingSend]:
+        batch = [self._pending.popleft()]
+        size = len(batch[0].payload)
+        while self._pending and size + len(self._pending[0].payload) <= self._max_batch_bytes:
+            item = self._pending.popleft()
+            size += len(item.payload)
+            batch.append(item)
+        return batch
+
+    def _record_flush(self, messages: int, size: int) -> None:
+        self._queued_bytes -= size
+        self._flushes += 1
+        self._messages_sent += messages
+        self._bytes_sent += size
+        self._last_flush_bytes = size
+        self._max_flush_bytes = max(self._max_flush_bytes, size)
+        if self._queued_bytes <= self._low_water:
+            self._writable.set()
+
+    def _fail(self, exc: BaseException, batch: list[_PendingSend]) -> None:
+        self._error = exc
+        for item in [*batch, *self._pending]:
+            if item.future is not None and not item.future.done():
+                item.future.set_exception(exc)
+        self._pending.clear()
+        self._queued_bytes = 0
+        self._writable.set()
+
     def _on_error(self, task: asyncio.Task[Any], exc: BaseException) -> None:
         logging.exception("Send loop failed", exc_info=exc)
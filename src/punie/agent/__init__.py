@@ -13,19 +13,42 @@ Main components:
 - SessionState: Immutable session-scoped cached state
 - create_toolset_from_catalog: Build toolset from discovery (Tier 1)
 - create_toolset_from_capabilities: Build toolset from capabilities (Tier 2)
+
+Components are imported on first access: importing a submodule such as
+punie.agent.deps does not drag in the adapter, the factory and pydantic_ai.
 """
 
-from punie.agent.adapter import PunieAgent
-from punie.agent.deps import ACPDeps
-from punie.agent.discovery import ToolCatalog, ToolDescriptor, parse_tool_catalog
-from punie.agent.factory import create_pydantic_agent
-from punie.agent.session import SessionState
-from punie.agent.toolset import (
-    ACPToolset,
-    create_toolset,
-    create_toolset_from_capabilities,
-    create_toolset_from_catalog,
-)
+from typing import TYPE_CHECKING
+
+from punie._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from punie.agent.adapter import PunieAgent
+    from punie.agent.deps import ACPDeps
+    from punie.agent.discovery import ToolCatalog, ToolDescriptor, parse_tool_catalog
+    from punie.agent.factory import create_pydantic_agent
+    from punie.agent.session import SessionState
+    from punie.agent.toolset import (
+        ACPToolset,
+        create_toolset,
+        create_toolset_from_capabilities,
+        create_toolset_from_catalog,
+    )
+
+# Export name → module that defines it
+_LAZY_EXPORTS = {
+    "PunieAgent": "punie.agent.adapter",
+    "ACPDeps": "punie.agent.deps",
+    "ToolCatalog": "punie.agent.discovery",
+    "ToolDescriptor": "punie.agent.discovery",
+    "parse_tool_catalog": "punie.agent.discovery",
+    "create_pydantic_agent": "punie.agent.factory",
+    "SessionState": "punie.agent.session",
+    "ACPToolset": "punie.agent.toolset",
+    "create_toolset": "punie.agent.toolset",
+    "create_toolset_from_capabilities": "punie.agent.toolset",
+    "create_toolset_from_catalog": "punie.agent.toolset",
+}
 
 __all__ = [
     "ACPDeps",
@@ -40,3 +63,5 @@ __all__ = [
     "create_toolset_from_catalog",
     "parse_tool_catalog",
 ]
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
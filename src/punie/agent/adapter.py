@@ -15,13 +15,17 @@ import asyncio
 import logging
 import secrets
 import time
+from contextlib import nullcontext
+from collections.abc import Callable
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any, cast
 
 from pydantic_ai import Agent as PydanticAgent
 from pydantic_ai.exceptions import UsageLimitExceeded
 from pydantic_ai.models import KnownModelName, Model
+from pydantic_ai.toolsets import FunctionToolset
 from pydantic_ai.usage import UsageLimits
 
 from punie.acp import (
@@ -53,10 +57,37 @@ from punie.acp.schema import (
     TextContentBlock,
 )
 
+from punie.agent.agent_pool import DEFAULT_TOOLSET, AgentKey, AgentPool, model_key
+from punie.agent.cancellation import PromptScope, SandboxCancelled, ScopedClient
 from punie.agent.deps import ACPDeps
 from punie.agent.discovery import ToolCatalog, parse_tool_catalog
-from punie.agent.factory import create_pydantic_agent
+from punie.agent.config import AgentConfig
+from punie.agent.factory import (
+    create_pydantic_agent,
+    is_local_model,
+    resolve_model,
+    tool_definitions,
+)
+from punie.agent.history import DEFAULT_HISTORY_TOKENS, SessionHistory, token_counter_for
+from punie.agent.lsp_pool import shutdown_lsp_pool
+from punie.agent.monty_runner import DEFAULT_MAX_PARALLEL, ParallelLimit
+from punie.agent.prompt_cache import PrefillSample, log_prefill, prewarm
+from punie.agent.result_cache import ToolResultCache
+from punie.agent.result_store import ResultStore
 from punie.agent.session import SessionState
+from punie.agent.scheduler import (
+    PREWARM_SESSION,
+    Priority,
+    ScheduledModel,
+    get_model_scheduler,
+    scheduled_as,
+)
+from punie.agent.streaming import (
+    ChunkCoalescer,
+    create_session_coalescer,
+    run_streaming,
+)
+from punie.agent.symbol_index import start_symbol_index
 from punie.agent.toolset import (
     create_toolset,
     create_toolset_from_capabilities,
@@ -76,12 +107,17 @@ def _get_agent_tool_names(agent: PydanticAgent[Any, Any]) -> list[str]:
     return names
 
 
+def _prebuilt_toolset(toolset: FunctionToolset[ACPDeps]) -> FunctionToolset[ACPDeps]:
+    """build_toolset for a toolset that is already built (hands it over as is)."""
+    return toolset
+
+
 class PunieAgent:
     """Adapter that bridges ACP Agent protocol to Pydantic AI.
 
     Implements all 14 methods of the ACP Agent protocol. The prompt() method
-    delegates to Pydantic AI Agent.run(), while other methods provide
-    sensible defaults.
+    delegates to Pydantic AI (streaming tokens via Agent.iter() by default,
+    or a single Agent.run()), while other methods provide sensible defaults.
 
     Supports dynamic tool discovery:
     - Stores client_capabilities from initialize()
@@ -94,6 +130,14 @@ class PunieAgent:
                For backward compatibility, can also accept a PydanticAgent instance.
         name: Agent name for identification
         usage_limits: Optional usage limits for token/request control
+        streaming: Stream tokens as agent_message_chunk/agent_thought_chunk
+                   updates while the model generates (default: True). When
+                   False, one agent_message is sent after the run completes.
+        max_parallel_calls: Per-session cap on concurrent tool calls made
+                            through parallel() in execute_code.
+        history_tokens: Token budget of the conversation history carried
+                        from one prompt to the next in a session (0 disables
+                        history, so every prompt starts cold).
     """
 
     def __init__(
@@ -101,11 +145,15 @@ class PunieAgent:
         model: KnownModelName | Model | PydanticAgent[ACPDeps, str] = "test",
         name: str = "punie-agent",
         usage_limits: UsageLimits | None = None,
+        streaming: bool = True,
+        max_parallel_calls: int = DEFAULT_MAX_PARALLEL,
+        history_tokens: int = DEFAULT_HISTORY_TOKENS,
     ) -> None:
         logger.info("=== PunieAgent.__init__() called ===")
         logger.info(f"Model: {model}")
         logger.info(f"Name: {name}")
         logger.info(f"Usage limits: {usage_limits}")
+        logger.info(f"Streaming: {streaming}")
 
         # Backward compatibility: support passing PydanticAgent instance
         if isinstance(model, PydanticAgent):
@@ -119,12 +167,21 @@ class PunieAgent:
 
         self._name = name
         self._usage_limits = usage_limits
+        self._streaming = streaming
+        self._max_parallel_calls = max_parallel_calls
+        self._history_tokens = history_tokens
         self._next_session_id = 0
         self._conn: Client | None = None
         self._client_capabilities: ClientCapabilities | None = None
         self._client_info: Implementation | None = None
         self._sessions: dict[str, SessionState] = {}
+        self._agent_pool = AgentPool()  # Agents shared by sessions with the same tools
         self._greeted_sessions: set[str] = set()  # Track which sessions got greeting
+        self._session_roots: dict[str, Path] = {}  # session_id → workspace root (cwd)
+        self._result_caches: dict[str, ToolResultCache] = {}  # session_id → typed tool results
+        self._parallel_limits: dict[str, ParallelLimit] = {}  # session_id → parallel() cap
+        self._result_stores: dict[str, ResultStore] = {}  # session_id → paged tool outputs
+        self._histories: dict[str, SessionHistory] = {}  # session_id → conversation so far
         self._pending_errors: dict[
             str, str
         ] = {}  # Store errors to send during first prompt
@@ -143,6 +200,12 @@ class PunieAgent:
         # Issue #7: Add locks to protect shared state
         self._state_lock = asyncio.Lock()  # Protects all dictionaries
 
+        # In-flight prompts, for cancel(): session_id → (prompt task, scope)
+        self._active_prompts: dict[str, tuple[asyncio.Task[Any], PromptScope]] = {}
+
+        # Prompt prefix prewarms of newly built agents (see _start_prewarm)
+        self._prewarm_tasks: set[asyncio.Task[PrefillSample | None]] = set()
+
         # Cleanup task (started lazily when event loop is running)
         self._cleanup_task: asyncio.Task[None] | None = None
         self._cleanup_started = False
@@ -167,6 +230,11 @@ class PunieAgent:
                 await self._cleanup_task
             except asyncio.CancelledError:
                 pass
+        for task in list(self._prewarm_tasks):
+            task.cancel()
+        for session_id in list(self._result_stores):
+            self._close_result_store(session_id)
+        await shutdown_lsp_pool()
         logger.info("Agent shutdown complete")
 
     async def _cleanup_expired_sessions(self) -> None:
@@ -209,12 +277,7 @@ class PunieAgent:
                         ]
 
                         for session_id in sessions_to_remove:
-                            self._sessions.pop(session_id, None)
-                            self._greeted_sessions.discard(session_id)
-                            self._pending_errors.pop(session_id, None)
-                            self._perf_collectors.pop(session_id, None)
-                            self._session_tokens.pop(session_id, None)
-                            del self._session_owners[session_id]
+                            self._forget_session(session_id)
 
                         # Only remove client if all sessions were cleaned up
                         # (if some sessions are being resumed, keep client in grace period)
@@ -299,12 +362,7 @@ class PunieAgent:
                 for session_id in sessions_to_remove:
                     logger.info(f"Cleaning up session {session_id} owned by {client_id}")
                     # Issue #8: Remove sessions from _sessions dict (prevents stale reuse)
-                    self._sessions.pop(session_id, None)
-                    self._greeted_sessions.discard(session_id)
-                    self._pending_errors.pop(session_id, None)
-                    self._perf_collectors.pop(session_id, None)
-                    self._session_tokens.pop(session_id, None)
-                    del self._session_owners[session_id]
+                    self._forget_session(session_id)
 
                 logger.info(
                     f"Unregistered client {client_id}, cleaned up {len(sessions_to_remove)} sessions"
@@ -324,6 +382,94 @@ class PunieAgent:
             return None
         return self._connections.get(client_id)
 
+    async def prewarm(
+        self, toolset: FunctionToolset[ACPDeps] | None = None
+    ) -> PrefillSample | None:
+        """Have a local model server cache a toolset's prompt prefix before the first prompt.
+
+        Sends the instructions and toolset (default: create_toolset(), the
+        toolset of sessions without a client) once, so sessions using that
+        toolset start with their prefix already in the server's cache.
+        Sessions don't need to call this: building an agent for a new
+        toolset prewarms it (see _start_prewarm). Prewarming yields to
+        people: it is skipped while interactive requests hold or wait for a
+        ModelScheduler slot, and otherwise queues as batch work behind any
+        that arrive. The scheduler does not preempt, so a prompt arriving
+        while the prewarm request runs still waits for it to finish.
+        Does nothing for non-local models; failures are logged, not raised.
+
+        Returns:
+            PrefillSample of the prewarm request, or None if none was sent
+        """
+        if self._legacy_agent is not None or not is_local_model(self._model):
+            return None
+        interactive = get_model_scheduler().stats().by_priority[Priority.INTERACTIVE]
+        if interactive.running or interactive.waiting:
+            logger.info("Skipping prompt prefix prewarm: interactive requests are in flight")
+            return None
+        config = AgentConfig()
+        model = ScheduledModel(cast(Model, resolve_model(cast(KnownModelName, self._model))))
+        try:
+            with scheduled_as(PREWARM_SESSION, Priority.BATCH):
+                return await prewarm(
+                    model,
+                    config.instructions,
+                    tool_definitions(toolset if toolset is not None else create_toolset()),
+                )
+        except Exception as exc:
+            logger.warning(f"Prompt prefix prewarm failed: {exc}")
+            return None
+
+    def _start_prewarm(self, toolset: FunctionToolset[ACPDeps]) -> None:
+        """Prewarm a newly built agent's prefix in the background.
+
+        Called once per AgentKey, when the agent pool builds its agent, so
+        the prefix is cached by the time the session sends its first prompt
+        and later sessions with the same tools reuse it.
+        """
+        if self._legacy_agent is not None or not is_local_model(self._model):
+            return
+        task = asyncio.create_task(self.prewarm(toolset))
+        self._prewarm_tasks.add(task)
+        task.add_done_callback(self._prewarm_tasks.discard)
+
+    def _session_history(self, session_id: str) -> SessionHistory | None:
+        """The session's conversation history (None when history is disabled)."""
+        if self._history_tokens <= 0:
+            return None
+        history = self._histories.get(session_id)
+        if history is None:
+            history = SessionHistory(
+                self._history_tokens, count_tokens=token_counter_for(self._model)
+            )
+            self._histories[session_id] = history
+        return history
+
+    def _forget_session(self, session_id: str) -> None:
+        """Drop everything kept for a session (call with _state_lock held).
+
+        Every cleanup path (expiry, immediate unregister, resume taking over
+        a client's sessions) goes through here, so none of them can miss a
+        per-session map.
+        """
+        self._sessions.pop(session_id, None)
+        self._greeted_sessions.discard(session_id)
+        self._pending_errors.pop(session_id, None)
+        self._perf_collectors.pop(session_id, None)
+        self._session_tokens.pop(session_id, None)
+        self._session_roots.pop(session_id, None)
+        self._parallel_limits.pop(session_id, None)
+        self._result_caches.pop(session_id, None)
+        self._close_result_store(session_id)
+        self._histories.pop(session_id, None)
+        self._session_owners.pop(session_id, None)
+
+    def _close_result_store(self, session_id: str) -> None:
+        """Forget a session's paged outputs and remove their spill files."""
+        store = self._result_stores.pop(session_id, None)
+        if store is not None:
+            store.close()
+
     async def _discover_and_build_toolset(self, session_id: str) -> SessionState:
         """Discover tools and build session state.
 
@@ -333,6 +479,10 @@ class PunieAgent:
         3. Tier 3: Default toolset (all 7 static tools)
 
         Returns immutable SessionState with catalog, agent, and discovery tier.
+        The agent comes from the agent pool: sessions with the same model,
+        tier and tools (catalog fingerprint) share one, so only the first
+        session with a new catalog builds a toolset and agent. Called without
+        holding _state_lock, since discovery is a round trip to the client.
 
         >>> # This is an internal helper, called from new_session()
         >>> # See examples/10_session_registration.py for usage
@@ -349,95 +499,94 @@ class PunieAgent:
             # For WebSocket, self._conn is None but we still want to create a toolset
             has_any_connection = self._conn is not None or len(self._connections) > 0
 
-            if not has_any_connection:
-                # No connection: return Tier 3 default
-                logger.info("No connection, using Tier 3 default toolset")
-                toolset = create_toolset()
-                model_value = cast(KnownModelName | Model, self._model)
-                # Create collector if perf enabled
-                perf_collector = PerformanceCollector() if self._perf_enabled else None
-                if perf_collector:
-                    self._perf_collectors[session_id] = perf_collector
-                pydantic_agent = create_pydantic_agent(
-                    model=model_value, toolset=toolset, perf_collector=perf_collector
-                )
-                logger.info("Tier 3 agent created successfully")
-                return SessionState(
-                    catalog=None, agent=pydantic_agent, discovery_tier=3
-                )
-
             catalog: ToolCatalog | None = None
-            toolset = None
+            build_toolset: Callable[[], FunctionToolset[ACPDeps]] | None = None
+            tools_key = DEFAULT_TOOLSET
             discovery_tier = 3
 
-            try:
-                # Tier 1: Try discovery
-                logger.info("Checking for discover_tools method...")
-                if hasattr(self._conn, "discover_tools"):
-                    logger.info("discover_tools method found, calling it...")
-                    catalog_dict = await self._conn.discover_tools(
-                        session_id=session_id
-                    )
-                    logger.info(f"discover_tools returned: {catalog_dict}")
-                    if catalog_dict and catalog_dict.get("tools"):
-                        logger.info("Parsing tool catalog...")
-                        catalog = parse_tool_catalog(catalog_dict)
-                        logger.info("Creating toolset from catalog...")
-                        toolset = create_toolset_from_catalog(catalog)
-                        discovery_tier = 1
-                        tool_names = [t.name for t in catalog.tools]
+            if not has_any_connection:
+                # No connection: Tier 3 default
+                logger.info("No connection, using Tier 3 default toolset")
+            else:
+                try:
+                    # Tier 1: Try discovery
+                    logger.info("Checking for discover_tools method...")
+                    if hasattr(self._conn, "discover_tools"):
+                        logger.info("discover_tools method found, calling it...")
+                        catalog_dict = await self._conn.discover_tools(
+                            session_id=session_id
+                        )
+                        logger.info(f"discover_tools returned: {catalog_dict}")
+                        if catalog_dict and catalog_dict.get("tools"):
+                            logger.info("Parsing tool catalog...")
+                            catalog = parse_tool_catalog(catalog_dict)
+                            build_toolset = partial(create_toolset_from_catalog, catalog)
+                            tools_key = catalog.fingerprint()
+                            discovery_tier = 1
+                            tool_names = [t.name for t in catalog.tools]
+                            logger.info(
+                                f"Using tool catalog: {len(catalog.tools)} tools - {tool_names}"
+                            )
+                        else:
+                            logger.info("discover_tools returned empty or invalid catalog")
+                    else:
+                        logger.info("discover_tools method not available")
+                except Exception as exc:
+                    logger.warning(f"Tool discovery failed, falling back: {exc}")
+                    logger.exception("Full discovery exception:")
+
+                # Tier 2: Capabilities fallback
+                if build_toolset is None and self._client_capabilities:
+                    logger.info("Using Tier 2: capabilities-based toolset")
+                    candidate = create_toolset_from_capabilities(self._client_capabilities)
+                    if candidate.tools:
+                        # A pool miss gets this toolset rather than building another
+                        build_toolset = partial(_prebuilt_toolset, candidate)
+                        discovery_tier = 2
+                        tool_names = list(candidate.tools.keys())
+                        tools_key = ",".join(tool_names)
                         logger.info(
-                            f"Built toolset from catalog: {len(catalog.tools)} tools - {tool_names}"
+                            f"Built toolset from capabilities: {len(tool_names)} tools - {tool_names}"
                         )
                     else:
-                        logger.info("discover_tools returned empty or invalid catalog")
-                else:
-                    logger.info("discover_tools method not available")
-            except Exception as exc:
-                logger.warning(f"Tool discovery failed, falling back: {exc}")
-                logger.exception("Full discovery exception:")
-
-            # Tier 2: Capabilities fallback
-            if toolset is None and self._client_capabilities:
-                logger.info("Using Tier 2: capabilities-based toolset")
-                candidate = create_toolset_from_capabilities(self._client_capabilities)
-                if candidate.tools:
-                    toolset = candidate
-                    discovery_tier = 2
-                    tool_names = list(toolset.tools.keys())
-                    logger.info(
-                        f"Built toolset from capabilities: {len(tool_names)} tools - {tool_names}"
-                    )
-                else:
-                    logger.info(
-                        "Tier 2 produced empty toolset, falling through to Tier 3"
-                    )
+                        logger.info(
+                            "Tier 2 produced empty toolset, falling through to Tier 3"
+                        )
 
             # Tier 3: Default fallback
-            if toolset is None:
+            if build_toolset is None:
                 logger.info("Using Tier 3: default toolset")
-                toolset = create_toolset()
-                discovery_tier = 3
-                tool_names = list(toolset.tools.keys())
-                logger.info(
-                    f"Using default toolset: {len(tool_names)} tools - {tool_names}"
-                )
+                build_toolset = create_toolset
 
-            # Construct per-session Pydantic AI agent
-            logger.info(f"Creating Pydantic AI agent with model: {self._model}")
+            # Sessions with the same model, tier, tools and config share one agent
+            logger.info(f"Getting Pydantic AI agent with model: {self._model}")
             # Cast is safe: __init__ ensures self._model is KnownModelName | Model when not legacy
             model_value = cast(KnownModelName | Model, self._model)
 
-            # Create collector if perf enabled (one per session)
+            # Create collector if perf enabled (one per session, so its agent is not shared)
             perf_collector = PerformanceCollector() if self._perf_enabled else None
             if perf_collector:
                 self._perf_collectors[session_id] = perf_collector
 
-            try:
-                pydantic_agent = create_pydantic_agent(
+            def build_agent() -> PydanticAgent[ACPDeps, str]:
+                toolset = build_toolset()
+                agent = create_pydantic_agent(
                     model=model_value, toolset=toolset, perf_collector=perf_collector
                 )
-                logger.info("Pydantic AI agent created successfully")
+                self._start_prewarm(toolset)
+                return agent
+
+            try:
+                if perf_collector:
+                    pydantic_agent = build_agent()
+                else:
+                    key = AgentKey(
+                        model=model_key(model_value),
+                        discovery_tier=discovery_tier,
+                        tools=tools_key,
+                    )
+                    pydantic_agent = self._agent_pool.get_or_create(key, build_agent)
+                logger.info("Pydantic AI agent ready")
             except Exception as exc:
                 # Handle local server connection errors gracefully
                 # This catches errors when trying to connect to LM Studio or mlx-lm.server
@@ -478,7 +627,7 @@ class PunieAgent:
                     # Fall back to test model
                     logger.info("Falling back to test model...")
                     pydantic_agent = create_pydantic_agent(
-                        model="test", toolset=toolset, perf_collector=perf_collector
+                        model="test", toolset=build_toolset(), perf_collector=perf_collector
                     )
                     logger.info("Fallback to test model successful")
                 else:
@@ -587,6 +736,9 @@ class PunieAgent:
                 session_id = f"punie-session-{self._next_session_id}"
                 self._next_session_id += 1
                 logger.info(f"Generated session_id: {session_id}")
+                if cwd:
+                    self._session_roots[session_id] = Path(cwd)
+                    start_symbol_index(cwd)
 
                 # Track session ownership for multi-client routing (Phase 28)
                 if client_id:
@@ -744,12 +896,7 @@ class PunieAgent:
                         if owner == original_owner and sid != session_id
                     ]
                     for sid in old_sessions:
-                        self._sessions.pop(sid, None)
-                        self._greeted_sessions.discard(sid)
-                        self._pending_errors.pop(sid, None)
-                        self._perf_collectors.pop(sid, None)
-                        self._session_tokens.pop(sid, None)
-                        del self._session_owners[sid]
+                        self._forget_session(sid)
             finally:
                 # Always remove from resuming set
                 self._resuming_sessions.pop(session_id, None)
@@ -778,7 +925,9 @@ class PunieAgent:
 
         This is the core integration point. Extracts text from ACP prompt blocks,
         constructs ACPDeps, builds session-specific toolset via discovery, and
-        delegates to Pydantic AI Agent.run().
+        delegates to Pydantic AI. In streaming mode, tokens are forwarded as
+        coalesced agent_message_chunk/agent_thought_chunk updates while the
+        model generates; otherwise the full response is sent once at the end.
 
         Three-tier toolset discovery:
         1. Call discover_tools() if available (IDE advertises tools)
@@ -789,7 +938,9 @@ class PunieAgent:
             prompt: List of content blocks containing the user's prompt.
             session_id: Session ID for this prompt.
             calling_client_id: ID of the client making this request (for multi-client security).
-            **kwargs: Additional parameters.
+            **kwargs: Additional parameters. A "priority" of "batch" (e.g. from
+                the request's _meta) queues this prompt's model requests behind
+                interactive ones on a local model server.
 
         Returns:
             PromptResponse with stop_reason.
@@ -875,10 +1026,20 @@ class PunieAgent:
             logger.error("No client connection established")
             raise RuntimeError("No client connection established")
 
+        # Everything this prompt starts is recorded in its scope for cancel()
+        scope = PromptScope(session_id)
         deps = ACPDeps(
-            client_conn=conn,
+            client_conn=cast(Client, ScopedClient(conn, scope)),
             session_id=session_id,
             tracker=ToolCallTracker(),
+            cancel_scope=scope,
+            workspace_root=self._session_roots.get(session_id),
+            max_parallel_calls=self._max_parallel_calls,
+            parallel_limit=self._parallel_limits.setdefault(
+                session_id, ParallelLimit(self._max_parallel_calls)
+            ),
+            result_cache=self._result_caches.setdefault(session_id, ToolResultCache()),
+            result_store=self._result_stores.setdefault(session_id, ResultStore()),
         )
         logger.debug(f"Created ACPDeps for session {session_id}")
 
@@ -900,22 +1061,23 @@ class PunieAgent:
                 logger.info(f"Using cached session state (Tier {state.discovery_tier})")
                 pydantic_agent = state.agent
             else:
-                # Issue #11: Lazy fallback with lock to prevent race condition
+                # Issue #11: Discover outside the lock (it awaits the client), then
+                # keep whichever state a concurrent request registered first
                 logger.info("No cached session, performing lazy registration")
+                state = await self._discover_and_build_toolset(session_id)
                 async with self._state_lock:
-                    # Double-check after acquiring lock (another request may have created it)
                     if session_id in self._sessions:
                         state = self._sessions[session_id]
                         logger.info("Session created by concurrent request, using it")
                     else:
-                        # Actually create the session
-                        state = await self._discover_and_build_toolset(session_id)
                         self._sessions[session_id] = state
                         logger.info(
                             f"Lazy registration for session {session_id}: Tier {state.discovery_tier}"
                         )
                 pydantic_agent = state.agent
 
+        history = self._session_history(session_id)
+
         # Log model and tool information
         logger.info(f"Agent model: {pydantic_agent.model}")
         tool_names = _get_agent_tool_names(pydantic_agent)
@@ -930,35 +1092,99 @@ class PunieAgent:
             collector.start_prompt(str(self._model), backend)
 
         # Delegate to Pydantic AI with error handling
-        logger.info("Calling pydantic_agent.run()...")
+        # streamed_chars > 0 means the response text already reached the client
+        streamed_chars = 0
+        ttft_ms: float | None = None
+        prefill: list[PrefillSample] = []
+        coalescer: ChunkCoalescer | None = None
+        priority = Priority.parse(kwargs.get("priority"))
+        current_task = asyncio.current_task()
+        if current_task is not None:
+            self._active_prompts[session_id] = (current_task, scope)
         try:
-            result = await pydantic_agent.run(
-                prompt_text, deps=deps, usage_limits=self._usage_limits
-            )
-            response_text = result.output
+            # Runs of a session take turns on its history, so each one starts
+            # from the previous run's messages and appends its own after them
+            turn = history.turn() if history is not None else nullcontext()
+            async with turn as message_history:
+                if self._streaming:
+                    logger.info("Calling pydantic_agent.iter() (streaming)...")
+                    coalescer = create_session_coalescer(deps)
+                    with scheduled_as(session_id, priority):
+                        streamed = await run_streaming(
+                            pydantic_agent,
+                            prompt_text,
+                            deps,
+                            usage_limits=self._usage_limits,
+                            coalescer=coalescer,
+                            message_history=message_history,
+                        )
+                    if history is not None:
+                        history.extend(streamed.new_messages)
+                    response_text = streamed.output
+                    streamed_chars = streamed.message_chars_sent
+                    ttft_ms = streamed.time_to_first_token_ms
+                    prefill = streamed.prefill
+                    usage = streamed.usage
+                else:
+                    logger.info("Calling pydantic_agent.run()...")
+                    with scheduled_as(session_id, priority):
+                        result = await pydantic_agent.run(
+                            prompt_text,
+                            deps=deps,
+                            usage_limits=self._usage_limits,
+                            message_history=message_history,
+                        )
+                    if history is not None:
+                        history.extend(result.new_messages())
+                    response_text = result.output
+                    usage = result.usage()
             logger.info(
                 f"Agent run successful, response length: {len(response_text)} chars"
             )
             logger.info(f"Response preview: {response_text[:200]}...")
 
+            log_prefill(prefill)
+
             # Log usage info if available
-            if result.usage():
-                usage = result.usage()
+            if usage:
                 logger.info(
                     f"Token usage - requests: {usage.requests}, total tokens: {usage.total_tokens}"
                 )
 
+        except (asyncio.CancelledError, SandboxCancelled):
+            if not scope.cancelled:
+                raise  # Cancelled from outside (e.g. shutdown), not by cancel()
+            if current_task is not None:
+                current_task.uncancel()
+            logger.info(f"=== prompt() cancelled for session {session_id} ===")
+            if collector:
+                collector.end_prompt()
+            return PromptResponse(stop_reason="cancelled")
+
         except UsageLimitExceeded as exc:
             logger.error(f"Usage limit exceeded: {exc}")
             response_text = f"Usage limit exceeded: {exc}"
+            if coalescer and coalescer.message_chars_sent:
+                response_text = f"\n\n{response_text}"
+            streamed_chars = 0
 
         except Exception as exc:
             logger.exception("Agent run failed")
             response_text = f"Agent error: {exc}"
+            if coalescer and coalescer.message_chars_sent:
+                response_text = f"\n\n{response_text}"
+            streamed_chars = 0
+
+        finally:
+            active = self._active_prompts.get(session_id)
+            if active is not None and active[1] is scope:
+                del self._active_prompts[session_id]
 
         # End performance timing and generate report if enabled
         if collector:
             logger.info("Ending performance timing and generating report")
+            if ttft_ms is not None:
+                collector.record_first_token(ttft_ms)
             collector.end_prompt()
             try:
                 report_data = collector.report()
@@ -974,21 +1200,55 @@ class PunieAgent:
                 logger.info(f"Performance report saved to: {report_path}")
 
                 # Append report location to response
-                response_text += f"\n\n📊 **Performance report**: `{report_filename}`"
+                report_note = f"\n\n📊 **Performance report**: `{report_filename}`"
+                if streamed_chars:
+                    await conn.session_update(
+                        session_id, update_agent_message_text(report_note)
+                    )
+                else:
+                    response_text += report_note
             except Exception as perf_exc:
                 logger.warning(f"Failed to generate performance report: {perf_exc}")
 
-        logger.info("Sending session_update to client...")
-        await conn.session_update(
-            session_id,
-            update_agent_message(text_block(response_text)),
-        )
+        # Streaming already delivered the text; only send it if nothing streamed
+        if not streamed_chars:
+            logger.info("Sending session_update to client...")
+            await conn.session_update(
+                session_id,
+                update_agent_message(text_block(response_text)),
+            )
         logger.info(f"=== prompt() complete for session {session_id} ===")
-        return PromptResponse(stop_reason="end_turn")
+        field_meta = None
+        if ttft_ms is not None:
+            field_meta = {"time_to_first_token_ms": round(ttft_ms, 1)}
+        if prefill:
+            field_meta = {**(field_meta or {}), "prefill": [s.as_dict() for s in prefill]}
+        return PromptResponse(stop_reason="end_turn", field_meta=field_meta)
 
     async def cancel(self, session_id: str, **kwargs: Any) -> None:
-        """Cancel a running prompt."""
-        pass
+        """Cancel the running prompt for a session and free its resources.
+
+        Cancels the prompt task (the model request and any awaiting tool),
+        abandons bridge calls from the execute_code sandbox, interrupts the
+        sandbox thread, and kills and releases every terminal the prompt
+        created. The cancelled prompt() returns stop_reason="cancelled".
+        No-op if the session has no prompt in flight.
+
+        Args:
+            session_id: Session whose prompt should be cancelled.
+            **kwargs: Additional parameters.
+        """
+        active = self._active_prompts.get(session_id)
+        if active is None:
+            logger.info(f"cancel(): no prompt in flight for session {session_id}")
+            return
+        task, scope = active
+        logger.info(f"Cancelling prompt for session {session_id}")
+        scope.cancel()
+        task.cancel()
+        conn = self.get_client_connection(session_id) or self._conn
+        if conn is not None:
+            await scope.release_terminals(conn)
 
     async def ext_method(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
         """Handle extension methods."""
@@ -0,0 +1,131 @@
+"""Pydantic AI agents shared by sessions with identical toolsets.
+
+Most sessions come from the same IDE with the same tool catalog, and a
+Pydantic AI Agent (model, provider and HTTP client included) holds no
+per-run state: each run gets its own ACPDeps. Sessions whose model,
+discovery tier, tools and config match therefore share one agent instead
+of each building a toolset and agent of their own.
+
+AgentPool keys agents by AgentKey and keeps the most recently used
+max_agents of them.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from punie.agent.config import AgentConfig
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent as PydanticAgent
+
+    from punie.agent.deps import ACPDeps
+
+DEFAULT_MAX_AGENTS = 32
+
+# AgentKey.tools for the static toolset (Tier 3)
+DEFAULT_TOOLSET = "default"
+
+
+@dataclass(frozen=True)
+class AgentKey:
+    """Everything that makes two sessions' agents interchangeable.
+
+    >>> AgentKey(model="test", discovery_tier=3) == AgentKey(model="test", discovery_tier=3)
+    True
+    """
+
+    model: Hashable
+    """Model name, or the identity of a Model instance (see model_key)."""
+
+    discovery_tier: int
+    """Discovery tier that produced the toolset: 1=catalog, 2=capabilities, 3=default."""
+
+    tools: str = DEFAULT_TOOLSET
+    """Toolset identity: catalog fingerprint (Tier 1) or tool names (Tier 2)."""
+
+    config: AgentConfig = field(default_factory=AgentConfig)
+    """Agent configuration (instructions, sampling, retries)."""
+
+
+def model_key(model: Any) -> Hashable:
+    """AgentKey.model for a model name or Model instance.
+
+    Model instances are dataclasses that compare by value and can't be
+    hashed, so agents built from one are keyed by its identity.
+
+    >>> model_key("local:my-model")
+    'local:my-model'
+    """
+    return model if isinstance(model, str) else ("instance", id(model))
+
+
+@dataclass(frozen=True)
+class AgentPoolStats:
+    """Snapshot of AgentPool counters."""
+
+    hits: int
+    """Sessions that reused a pooled agent."""
+
+    misses: int
+    """Sessions that had to build an agent."""
+
+    agents: int
+    """Agents currently pooled."""
+
+
+class AgentPool:
+    """LRU pool of agents keyed by AgentKey.
+
+    >>> pool = AgentPool()
+    >>> built = []
+    >>> def build():
+    ...     built.append(1)
+    ...     return object()
+    >>> key = AgentKey(model="test", discovery_tier=3)
+    >>> pool.get_or_create(key, build) is pool.get_or_create(key, build)
+    True
+    >>> len(built), pool.stats().hits
+    (1, 1)
+    """
+
+    def __init__(self, max_agents: int = DEFAULT_MAX_AGENTS) -> None:
+        self.max_agents = max_agents
+        self._agents: OrderedDict[AgentKey, PydanticAgent[ACPDeps, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_create(
+        self, key: AgentKey, build: Callable[[], PydanticAgent[ACPDeps, str]]
+    ) -> PydanticAgent[ACPDeps, str]:
+        """Return the pooled agent for key, building it with build() on a miss.
+
+        Errors from build() propagate and nothing is pooled.
+        """
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is not None:
+                self._agents.move_to_end(key)
+                self._hits += 1
+                return agent
+            self._misses += 1
+            agent = build()
+            self._agents[key] = agent
+            while len(self._agents) > self.max_agents:
+                self._agents.popitem(last=False)
+            return agent
+
+    def clear(self) -> None:
+        """Drop every pooled agent."""
+        with self._lock:
+            self._agents.clear()
+
+    def stats(self) -> AgentPoolStats:
+        """Current hit/miss counters and pool size."""
+        with self._lock:
+            return AgentPoolStats(hits=self._hits, misses=self._misses, agents=len(self._agents))
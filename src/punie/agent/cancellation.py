@@ -0,0 +1,220 @@
+"""Cancellation support for in-flight prompts.
+
+PunieAgent.cancel() has to free everything a prompt started, not just stop
+waiting for it:
+
+- the Pydantic AI run (the prompt task is cancelled)
+- terminals created through ``create_terminal`` (killed and released)
+- bridge calls issued from the execute_code sandbox thread, such as LSP
+  queries and terminal workflows (their futures are cancelled)
+- the sandbox thread itself (interrupted with SandboxCancelled)
+
+A PromptScope records those resources as they are created; ScopedClient
+wraps the ACP client so terminal creation is recorded automatically.
+"""
+
+import asyncio
+import concurrent.futures
+import ctypes
+import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from punie.acp.interfaces import Client
+from punie.acp.schema import CreateTerminalResponse, ReleaseTerminalResponse
+
+logger = logging.getLogger(__name__)
+
+
+class SandboxCancelled(BaseException):
+    """Raised inside the execute_code sandbox thread when its prompt is cancelled.
+
+    Derives from BaseException so model-generated ``except Exception`` blocks
+    cannot swallow it.
+    """
+
+
+def _interrupt_thread(thread_id: int, exc_type: type[BaseException] | None) -> None:
+    """Schedule exc_type to be raised in another thread (None clears it).
+
+    The exception is delivered at the thread's next bytecode boundary, which
+    stops pure-Python loops in the sandbox without waiting for them to end.
+    """
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id),
+        ctypes.py_object(exc_type) if exc_type is not None else None,
+    )
+
+
+class PromptScope:
+    """Resources owned by one in-flight prompt.
+
+    Mutable by design: resources are registered while the prompt runs and torn
+    down together by cancel(). Thread-safe, since the execute_code sandbox
+    registers bridge futures from a worker thread.
+
+    >>> scope = PromptScope("punie-session-0")
+    >>> scope.add_terminal("term-1")
+    >>> scope.terminal_ids
+    frozenset({'term-1'})
+    >>> scope.cancelled
+    False
+    >>> scope.cancel()
+    >>> scope.cancelled
+    True
+    """
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._terminal_ids: set[str] = set()
+        self._futures: set[concurrent.futures.Future[Any]] = set()
+        self._sandbox_threads: set[int] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._cancelled.is_set()
+
+    @property
+    def terminal_ids(self) -> frozenset[str]:
+        """Terminals created during this prompt and not yet released."""
+        with self._lock:
+            return frozenset(self._terminal_ids)
+
+    def add_terminal(self, terminal_id: str) -> None:
+        """Record a terminal created during this prompt."""
+        with self._lock:
+            self._terminal_ids.add(terminal_id)
+
+    def discard_terminal(self, terminal_id: str) -> None:
+        """Forget a terminal that has been released."""
+        with self._lock:
+            self._terminal_ids.discard(terminal_id)
+
+    def track_future(
+        self, future: concurrent.futures.Future[Any]
+    ) -> concurrent.futures.Future[Any]:
+        """Record a bridge future so cancel() can abandon it.
+
+        Futures submitted after cancellation are cancelled immediately.
+        """
+        with self._lock:
+            if self._cancelled.is_set():
+                future.cancel()
+                return future
+            self._futures.add(future)
+        future.add_done_callback(self._forget_future)
+        return future
+
+    def _forget_future(self, future: concurrent.futures.Future[Any]) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def check(self) -> None:
+        """Raise SandboxCancelled if the prompt has been cancelled."""
+        if self._cancelled.is_set():
+            raise SandboxCancelled(f"Prompt for {self.session_id} was cancelled")
+
+    @contextmanager
+    def sandbox_thread(self) -> Iterator[None]:
+        """Register the current thread as this prompt's sandbox thread.
+
+        While registered, cancel() interrupts the thread with SandboxCancelled.
+        A pending interrupt is cleared on exit so it cannot leak into whatever
+        the (pooled) thread runs next.
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            self.check()
+            self._sandbox_threads.add(thread_id)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._sandbox_threads.discard(thread_id)
+                if self._cancelled.is_set():
+                    _interrupt_thread(thread_id, None)
+
+    def cancel(self) -> None:
+        """Mark cancelled, abandon bridge futures, and interrupt sandbox threads.
+
+        Terminals need an async round trip to the client, see release_terminals().
+        """
+        with self._lock:
+            self._cancelled.set()
+            futures = list(self._futures)
+            threads = list(self._sandbox_threads)
+            self._futures.clear()
+            for thread_id in threads:
+                _interrupt_thread(thread_id, SandboxCancelled)
+        for future in futures:
+            future.cancel()
+        if futures or threads:
+            logger.info(
+                f"Cancelled {len(futures)} bridge calls and {len(threads)} sandbox "
+                f"threads for {self.session_id}"
+            )
+
+    async def release_terminals(self, client: Client) -> None:
+        """Kill and release every terminal this prompt created."""
+        with self._lock:
+            terminal_ids = list(self._terminal_ids)
+            self._terminal_ids.clear()
+        for terminal_id in terminal_ids:
+            try:
+                await client.kill_terminal(
+                    session_id=self.session_id, terminal_id=terminal_id
+                )
+                await client.release_terminal(
+                    session_id=self.session_id, terminal_id=terminal_id
+                )
+            except Exception as exc:
+                logger.warning(f"Failed to kill terminal {terminal_id}: {exc}")
+        if terminal_ids:
+            logger.info(
+                f"Killed {len(terminal_ids)} terminals for {self.session_id}"
+            )
+
+
+class ScopedClient:
+    """Client wrapper that records terminals in a PromptScope.
+
+    Terminal creation and release are intercepted; every other Client method
+    is forwarded unchanged to the wrapped connection.
+    """
+
+    def __init__(self, client: Client, scope: PromptScope) -> None:
+        self._client = client
+        self._scope = scope
+
+    @property
+    def wrapped(self) -> Client:
+        """The underlying client connection."""
+        return self._client
+
+    async def create_terminal(self, *args: Any, **kwargs: Any) -> CreateTerminalResponse:
+        if self._scope.cancelled:
+            raise asyncio.CancelledError
+        response = await self._client.create_terminal(*args, **kwargs)
+        self._scope.add_terminal(response.terminal_id)
+        if self._scope.cancelled:
+            # Cancelled while the terminal was being created
+            await self._scope.release_terminals(self._client)
+            raise asyncio.CancelledError
+        return response
+
+    async def release_terminal(
+        self, session_id: str, terminal_id: str, **kwargs: Any
+    ) -> ReleaseTerminalResponse | None:
+        response = await self._client.release_terminal(
+            session_id=session_id, terminal_id=terminal_id, **kwargs
+        )
+        self._scope.discard_terminal(terminal_id)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
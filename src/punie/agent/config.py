@@ -2,11 +2,15 @@
 
 Provides AgentConfig dataclass and instruction sets for PyCharm/ACP mode
 (default) and standalone local mode (PUNIE_MODE=local).
-"""
 
-from dataclasses import dataclass
+The Code Mode instruction sets embed stubs generated from the toolset, which
+means importing pydantic_ai. They are built on first use and cached:
+punie_instructions() and punie_local_instructions() return them, and the
+PUNIE_INSTRUCTIONS / PUNIE_LOCAL_INSTRUCTIONS module attributes still work.
+"""
 
-from punie.agent.stubs import get_stub_instructions
+from dataclasses import dataclass, field
+from functools import cache
 
 
 def default_stop_sequences(model: str) -> tuple[str, ...] | None:
@@ -35,7 +39,7 @@ def default_stop_sequences(model: str) -> tuple[str, ...] | None:
     # Ollama and other backends handle stop sequences internally
     return None
 
-PUNIE_INSTRUCTIONS = f"""\
+_PUNIE_INSTRUCTIONS_TEMPLATE = """\
 You are Punie, an AI coding assistant that works inside PyCharm.
 
 You have access to the user's workspace through the IDE. You can read files,
@@ -47,9 +51,10 @@ Available tools:
 - write_file(path, content): Write content to a file (requires permission)
 - run_command(command, args, cwd): Run a shell command (requires permission)
 - execute_code(code): Execute Python code with multiple tool calls (Code Mode)
+- read_more(handle, offset): Next page of an output that ended with "Output truncated"
 - Terminal tools: get_terminal_output, release_terminal, wait_for_terminal_exit, kill_terminal
 
-{get_stub_instructions()}
+{stubs}
 
 Guidelines:
 - Use Code Mode for multi-step queries (find + analyze, search + count, etc.)
@@ -76,7 +81,7 @@ Guidelines:
 - Keep responses focused and actionable.
 """
 
-PUNIE_LOCAL_INSTRUCTIONS = f"""\
+_PUNIE_LOCAL_INSTRUCTIONS_TEMPLATE = """\
 You are Punie, a standalone AI coding assistant.
 
 You have direct access to the project filesystem and can run commands
@@ -87,9 +92,10 @@ Available tools:
 - write_file(path, content): Write content to a file
 - run_command(command, args, cwd): Run a shell command
 - execute_code(code): Execute Python code with multiple tool calls (Code Mode)
+- read_more(handle, offset): Next page of an output that ended with "Output truncated"
 - Terminal tools: get_terminal_output, release_terminal, wait_for_terminal_exit, kill_terminal
 
-{get_stub_instructions()}
+{stubs}
 
 Guidelines:
 - Use Code Mode for multi-step queries (find + analyze, search + count, etc.)
@@ -127,10 +133,11 @@ File operations:
 - read_file(path) - read any file
 - write_file(path, content) - write to files
 - run_command(command, args, cwd) - run ANY shell command (find files, grep, etc.)
+- read_more(handle, offset) - next page of a large output (see its "Output truncated" footer)
 
 Code quality:
 - typecheck_direct(path) - type checking (returns JSON with errors, severity, messages)
-- ruff_check_direct(path) - linting (returns JSON with violations, fixable count)
+- ruff_check_direct(path) - linting (returns JSON with per-rule counts and a sample of violations)
 - pytest_run_direct(path) - testing (returns JSON with passed/failed counts, test details)
 
 Git operations:
@@ -160,6 +167,7 @@ Domain validators (tdom-svcs architecture):
 - validate_middleware_chain_direct(file) - check @middleware categories + __call__ signature
 - check_di_template_binding_direct(file) - verify html() context= for DI components
 - validate_route_pattern_direct(file) - validate route path syntax
+- validate_all_direct(file, checks) - run several validators in one pass (checks: names or "tdom"/"svcs"/"tdom-svcs")
 
 Query mapping examples:
 - "Find Python files" → run_command("find", ["-name", "*.py"])
@@ -178,6 +186,35 @@ Guidelines:
 """
 
 
+@cache
+def punie_instructions() -> str:
+    """Instructions for PyCharm/ACP mode, including the Code Mode stubs."""
+    from punie.agent.stubs import get_stub_instructions
+
+    return _PUNIE_INSTRUCTIONS_TEMPLATE.format(stubs=get_stub_instructions())
+
+
+@cache
+def punie_local_instructions() -> str:
+    """Instructions for standalone local mode, including the Code Mode stubs."""
+    from punie.agent.stubs import get_stub_instructions
+
+    return _PUNIE_LOCAL_INSTRUCTIONS_TEMPLATE.format(stubs=get_stub_instructions())
+
+
+_LAZY_INSTRUCTIONS = {
+    "PUNIE_INSTRUCTIONS": punie_instructions,
+    "PUNIE_LOCAL_INSTRUCTIONS": punie_local_instructions,
+}
+
+
+def __getattr__(name: str) -> str:
+    builder = _LAZY_INSTRUCTIONS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    return builder()
+
+
 @dataclass(frozen=True)
 class AgentConfig:
     """Configuration for Punie agent behavior.
@@ -185,12 +222,12 @@ class AgentConfig:
     Frozen dataclass for immutable configuration. Default values target
     PyCharm/ACP mode. For standalone local mode, use:
         AgentConfig(
-            instructions=PUNIE_LOCAL_INSTRUCTIONS,
+            instructions=punie_local_instructions(),
             validate_python_syntax=True,
         )
     """
 
-    instructions: str = PUNIE_INSTRUCTIONS
+    instructions: str = field(default_factory=punie_instructions)
     temperature: float = 0.0
     max_tokens: int = 2048  # Reduced from 4096 to match GenerateParams default
     retries: int = 3
@@ -1,13 +1,21 @@
 """Dependencies for Pydantic AI agents in Punie.
 
 ACPDeps is the frozen dataclass holding ACP Client connection, session ID,
-and tool call tracker. This is the DepsType for Punie's Pydantic AI Agent.
+tool call tracker, the prompt's cancellation scope, the workspace root, the
+Code Mode concurrency cap, the session's typed tool result cache, and the
+store that pages large tool outputs. This is the DepsType for Punie's
+Pydantic AI Agent.
 """
 
 from dataclasses import dataclass
+from pathlib import Path
 
 from punie.acp import Client
 from punie.acp.contrib.tool_calls import ToolCallTracker
+from punie.agent.cancellation import PromptScope
+from punie.agent.monty_runner import DEFAULT_MAX_PARALLEL, ParallelLimit
+from punie.agent.result_cache import ToolResultCache
+from punie.agent.result_store import ResultStore
 
 
 @dataclass(frozen=True)
@@ -22,8 +30,26 @@ class ACPDeps:
         client_conn: ACP Client protocol reference for making RPC calls
         session_id: Current ACP session ID
         tracker: Tool call lifecycle manager for reporting tool activity
+        cancel_scope: Resources of the in-flight prompt, torn down by
+                      PunieAgent.cancel() (None outside of a prompt)
+        workspace_root: Session working directory from session/new; selects
+                        the ty server in the LSP pool (None: process cwd)
+        max_parallel_calls: Cap on concurrent calls made through parallel()
+                            inside execute_code
+        parallel_limit: Session's shared parallel() cap, so concurrent and
+                        nested calls stay within max_parallel_calls together
+                        (None: each execute_code gets its own cap)
+        result_cache: Session's cache of typed tool results (None: no caching)
+        result_store: Session's store of oversized tool outputs, read back
+                      page by page with read_more (None: outputs are not paged)
     """
 
     client_conn: Client
     session_id: str
     tracker: ToolCallTracker
+    cancel_scope: PromptScope | None = None
+    workspace_root: Path | None = None
+    max_parallel_calls: int = DEFAULT_MAX_PARALLEL
+    parallel_limit: ParallelLimit | None = None
+    result_cache: ToolResultCache | None = None
+    result_store: ResultStore | None = None
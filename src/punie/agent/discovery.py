@@ -5,7 +5,9 @@ The catalog is built from the IDE's `discover_tools()` response and used to cons
 session-specific toolsets.
 """
 
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import asdict, dataclass
 from typing import Any
 
 
@@ -71,6 +73,25 @@ class ToolCatalog:
     tools: tuple[ToolDescriptor, ...]
     """Immutable sequence of available tool descriptors."""
 
+    def fingerprint(self) -> str:
+        """Digest of the catalog's contents, independent of tool order.
+
+        Sessions whose IDEs advertise the same tools get the same fingerprint,
+        so they can share one toolset and agent.
+
+        >>> read = ToolDescriptor(name="read_file", kind="read", description="Read", parameters={})
+        >>> edit = ToolDescriptor(name="write_file", kind="edit", description="Write", parameters={})
+        >>> ToolCatalog(tools=(read, edit)).fingerprint() == ToolCatalog(tools=(edit, read)).fingerprint()
+        True
+        >>> ToolCatalog(tools=(read,)).fingerprint() == ToolCatalog(tools=(edit,)).fingerprint()
+        False
+        """
+        descriptors = sorted(
+            (asdict(descriptor) for descriptor in self.tools), key=lambda d: d["name"]
+        )
+        encoded = json.dumps(descriptors, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
     def by_name(self, name: str) -> ToolDescriptor | None:
         """Look up a tool descriptor by name.
 
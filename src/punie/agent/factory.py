@@ -14,10 +14,18 @@ from typing import TYPE_CHECKING
 from pydantic_ai import Agent, ModelRetry, RunContext
 from pydantic_ai.models import KnownModelName, Model, ModelSettings
 from pydantic_ai.models.test import TestModel
-from pydantic_ai.toolsets import AbstractToolset
-
-from punie.agent.config import PUNIE_DIRECT_INSTRUCTIONS, PUNIE_LOCAL_INSTRUCTIONS, AgentConfig, default_stop_sequences
+from pydantic_ai.tools import ToolDefinition
+from pydantic_ai.toolsets import AbstractToolset, FunctionToolset
+
+from punie.agent.config import (
+    PUNIE_DIRECT_INSTRUCTIONS,
+    AgentConfig,
+    default_stop_sequences,
+    punie_local_instructions,
+)
 from punie.agent.deps import ACPDeps
+from punie.agent.prompt_cache import prefix_cache_key, prompt_cache_settings
+from punie.agent.scheduler import ScheduledModel
 from punie.agent.toolset import create_direct_toolset, create_toolset
 
 if TYPE_CHECKING:
@@ -150,11 +158,16 @@ def _create_local_model(spec: str = "") -> Model:
     from pydantic_ai.models.openai import OpenAIChatModel
     from pydantic_ai.providers.openai import OpenAIProvider
 
+    from punie.http.client_pool import get_http_pool
+
     parsed = _parse_local_spec(spec)
     logger.info("Creating local model: %s at %s", parsed.model_name, parsed.base_url)
 
-    # Local servers don't need authentication, but OpenAI client requires an API key
-    provider = OpenAIProvider(base_url=parsed.base_url, api_key="not-needed")
+    # Local servers don't need authentication, but OpenAI client requires an API key.
+    # All agents share one keep-alive connection pool to the server.
+    provider = OpenAIProvider(
+        base_url=parsed.base_url, api_key="not-needed", http_client=get_http_pool().provider_client()
+    )
     return OpenAIChatModel(parsed.model_name, provider=provider)
 
 
@@ -178,14 +191,66 @@ def create_server_model(config: "ServerConfig") -> Model:
     from pydantic_ai.models.openai import OpenAIChatModel
     from pydantic_ai.providers.openai import OpenAIProvider
 
+    from punie.http.client_pool import get_http_pool
+
     logger.info("Creating server model at %s", config.base_url)
 
     # Local servers don't need authentication, but OpenAI client requires an API key
-    provider = OpenAIProvider(base_url=config.base_url, api_key="not-needed")
+    provider = OpenAIProvider(
+        base_url=config.base_url, api_key="not-needed", http_client=get_http_pool().provider_client()
+    )
     # mlx_lm.server requires the actual model path in API requests
     return OpenAIChatModel(config.model_path, provider=provider)
 
 
+def is_local_model(model: object) -> bool:
+    """True for model specs served by a local OpenAI-compatible server.
+
+    >>> is_local_model("local"), is_local_model("local:my-model"), is_local_model("test")
+    (True, True, False)
+    """
+    return isinstance(model, str) and (model == "local" or model.startswith("local:"))
+
+
+def resolve_model(model: KnownModelName | Model) -> KnownModelName | Model:
+    """Turn Punie's model specs ("test", "local:...", "ollama:...") into models.
+
+    Other names are returned unchanged for Pydantic AI to resolve.
+    """
+    if model == "test":
+        logger.info("Using enhanced test model for better debugging")
+        return _create_enhanced_test_model()
+    if model == "local":
+        return _create_local_model("")
+    if isinstance(model, str) and model.startswith("local:"):
+        return _create_local_model(model.split(":", 1)[1])
+    if isinstance(model, str) and model.startswith("ollama:"):
+        model_name = model.split(":", 1)[1]
+        from pydantic_ai.providers.ollama import OllamaProvider
+
+        from punie.agent.ollama_model import OllamaChatModel
+        from punie.http.client_pool import get_http_pool
+
+        logger.info("Creating ollama model: %s", model_name)
+        # Ollama uses OpenAI-compatible API at http://localhost:11434/v1
+        provider = OllamaProvider(
+            base_url="http://localhost:11434/v1", http_client=get_http_pool().provider_client()
+        )
+        return OllamaChatModel(model_name, provider=provider)
+    return model
+
+
+def tool_definitions(toolset: AbstractToolset[ACPDeps]) -> list[ToolDefinition]:
+    """Definitions of a function toolset's tools, in the order they are sent.
+
+    >>> [tool.name for tool in tool_definitions(create_toolset())][:3]
+    ['read_file', 'write_file', 'run_command']
+    """
+    if not isinstance(toolset, FunctionToolset):
+        return []
+    return [tool.tool_def for tool in toolset.tools.values()]
+
+
 def create_pydantic_agent(
     model: KnownModelName | Model = "test",
     toolset: AbstractToolset[ACPDeps] | None = None,
@@ -219,33 +284,28 @@ def create_pydantic_agent(
     if config is None:
         config = AgentConfig()
 
+    # Requests to a local server share one cacheable instructions + tools prefix
+    cache_settings = (
+        prompt_cache_settings(prefix_cache_key(config.instructions, tool_definitions(toolset)))
+        if is_local_model(model)
+        else {}
+    )
+
     # Wrap toolset with performance measurement if requested
     if perf_collector is not None:
         toolset = TimedToolset(wrapped=toolset, collector=perf_collector)
 
-    # Use enhanced test model if "test" string is passed
-    if model == "test":
-        logger.info("Using enhanced test model for better debugging")
-        model = _create_enhanced_test_model()
-    elif model == "local":
-        model = _create_local_model("")
-    elif isinstance(model, str) and model.startswith("local:"):
-        model = _create_local_model(model.split(":", 1)[1])
-    elif isinstance(model, str) and model.startswith("ollama:"):
-        model_name = model.split(":", 1)[1]
-        from pydantic_ai.providers.ollama import OllamaProvider
-
-        from punie.agent.ollama_model import OllamaChatModel
-
-        logger.info("Creating ollama model: %s", model_name)
-        # Ollama uses OpenAI-compatible API at http://localhost:11434/v1
-        provider = OllamaProvider(base_url="http://localhost:11434/v1")
-        model = OllamaChatModel(model_name, provider=provider)
+    # Sessions take turns on the single local model server
+    scheduled = is_local_model(model) or (isinstance(model, str) and model.startswith("ollama:"))
+    model = resolve_model(model)
+    if scheduled:
+        model = ScheduledModel(model)
 
     # Build model settings dict with standard parameters
     model_settings_dict = {
         "temperature": config.temperature,
         "max_tokens": config.max_tokens,
+        **cache_settings,
     }
 
     # Add stop_sequences if provided
@@ -325,7 +385,7 @@ def create_local_agent(
         else:
             # Fine-tuned models: use Code Mode toolset + full instructions
             config = AgentConfig(
-                instructions=PUNIE_LOCAL_INSTRUCTIONS,
+                instructions=punie_local_instructions(),
                 validate_python_syntax=True,
                 stop_sequences=default_stop_sequences(model_str),
             )
@@ -0,0 +1,242 @@
+"""Per-session conversation history with token-budgeted compaction.
+
+SessionHistory keeps the messages of a session's completed runs and hands
+them to the next run as message_history, so the model can build on the
+files it read and the tools it ran in earlier turns. A session's runs take
+turns on its history (SessionHistory.turn), so concurrent prompts are
+answered one after another, each seeing the previous one.
+
+History is bounded by a token budget. When a completed run pushes it over,
+compaction runs in three steps until it fits:
+
+1. Tool outputs from earlier turns are replaced by a one-line note. The
+   tool calls and their ids stay, so the transcript remains well-formed and
+   the model still sees what it did and can re-run a tool it needs.
+2. The oldest turns are dropped whole. A turn starts at a user prompt, so
+   the history never begins halfway through a tool exchange.
+3. Tool outputs of the latest turn are elided as well.
+
+The latest turn is never dropped. The agent's instructions are not stored
+in history: Pydantic AI sends them first on every request, so the stable
+system prefix is unaffected by compaction. System prompt parts (agents
+built with system_prompt=) are carried over into the new first turn
+when their turn is dropped.
+
+Tokens are counted with the model's tokenizer when it is available
+locally (prompt_utils.get_tokenizer) and estimated from UTF-8 size
+otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from punie.agent.result_store import BYTES_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_TOKENS = 16_000
+
+TokenCounter = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count from UTF-8 size.
+
+    >>> estimate_tokens("x" * 40)
+    10
+    """
+    return len(text.encode("utf-8")) // BYTES_PER_TOKEN
+
+
+def tokenizer_counter(model_path: str | Path) -> TokenCounter:
+    """Count tokens with the tokenizer of a local model directory.
+
+    Raises:
+        ImportError: If transformers is not installed
+        OSError: If the directory has no tokenizer files
+    """
+    from punie.agent.prompt_utils import get_tokenizer
+
+    tokenizer = get_tokenizer(model_path)
+
+    def count(text: str) -> int:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+
+    return count
+
+
+def token_counter_for(model: Any) -> TokenCounter:
+    """Pick the best token counter for a PunieAgent model setting.
+
+    Local models ("local:<name>") whose name is a model directory on disk are
+    measured with their own tokenizer; everything else is estimated.
+
+    >>> token_counter_for("test") is estimate_tokens
+    True
+    """
+    if isinstance(model, str) and model.startswith("local:"):
+        name = model.split(":", 1)[1]
+        if name and Path(name).is_dir():
+            try:
+                return tokenizer_counter(name)
+            except (ImportError, OSError) as exc:
+                logger.warning(f"Tokenizer for {name} unavailable ({exc}), estimating history tokens")
+    return estimate_tokens
+
+
+def _part_text(part: Any) -> str:
+    """Text a part contributes to the prompt."""
+    if isinstance(part, ToolCallPart):
+        return f"{part.tool_name}({part.args_as_json_str()})"
+    if isinstance(part, ToolReturnPart):
+        return part.model_response_str()
+    content = getattr(part, "content", "")
+    return content if isinstance(content, str) else str(content)
+
+
+def _starts_turn(message: ModelMessage) -> bool:
+    return isinstance(message, ModelRequest) and any(
+        isinstance(part, UserPromptPart) for part in message.parts
+    )
+
+
+def _elided(part: ToolReturnPart) -> ToolReturnPart:
+    """The part with its output replaced by a note, unless the output is shorter."""
+    output = part.model_response_str()
+    note = (
+        f"[Output of {part.tool_name} omitted from history ({len(output)} chars). "
+        f"Call the tool again if you need it.]"
+    )
+    return replace(part, content=note) if len(note) < len(output) else part
+
+
+class SessionHistory:
+    """Messages of one session's completed runs, kept within max_tokens.
+
+    >>> from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart
+    >>> history = SessionHistory(max_tokens=100)
+    >>> history.extend([
+    ...     ModelRequest(parts=[UserPromptPart("hi")]),
+    ...     ModelResponse(parts=[TextPart("hello")]),
+    ... ])
+    >>> len(history.messages), history.tokens
+    (2, 1)
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_HISTORY_TOKENS,
+        *,
+        count_tokens: TokenCounter = estimate_tokens,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self._count_tokens = count_tokens
+        self._messages: list[ModelMessage] = []
+        self._sizes: list[int] = []  # Token count of each message
+        self._turn_lock = asyncio.Lock()
+
+    @property
+    def messages(self) -> list[ModelMessage]:
+        """Copy of the history, ready to pass as message_history."""
+        return list(self._messages)
+
+    @asynccontextmanager
+    async def turn(self) -> AsyncIterator[list[ModelMessage]]:
+        """Hold the history for one run, yielding its messages.
+
+        The run extend()s its new messages before leaving the block. A
+        session's runs take turns, so concurrent prompts never start from
+        the same snapshot and interleave their messages.
+        """
+        async with self._turn_lock:
+            yield self.messages
+
+    @property
+    def tokens(self) -> int:
+        """Tokens the history adds to the next prompt."""
+        return sum(self._sizes)
+
+    def extend(self, messages: Iterable[ModelMessage]) -> None:
+        """Record the new messages of a completed run, then compact."""
+        for message in messages:
+            self._messages.append(message)
+            self._sizes.append(self._measure(message))
+        if self.tokens > self.max_tokens:
+            before = self.tokens
+            self._compact()
+            logger.info(f"Compacted session history from {before} to {self.tokens} tokens")
+
+    def clear(self) -> None:
+        """Forget the whole conversation."""
+        self._messages.clear()
+        self._sizes.clear()
+
+    def _measure(self, message: ModelMessage) -> int:
+        return sum(self._count_tokens(_part_text(part)) for part in message.parts)
+
+    def _turn_starts(self) -> list[int]:
+        starts = [i for i, message in enumerate(self._messages) if _starts_turn(message)]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        return starts
+
+    def _compact(self) -> None:
+        latest = self._turn_starts()[-1]
+        self._elide_tool_outputs(0, latest)
+        while self.tokens > self.max_tokens and len(starts := self._turn_starts()) > 1:
+            self._drop_first_turn(starts[1])
+        if self.tokens > self.max_tokens:
+            self._elide_tool_outputs(0, len(self._messages))
+
+    def _elide_tool_outputs(self, start: int, stop: int) -> None:
+        """Replace tool outputs in messages[start:stop], oldest first, until within budget."""
+        for i in range(start, stop):
+            if self.tokens <= self.max_tokens:
+                return
+            message = self._messages[i]
+            if not isinstance(message, ModelRequest):
+                continue
+            parts = [
+                _elided(part) if isinstance(part, ToolReturnPart) else part
+                for part in message.parts
+            ]
+            if parts != list(message.parts):
+                self._messages[i] = replace(message, parts=parts)
+                self._sizes[i] = self._measure(self._messages[i])
+
+    def _drop_first_turn(self, end: int) -> None:
+        """Drop messages[:end], keeping their system prompt parts in front."""
+        system_parts = _system_parts(self._messages[:end])
+        del self._messages[:end]
+        del self._sizes[:end]
+        first = self._messages[0]
+        if system_parts and isinstance(first, ModelRequest):
+            self._messages[0] = replace(first, parts=[*system_parts, *first.parts])
+            self._sizes[0] = self._measure(self._messages[0])
+
+
+def _system_parts(messages: Sequence[ModelMessage]) -> list[SystemPromptPart]:
+    return [
+        part
+        for message in messages
+        if not isinstance(message, ModelResponse)
+        for part in message.parts
+        if isinstance(part, SystemPromptPart)
+    ]
@@ -3,28 +3,63 @@
 This module provides a minimal async LSP client that connects to ty server
 via stdio transport. It's designed specifically for Phase 26 navigation tools.
 
-The client lifecycle is managed as a module-level singleton:
-- First call to get_lsp_client() starts ty server and performs initialize handshake
-- Subsequent calls return the same client instance
-- Client stays alive for the duration of the process (no explicit shutdown needed)
+Requests are multiplexed: a background reader task owns stdout and routes each
+response to the future registered for its id, so many requests can be in
+flight at once. Notifications (e.g. textDocument/publishDiagnostics) go to
+subscribers registered with LSPClient.subscribe() instead of being discarded.
+
+Open documents are kept in sync with disk: before each request the file's
+mtime/size is checked and, if its content changed, a textDocument/didChange
+with the next version is sent (a single range edit when the server supports
+incremental sync). The least recently used documents are closed with
+textDocument/didClose once max_open_documents is exceeded.
+
+Clients are pooled per workspace root (see punie.agent.lsp_pool):
+- lsp_lease(root) starts a ty server rooted at that directory on first use
+- Later leases for the same root use the same client
+- Idle and crashed servers are replaced transparently by the pool, but never
+  while leased
 
 Example:
-    client = await get_lsp_client()
-    response = await client.goto_definition("src/app.py", 10, 5)
+    async with lsp_lease(Path("/path/to/project")) as client:
+        response = await client.goto_definition("src/app.py", 10, 5)
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
-# Module-level singleton
-_lsp_client: LSPClient | None = None
+# Default per-request timeout in seconds
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+# Documents kept open in the server before the least recently used is closed
+DEFAULT_MAX_OPEN_DOCUMENTS = 256
+
+# TextDocumentSyncKind values from the LSP spec
+_SYNC_FULL = 1
+_SYNC_INCREMENTAL = 2
+
+# Server → client requests answered with a null result; others get MethodNotFound
+_NULL_RESULT_SERVER_REQUESTS = frozenset(
+    {
+        "window/workDoneProgress/create",
+        "client/registerCapability",
+        "client/unregisterCapability",
+    }
+)
+
+NotificationHandler = Callable[[dict[str, Any]], None]
 
 
 class LSPError(Exception):
@@ -33,12 +68,77 @@ class LSPError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class OpenDocument:
+    """A document the server has open, as last synced from disk."""
+
+    version: int
+    """Version sent with the last didOpen/didChange."""
+
+    text: str
+    """Content the server has, used to compute incremental edits."""
+
+    digest: str
+    """Content hash, to skip didChange when only the mtime moved."""
+
+    mtime_ns: int
+    """File mtime when last synced."""
+
+    size: int
+    """File size in bytes when last synced."""
+
+
+def _content_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _lsp_position(text: str, offset: int) -> dict[str, int]:
+    r"""Convert a string offset to an LSP Position (UTF-16 code units).
+
+    >>> _lsp_position("ab\ncd", 4)
+    {'line': 1, 'character': 1}
+    >>> _lsp_position("é😀x", 2)
+    {'line': 0, 'character': 3}
+    """
+    line = text.count("\n", 0, offset)
+    line_start = text.rfind("\n", 0, offset) + 1
+    character = len(text[line_start:offset].encode("utf-16-le")) // 2
+    return {"line": line, "character": character}
+
+
+def incremental_change(old: str, new: str) -> dict[str, Any]:
+    r"""Build one TextDocumentContentChangeEvent replacing the changed span.
+
+    The common prefix and suffix of old and new are kept; the range between
+    them is replaced, so a local edit sends only the edited text.
+
+    >>> incremental_change("a = 1\nb = 2\n", "a = 1\nb = 3\n")
+    {'range': {'start': {'line': 1, 'character': 4}, 'end': {'line': 1, 'character': 5}}, 'text': '3'}
+    """
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end_old, end_new = len(old), len(new)
+    while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+    return {
+        "range": {
+            "start": _lsp_position(old, start),
+            "end": _lsp_position(old, end_old),
+        },
+        "text": new[start:end_new],
+    }
+
+
 class LSPClient:
     """Minimal async LSP client for ty server navigation.
 
     Handles:
     - initialize/shutdown lifecycle
-    - textDocument/didOpen lazy loading
+    - textDocument/didOpen lazy loading, didChange on disk edits, and
+      didClose of least recently used documents
     - textDocument/definition (goto definition)
     - textDocument/references (find references)
     - textDocument/hover (hover info)
@@ -47,30 +147,84 @@ class LSPClient:
 
     Protocol details:
     - Uses stdio transport (stdin/stdout)
-    - Handles notifications (textDocument/publishDiagnostics) before responses
-    - Converts paths to file:// URIs
+    - A background reader task demultiplexes responses by id, so concurrent
+      requests are pipelined instead of serialized
+    - Notifications are dispatched to subscribers (see subscribe())
+    - Each request has its own timeout; timed-out or cancelled requests are
+      withdrawn with $/cancelRequest
+    - Converts paths to file:// URIs (relative paths resolve against root)
     - Converts 1-based line/column to 0-based LSP positions
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        max_open_documents: int = DEFAULT_MAX_OPEN_DOCUMENTS,
+    ):
         self.process: asyncio.subprocess.Process | None = None
         self.next_id = 1
-        self.root_uri = Path.cwd().as_uri()
-        self.opened_documents: set[str] = set()  # Track opened files
-        self._read_lock = asyncio.Lock()  # Serialize reads
+        self.root = Path(root if root is not None else Path.cwd()).resolve()
+        self.root_uri = self.root.as_uri()
+        # Open documents by URI, least recently used first
+        self.opened_documents: OrderedDict[str, OpenDocument] = OrderedDict()
+        self.max_open_documents = max_open_documents
+        self.request_timeout = request_timeout
+        self._sync_kind = _SYNC_FULL  # Updated from server capabilities
+        self._documents_lock = asyncio.Lock()  # Keeps versions monotonic
+        self._pending: dict[int, asyncio.Future[dict]] = {}  # id → response future
+        self._subscribers: dict[str, list[NotificationHandler]] = {}
+        self._reader_task: asyncio.Task[None] | None = None
         self._initialized = False
 
+    @property
+    def in_flight(self) -> int:
+        """Number of requests awaiting a response."""
+        return len(self._pending)
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the server is initialized, running, and its stdout is open."""
+        if not self._initialized or self.process is None:
+            return False
+        if self.process.returncode is not None:
+            return False
+        return self._reader_task is None or not self._reader_task.done()
+
+    def subscribe(self, method: str, handler: NotificationHandler) -> Callable[[], None]:
+        """Register a handler for server notifications with the given method.
+
+        Handlers run on the reader task and receive the notification params;
+        they must not block.
+
+        Args:
+            method: Notification method, e.g. "textDocument/publishDiagnostics"
+            handler: Callable receiving the params dict
+
+        Returns:
+            Callable that removes the subscription
+        """
+        handlers = self._subscribers.setdefault(method, [])
+        handlers.append(handler)
+
+        def unsubscribe() -> None:
+            if handler in handlers:
+                handlers.remove(handler)
+
+        return unsubscribe
+
     async def start(self) -> None:
         """Start ty server and perform initialize handshake."""
         if self._initialized:
             return
 
-        logger.info("Starting ty server...")
+        logger.info(f"Starting ty server for {self.root}...")
 
         # Start ty server subprocess
         self.process = await asyncio.create_subprocess_exec(
             "ty",
             "server",
+            cwd=self.root,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
@@ -89,6 +243,7 @@ class LSPClient:
                 "rootUri": self.root_uri,
                 "capabilities": {
                     "textDocument": {
+                        "synchronization": {"dynamicRegistration": False},
                         "definition": {"dynamicRegistration": False},
                         "references": {"dynamicRegistration": False},
                         "hover": {"dynamicRegistration": False},
@@ -116,6 +271,11 @@ class LSPClient:
 
         logger.debug(f"Server capabilities: {capabilities}")
 
+        sync = capabilities.get("textDocumentSync", _SYNC_FULL)
+        if isinstance(sync, dict):
+            sync = sync.get("change", _SYNC_FULL)
+        self._sync_kind = _SYNC_INCREMENTAL if sync == _SYNC_INCREMENTAL else _SYNC_FULL
+
         # Send initialized notification
         await self._send_notification("initialized", {})
 
@@ -143,42 +303,108 @@ class LSPClient:
                 logger.warning("ty server did not stop within 5s, terminating")
                 self.process.terminate()
 
+        await self._stop_reader()
+        self.opened_documents.clear()
         self._initialized = False
 
     async def open_document(self, file_path: str) -> None:
-        """Send textDocument/didOpen notification (lazy, first-access only).
+        """Make sure the server has the current content of a file.
+
+        Sends textDocument/didOpen on first access. Afterwards the file's
+        mtime and size are compared with the last sync; if they moved and
+        the content hash differs, textDocument/didChange is sent with the
+        next version. Opening a document beyond max_open_documents closes the
+        least recently used one.
 
         Args:
             file_path: Absolute or relative path to file
 
-        Note:
-            Tracks opened documents to avoid sending multiple didOpen for same file.
+        Raises:
+            FileNotFoundError: If the file does not exist
         """
         uri = self._file_uri(file_path)
+        path = self._resolve_path(file_path)
 
-        if uri in self.opened_documents:
-            return  # Already opened
+        async with self._documents_lock:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"File not found: {file_path}") from None
+
+            document = self.opened_documents.get(uri)
+            if document is not None:
+                self.opened_documents.move_to_end(uri)
+                if document.mtime_ns == stat.st_mtime_ns and document.size == stat.st_size:
+                    return  # Unchanged since last sync
+
+            content = path.read_text()
+            digest = _content_digest(content)
+
+            if document is None:
+                await self._send_notification(
+                    "textDocument/didOpen",
+                    {
+                        "textDocument": {
+                            "uri": uri,
+                            "languageId": "python",
+                            "version": 1,
+                            "text": content,
+                        }
+                    },
+                )
+                self.opened_documents[uri] = OpenDocument(
+                    1, content, digest, stat.st_mtime_ns, stat.st_size
+                )
+                logger.debug(f"Opened document: {uri}")
+                await self._evict_documents()
+                return
+
+            if document.digest == digest:
+                # Touched but not modified: remember the new mtime only
+                self.opened_documents[uri] = OpenDocument(
+                    document.version, document.text, digest, stat.st_mtime_ns, stat.st_size
+                )
+                return
+
+            version = document.version + 1
+            if self._sync_kind == _SYNC_INCREMENTAL:
+                change = incremental_change(document.text, content)
+            else:
+                change = {"text": content}
+            await self._send_notification(
+                "textDocument/didChange",
+                {
+                    "textDocument": {"uri": uri, "version": version},
+                    "contentChanges": [change],
+                },
+            )
+            self.opened_documents[uri] = OpenDocument(
+                version, content, digest, stat.st_mtime_ns, stat.st_size
+            )
+            logger.debug(f"Synced document: {uri} (version {version})")
+
+    async def close_document(self, file_path: str) -> None:
+        """Send textDocument/didClose for a file if it is open.
 
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        Args:
+            file_path: Absolute or relative path to file
+        """
+        uri = self._file_uri(file_path)
+        async with self._documents_lock:
+            if self.opened_documents.pop(uri, None) is not None:
+                await self._send_did_close(uri)
 
-        content = path.read_text()
+    async def _evict_documents(self) -> None:
+        """Close least recently used documents beyond max_open_documents."""
+        while len(self.opened_documents) > self.max_open_documents:
+            uri, _ = self.opened_documents.popitem(last=False)
+            await self._send_did_close(uri)
 
+    async def _send_did_close(self, uri: str) -> None:
         await self._send_notification(
-            "textDocument/didOpen",
-            {
-                "textDocument": {
-                    "uri": uri,
-                    "languageId": "python",
-                    "version": 1,
-                    "text": content,
-                }
-            },
+            "textDocument/didClose", {"textDocument": {"uri": uri}}
         )
-
-        self.opened_documents.add(uri)
-        logger.debug(f"Opened document: {uri}")
+        logger.debug(f"Closed document: {uri}")
 
     async def goto_definition(
         self, file_path: str, line: int, column: int
@@ -335,16 +561,20 @@ class LSPClient:
         logger.debug(f"Workspace symbols response: {response}")
         return response
 
+    def _resolve_path(self, file_path: str) -> Path:
+        """Resolve a file path, treating relative paths as relative to root."""
+        return (self.root / file_path).resolve()
+
     def _file_uri(self, file_path: str) -> str:
         """Convert file path to LSP file:// URI.
 
         Args:
-            file_path: Absolute or relative file path
+            file_path: Absolute or relative (to root) file path
 
         Returns:
             file:// URI (always absolute)
         """
-        return Path(file_path).resolve().as_uri()
+        return self._resolve_path(file_path).as_uri()
 
     def _to_lsp_position(self, line: int, column: int) -> dict[str, int]:
         """Convert 1-based line/column to LSP 0-based Position.
@@ -375,6 +605,17 @@ class LSPClient:
         Args:
             message: JSON-RPC message dict
         """
+        stdin = self._write_message(message)
+        await stdin.drain()
+
+    def _write_message(self, message: dict) -> asyncio.StreamWriter:
+        """Frame and buffer a JSON-RPC message without waiting for drain.
+
+        Used directly where awaiting is not possible (request cancellation).
+
+        Returns:
+            The stdin writer, for callers that want to drain it
+        """
         if not self.process or not self.process.stdin:
             raise LSPError("LSP server not started")
 
@@ -384,98 +625,197 @@ class LSPClient:
         logger.debug(f"→ {message.get('method', 'response')} (id={message.get('id', 'N/A')})")
 
         self.process.stdin.write(content.encode("utf-8"))
-        await self.process.stdin.drain()
+        return self.process.stdin
 
-    async def _read_message(self, timeout: float = 10.0) -> dict:
+    async def _read_message(self, timeout: float | None = None) -> dict:
         """Read JSON-RPC message with Content-Length header.
 
         Args:
-            timeout: Read timeout in seconds
+            timeout: Read timeout in seconds (None waits indefinitely)
 
         Returns:
             JSON-RPC message dict
 
+        Raises:
+            LSPError: If the server closed stdout or sent a malformed header
+
         Note:
-            Uses lock to serialize reads (prevent interleaving).
+            Only the reader task calls this once the client is running.
         """
-        async with self._read_lock:
-            if not self.process or not self.process.stdout:
-                raise LSPError("LSP server not started")
+        if not self.process or not self.process.stdout:
+            raise LSPError("LSP server not started")
 
-            # Read headers
-            headers: dict[str, str] = {}
-            while True:
-                line = await asyncio.wait_for(
-                    self.process.stdout.readline(), timeout=timeout
-                )
-                line_str = line.decode("utf-8")
+        # Read headers
+        headers: dict[str, str] = {}
+        while True:
+            line = await asyncio.wait_for(
+                self.process.stdout.readline(), timeout=timeout
+            )
+            if not line:
+                raise LSPError("LSP server closed the connection")
+            line_str = line.decode("utf-8")
 
-                if line_str == "\r\n":
-                    break  # End of headers
+            if line_str == "\r\n":
+                break  # End of headers
 
-                if ":" in line_str:
-                    key, value = line_str.split(":", 1)
-                    headers[key.strip()] = value.strip()
+            if ":" in line_str:
+                key, value = line_str.split(":", 1)
+                headers[key.strip()] = value.strip()
 
-            # Read body
-            content_length = int(headers.get("Content-Length", 0))
-            if content_length == 0:
-                raise LSPError("No Content-Length header in LSP message")
+        # Read body
+        content_length = int(headers.get("Content-Length", 0))
+        if content_length == 0:
+            raise LSPError("No Content-Length header in LSP message")
 
-            body_bytes = await asyncio.wait_for(
-                self.process.stdout.readexactly(content_length), timeout=timeout
-            )
-            body = body_bytes.decode("utf-8")
-            message = json.loads(body)
+        body_bytes = await asyncio.wait_for(
+            self.process.stdout.readexactly(content_length), timeout=timeout
+        )
+        body = body_bytes.decode("utf-8")
+        message = json.loads(body)
+
+        logger.debug(f"← {message.get('method', 'response')} (id={message.get('id', 'N/A')})")
 
-            logger.debug(f"← {message.get('method', 'response')} (id={message.get('id', 'N/A')})")
+        return message
 
-            return message
+    def _ensure_reader(self) -> None:
+        """Start the background reader task if it is not running."""
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = asyncio.create_task(
+                self._reader_loop(), name="lsp-reader"
+            )
+
+    async def _stop_reader(self) -> None:
+        """Cancel the reader task and fail any requests still pending."""
+        task, self._reader_task = self._reader_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._fail_pending(LSPError("LSP client shut down"))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        """Fail every pending request with exc."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _reader_loop(self) -> None:
+        """Read messages from the server and route them until stdout closes."""
+        try:
+            while True:
+                message = await self._read_message()
+                if "method" in message:
+                    if "id" in message:
+                        await self._answer_server_request(message)
+                    else:
+                        self._dispatch_notification(message)
+                    continue
+
+                future = self._pending.pop(message.get("id", -1), None)
+                if future is None:
+                    # Late response to a timed-out or cancelled request
+                    logger.debug(f"Dropping response for unknown id={message.get('id')}")
+                elif not future.done():
+                    future.set_result(message)
+        except Exception as exc:
+            logger.warning(f"LSP reader stopped: {exc}")
+            error = exc if isinstance(exc, LSPError) else LSPError(f"LSP reader failed: {exc}")
+            self._fail_pending(error)
+
+    def _dispatch_notification(self, message: dict) -> None:
+        """Pass a notification's params to its subscribers."""
+        method = message["method"]
+        for handler in list(self._subscribers.get(method, ())):
+            try:
+                handler(message.get("params") or {})
+            except Exception:
+                logger.exception(f"Notification handler for {method} failed")
+
+    async def _answer_server_request(self, message: dict) -> None:
+        """Reply to a server → client request so the server does not wait on it."""
+        method = message["method"]
+        if method in _NULL_RESULT_SERVER_REQUESTS:
+            reply: dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"], "result": None}
+        else:
+            reply = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": f"Unsupported method: {method}"},
+            }
+        await self._send_message(reply)
 
-    async def _send_request(self, method: str, params: dict | None) -> dict:
-        """Send JSON-RPC request and wait for response.
+    async def _send_request(
+        self, method: str, params: dict | None, timeout: float | None = None
+    ) -> dict:
+        """Send JSON-RPC request and wait for its response.
 
         Args:
             method: LSP method name
             params: Request params (or None)
+            timeout: Seconds to wait (default: self.request_timeout)
 
         Returns:
             Response message dict
 
+        Raises:
+            LSPError: If the server returns an error, the request times out,
+                      or the connection closes first
+
         Note:
-            Handles notifications that may arrive before the response.
-            Keeps reading until we get a message with matching ID.
+            Other requests may be sent while this one is waiting; the reader
+            task matches the response by id. If the wait times out or the
+            caller is cancelled, $/cancelRequest is sent to the server.
         """
         request_id = self.next_id
         self.next_id += 1
 
-        await self._send_message(
-            {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "method": method,
-                "params": params,
-            }
-        )
-
-        # Read messages until we get response with matching ID
-        # (server may send notifications in between)
-        max_attempts = 10
-        for attempt in range(max_attempts):
-            message = await self._read_message()
-
-            # Check if this is the response we're waiting for
-            if message.get("id") == request_id:
-                # Check for error
-                if "error" in message:
-                    error = message["error"]
-                    raise LSPError(f"LSP error: {error.get('message', error)}")
-                return message
-
-            # This is a notification or unrelated message, continue reading
-            logger.debug(f"Received notification while waiting for id={request_id}, continuing...")
-
-        raise LSPError(f"No response with id={request_id} after {max_attempts} attempts")
+        wait = self.request_timeout if timeout is None else timeout
+        future: asyncio.Future[dict] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._ensure_reader()
+            await self._send_message(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": params,
+                }
+            )
+            message = await asyncio.wait_for(future, timeout=wait)
+        except TimeoutError:
+            self._cancel_request(request_id)
+            raise LSPError(f"{method} (id={request_id}) timed out after {wait}s") from None
+        except asyncio.CancelledError:
+            self._cancel_request(request_id)
+            raise
+        except BaseException:
+            self._pending.pop(request_id, None)
+            raise
+
+        # Check for error
+        if "error" in message:
+            error = message["error"]
+            raise LSPError(f"LSP error: {error.get('message', error)}")
+        return message
+
+    def _cancel_request(self, request_id: int) -> None:
+        """Withdraw a pending request and ask the server to stop working on it."""
+        if self._pending.pop(request_id, None) is None:
+            return
+        try:
+            self._write_message(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "$/cancelRequest",
+                    "params": {"id": request_id},
+                }
+            )
+        except Exception as exc:
+            logger.debug(f"Could not send $/cancelRequest for id={request_id}: {exc}")
 
     async def _send_notification(self, method: str, params: dict) -> None:
         """Send JSON-RPC notification (no response expected).
@@ -493,19 +833,36 @@ class LSPClient:
         )
 
 
-async def get_lsp_client() -> LSPClient:
-    """Get or create the module-level LSP client singleton.
+async def get_lsp_client(root: Path | str | None = None) -> LSPClient:
+    """Get the pooled LSP client for a workspace root, starting it if needed.
+
+    Args:
+        root: Workspace root (default: the current working directory)
 
     Returns:
-        Initialized LSPClient instance
+        Initialized LSPClient instance for that root
 
     Note:
-        First call starts ty server. Subsequent calls return same instance.
+        Delegates to the process-wide LSPServerPool (see get_lsp_pool()).
     """
-    global _lsp_client
+    from punie.agent.lsp_pool import get_lsp_pool
 
-    if _lsp_client is None:
-        _lsp_client = LSPClient()
-        await _lsp_client.start()
+    return await get_lsp_pool().get(root)
+
+
+@asynccontextmanager
+async def lsp_lease(root: Path | str | None = None) -> AsyncIterator[LSPClient]:
+    """Use the pooled LSP client for a workspace root for the block.
+
+    The pool does not evict the client while it is leased.
+
+    Args:
+        root: Workspace root (default: the current working directory)
+
+    Yields:
+        Initialized LSPClient instance for that root
+    """
+    from punie.agent.lsp_pool import get_lsp_pool
 
-    return _lsp_client
+    async with get_lsp_pool().lease(root) as client:
+        yield client
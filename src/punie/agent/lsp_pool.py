@@ -0,0 +1,327 @@
+"""Pool of ty LSP servers keyed by workspace root.
+
+One ``punie serve`` process can host sessions for many workspaces, and a ty
+server only understands the project it was started in. LSPServerPool keeps
+one LSPClient per workspace root:
+
+- servers start lazily on the first request for a root
+- at most max_size servers run; the least recently used idle one is shut
+  down to make room
+- servers unused for idle_timeout seconds are shut down
+- a crashed server (exited process or closed stdout) is restarted on the
+  next request for its root
+- a maintenance task checks every maintenance_interval seconds for crashed
+  and idle servers, so they are noticed without waiting for a request
+
+Callers hold a lease while they use a client, so it is never evicted under
+them even when it has no request in flight yet. The process-wide pool's
+limits come from PUNIE_LSP_MAX_SERVERS and PUNIE_LSP_IDLE_TIMEOUT.
+
+Example:
+    pool = get_lsp_pool()
+    async with pool.lease("/path/to/project") as client:
+        await client.hover("app.py", 1, 1)
+    print(pool.stats)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from punie.agent.lsp_client import LSPClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SERVERS = 4
+DEFAULT_IDLE_TIMEOUT = 600.0  # 10 minutes
+DEFAULT_MAINTENANCE_INTERVAL = 60.0
+
+# Environment overrides for the process-wide pool's limits
+MAX_SERVERS_ENV = "PUNIE_LSP_MAX_SERVERS"
+IDLE_TIMEOUT_ENV = "PUNIE_LSP_IDLE_TIMEOUT"
+
+# Process-wide pool used by get_lsp_client()
+_pool: LSPServerPool | None = None
+
+
+@dataclass(frozen=True)
+class LSPPoolStats:
+    """Snapshot of pool activity counters."""
+
+    size: int
+    """Servers currently running."""
+
+    hits: int
+    """Requests served by an already running server."""
+
+    spawns: int
+    """Servers started, including restarts."""
+
+    restarts: int
+    """Servers started to replace a crashed one."""
+
+    evictions: int
+    """Servers shut down for being idle or to respect max_size."""
+
+
+class LSPServerPool:
+    """LSP clients keyed by resolved workspace root, least recently used first.
+
+    Mutable by design: tracks running servers and counters for the lifetime
+    of the process. Each root has its own lock, so servers for different
+    workspaces start concurrently while two requests for the same root never
+    start two servers. Servers leave the pool (eviction, health checks,
+    shutdown) without awaiting in between, so concurrent callers never pick
+    the same server to close.
+
+    >>> pool = LSPServerPool(max_size=2)
+    >>> pool.stats
+    LSPPoolStats(size=0, hits=0, spawns=0, restarts=0, evictions=0)
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SERVERS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        client_factory: Callable[[Path], LSPClient] = LSPClient,
+        clock: Callable[[], float] = time.monotonic,
+        maintenance_interval: float | None = DEFAULT_MAINTENANCE_INTERVAL,
+    ) -> None:
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.maintenance_interval = maintenance_interval
+        self._client_factory = client_factory
+        self._clock = clock
+        self._clients: OrderedDict[Path, LSPClient] = OrderedDict()
+        self._last_used: dict[Path, float] = {}
+        self._locks: dict[Path, asyncio.Lock] = {}
+        self._leases: Counter[Path] = Counter()
+        self._maintenance: asyncio.Task[None] | None = None
+        self._hits = 0
+        self._spawns = 0
+        self._restarts = 0
+        self._evictions = 0
+
+    @property
+    def stats(self) -> LSPPoolStats:
+        """Current pool counters."""
+        return LSPPoolStats(
+            size=len(self._clients),
+            hits=self._hits,
+            spawns=self._spawns,
+            restarts=self._restarts,
+            evictions=self._evictions,
+        )
+
+    @property
+    def roots(self) -> list[Path]:
+        """Workspace roots with a running server, least recently used first."""
+        return list(self._clients)
+
+    @asynccontextmanager
+    async def lease(self, root: Path | str | None = None) -> AsyncIterator[LSPClient]:
+        """Use the client for root for the duration of the block.
+
+        The client is not evicted while leased.
+
+        Args:
+            root: Workspace root (default: the current working directory)
+
+        Yields:
+            Initialized LSPClient rooted at the resolved root
+
+        Raises:
+            LSPError: If the server fails to start
+        """
+        key = Path(root if root is not None else Path.cwd()).resolve()
+        client = await self._checkout(key)
+        try:
+            yield client
+        finally:
+            self._leases[key] -= 1
+            if self._leases[key] <= 0:
+                del self._leases[key]
+
+    async def get(self, root: Path | str | None = None) -> LSPClient:
+        """Return the running client for root, starting or restarting it if needed.
+
+        The client is not leased: a later request for another root may evict
+        it once it is idle. Prefer lease() when using the client.
+
+        Args:
+            root: Workspace root (default: the current working directory)
+
+        Returns:
+            Initialized LSPClient rooted at the resolved root
+
+        Raises:
+            LSPError: If the server fails to start
+        """
+        async with self.lease(root) as client:
+            return client
+
+    async def _checkout(self, key: Path) -> LSPClient:
+        """Start key's server if needed and take a lease on it."""
+        self._ensure_maintenance()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            client = self._clients.get(key)
+            if client is not None and client.is_alive:
+                self._hits += 1
+            else:
+                if client is not None:
+                    logger.warning(f"ty server for {key} is not running, restarting")
+                    del self._clients[key]
+                    await self._close(client)
+                    self._restarts += 1
+                client = self._client_factory(key)
+                try:
+                    await client.start()
+                except BaseException:
+                    await self._close(client)
+                    raise
+                self._spawns += 1
+                self._clients[key] = client
+                logger.info(f"LSP pool: started server for {key} ({self.stats})")
+            self._clients.move_to_end(key)
+            self._last_used[key] = self._clock()
+            self._leases[key] += 1
+
+        await self._evict()
+        return client
+
+    async def check_health(self) -> list[Path]:
+        """Shut down servers that have crashed; they restart on next use.
+
+        Returns:
+            Roots whose servers were found dead
+        """
+        dead = [root for root, client in self._clients.items() if not client.is_alive]
+        clients = [self._remove(root) for root in dead]
+        self._restarts += len(dead)
+        for root, client in zip(dead, clients, strict=True):
+            logger.warning(f"LSP pool: removed crashed server for {root}")
+            await self._close(client)
+        return dead
+
+    async def maintain(self) -> None:
+        """Remove crashed servers and shut down idle ones."""
+        await self.check_health()
+        await self._evict()
+
+    async def shutdown(self) -> None:
+        """Stop maintenance and shut down every server in the pool."""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._last_used.clear()
+        for client in clients:
+            await self._close(client)
+
+    def _ensure_maintenance(self) -> None:
+        """Run the maintenance loop on the current event loop."""
+        if self.maintenance_interval is None:
+            return
+        task = self._maintenance
+        if (
+            task is not None
+            and not task.done()
+            and task.get_loop() is asyncio.get_running_loop()
+        ):
+            return
+        self._maintenance = asyncio.create_task(self._maintenance_loop())
+
+    async def _maintenance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(
+                self.maintenance_interval or DEFAULT_MAINTENANCE_INTERVAL
+            )
+            try:
+                await self.maintain()
+            except Exception as exc:
+                logger.warning(f"LSP pool maintenance failed: {exc}")
+
+    async def _evict(self) -> None:
+        """Shut down idle servers and, if still over max_size, the LRU idle ones.
+
+        Leased servers and servers with requests in flight are never
+        evicted; the pool may run over max_size until they are released.
+        """
+        now = self._clock()
+        evictable = [
+            root
+            for root, client in self._clients.items()
+            if not self._leases[root] and client.in_flight == 0
+        ]
+        victims = [
+            root
+            for root in evictable
+            if now - self._last_used.get(root, now) >= self.idle_timeout
+        ]
+        overflow = len(self._clients) - len(victims) - self.max_size
+        for root in evictable:
+            if overflow <= 0:
+                break
+            if root not in victims:
+                victims.append(root)
+                overflow -= 1
+
+        # Take every victim out before awaiting, so no one else picks it
+        clients = [self._remove(root) for root in victims]
+        self._evictions += len(victims)
+        for root, client in zip(victims, clients, strict=True):
+            logger.info(f"LSP pool: evicting server for {root}")
+            await self._close(client)
+
+    def _remove(self, root: Path) -> LSPClient:
+        self._last_used.pop(root, None)
+        return self._clients.pop(root)
+
+    async def _close(self, client: LSPClient) -> None:
+        """Shut a client down, killing the process if the handshake fails."""
+        try:
+            await client.shutdown()
+        except Exception as exc:
+            logger.warning(f"Error shutting down ty server for {client.root}: {exc}")
+        process = client.process
+        if process is not None and process.returncode is None:
+            process.kill()
+
+
+def get_lsp_pool() -> LSPServerPool:
+    """Return the process-wide LSP server pool, creating it on first use.
+
+    max_size and idle_timeout come from PUNIE_LSP_MAX_SERVERS and
+    PUNIE_LSP_IDLE_TIMEOUT when set.
+    """
+    global _pool
+    if _pool is None:
+        _pool = LSPServerPool(
+            max_size=int(os.environ.get(MAX_SERVERS_ENV, DEFAULT_MAX_SERVERS)),
+            idle_timeout=float(os.environ.get(IDLE_TIMEOUT_ENV, DEFAULT_IDLE_TIMEOUT)),
+        )
+    return _pool
+
+
+async def shutdown_lsp_pool() -> None:
+    """Shut down the process-wide pool's servers, if it was ever created."""
+    if _pool is not None:
+        await _pool.shutdown()
+
+
+def set_lsp_pool(pool: LSPServerPool | None) -> LSPServerPool | None:
+    """Replace the process-wide pool (e.g. to change max_size), returning the old one.
+
+    The caller is responsible for shutting down the previous pool.
+    """
+    global _pool
+    previous, _pool = _pool, pool
+    return previous
@@ -9,11 +9,17 @@ upgrading to Monty (Pydantic's Rust-based sandbox) when it reaches stable API (>
 
 from __future__ import annotations
 
-import ast
+import hashlib
 import io
-from contextlib import redirect_stdout
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext, redirect_stdout
+from dataclasses import dataclass, fields
+from types import CodeType
+from typing import TYPE_CHECKING, Any, Callable
 
 if TYPE_CHECKING:
     from punie.agent.typed_tools import (
@@ -35,6 +41,13 @@ if TYPE_CHECKING:
     from punie.cst.domain_models import DomainValidationResult
 
 
+# Default cap on concurrent calls made through parallel() in one execution
+DEFAULT_MAX_PARALLEL = 4
+
+# Compiled scripts kept for reuse (models often resend identical code)
+COMPILE_CACHE_SIZE = 256
+
+
 @dataclass(frozen=True)
 class ExternalFunctions:
     """Registry of external functions available in sandbox.
@@ -42,7 +55,7 @@ class ExternalFunctions:
     These functions bridge from the sandbox back to ACP tools and typed tools.
     """
 
-    read_file: Callable[[str], str]
+    read_file: Callable[..., str]  # (path, line=None, limit=None)
     write_file: Callable[[str, str], str]
     run_command: Callable[[str, list[str] | None, str | None], str]
     typecheck: Callable[[str], TypeCheckResult]
@@ -70,6 +83,14 @@ class ExternalFunctions:
     validate_middleware_chain: Callable[[str], DomainValidationResult]
     check_di_template_binding: Callable[[str], DomainValidationResult]
     validate_route_pattern: Callable[[str], DomainValidationResult]
+    validate_all: Callable[[str, list[str] | None], dict[str, DomainValidationResult]]
+    # Workspace-wide scans over a directory or glob
+    scan_pattern: Callable[[str, str], CstFindResult]
+    scan_validate: Callable[[str, list[str] | None], dict[str, DomainValidationResult]]
+
+
+# Namespace names bound to ExternalFunctions fields, computed once
+_EXTERNAL_FUNCTION_NAMES = tuple(f.name for f in fields(ExternalFunctions))
 
 
 class CodeExecutionError(Exception):
@@ -78,19 +99,57 @@ class CodeExecutionError(Exception):
     pass
 
 
-def _validate_code(code: str) -> None:
-    """Validate Python code syntax before execution.
+@dataclass(frozen=True)
+class SandboxRun:
+    """Result and timing of one sandbox execution."""
+
+    output: str
+    """Captured stdout."""
+
+    wall_ms: float
+    """Wall-clock time spent compiling and executing."""
+
+    cpu_ms: float
+    """CPU time used by the sandbox thread."""
+
+    compile_cache_hit: bool
+    """Whether the compiled code object came from the compile cache."""
+
+
+_compile_cache: OrderedDict[str, CodeType] = OrderedDict()
+_compile_cache_lock = threading.Lock()
+
+
+def _compile_code(code: str) -> tuple[CodeType, bool]:
+    """Compile sandbox code, reusing the code object for identical source.
+
+    Compiling also validates the syntax, so there is no separate parse step.
+    Entries are keyed by a hash of the source and evicted least recently used.
 
     Args:
-        code: Python source code to validate
+        code: Python source code
+
+    Returns:
+        Tuple of (code object, whether it came from the cache)
 
     Raises:
         CodeExecutionError: If code has syntax errors
     """
+    key = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    with _compile_cache_lock:
+        compiled = _compile_cache.get(key)
+        if compiled is not None:
+            _compile_cache.move_to_end(key)
+            return compiled, True
     try:
-        ast.parse(code)
-    except SyntaxError as exc:
+        compiled = compile(code, "<sandbox>", "exec")
+    except (SyntaxError, ValueError) as exc:
         raise CodeExecutionError(f"Syntax error: {exc}") from exc
+    with _compile_cache_lock:
+        _compile_cache[key] = compiled
+        while len(_compile_cache) > COMPILE_CACHE_SIZE:
+            _compile_cache.popitem(last=False)
+    return compiled, False
 
 
 def _create_restricted_builtins() -> dict:
@@ -142,12 +201,129 @@ def _create_restricted_builtins() -> dict:
     return safe_builtins
 
 
-def run_code(code: str, external_functions: ExternalFunctions) -> str:
+# Built once; each run gets a shallow copy so scripts can't leak changes
+_RESTRICTED_BUILTINS = _create_restricted_builtins()
+
+
+# Set on threads running a call made through parallel()
+_parallel_call = threading.local()
+
+
+class ParallelLimit:
+    """Cap on concurrent calls made through parallel(), shared by every script using it.
+
+    PunieAgent keeps one per session, so concurrent execute_code runs of a
+    session together stay within max_parallel_calls. A parallel() call made
+    from inside another one runs inline on that worker, which already holds a
+    slot, so nesting neither exceeds the cap nor deadlocks on it.
+
+    >>> limit = ParallelLimit(2)
+    >>> limit.call(lambda: "ran in a slot")
+    'ran in a slot'
+    """
+
+    def __init__(self, max_calls: int = DEFAULT_MAX_PARALLEL) -> None:
+        self.max_calls = max_calls
+        self._slots = threading.BoundedSemaphore(max(1, max_calls))
+
+    def call(self, thunk: Callable[[], Any]) -> Any:
+        """Run thunk once a slot is free."""
+        with self._slots:
+            _parallel_call.active = True
+            try:
+                return thunk()
+            finally:
+                _parallel_call.active = False
+
+
+def _create_parallel(
+    max_parallel: int | ParallelLimit,
+    worker_context: Callable[[], AbstractContextManager[Any]] | None = None,
+) -> Callable[..., list[Any]]:
+    """Create the sandbox's parallel() helper.
+
+    External functions block the sandbox thread until their ACP/LSP round trip
+    completes. parallel() runs independent calls on worker threads so their
+    round trips overlap on the event loop, at most max_parallel at a time.
+    It returns only once every worker has finished, so no call outlives the
+    script that made it.
+
+    Args:
+        max_parallel: Maximum number of calls running at once, or a
+            ParallelLimit shared with other scripts
+        worker_context: Entered on each worker thread around its call, so the
+            caller can put workers under the same limits and cancellation as
+            the sandbox thread
+
+    Returns:
+        parallel(*calls) function for the sandbox namespace
+
+    Example:
+        >>> parallel = _create_parallel(2)
+        >>> parallel(lambda: 1 + 1, (max, 3, 7), (str.upper, "ok"))
+        [2, 7, 'OK']
+    """
+    limit = max_parallel if isinstance(max_parallel, ParallelLimit) else ParallelLimit(max_parallel)
+
+    def run_on_worker(thunk: Callable[[], Any]) -> Any:
+        with worker_context() if worker_context is not None else nullcontext():
+            return limit.call(thunk)
+
+    def parallel(*calls: Any) -> list[Any]:
+        """Run calls concurrently and return their results in order.
+
+        Each call is a zero-argument callable or a (function, *args) tuple.
+        If a call raises, the first exception (in call order) is re-raised.
+        """
+        thunks: list[Callable[[], Any]] = []
+        for call in calls:
+            if callable(call):
+                thunks.append(call)
+            elif isinstance(call, tuple) and call and callable(call[0]):
+                func, *args = call
+                thunks.append(lambda func=func, args=args: func(*args))
+            else:
+                raise TypeError(
+                    "parallel() takes callables or (function, *args) tuples, "
+                    f"got {type(call).__name__}"
+                )
+
+        if getattr(_parallel_call, "active", False):
+            return [thunk() for thunk in thunks]  # Nested: already holds a slot
+        if len(thunks) <= 1 or limit.max_calls <= 1:
+            return [limit.call(thunk) for thunk in thunks]
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(limit.max_calls, len(thunks)),
+            thread_name_prefix="punie-parallel",
+        )
+        try:
+            futures = [executor.submit(run_on_worker, thunk) for thunk in thunks]
+            return [future.result() for future in futures]
+        finally:
+            # Drop calls not yet started, wait for running ones. If the run was
+            # interrupted, worker_context has interrupted the workers too.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return parallel
+
+
+def run_code(
+    code: str,
+    external_functions: ExternalFunctions,
+    max_parallel: int | ParallelLimit = DEFAULT_MAX_PARALLEL,
+) -> str:
     """Execute Python code in a restricted sandbox with external functions.
 
+    Besides the external functions, the namespace provides ``parallel()`` for
+    running independent calls concurrently, e.g.
+    ``parallel((typecheck, "a.py"), (ruff_check, "a.py"))``.
+
     Args:
         code: Python source code to execute
         external_functions: Registry of external functions (read_file, write_file, run_command)
+        max_parallel: Maximum concurrent calls made through parallel(), or
+            a ParallelLimit shared with the session's other scripts
 
     Returns:
         Captured stdout from code execution
@@ -210,68 +386,81 @@ def run_code(code: str, external_functions: ExternalFunctions) -> str:
         ...     validate_service_registration=fake_domain, check_dependency_graph=fake_domain,
         ...     validate_injection_site=fake_domain, validate_middleware_chain=fake_domain,
         ...     check_di_template_binding=fake_domain, validate_route_pattern=fake_domain,
+        ...     validate_all=lambda fp, checks=None: {},
+        ...     scan_pattern=fake_cst_find, scan_validate=lambda path, checks=None: {},
         ... )
         >>> result = run_code('content = read_file("test.txt"); print(content)', funcs)
         >>> result.strip()
         'test content'
     """
-    import json
-
-    # Validate syntax first
-    _validate_code(code)
-
-    # Create namespace with restricted builtins + external functions + safe modules
-    namespace = {
-        "__builtins__": _create_restricted_builtins(),
-        "read_file": external_functions.read_file,
-        "write_file": external_functions.write_file,
-        "run_command": external_functions.run_command,
-        "typecheck": external_functions.typecheck,
-        "ruff_check": external_functions.ruff_check,
-        "pytest_run": external_functions.pytest_run,
-        "goto_definition": external_functions.goto_definition,
-        "find_references": external_functions.find_references,
-        "hover": external_functions.hover,
-        "document_symbols": external_functions.document_symbols,
-        "workspace_symbols": external_functions.workspace_symbols,
-        "git_status": external_functions.git_status,
-        "git_diff": external_functions.git_diff,
-        "git_log": external_functions.git_log,
-        # LibCST code tools
-        "cst_find_pattern": external_functions.cst_find_pattern,
-        "cst_rename": external_functions.cst_rename,
-        "cst_add_import": external_functions.cst_add_import,
-        # Domain validators
-        "validate_component": external_functions.validate_component,
-        "check_render_tree": external_functions.check_render_tree,
-        "validate_escape_context": external_functions.validate_escape_context,
-        "validate_service_registration": external_functions.validate_service_registration,
-        "check_dependency_graph": external_functions.check_dependency_graph,
-        "validate_injection_site": external_functions.validate_injection_site,
-        "validate_middleware_chain": external_functions.validate_middleware_chain,
-        "check_di_template_binding": external_functions.check_di_template_binding,
-        "validate_route_pattern": external_functions.validate_route_pattern,
-        "json": json,  # Available directly, no import needed
+    return run_code_timed(code, external_functions, max_parallel).output
+
+
+def run_code_timed(
+    code: str,
+    external_functions: ExternalFunctions,
+    max_parallel: int | ParallelLimit = DEFAULT_MAX_PARALLEL,
+    worker_context: Callable[[], AbstractContextManager[Any]] | None = None,
+) -> SandboxRun:
+    """Execute sandbox code like run_code(), also reporting timing.
+
+    Args:
+        code: Python source code to execute
+        external_functions: Registry of external functions
+        max_parallel: Maximum concurrent calls made through parallel(), or
+            a ParallelLimit shared with the session's other scripts
+        worker_context: Entered on each parallel() worker thread around its
+            call (see _create_parallel)
+
+    Returns:
+        SandboxRun with captured stdout, wall/CPU time, and compile cache status
+
+    Raises:
+        CodeExecutionError: If code validation or execution fails
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+
+    compiled, cache_hit = _compile_code(code)
+
+    # Fresh namespace per run from prebuilt pieces: restricted builtins,
+    # external functions, and safe modules
+    namespace: dict[str, Any] = {
+        name: getattr(external_functions, name) for name in _EXTERNAL_FUNCTION_NAMES
     }
+    namespace["__builtins__"] = dict(_RESTRICTED_BUILTINS)
+    namespace["parallel"] = _create_parallel(max_parallel, worker_context)
+    namespace["json"] = json  # Available directly, no import needed
 
     # Capture stdout
     stdout_capture = io.StringIO()
 
     try:
         with redirect_stdout(stdout_capture):
-            exec(code, namespace)  # noqa: S102 - Intentional use in sandbox
+            exec(compiled, namespace)  # noqa: S102 - Intentional use in sandbox
     except Exception as exc:
         raise CodeExecutionError(f"Runtime error: {exc}") from exc
 
-    return stdout_capture.getvalue()
+    return SandboxRun(
+        output=stdout_capture.getvalue(),
+        wall_ms=(time.perf_counter() - wall_start) * 1000,
+        cpu_ms=(time.thread_time() - cpu_start) * 1000,
+        compile_cache_hit=cache_hit,
+    )
 
 
-async def run_code_async(code: str, external_functions: ExternalFunctions) -> str:
+async def run_code_async(
+    code: str,
+    external_functions: ExternalFunctions,
+    max_parallel: int | ParallelLimit = DEFAULT_MAX_PARALLEL,
+) -> str:
     """Async wrapper for run_code (for compatibility with async toolset).
 
     Args:
         code: Python source code to execute
         external_functions: Registry of external functions
+        max_parallel: Maximum concurrent calls made through parallel(), or
+            a ParallelLimit shared with the session's other scripts
 
     Returns:
         Captured stdout from code execution
@@ -283,4 +472,4 @@ async def run_code_async(code: str, external_functions: ExternalFunctions) -> st
         Currently runs code synchronously. In future, could use async exec or
         run in thread pool for true async execution.
     """
-    return run_code(code, external_functions)
+    return run_code(code, external_functions, max_parallel)
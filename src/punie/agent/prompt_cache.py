@@ -0,0 +1,169 @@
+"""Prompt-prefix caching for local OpenAI-compatible servers.
+
+Every request Punie sends starts with the same large prefix: the agent
+instructions (with the Code Mode stubs) followed by the tool schema. Local
+servers such as mlx_lm.server can reuse the KV cache of a prefix they have
+already processed, but only when the prefix is byte-identical. Otherwise
+a 30B model spends seconds of prefill on it for every request.
+
+This module covers three things:
+
+- A stable cache key for an instructions + tools prefix, sent as prompt-cache
+  hints (OpenAI's prompt_cache_key and llama.cpp's cache_prompt; servers
+  that don't know them ignore them)
+- prewarm(), which sends the prefix once with a one-token completion so
+  the server has it cached before the first real prompt
+- PrefillSample, which records the prefill time and cached token count of
+  each model request so the savings can be checked
+
+Keeping the prefix identical is up to the callers. The instructions are
+built once per process (config.punie_instructions), and toolsets list
+their tools in a fixed order.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_ai.direct import model_request
+from pydantic_ai.messages import ModelRequest, UserPromptPart
+from pydantic_ai.models import Model, ModelRequestParameters
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.tools import ToolDefinition
+
+from punie.agent.scheduler import recording_slot_waits
+
+logger = logging.getLogger(__name__)
+
+# User message of the prewarm request (only the prefix before it matters)
+PREWARM_PROMPT = "."
+
+
+def prefix_cache_key(instructions: str, tools: Iterable[ToolDefinition]) -> str:
+    """Key identifying an instructions + tool schema prefix.
+
+    Equal prefixes get equal keys, so requests from every session share the
+    server's cached prefix.
+
+    >>> prefix_cache_key("Be brief.", []) == prefix_cache_key("Be brief.", [])
+    True
+    >>> prefix_cache_key("Be brief.", []).startswith("punie-")
+    True
+    """
+    digest = hashlib.sha256(instructions.encode("utf-8"))
+    for tool in tools:
+        schema = {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": tool.parameters_json_schema,
+        }
+        digest.update(json.dumps(schema, sort_keys=True).encode("utf-8"))
+    return f"punie-{digest.hexdigest()[:16]}"
+
+
+def prompt_cache_settings(cache_key: str) -> dict[str, Any]:
+    """Model settings asking an OpenAI-compatible server to cache the prompt prefix.
+
+    >>> prompt_cache_settings("punie-0123")["extra_body"]
+    {'cache_prompt': True}
+    """
+    return {
+        "openai_prompt_cache_key": cache_key,
+        "extra_body": {"cache_prompt": True},
+    }
+
+
+@dataclass(frozen=True)
+class PrefillSample:
+    """Prompt processing cost of one model request."""
+
+    input_tokens: int
+    """Prompt tokens of the request, cached ones included."""
+
+    cached_tokens: int
+    """Prompt tokens the server served from its prefix cache."""
+
+    prefill_ms: float | None
+    """Time until the first response token, not counting queued_ms (None if not measured)."""
+
+    queued_ms: float = 0.0
+    """Time the request waited for a ModelScheduler slot before it was sent."""
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-friendly form for PromptResponse metadata.
+
+        >>> PrefillSample(input_tokens=900, cached_tokens=800, prefill_ms=41.26).as_dict()
+        {'input_tokens': 900, 'cached_tokens': 800, 'prefill_ms': 41.3, 'queued_ms': 0.0}
+        """
+        return {
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "prefill_ms": None if self.prefill_ms is None else round(self.prefill_ms, 1),
+            "queued_ms": round(self.queued_ms, 1),
+        }
+
+
+def log_prefill(samples: Sequence[PrefillSample]) -> None:
+    """Log prefill time against cached tokens for each request of a prompt."""
+    for n, sample in enumerate(samples, start=1):
+        elapsed = "?" if sample.prefill_ms is None else f"{sample.prefill_ms:.0f}ms"
+        logger.info(
+            f"Request {n}: prefill {elapsed} (queued {sample.queued_ms:.0f}ms), "
+            f"{sample.cached_tokens}/{sample.input_tokens} prompt tokens cached"
+        )
+
+
+async def prewarm(
+    model: Model,
+    instructions: str,
+    tools: Sequence[ToolDefinition],
+    model_settings: ModelSettings | None = None,
+) -> PrefillSample:
+    """Send the instructions + tools prefix once so the server caches it.
+
+    Requests a single token, so the cost is the prefill itself. Time spent
+    queued for a ModelScheduler slot (when model is a ScheduledModel) is
+    reported as queued_ms, not as prefill.
+
+    Args:
+        model: Model to warm (requests go to its server)
+        instructions: Agent instructions, exactly as sessions will send them
+        tools: Tool definitions, in the order sessions will send them
+        model_settings: Extra settings merged into the request
+
+    Returns:
+        PrefillSample of the prewarm request
+    """
+    settings: dict[str, Any] = {
+        **(model_settings or {}),
+        **prompt_cache_settings(prefix_cache_key(instructions, tools)),
+        "max_tokens": 1,
+    }
+    messages = [ModelRequest(parts=[UserPromptPart(PREWARM_PROMPT)], instructions=instructions)]
+    start = time.perf_counter()
+    with recording_slot_waits() as waits:
+        response = await model_request(
+            model,
+            messages,
+            model_settings=ModelSettings(**settings),
+            model_request_parameters=ModelRequestParameters(
+                function_tools=list(tools), allow_text_output=True
+            ),
+        )
+    queued_ms = sum(waits) * 1000
+    sample = PrefillSample(
+        input_tokens=response.usage.input_tokens,
+        cached_tokens=response.usage.cache_read_tokens,
+        prefill_ms=(time.perf_counter() - start) * 1000 - queued_ms,
+        queued_ms=queued_ms,
+    )
+    logger.info(
+        f"Prewarmed prompt prefix: {sample.input_tokens} tokens in {sample.prefill_ms:.0f}ms"
+    )
+    return sample
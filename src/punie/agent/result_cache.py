@@ -0,0 +1,300 @@
+"""Session-scoped memoization for the subprocess-backed typed tools.
+
+typecheck, ruff_check, pytest_run and the git tools each spawn a terminal
+subprocess, and models often repeat the same call two or three times in one
+turn with nothing changed in between. ToolResultCache remembers results
+keyed by tool name, arguments and a fingerprint of the state the tool reads:
+
+- typecheck and pytest_run: every file in the workspace (imports reach
+  beyond the target path)
+- ruff_check: the target path plus the workspace's ruff/pyproject config
+- git_log and staged git_diff: HEAD and the index
+- git_status and unstaged git_diff: HEAD, the index and the workspace files
+
+Fingerprints use file paths, mtimes and sizes, so editing any relevant file
+produces a new key. Walking a large workspace costs about as much as the
+tool itself, so ToolResultCache.key() reuses a workspace's fingerprint for
+fingerprint_ttl seconds; a burst of calls walks the tree once. Entries also
+expire after a TTL, the least recently used are evicted beyond max_entries,
+and write_file drops entries whose scope contains the written path (and the
+reused fingerprints of workspaces containing it). Each ACP session gets its
+own cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_TTL = 300.0  # Seconds
+DEFAULT_FINGERPRINT_TTL = 2.0  # Seconds a workspace walk is reused
+
+# Directories never fingerprinted (tool output does not depend on them)
+_SKIPPED_DIRS = frozenset({"__pycache__", "node_modules", "venv", "build", "dist"})
+
+# Config files whose edits change lint results
+_RUFF_CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+
+# Tools whose results depend on the working tree, not just on their target
+_WORKSPACE_TOOLS = frozenset({"typecheck", "pytest_run", "git_status", "git_diff"})
+_GIT_TOOLS = frozenset({"git_status", "git_diff", "git_log"})
+
+
+@dataclass(frozen=True)
+class ResultCacheStats:
+    """Snapshot of ToolResultCache counters."""
+
+    hits: int
+    """Lookups answered from the cache."""
+
+    misses: int
+    """Lookups that had to run the tool."""
+
+    evictions: int
+    """Entries dropped for age or to respect max_entries."""
+
+    invalidations: int
+    """Entries dropped because a file in their scope was written."""
+
+    entries: int
+    """Results currently cached."""
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Identity of one tool invocation against one workspace state."""
+
+    tool: str
+    """Typed tool name, e.g. "ruff_check"."""
+
+    args: tuple[Hashable, ...]
+    """Tool arguments as passed by the model."""
+
+    fingerprint: str
+    """Hash of the files (or git state) the tool reads."""
+
+    scope: Path | None
+    """Directory or file whose writes invalidate the result (None: writes never do)."""
+
+
+class _Entry:
+    __slots__ = ("expires", "value")
+
+    def __init__(self, value: Any, expires: float) -> None:
+        self.value = value
+        self.expires = expires
+
+
+def _iter_files(path: Path) -> Iterable[Path]:
+    if path.is_file():
+        yield path
+        return
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in _SKIPPED_DIRS]
+        for filename in filenames:
+            yield Path(dirpath, filename)
+
+
+def _hash_stats(digest: Any, paths: Iterable[Path]) -> None:
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+
+
+def _git_dir(start: Path) -> Path | None:
+    """Find the .git directory for start, following worktree gitdir files."""
+    for directory in (start, *start.parents):
+        candidate = directory / ".git"
+        if candidate.is_dir():
+            return candidate
+        if candidate.is_file():
+            text = candidate.read_text().strip()
+            if text.startswith("gitdir:"):
+                return (directory / text.removeprefix("gitdir:").strip()).resolve()
+    return None
+
+
+def _hash_git_state(digest: Any, start: Path) -> None:
+    git_dir = _git_dir(start)
+    if git_dir is None:
+        digest.update(b"no-git")
+        return
+    head = git_dir / "HEAD"
+    try:
+        head_text = head.read_text()
+    except OSError:
+        head_text = ""
+    digest.update(head_text.encode())
+    paths = [git_dir / "index", git_dir / "packed-refs"]
+    if head_text.startswith("ref:"):
+        ref = head_text.removeprefix("ref:").strip()
+        paths.append(git_dir / ref)
+        # Linked worktrees keep branch refs in the common directory
+        commondir = git_dir / "commondir"
+        if commondir.is_file():
+            paths.append((git_dir / commondir.read_text().strip() / ref).resolve())
+    _hash_stats(digest, paths)
+
+
+def workspace_fingerprint(root: Path) -> str:
+    """Hash of the paths, mtimes and sizes of every file under root."""
+    digest = hashlib.blake2b(digest_size=16)
+    _hash_stats(digest, sorted(_iter_files(root)))
+    return digest.hexdigest()
+
+
+def cache_key(
+    tool: str,
+    args: tuple[Hashable, ...],
+    target: Path,
+    root: Path,
+    fingerprint_workspace: Callable[[Path], str] = workspace_fingerprint,
+) -> CacheKey:
+    """Build the key for a tool call, fingerprinting the state it depends on.
+
+    Args:
+        tool: Typed tool name
+        args: Tool arguments (git_diff's staged flag must be args[1])
+        target: Resolved path the tool was pointed at
+        root: Workspace root
+        fingerprint_workspace: Fingerprints the workspace for tools that
+            depend on all of it (ToolResultCache.key() passes a memoized one)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    staged_diff = tool == "git_diff" and len(args) > 1 and bool(args[1])
+    if tool in _GIT_TOOLS:
+        _hash_git_state(digest, target if target.is_dir() else target.parent)
+    if tool in _WORKSPACE_TOOLS and not staged_diff:
+        digest.update(fingerprint_workspace(root).encode())
+    scope: Path | None = root
+    if tool == "ruff_check":
+        _hash_stats(digest, sorted(_iter_files(target)))
+        _hash_stats(digest, (root / name for name in _RUFF_CONFIG_FILES))
+        scope = target
+    elif tool == "git_log" or staged_diff:
+        scope = None
+    return CacheKey(tool, args, digest.hexdigest(), scope)
+
+
+class ToolResultCache:
+    """TTL + LRU cache of typed tool results for one session.
+
+    Mutable by design: counters and entries change on every lookup. Thread
+    safe, since Code Mode calls tools from parallel() workers.
+
+    >>> cache = ToolResultCache(max_entries=2)
+    >>> key = CacheKey("git_log", (".", 10), "abc", None)
+    >>> cache.get(key) is None
+    True
+    >>> cache.put(key, "log")
+    >>> cache.get(key)
+    'log'
+    >>> cache.stats
+    ResultCacheStats(hits=1, misses=1, evictions=0, invalidations=0, entries=1)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+        fingerprint_ttl: float = DEFAULT_FINGERPRINT_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.fingerprint_ttl = fingerprint_ttl
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._fingerprints: dict[Path, tuple[str, float]] = {}  # root → (hash, expires)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def stats(self) -> ResultCacheStats:
+        """Current cache counters."""
+        with self._lock:
+            return ResultCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+            )
+
+    def key(
+        self, tool: str, args: tuple[Hashable, ...], target: Path, root: Path
+    ) -> CacheKey:
+        """Build the key for a tool call, like cache_key(), reusing recent workspace walks."""
+        return cache_key(tool, args, target, root, self._workspace_fingerprint)
+
+    def get(self, key: CacheKey) -> Any | None:
+        """Return the cached result for key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self._clock():
+                del self._entries[key]
+                self._evictions += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        """Store a result, evicting the least recently used beyond max_entries."""
+        with self._lock:
+            self._entries[key] = _Entry(value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, path: Path) -> int:
+        """Drop results whose scope contains path; returns how many were dropped."""
+        path = path.resolve()
+        with self._lock:
+            for root in [r for r in self._fingerprints if path.is_relative_to(r)]:
+                del self._fingerprints[root]
+            stale = [
+                key
+                for key in self._entries
+                if key.scope is not None and (path == key.scope or path.is_relative_to(key.scope))
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached result (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+
+    def _workspace_fingerprint(self, root: Path) -> str:
+        now = self._clock()
+        with self._lock:
+            cached = self._fingerprints.get(root)
+            if cached is not None and cached[1] > now:
+                return cached[0]
+        # Walk outside the lock; concurrent misses just walk twice
+        fingerprint = workspace_fingerprint(root)
+        with self._lock:
+            self._fingerprints[root] = (fingerprint, now + self.fingerprint_ttl)
+        return fingerprint
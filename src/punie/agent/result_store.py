@@ -0,0 +1,221 @@
+"""Session-scoped store that pages large tool outputs.
+
+Some tool outputs are too large to hand to the model whole: read_file on a
+20k-line module, find_references with hundreds of locations, git_diff across
+a big branch. ResultStore keeps such an output server-side under a handle
+and hands back only its first page, followed by a footer that says how to
+continue:
+
+    [Output truncated: bytes 0-48000 of 912345. Call read_more("read_file-1", 48000) ...]
+
+The model fetches later pages with the read_more tool. Page sizes are set
+per tool by a PageBudget (bytes, and an estimate of tokens). Pages end on a
+line boundary when one is near the budget. Outputs larger than spill_bytes
+are written to a temporary directory instead of being held in memory. The
+least recently used outputs are dropped beyond max_results. Each ACP session
+gets its own store, closed (and its spill files removed) with the session.
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_MAX_RESULTS = 32
+DEFAULT_SPILL_BYTES = 256_000  # Larger outputs are kept on disk, not in memory
+
+# Rough size of a token for English text and code; used to turn token budgets into bytes
+BYTES_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class PageBudget:
+    """How much of one tool's output the model sees per call."""
+
+    max_bytes: int
+    """Upper bound on the page size in UTF-8 bytes."""
+
+    max_tokens: int | None = None
+    """Upper bound on the page size in (estimated) tokens; None: bytes only."""
+
+    @property
+    def limit(self) -> int:
+        """Page size in bytes satisfying both bounds.
+
+        >>> PageBudget(max_bytes=10_000, max_tokens=1_000).limit
+        4000
+        """
+        if self.max_tokens is None:
+            return self.max_bytes
+        return min(self.max_bytes, self.max_tokens * BYTES_PER_TOKEN)
+
+
+DEFAULT_BUDGET = PageBudget(max_bytes=32_000, max_tokens=8_000)
+
+DEFAULT_BUDGETS: Mapping[str, PageBudget] = {
+    "read_file": PageBudget(max_bytes=48_000, max_tokens=12_000),
+    "run_command": PageBudget(max_bytes=16_000, max_tokens=4_000),
+    "execute_code": PageBudget(max_bytes=16_000, max_tokens=4_000),
+    "git_diff": PageBudget(max_bytes=32_000, max_tokens=8_000),
+    "find_references": PageBudget(max_bytes=16_000, max_tokens=4_000),
+}
+
+
+class _Stored:
+    __slots__ = ("data", "path", "size", "tool")
+
+    def __init__(self, tool: str, size: int, data: bytes | None, path: Path | None) -> None:
+        self.tool = tool
+        self.size = size
+        self.data = data
+        self.path = path
+
+    def read(self, offset: int, length: int) -> bytes:
+        if self.data is not None:
+            return self.data[offset : offset + length]
+        assert self.path is not None
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+def _page_end(chunk: bytes, limit: int) -> int:
+    """Where to cut chunk (limit + 1 bytes read) so the page is at most limit bytes.
+
+    Prefers the end of a line in the second half of the page, and never
+    splits a UTF-8 sequence.
+    """
+    if len(chunk) <= limit:
+        return len(chunk)
+    newline = chunk.rfind(b"\n", 0, limit)
+    if newline >= limit // 2:
+        return newline + 1
+    end = limit
+    # Continuation bytes look like 0b10xxxxxx
+    while end > 0 and chunk[end] & 0xC0 == 0x80:
+        end -= 1
+    return end or limit
+
+
+class ResultStore:
+    """Pages tool outputs that exceed their budget, for one session.
+
+    Mutable by design: outputs are added as tools run. Thread safe, since
+    direct tools and the Code Mode sandbox may page concurrently.
+
+    >>> store = ResultStore({"read_file": PageBudget(max_bytes=12)})
+    >>> store.page("read_file", "short")
+    'short'
+    >>> print(store.page("read_file", "line one\\nline two\\nline three\\n"))
+    line one
+    <BLANKLINE>
+    [Output truncated: bytes 0-9 of 29. Call read_more("read_file-1", 9) for the next page.]
+    >>> print(store.read_more("read_file-1", 18))
+    line three
+    <BLANKLINE>
+    [End of output read_file-1: bytes 18-29 of 29.]
+    >>> store.close()
+    """
+
+    def __init__(
+        self,
+        budgets: Mapping[str, PageBudget] | None = None,
+        *,
+        default_budget: PageBudget = DEFAULT_BUDGET,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        spill_bytes: int = DEFAULT_SPILL_BYTES,
+        directory: Path | None = None,
+    ) -> None:
+        self.budgets = dict(DEFAULT_BUDGETS if budgets is None else budgets)
+        self.default_budget = default_budget
+        self.max_results = max_results
+        self.spill_bytes = spill_bytes
+        self._directory = directory
+        self._owns_directory = False
+        self._results: OrderedDict[str, _Stored] = OrderedDict()
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def budget(self, tool: str) -> PageBudget:
+        """Budget for a tool's pages (default_budget if none is configured)."""
+        return self.budgets.get(tool, self.default_budget)
+
+    def page(self, tool: str, text: str) -> str:
+        """Return text unchanged if it fits the tool's budget, else its first page.
+
+        Oversized text is stored under a new handle, named after the tool,
+        that read_more accepts.
+        """
+        limit = self.budget(tool).limit
+        # Cheap check first: UTF-8 never uses fewer bytes than characters
+        if len(text) <= limit // 4:
+            return text
+        data = text.encode()
+        if len(data) <= limit:
+            return text
+        with self._lock:
+            self._counter += 1
+            handle = f"{tool}-{self._counter}"
+            self._results[handle] = self._store(handle, tool, data)
+            self._evict()
+        return self.read_more(handle, 0)
+
+    def read_more(self, handle: str, offset: int = 0) -> str:
+        """Return the page of a stored output starting at byte offset.
+
+        Raises:
+            KeyError: If the handle is unknown or its output was evicted
+            ValueError: If offset is outside the output
+        """
+        with self._lock:
+            stored = self._results.get(handle)
+            if stored is None:
+                raise KeyError(f"No stored output {handle!r} (it may have expired)")
+            self._results.move_to_end(handle)
+        if not 0 <= offset < stored.size:
+            raise ValueError(f"Offset {offset} is outside {handle} (0-{stored.size})")
+        limit = self.budget(stored.tool).limit
+        chunk = stored.read(offset, limit + 1)
+        end = offset + _page_end(chunk, limit)
+        text = chunk[: end - offset].decode(errors="replace")
+        if end < stored.size:
+            footer = (
+                f"[Output truncated: bytes {offset}-{end} of {stored.size}."
+                f' Call read_more("{handle}", {end}) for the next page.]'
+            )
+        else:
+            footer = f"[End of output {handle}: bytes {offset}-{end} of {stored.size}.]"
+        return f"{text}\n{footer}"
+
+    def close(self) -> None:
+        """Drop every stored output and remove spill files."""
+        with self._lock:
+            for stored in self._results.values():
+                if stored.path is not None:
+                    stored.path.unlink(missing_ok=True)
+            self._results.clear()
+            if self._owns_directory and self._directory is not None:
+                shutil.rmtree(self._directory, ignore_errors=True)
+                self._directory = None
+                self._owns_directory = False
+
+    def _store(self, handle: str, tool: str, data: bytes) -> _Stored:
+        if len(data) <= self.spill_bytes:
+            return _Stored(tool, len(data), data, None)
+        if self._directory is None:
+            self._directory = Path(tempfile.mkdtemp(prefix="punie-results-"))
+            self._owns_directory = True
+        path = self._directory / handle
+        path.write_bytes(data)
+        return _Stored(tool, len(data), None, path)
+
+    def _evict(self) -> None:
+        while len(self._results) > self.max_results:
+            _, stored = self._results.popitem(last=False)
+            if stored.path is not None:
+                stored.path.unlink(missing_ok=True)
@@ -0,0 +1,356 @@
+"""Dedicated worker pool for Code Mode (execute_code) sandbox runs.
+
+SandboxPool runs scripts on its own bounded set of threads, apart from the
+event loop's default executor, and enforces per-execution limits:
+
+- CPU time of the sandbox thread (SandboxLimits.cpu_seconds), where the
+  platform has a per-thread CPU clock; elsewhere (e.g. macOS) the CPU limit
+  is disabled and a warning is logged
+- growth of the process's peak memory during the run (SandboxLimits.memory_mb),
+  best-effort only: see SandboxLimits.memory_mb
+
+A watchdog thread polls running executions and interrupts any that exceed a
+limit by raising SandboxLimitExceeded in the sandbox thread and its parallel()
+workers; the run then fails with CodeExecutionError, which execute_code
+reports to the model. Workers count against the run's CPU budget and are
+interrupted by PromptScope.cancel() like the sandbox thread.
+
+Example:
+    pool = get_sandbox_pool()
+    run = await pool.run(code, external_functions)
+    print(run.output, run.wall_ms, run.cpu_ms)
+"""
+
+import asyncio
+import ctypes
+import logging
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import partial
+
+from punie.agent.cancellation import PromptScope
+from punie.agent.monty_runner import (
+    DEFAULT_MAX_PARALLEL,
+    CodeExecutionError,
+    ExternalFunctions,
+    ParallelLimit,
+    SandboxRun,
+    run_code_timed,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SANDBOX_WORKERS = 4
+DEFAULT_CPU_SECONDS = 30.0
+DEFAULT_MEMORY_MB = 1024
+
+# ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# Process-wide pool used by execute_code
+_pool: SandboxPool | None = None
+
+# Whether the missing per-thread CPU clock has been reported
+_cpu_clock_warned = False
+
+
+class SandboxLimitExceeded(BaseException):
+    """Raised inside a sandbox thread that went over a SandboxLimits budget.
+
+    Derives from BaseException so the script's own ``except Exception`` blocks
+    cannot swallow it.
+    """
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    """Per-execution resource limits (None disables a limit)."""
+
+    cpu_seconds: float | None = DEFAULT_CPU_SECONDS
+    """CPU time the sandbox thread and its parallel() workers may use together.
+
+    Time blocked on tool calls is free.
+
+    Needs a per-thread CPU clock (time.pthread_getcpuclockid); without one the
+    limit is not enforced, rather than counting tool waits as CPU time.
+    """
+
+    memory_mb: int | None = DEFAULT_MEMORY_MB
+    """How far the process's peak RSS may grow while the script runs.
+
+    Best-effort: peak RSS is process-wide and never decreases, so growth
+    caused by concurrent runs (or the agent itself) is charged to whichever
+    run is watching, and memory freed and reallocated below an earlier peak
+    is not seen at all. It guards against one script ballooning the process,
+    not against a precise per-run quota.
+    """
+
+
+def _peak_rss_bytes() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+def _thread_cpu_clock(thread_id: int) -> int | None:
+    """CPU clock of a thread, readable from the watchdog, where the platform has one."""
+    getcpuclockid = getattr(time, "pthread_getcpuclockid", None)
+    if getcpuclockid is None:
+        return None
+    try:
+        return getcpuclockid(thread_id)
+    except OSError:
+        return None
+
+
+def _warn_no_cpu_clock() -> None:
+    global _cpu_clock_warned
+    if not _cpu_clock_warned:
+        _cpu_clock_warned = True
+        logger.warning(
+            "No per-thread CPU clock on this platform; sandbox CPU limit is disabled"
+        )
+
+
+class _Watch:
+    """Budget tracking for one running execution (mutable, watchdog-owned).
+
+    Created on the sandbox thread; parallel() workers join and leave it from
+    their own threads. Callers hold the pool lock for everything but __init__.
+    """
+
+    def __init__(self, thread_id: int, limits: SandboxLimits) -> None:
+        self.thread_id = thread_id
+        self.limits = limits if limits is not None else SandboxLimits()
+        self.cpu_clock = _thread_cpu_clock(thread_id)
+        self.threads: dict[int, tuple[int | None, float]] = {}  # id → (clock, CPU start)
+        self.cpu_done = 0.0  # CPU seconds of workers that have left
+        self.wall_start = time.monotonic()
+        self.rss_start = _peak_rss_bytes()
+        self.exceeded: str | None = None
+        self.add_thread()
+
+    def add_thread(self) -> None:
+        """Count the calling thread's CPU time against this run."""
+        thread_id = threading.get_ident()
+        clock = self.cpu_clock if thread_id == self.thread_id else _thread_cpu_clock(thread_id)
+        # Sampled on the thread itself: the same clock thread_time() reads
+        self.threads[thread_id] = (clock, time.thread_time())
+
+    def remove_thread(self) -> None:
+        """Stop watching the calling thread, keeping the CPU time it used."""
+        _, cpu_start = self.threads.pop(threading.get_ident())
+        self.cpu_done += time.thread_time() - cpu_start
+
+    def cpu_used(self) -> float:
+        """CPU seconds used so far by the sandbox thread and its workers."""
+        return self.cpu_done + sum(
+            time.clock_gettime(clock) - cpu_start
+            for clock, cpu_start in self.threads.values()
+            if clock is not None
+        )
+
+    def check(self) -> str | None:
+        """Return a description of the first exceeded limit, if any."""
+        cpu_limit = self.limits.cpu_seconds
+        if (
+            cpu_limit is not None
+            and self.cpu_clock is not None
+            and self.cpu_used() > cpu_limit
+        ):
+            return f"CPU limit of {cpu_limit:g}s exceeded"
+        memory_limit = self.limits.memory_mb
+        if memory_limit is not None:
+            grown = _peak_rss_bytes() - self.rss_start
+            if grown > memory_limit * 1024 * 1024:
+                return f"memory limit of {memory_limit} MB exceeded"
+        return None
+
+
+class SandboxPool:
+    """Bounded thread pool running sandbox scripts under resource limits.
+
+    Mutable by design: owns the executor, the watchdog thread, and the set of
+    running executions.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_SANDBOX_WORKERS,
+        limits: SandboxLimits | None = None,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self.max_workers = max_workers
+        self.limits = limits if limits is not None else SandboxLimits()
+        self._poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="punie-sandbox"
+        )
+        self._lock = threading.Lock()
+        self._watches: dict[int, _Watch] = {}
+        self._wakeup = threading.Event()
+        self._watchdog: threading.Thread | None = None
+        self._closed = False
+
+    @property
+    def active(self) -> int:
+        """Number of scripts currently executing."""
+        with self._lock:
+            return len(self._watches)
+
+    async def run(
+        self,
+        code: str,
+        external_functions: ExternalFunctions,
+        max_parallel: int | ParallelLimit = DEFAULT_MAX_PARALLEL,
+        scope: PromptScope | None = None,
+    ) -> SandboxRun:
+        """Execute code on a pool thread.
+
+        Args:
+            code: Python source code to execute
+            external_functions: Registry of external functions
+            max_parallel: Maximum concurrent calls made through parallel(), or
+                a ParallelLimit shared with the session's other scripts
+            scope: Prompt scope, so PunieAgent.cancel() can interrupt the run
+
+        Returns:
+            SandboxRun with output and timing
+
+        Raises:
+            CodeExecutionError: On syntax/runtime errors or exceeded limits
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            run = await loop.run_in_executor(
+                self._executor, self._run_sync, code, external_functions, max_parallel, scope
+            )
+        except SandboxLimitExceeded:
+            # Interrupt landed after the script finished, during cleanup
+            raise CodeExecutionError("Execution stopped: resource limit exceeded") from None
+        logger.info(
+            f"Sandbox run: {run.wall_ms:.1f}ms wall, {run.cpu_ms:.1f}ms CPU, "
+            f"compile cache {'hit' if run.compile_cache_hit else 'miss'}"
+        )
+        return run
+
+    def shutdown(self) -> None:
+        """Stop accepting work and stop the watchdog (running scripts finish)."""
+        self._closed = True
+        self._wakeup.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_sync(
+        self,
+        code: str,
+        external_functions: ExternalFunctions,
+        max_parallel: int | ParallelLimit,
+        scope: PromptScope | None,
+    ) -> SandboxRun:
+        watch = _Watch(threading.get_ident(), self.limits)
+        if watch.cpu_clock is None and watch.limits.cpu_seconds is not None:
+            _warn_no_cpu_clock()
+        self._register(watch)
+        try:
+            with scope.sandbox_thread() if scope is not None else nullcontext():
+                return run_code_timed(
+                    code,
+                    external_functions,
+                    max_parallel,
+                    worker_context=partial(self._worker_thread, watch, scope),
+                )
+        except SandboxLimitExceeded:
+            raise CodeExecutionError(
+                f"Execution stopped: {watch.exceeded or 'resource limit exceeded'}"
+            ) from None
+        finally:
+            self._unregister(watch)
+
+    @contextmanager
+    def _worker_thread(self, watch: _Watch, scope: PromptScope | None) -> Iterator[None]:
+        """Put a parallel() worker under the run's limits and cancellation."""
+        with self._lock:
+            if watch.exceeded is not None:
+                raise SandboxLimitExceeded
+            watch.add_thread()
+        try:
+            with scope.sandbox_thread() if scope is not None else nullcontext():
+                yield
+        finally:
+            with self._lock:
+                watch.remove_thread()
+                if watch.exceeded is not None:
+                    # Clear an interrupt that was scheduled but not yet delivered
+                    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                        ctypes.c_ulong(threading.get_ident()), None
+                    )
+
+    def _register(self, watch: _Watch) -> None:
+        with self._lock:
+            self._watches[watch.thread_id] = watch
+            if self._watchdog is None or not self._watchdog.is_alive():
+                self._watchdog = threading.Thread(
+                    target=self._watch_loop, name="punie-sandbox-watchdog", daemon=True
+                )
+                self._watchdog.start()
+        self._wakeup.set()
+
+    def _unregister(self, watch: _Watch) -> None:
+        with self._lock:
+            self._watches.pop(watch.thread_id, None)
+            if watch.exceeded is not None:
+                # Clear an interrupt that was scheduled but not yet delivered
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                    ctypes.c_ulong(watch.thread_id), None
+                )
+
+    def _watch_loop(self) -> None:
+        while not self._closed:
+            with self._lock:
+                watches = list(self._watches.values())
+            if not watches:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            for watch in watches:
+                with self._lock:
+                    if watch.exceeded is not None:
+                        continue
+                    if self._watches.get(watch.thread_id) is not watch:
+                        continue  # Finished meanwhile
+                    reason = watch.check()
+                    if reason is None:
+                        continue
+                    watch.exceeded = reason
+                    logger.warning(
+                        f"Sandbox {reason}, interrupting thread {watch.thread_id} "
+                        f"and {len(watch.threads) - 1} parallel() workers"
+                    )
+                    for thread_id in watch.threads:
+                        ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                            ctypes.c_ulong(thread_id),
+                            ctypes.py_object(SandboxLimitExceeded),
+                        )
+            time.sleep(self._poll_interval)
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """Return the process-wide sandbox pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = SandboxPool()
+    return _pool
+
+
+def set_sandbox_pool(pool: SandboxPool | None) -> SandboxPool | None:
+    """Replace the process-wide pool (e.g. to change limits), returning the old one.
+
+    The caller is responsible for shutting down the previous pool.
+    """
+    global _pool
+    previous, _pool = _pool, pool
+    return previous
@@ -0,0 +1,380 @@
+"""Scheduling of model requests to a single local model server.
+
+In `punie serve`, every session sends its model requests straight to the
+one local model server. Concurrent prompts compete in no particular order,
+and batch work or a long Code Mode loop can starve the IDE user typing a
+question.
+
+ModelScheduler hands out a fixed number of generation slots
+(max_concurrent, by default 1, which suits a single GPU):
+
+- Priority classes: waiting interactive requests always go before batch
+  requests (evals, background work).
+- Per-session fairness: within a class, sessions take turns round-robin,
+  so a session issuing many requests gets one slot per round, like
+  everyone else.
+- Queue-wait metrics per class (SchedulerStats).
+
+ScheduledModel wraps the Pydantic AI Model used by create_pydantic_agent
+and holds a slot for each request, including for the whole of a streamed
+response. Model.request() does not see the run's deps, so PunieAgent.prompt
+declares which session and priority its requests belong to with
+scheduled_as(). Requests made outside scheduled_as() are treated as
+interactive requests of an anonymous session. Code that times requests
+can collect their queue waits with recording_slot_waits().
+
+The scheduler only orders the requests of the process it runs in.
+Requests that another process sends to the same model server (a separate
+eval run, a second punie serve) are out of its reach; batch work that
+should yield to IDE users has to go through the serving process, e.g. as
+prompts whose request carries a "batch" priority.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 1
+
+# Environment override for the process-wide scheduler's max_concurrent
+MAX_CONCURRENT_ENV = "PUNIE_MAX_GENERATIONS"
+
+# Session id of requests made outside scheduled_as()
+ANONYMOUS_SESSION = "-"
+
+# Session id of PunieAgent's prompt prefix prewarms
+PREWARM_SESSION = "prewarm"
+
+# Process-wide scheduler used by create_pydantic_agent
+_scheduler: ModelScheduler | None = None
+
+
+class Priority(IntEnum):
+    """Scheduling class of a model request (lower is served first)."""
+
+    INTERACTIVE = 0
+    """A person is waiting: IDE and `punie ask` prompts."""
+
+    BATCH = 1
+    """Evals, benchmarks and other background work."""
+
+    @classmethod
+    def parse(cls, value: object) -> Priority:
+        """Priority from a name like "batch" (anything unknown is interactive).
+
+        >>> Priority.parse("batch"), Priority.parse(None)
+        (<Priority.BATCH: 1>, <Priority.INTERACTIVE: 0>)
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str) and value.upper() in cls.__members__:
+            return cls[value.upper()]
+        return cls.INTERACTIVE
+
+
+@dataclass(frozen=True)
+class ScheduleContext:
+    """Who the model requests of the current task are made for."""
+
+    session_id: str = ANONYMOUS_SESSION
+    """Session whose turn the requests take."""
+
+    priority: Priority = Priority.INTERACTIVE
+    """Scheduling class of the requests."""
+
+
+# Context of requests made outside scheduled_as()
+_UNSCHEDULED = ScheduleContext()
+
+
+_context: ContextVar[ScheduleContext] = ContextVar(
+    "punie_schedule", default=_UNSCHEDULED
+)
+
+# Queue waits (seconds) of scheduled requests, while recording_slot_waits() is active
+_slot_waits: ContextVar[list[float] | None] = ContextVar("punie_slot_waits", default=None)
+
+
+@contextmanager
+def scheduled_as(
+    session_id: str, priority: Priority = Priority.INTERACTIVE
+) -> Iterator[ScheduleContext]:
+    """Schedule model requests made in this block (and tasks it starts) for a session."""
+    token = _context.set(ScheduleContext(session_id=session_id, priority=priority))
+    try:
+        yield _context.get()
+    finally:
+        _context.reset(token)
+
+
+@contextmanager
+def recording_slot_waits() -> Iterator[list[float]]:
+    """Collect the queue wait, in seconds, of each scheduled request made in this block.
+
+    Lets callers that time a request tell the scheduler's queue apart from
+    the model server's work.
+
+    >>> async def generate(scheduler):
+    ...     async with scheduler.slot("s-1"):
+    ...         pass
+    >>> with recording_slot_waits() as waits:
+    ...     asyncio.run(generate(ModelScheduler()))
+    >>> waits
+    [0.0]
+    """
+    waits: list[float] = []
+    token = _slot_waits.set(waits)
+    try:
+        yield waits
+    finally:
+        _slot_waits.reset(token)
+
+
+def _record_wait(waited: float) -> None:
+    waits = _slot_waits.get()
+    if waits is not None:
+        waits.append(waited)
+
+
+@dataclass(frozen=True)
+class PriorityStats:
+    """Queue counters of one priority class."""
+
+    granted: int = 0
+    """Requests that got a slot."""
+
+    waiting: int = 0
+    """Requests currently queued."""
+
+    running: int = 0
+    """Requests currently holding a slot."""
+
+    wait_seconds: float = 0.0
+    """Total time granted requests spent queued."""
+
+    max_wait_seconds: float = 0.0
+    """Longest time a granted request spent queued."""
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        """Average queue wait of granted requests."""
+        return self.wait_seconds / self.granted if self.granted else 0.0
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    """Snapshot of ModelScheduler counters."""
+
+    max_concurrent: int
+    """Generation slots."""
+
+    running: int
+    """Slots currently in use."""
+
+    by_priority: dict[Priority, PriorityStats] = field(default_factory=dict)
+    """Queue counters per priority class."""
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future[None]
+    priority: Priority
+    queued_at: float
+
+
+class ModelScheduler:
+    """Grants at most max_concurrent model requests at a time, fairly.
+
+    >>> scheduler = ModelScheduler(max_concurrent=2)
+    >>> async def generate():
+    ...     async with scheduler.slot("s-1"):
+    ...         return scheduler.stats().running
+    >>> asyncio.run(generate())
+    1
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self._running = 0
+        self._running_by_priority = dict.fromkeys(Priority, 0)
+        # Per class: session_id → its queued requests; dict order is the rotation
+        self._queues: dict[Priority, dict[str, deque[_Waiter]]] = {
+            p: {} for p in Priority
+        }
+        self._granted = dict.fromkeys(Priority, 0)
+        self._wait_seconds = dict.fromkeys(Priority, 0.0)
+        self._max_wait_seconds = dict.fromkeys(Priority, 0.0)
+
+    @asynccontextmanager
+    async def slot(
+        self, session_id: str, priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[float]:
+        """Hold a generation slot for the block, queueing until one is free.
+
+        Yields the seconds spent waiting in the queue (also recorded for
+        recording_slot_waits()).
+        """
+        waited = await self._acquire(session_id, priority)
+        _record_wait(waited)
+        self._running_by_priority[priority] += 1
+        try:
+            yield waited
+        finally:
+            self._running_by_priority[priority] -= 1
+            self._release()
+
+    def stats(self) -> SchedulerStats:
+        """Current slot usage and per-class queue counters."""
+        return SchedulerStats(
+            max_concurrent=self.max_concurrent,
+            running=self._running,
+            by_priority={
+                p: PriorityStats(
+                    granted=self._granted[p],
+                    waiting=sum(len(q) for q in self._queues[p].values()),
+                    running=self._running_by_priority[p],
+                    wait_seconds=self._wait_seconds[p],
+                    max_wait_seconds=self._max_wait_seconds[p],
+                )
+                for p in Priority
+            },
+        )
+
+    async def _acquire(self, session_id: str, priority: Priority) -> float:
+        now = time.monotonic()
+        if self._running < self.max_concurrent and not self._has_waiters():
+            self._running += 1
+            self._record(priority, 0.0)
+            return 0.0
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority, now)
+        self._queues[priority].setdefault(session_id, deque()).append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release()  # Granted just as we were cancelled
+            else:
+                self._discard(session_id, waiter)
+            raise
+        waited = time.monotonic() - now
+        if waited > 1.0:
+            logger.info(
+                f"Model request for {session_id} ({priority.name}) queued {waited:.1f}s"
+            )
+        return waited
+
+    def _release(self) -> None:
+        self._running -= 1
+        while self._running < self.max_concurrent:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._running += 1
+            self._record(waiter.priority, time.monotonic() - waiter.queued_at)
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> _Waiter | None:
+        """Front request of the next session in the highest class with waiters."""
+        for priority in Priority:
+            sessions = self._queues[priority]
+            if not sessions:
+                continue
+            session_id = next(iter(sessions))
+            queue = sessions.pop(session_id)
+            waiter = queue.popleft()
+            if queue:
+                sessions[session_id] = queue  # Back of the rotation
+            return waiter
+        return None
+
+    def _discard(self, session_id: str, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.priority].get(session_id)
+        if queue is None:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del self._queues[waiter.priority][session_id]
+
+    def _has_waiters(self) -> bool:
+        return any(self._queues[p] for p in Priority)
+
+    def _record(self, priority: Priority, waited: float) -> None:
+        self._granted[priority] += 1
+        self._wait_seconds[priority] += waited
+        self._max_wait_seconds[priority] = max(self._max_wait_seconds[priority], waited)
+
+
+class ScheduledModel(WrapperModel):
+    """Model whose requests each wait for a ModelScheduler slot."""
+
+    def __init__(self, wrapped: Model, scheduler: ModelScheduler | None = None) -> None:
+        super().__init__(wrapped)
+        self.scheduler = scheduler or get_model_scheduler()
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        context = _context.get()
+        async with self.scheduler.slot(context.session_id, context.priority):
+            return await super().request(
+                messages, model_settings, model_request_parameters
+            )
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: Any | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        context = _context.get()
+        async with (
+            self.scheduler.slot(context.session_id, context.priority),
+            super().request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response_stream,
+        ):
+            yield response_stream
+
+
+def get_model_scheduler() -> ModelScheduler:
+    """Return the process-wide scheduler, creating it on first use.
+
+    max_concurrent comes from PUNIE_MAX_GENERATIONS when set.
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ModelScheduler(
+            int(os.environ.get(MAX_CONCURRENT_ENV, DEFAULT_MAX_CONCURRENT))
+        )
+    return _scheduler
+
+
+def set_model_scheduler(scheduler: ModelScheduler | None) -> ModelScheduler | None:
+    """Replace the process-wide scheduler (e.g. to change limits), returning the old one."""
+    global _scheduler
+    previous, _scheduler = _scheduler, scheduler
+    return previous
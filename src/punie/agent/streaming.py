@@ -0,0 +1,284 @@
+"""Token streaming support for PunieAgent.prompt().
+
+Streams model output to the client as ``agent_message_chunk`` and
+``agent_thought_chunk`` session updates while the Pydantic AI run is still in
+progress, instead of sending one message once the whole run has finished.
+
+Tokens are coalesced by ChunkCoalescer so that a fast local model does not
+produce one WebSocket frame per token.
+"""
+
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from pydantic_ai import Agent as PydanticAgent
+from pydantic_ai.messages import (
+    ModelMessage,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ThinkingPart,
+    ThinkingPartDelta,
+)
+from pydantic_ai.usage import UsageLimits
+
+from punie.acp.helpers import update_agent_message_text, update_agent_thought_text
+from punie.agent.deps import ACPDeps
+from punie.agent.prompt_cache import PrefillSample
+from punie.agent.scheduler import recording_slot_waits
+
+logger = logging.getLogger(__name__)
+
+ChunkKind = Literal["message", "thought"]
+
+# Flush thresholds: ~a short sentence, or 50ms worth of tokens
+DEFAULT_MIN_CHUNK_CHARS = 64
+DEFAULT_MAX_CHUNK_DELAY = 0.05
+
+
+class ChunkCoalescer:
+    """Buffer streamed text and flush it as batched session updates.
+
+    Mutable by design: holds the pending buffer and timing counters for a
+    single prompt. A flush happens when the buffer reaches ``min_chars``,
+    when ``max_delay`` seconds have passed since the last flush, when the
+    chunk kind switches (message ↔ thought), or on an explicit flush().
+
+    >>> import asyncio
+    >>> sent = []
+    >>> async def send(kind, text):
+    ...     sent.append((kind, text))
+    >>> coalescer = ChunkCoalescer(send, min_chars=5, max_delay=60.0)
+    >>> async def demo():
+    ...     await coalescer.push("message", "Hel")
+    ...     await coalescer.push("message", "lo!")
+    ...     await coalescer.push("thought", "hm")
+    ...     await coalescer.flush()
+    >>> asyncio.run(demo())
+    >>> sent
+    [('message', 'Hello!'), ('thought', 'hm')]
+    >>> coalescer.chunks_sent, coalescer.chars_sent
+    (2, 8)
+    """
+
+    def __init__(
+        self,
+        send: Callable[[ChunkKind, str], Awaitable[None]],
+        min_chars: int = DEFAULT_MIN_CHUNK_CHARS,
+        max_delay: float = DEFAULT_MAX_CHUNK_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._send = send
+        self._min_chars = min_chars
+        self._max_delay = max_delay
+        self._clock = clock
+        self._kind: ChunkKind | None = None
+        self._buffer: list[str] = []
+        self._buffered_chars = 0
+        self._started_at = clock()
+        self._last_flush = self._started_at
+        self.first_token_at: float | None = None
+        self.chunks_sent = 0
+        self.chars_sent = 0
+        self.message_chars_sent = 0
+
+    @property
+    def time_to_first_token_ms(self) -> float | None:
+        """Milliseconds from construction to the first streamed token."""
+        if self.first_token_at is None:
+            return None
+        return (self.first_token_at - self._started_at) * 1000
+
+    async def push(self, kind: ChunkKind, text: str) -> None:
+        """Add streamed text, flushing if a threshold is reached."""
+        if not text:
+            return
+        if self.first_token_at is None:
+            self.first_token_at = self._clock()
+        if self._kind is not None and kind != self._kind:
+            await self.flush()
+        self._kind = kind
+        self._buffer.append(text)
+        self._buffered_chars += len(text)
+        if (
+            self._buffered_chars >= self._min_chars
+            or self._clock() - self._last_flush >= self._max_delay
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Send any buffered text as a single chunk."""
+        if not self._buffer or self._kind is None:
+            return
+        text = "".join(self._buffer)
+        kind = self._kind
+        self._buffer.clear()
+        self._buffered_chars = 0
+        self._last_flush = self._clock()
+        await self._send(kind, text)
+        self.chunks_sent += 1
+        self.chars_sent += len(text)
+        if kind == "message":
+            self.message_chars_sent += len(text)
+
+
+@dataclass(frozen=True)
+class StreamedRun:
+    """Outcome of a streamed agent run."""
+
+    output: str
+    """Final agent output (already delivered to the client as chunks)."""
+
+    usage: Any
+    """RunUsage from the completed run."""
+
+    time_to_first_token_ms: float | None
+    """Latency until the first token arrived, or None if nothing streamed."""
+
+    chunks_sent: int
+    """Number of coalesced session updates sent."""
+
+    message_chars_sent: int
+    """Characters delivered as agent_message_chunk updates."""
+
+    new_messages: list[ModelMessage] = field(default_factory=list)
+    """Messages produced by this run, for the session history."""
+
+    prefill: list[PrefillSample] = field(default_factory=list)
+    """Prefill time and cached prompt tokens of each model request."""
+
+
+def create_session_coalescer(
+    deps: ACPDeps,
+    min_chars: int = DEFAULT_MIN_CHUNK_CHARS,
+    max_delay: float = DEFAULT_MAX_CHUNK_DELAY,
+) -> ChunkCoalescer:
+    """Create a ChunkCoalescer that sends chunks as ACP session updates.
+
+    Args:
+        deps: ACPDeps carrying the client connection and session ID
+        min_chars: Flush threshold in characters
+        max_delay: Flush threshold in seconds since the last flush
+
+    Returns:
+        ChunkCoalescer emitting agent_message_chunk/agent_thought_chunk updates
+    """
+    conn = deps.client_conn
+    session_id = deps.session_id
+
+    async def send(kind: ChunkKind, text: str) -> None:
+        update = (
+            update_agent_message_text(text)
+            if kind == "message"
+            else update_agent_thought_text(text)
+        )
+        await conn.session_update(session_id, update)
+
+    return ChunkCoalescer(send, min_chars=min_chars, max_delay=max_delay)
+
+
+async def run_streaming(
+    pydantic_agent: PydanticAgent[ACPDeps, str],
+    prompt_text: str,
+    deps: ACPDeps,
+    usage_limits: UsageLimits | None = None,
+    coalescer: ChunkCoalescer | None = None,
+    message_history: Sequence[ModelMessage] | None = None,
+) -> StreamedRun:
+    """Run a Pydantic AI agent, streaming tokens to the ACP client.
+
+    Iterates the agent graph with ``Agent.iter()``; every model request node is
+    streamed and its text/thinking deltas are forwarded through a
+    ChunkCoalescer as ``agent_message_chunk``/``agent_thought_chunk`` updates.
+    Buffered text is flushed before tool calls run so the IDE shows the
+    model's explanation ahead of the tool activity. The time each request
+    takes to produce its first event is recorded as its prefill time; time
+    spent queued for a ModelScheduler slot is recorded separately.
+
+    Args:
+        pydantic_agent: Configured Pydantic AI agent
+        prompt_text: User prompt
+        deps: ACPDeps carrying the client connection and session ID
+        usage_limits: Optional usage limits for the run
+        coalescer: Optional coalescer (default: create_session_coalescer(deps)).
+                   Pass one in to inspect what was streamed if the run fails.
+        message_history: Earlier messages of the session to continue from
+
+    Returns:
+        StreamedRun with the final output and streaming statistics
+
+    Raises:
+        Whatever the underlying run raises (UsageLimitExceeded, model errors);
+        text streamed before the failure has already been delivered.
+    """
+    if coalescer is None:
+        coalescer = create_session_coalescer(deps)
+    prefill: list[PrefillSample] = []
+
+    async with pydantic_agent.iter(
+        prompt_text,
+        deps=deps,
+        usage_limits=usage_limits,
+        message_history=message_history,
+    ) as run:
+        async for node in run:
+            if not PydanticAgent.is_model_request_node(node):
+                continue
+            started = time.perf_counter()
+            prefill_ms: float | None = None
+            with recording_slot_waits() as waits:
+                async with node.stream(run.ctx) as request_stream:
+                    async for event in request_stream:
+                        if prefill_ms is None:
+                            # Queueing for a scheduler slot is not prefill
+                            elapsed = time.perf_counter() - started - sum(waits)
+                            prefill_ms = elapsed * 1000
+                        if isinstance(event, PartStartEvent):
+                            if isinstance(event.part, TextPart):
+                                await coalescer.push("message", event.part.content)
+                            elif isinstance(event.part, ThinkingPart):
+                                await coalescer.push("thought", event.part.content)
+                        elif isinstance(event, PartDeltaEvent):
+                            if isinstance(event.delta, TextPartDelta):
+                                await coalescer.push("message", event.delta.content_delta)
+                            elif isinstance(event.delta, ThinkingPartDelta):
+                                await coalescer.push(
+                                    "thought", event.delta.content_delta or ""
+                                )
+                    usage = request_stream.response.usage
+            queued_ms = sum(waits) * 1000
+            prefill.append(
+                PrefillSample(
+                    input_tokens=usage.input_tokens,
+                    cached_tokens=usage.cache_read_tokens,
+                    prefill_ms=prefill_ms,
+                    queued_ms=queued_ms,
+                )
+            )
+            # Flush at the end of each model response (before any tool calls)
+            await coalescer.flush()
+
+        result = run.result
+
+    if result is None:
+        raise RuntimeError("Agent run finished without a result")
+
+    ttft = coalescer.time_to_first_token_ms
+    if ttft is not None:
+        logger.info(f"Time to first token: {ttft:.0f}ms")
+    logger.info(
+        f"Streamed {coalescer.chars_sent} chars in {coalescer.chunks_sent} chunks"
+    )
+    return StreamedRun(
+        output=result.output,
+        usage=result.usage(),
+        time_to_first_token_ms=ttft,
+        chunks_sent=coalescer.chunks_sent,
+        message_chars_sent=coalescer.message_chars_sent,
+        new_messages=result.new_messages(),
+        prefill=prefill,
+    )
@@ -94,7 +94,7 @@ def generate_stubs() -> str:
 
     Example:
         >>> stubs = generate_stubs()
-        >>> "def read_file(path: str) -> str:" in stubs
+        >>> "def read_file(path: str, line: int | None = None, limit: int | None = None) -> str:" in stubs
         True
         >>> "RunContext" in stubs
         False
@@ -137,13 +137,19 @@ def generate_stubs() -> str:
     - success: True if no violations found
     - violation_count: Total number of violations
     - fixable_count: Number of auto-fixable violations
-    - violations: List of RuffViolation objects with file, line, column, code, message, fixable
+    - violations: Sample of RuffViolation objects (file, line, column, code, message,
+      fixable), at most 10 per rule and per file and 50 in total
+    - rule_counts: Violations per rule code, most frequent first (covers all violations)
+    - file_counts: Violations per file for the 20 most affected files
+    - file_count: Number of files with violations
+    - truncated: True if violations does not list every violation
 
     Example:
         result = ruff_check("src/")
         if not result.success:
-            fixable = [v for v in result.violations if v.fixable]
-            print(f"Found {len(fixable)} fixable violations")
+            print(f"{result.violation_count} violations in {result.file_count} files")
+            for code, count in result.rule_counts.items():
+                print(f"{code}: {count}")
     \"\"\"
     ...""")
 
@@ -518,6 +524,56 @@ def generate_stubs() -> str:
     \"\"\"
     ...""")
 
+    stubs.append("""def validate_all(
+    file_path: str, checks: list[str] | None = None
+) -> dict[str, DomainValidationResult]:
+    \"\"\"Run several domain validators on a file in one pass.
+
+    Parses and walks the file once instead of once per validator. checks
+    takes validator names (e.g. "validate_component") or domain names
+    ("tdom", "svcs", "tdom-svcs"); None runs all nine validators.
+
+    Returns a dict mapping each validator name to its DomainValidationResult.
+
+    Example:
+        results = validate_all("src/views.py", ["tdom"])
+        for name, result in results.items():
+            for issue in result.issues:
+                print(f"{name} [{issue.severity}] {issue.message}")
+    \"\"\"
+    ...""")
+
+    stubs.append("""def scan_pattern(path: str, pattern: str) -> CstFindResult:
+    \"\"\"Run cst_find_pattern over every Python file in a directory or glob.
+
+    path may be a file, a directory (searched recursively) or a glob such as
+    "src/**/*.py". Files are analyzed in parallel worker processes and
+    unchanged files reuse cached results, so prefer this to looping over files.
+
+    Returns one CstFindResult; each match has a file field.
+
+    Example:
+        result = scan_pattern("src/", "call:html")
+        for match in result.matches:
+            print(f"{match.file}:{match.line} {match.code_snippet}")
+    \"\"\"
+    ...""")
+
+    stubs.append("""def scan_validate(
+    path: str, checks: list[str] | None = None
+) -> dict[str, DomainValidationResult]:
+    \"\"\"Run domain validators over every Python file in a directory or glob.
+
+    checks works as for validate_all. Returns one DomainValidationResult per
+    validator covering all files; each issue has a file field.
+
+    Example:
+        results = scan_validate("src/components", ["validate_escape_context"])
+        for issue in results["validate_escape_context"].issues:
+            print(f"{issue.file}:{issue.line} {issue.message}")
+    \"\"\"
+    ...""")
+
     stubs.append("""def git_log(path: str, count: int = 10) -> GitLogResult:
     \"\"\"Get git commit history with structured commit information.
 
@@ -537,6 +593,20 @@ def generate_stubs() -> str:
     \"\"\"
     ...""")
 
+    stubs.append("""def parallel(*calls) -> list:
+    \"\"\"Run independent function calls concurrently; results come back in order.
+
+    Each call is a (function, *args) tuple or a zero-argument lambda. Use it
+    when calls don't depend on each other's results, e.g. checking several files.
+
+    Example:
+        files = ["src/a.py", "src/b.py"]
+        results = parallel(*[(typecheck, f) for f in files], *[(ruff_check, f) for f in files])
+        for f, result in zip(files + files, results):
+            print(f, type(result).__name__, result.success)
+    \"\"\"
+    ...""")
+
     return "\n".join(stubs)
 
 
@@ -563,6 +633,8 @@ Constraints:
 - Use only the external functions provided above
 - Print results to show output to the user
 - Handle errors with try/except
+- Use parallel() for independent calls instead of calling them one by one
+- Use scan_pattern()/scan_validate() on a directory instead of looping over files
 
 Example multi-step query:
 User: "Find all Python files and count imports"
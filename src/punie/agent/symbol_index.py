@@ -0,0 +1,361 @@
+"""Persistent workspace symbol index for instant workspace_symbols.
+
+SymbolIndex keeps classes, functions, methods and module-level names of a
+workspace in a SQLite database on disk, so a query is answered in
+milliseconds:
+
+- symbols are extracted with the stdlib ast parser (LibCST's lossless tree
+  is not needed here)
+- the first build runs on a background thread, started with the session
+  (start_symbol_index) or by the first query; until it finishes, the
+  toolset asks ty server's workspace/symbol instead
+- before a query, at most every refresh_interval seconds, files are stat'ed
+  and only new or changed ones are re-parsed; deleted files are dropped
+- lookup ranks exact, prefix and substring matches (case-insensitive), then
+  falls back to fuzzy subsequence matching ("gsi" finds "get_symbol_index")
+
+The toolset also asks ty server when the index has no match.
+
+Example:
+    index = get_symbol_index(Path("/path/to/project"))
+    result = index.search("LSPCli")
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from punie.agent.typed_tools import WorkspaceSymbol, WorkspaceSymbolsResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path.home() / ".punie" / "cache"
+DEFAULT_MAX_RESULTS = 100
+DEFAULT_REFRESH_INTERVAL = 2.0  # Seconds between stat sweeps of the workspace
+
+# Files that mark a session's cwd as a project worth indexing at session start
+PROJECT_MARKERS = ("pyproject.toml", "setup.py", "setup.cfg", ".git")
+
+# Bump when the schema or extraction rules change; old databases are rebuilt
+SCHEMA_VERSION = 1
+
+# LSP SymbolKind values
+KIND_CLASS = 5
+KIND_METHOD = 6
+KIND_FUNCTION = 12
+KIND_VARIABLE = 13
+KIND_CONSTANT = 14
+
+# One index per resolved workspace root
+_indexes: dict[Path, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL, lower TEXT NOT NULL, kind INTEGER NOT NULL,
+    path TEXT NOT NULL, line INTEGER NOT NULL, container TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_lower ON symbols (lower);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+"""
+
+Symbol = tuple[str, int, int, str | None]
+"""(name, kind, line, container) as extracted from one file."""
+
+
+def extract_symbols(source: str) -> list[Symbol]:
+    """Extract the symbols workspace_symbols reports from Python source.
+
+    >>> extract_symbols("MAX = 3\\nclass A:\\n    def run(self): ...\\ndef main(): ...\\n")
+    [('MAX', 14, 1, None), ('A', 5, 2, None), ('run', 6, 3, 'A'), ('main', 12, 4, None)]
+
+    Raises:
+        SyntaxError: If the source cannot be parsed
+    """
+    symbols: list[Symbol] = []
+
+    def visit(body: list[ast.stmt], container: str | None, in_class: bool) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                symbols.append((node.name, KIND_CLASS, node.lineno, container))
+                visit(node.body, node.name, True)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = KIND_METHOD if in_class else KIND_FUNCTION
+                symbols.append((node.name, kind, node.lineno, container))
+            elif container is None and isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        kind = KIND_CONSTANT if target.id.isupper() else KIND_VARIABLE
+                        symbols.append((target.id, kind, node.lineno, None))
+
+    visit(ast.parse(source).body, None, False)
+    return symbols
+
+
+def _is_subsequence(query: str, name: str) -> bool:
+    """True if every character of query appears in name, in order."""
+    chars = iter(name)
+    return all(char in chars for char in query)
+
+
+def default_index_path(root: Path) -> Path:
+    """Database location for a workspace root under ~/.punie/cache."""
+    digest = hashlib.blake2b(str(root).encode(), digest_size=8).hexdigest()
+    return DEFAULT_INDEX_DIR / f"symbols-{root.name}-{digest}.sqlite3"
+
+
+class SymbolIndex:
+    """SQLite-backed symbol index for one workspace root.
+
+    Mutable by design: the database is updated as files change. Thread safe;
+    the sandbox queries it from worker threads and direct tools from the
+    event loop's executor.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        path: Path | None = None,
+        *,
+        persist: bool = True,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.root = Path(root).resolve()
+        self.path = (path or default_index_path(self.root)) if persist else None
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._last_refresh: float | None = None
+        self._lock = threading.Lock()
+        self._built = threading.Event()
+        self._build_thread: threading.Thread | None = None
+        self._build_lock = threading.Lock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(self.path) if self.path is not None else ":memory:", check_same_thread=False
+        )
+        self._db.create_function("fuzzy", 2, _is_subsequence, deterministic=True)
+        self._init_schema()
+
+    @property
+    def ready(self) -> bool:
+        """Whether a full sweep has finished, so queries no longer build the index."""
+        return self._built.is_set()
+
+    def start_build(self) -> None:
+        """Build the index on a background thread, unless built or building."""
+        with self._build_lock:
+            if self.ready or self._build_thread is not None:
+                return
+            self._build_thread = threading.Thread(
+                target=self._build, name=f"punie-symbols-{self.root.name}", daemon=True
+            )
+            self._build_thread.start()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait for the index to be built, returning whether it is."""
+        return self._built.wait(timeout)
+
+    def refresh(self, force: bool = False) -> int:
+        """Re-index new and changed files and drop deleted ones.
+
+        Skipped if the last sweep was less than refresh_interval ago,
+        unless force is True.
+
+        Returns:
+            Number of files added, re-indexed or removed
+        """
+        from punie.cst.scan import expand_paths
+
+        now = self._clock()
+        if (
+            not force
+            and self._last_refresh is not None
+            and now - self._last_refresh < self.refresh_interval
+        ):
+            return 0
+        with self._lock:
+            known = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in self._db.execute(
+                    "SELECT path, mtime_ns, size FROM files"
+                )
+            }
+            seen: set[str] = set()
+            changed = 0
+            for path in expand_paths(str(self.root)):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                if known.get(path) != (st.st_mtime_ns, st.st_size):
+                    self._index_file(path, st.st_mtime_ns, st.st_size)
+                    changed += 1
+            for path in known.keys() - seen:
+                self._db.execute("DELETE FROM symbols WHERE path = ?", (path,))
+                self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+                changed += 1
+            self._db.commit()
+            self._last_refresh = now
+        self._built.set()
+        if changed:
+            logger.info(f"Symbol index for {self.root}: {changed} file(s) updated")
+        return changed
+
+    def search(self, query: str, limit: int = DEFAULT_MAX_RESULTS) -> WorkspaceSymbolsResult:
+        """Find symbols matching query, refreshing the index first if due.
+
+        On an index that is not built yet, this builds it first; callers
+        that cannot wait check ready and use start_build() instead.
+
+        Matches are case-insensitive and ranked exact, prefix, substring;
+        if none of those match, fuzzy subsequence matches are returned.
+
+        Returns:
+            WorkspaceSymbolsResult shaped like the LSP-backed one
+            (success=False when nothing matched)
+        """
+        self.refresh()
+        lowered = query.lower()
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT name, kind, path, line, container FROM symbols
+                WHERE instr(lower, :q) > 0
+                ORDER BY CASE WHEN lower = :q THEN 0 WHEN substr(lower, 1, length(:q)) = :q
+                         THEN 1 ELSE 2 END, length(name), name, path, line
+                LIMIT :limit
+                """,
+                {"q": lowered, "limit": limit},
+            ).fetchall()
+            if not rows:
+                rows = self._db.execute(
+                    """
+                    SELECT name, kind, path, line, container FROM symbols
+                    WHERE fuzzy(:q, lower)
+                    ORDER BY length(name), name, path, line
+                    LIMIT :limit
+                    """,
+                    {"q": lowered, "limit": limit},
+                ).fetchall()
+        symbols = [
+            WorkspaceSymbol(name=name, kind=kind, file=path, line=line, container_name=container)
+            for name, kind, path, line, container in rows
+        ]
+        return WorkspaceSymbolsResult(
+            success=bool(symbols), query=query, symbols=symbols, symbol_count=len(symbols)
+        )
+
+    def close(self) -> None:
+        """Close the database connection (after a running build finishes)."""
+        thread = self._build_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._db.close()
+
+    def _build(self) -> None:
+        try:
+            self.refresh(force=True)
+        except Exception as exc:
+            logger.warning(f"Building symbol index for {self.root} failed: {exc}")
+            with self._build_lock:
+                self._build_thread = None  # Let a later query retry
+
+    def _index_file(self, path: str, mtime_ns: int, size: int) -> None:
+        try:
+            with open(path, "rb") as f:
+                symbols = extract_symbols(f.read().decode("utf-8", "replace"))
+        except (OSError, SyntaxError, ValueError):
+            # Recorded with no symbols; retried once the file changes
+            symbols = []
+        self._db.execute("DELETE FROM symbols WHERE path = ?", (path,))
+        self._db.executemany(
+            "INSERT INTO symbols (name, lower, kind, path, line, container) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (name, name.lower(), kind, path, line, container)
+                for name, kind, line, container in symbols
+            ],
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+            (path, mtime_ns, size),
+        )
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            row = None
+            try:
+                row = self._db.execute(
+                    "SELECT value FROM meta WHERE key = 'schema_version'"
+                ).fetchone()
+            except sqlite3.OperationalError:
+                pass  # New database
+            if row is not None and row[0] != str(SCHEMA_VERSION):
+                self._db.executescript(
+                    "DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS files;"
+                    " DROP TABLE IF EXISTS meta;"
+                )
+            self._db.executescript(_SCHEMA)
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+            self._db.commit()
+
+
+def get_symbol_index(root: Path | str | None = None) -> SymbolIndex:
+    """Return the persistent index for a workspace root, opening it on first use.
+
+    Args:
+        root: Workspace root (default: the current working directory)
+    """
+    key = Path(root if root is not None else Path.cwd()).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SymbolIndex(key)
+        return index
+
+
+def start_symbol_index(root: Path | str) -> SymbolIndex | None:
+    """Start building the index for a session's workspace in the background.
+
+    Only roots that look like a project (see PROJECT_MARKERS) are indexed,
+    so a session opened in e.g. a home or temp directory does not walk it.
+
+    Returns:
+        The index being built, or None if root was skipped
+    """
+    path = Path(root)
+    if not any((path / marker).exists() for marker in PROJECT_MARKERS):
+        return None
+    index = get_symbol_index(path)
+    index.start_build()
+    return index
+
+
+def set_symbol_index(root: Path | str, index: SymbolIndex | None) -> SymbolIndex | None:
+    """Replace (or with None, forget) the index for a root, returning the old one."""
+    key = Path(root).resolve()
+    with _indexes_lock:
+        previous = _indexes.pop(key, None)
+        if index is not None:
+            _indexes[key] = index
+        return previous
@@ -1,15 +1,20 @@
 """Pydantic AI toolset that bridges to ACP Client Protocol.
 
 Exposes ACP Client methods as Pydantic AI tools: read_file, write_file (with
-permission), run_command (with permission), and terminal lifecycle tools.
+permission), run_command (with permission), read_more (pages of outputs too
+large to return at once), and terminal lifecycle tools.
 
 Provides three toolset factories:
-- create_toolset() — All 7 static tools (backward compat, Tier 3 fallback)
+- create_toolset() — All 9 static tools (backward compat, Tier 3 fallback)
 - create_toolset_from_capabilities() — Build from ClientCapabilities (Tier 2 fallback)
 - create_toolset_from_catalog() — Build from ToolCatalog (Tier 1, dynamic discovery)
 """
 
+import asyncio
+import json
 import logging
+from collections.abc import Awaitable, Callable
+from pathlib import Path
 from typing import Any
 
 from pydantic_ai import FunctionToolset, ModelRetry, RunContext
@@ -22,7 +27,9 @@ from punie.agent.discovery import ToolCatalog, ToolDescriptor
 logger = logging.getLogger(__name__)
 
 
-async def read_file(ctx: RunContext[ACPDeps], path: str) -> str:
+async def read_file(
+    ctx: RunContext[ACPDeps], path: str, line: int | None = None, limit: int | None = None
+) -> str:
     """Read contents of a text file from the IDE workspace.
 
     Reports tool call lifecycle to IDE via session_update:
@@ -33,17 +40,24 @@ async def read_file(ctx: RunContext[ACPDeps], path: str) -> str:
     Args:
         ctx: Run context with ACPDeps
         path: Absolute or workspace-relative file path
+        line: First line to read (1-based; default: start of file)
+        limit: Number of lines to read (default: to the end of the file)
 
     Returns:
-        File contents as string
+        File contents as string (the first page, with a read_more hint, if
+        the file exceeds the session's read_file budget)
     """
-    logger.info(f"🔧 TOOL: read_file(path={path})")
+    logger.info(f"🔧 TOOL: read_file(path={path}, line={line}, limit={limit})")
 
     # Start tracking this tool call
     tool_call_id = f"read_{path}"
+    title = f"Reading {path}"
+    if line is not None or limit is not None:
+        first = line or 1
+        title += f" (lines {first}-{first + limit - 1})" if limit else f" (from line {first})"
     start = ctx.deps.tracker.start(
         tool_call_id,
-        title=f"Reading {path}",
+        title=title,
         kind="read",
         locations=[ToolCallLocation(path=path)],
     )
@@ -55,18 +69,21 @@ async def read_file(ctx: RunContext[ACPDeps], path: str) -> str:
         response = await ctx.deps.client_conn.read_text_file(
             session_id=ctx.deps.session_id,
             path=path,
+            line=line,
+            limit=limit,
         )
         logger.info(f"✓ Read {len(response.content)} chars from {path}")
+        content = _page_output(ctx, "read_file", response.content)
 
         # Report completion
         progress = ctx.deps.tracker.progress(
             tool_call_id,
             status="completed",
-            content=[tool_content(text_block(response.content))],
+            content=[tool_content(text_block(content))],
         )
         await ctx.deps.client_conn.session_update(ctx.deps.session_id, progress)
 
-        return response.content
+        return content
     except Exception as exc:
         logger.error(f"✗ Failed to read {path}: {exc}")
         raise ModelRetry(f"Failed to read {path}: {exc}") from exc
@@ -117,6 +134,7 @@ async def write_file(ctx: RunContext[ACPDeps], path: str, content: str) -> str:
         await ctx.deps.client_conn.write_text_file(
             content=content, path=path, session_id=ctx.deps.session_id
         )
+        _invalidate_results(ctx, path)
 
         # Report completion
         progress = ctx.deps.tracker.progress(
@@ -213,7 +231,7 @@ async def run_command(
         )
         await ctx.deps.client_conn.session_update(ctx.deps.session_id, progress)
 
-        return output.output
+        return _page_output(ctx, "run_command", output.output)
     except Exception as exc:
         raise ModelRetry(f"Failed to run command {command}: {exc}") from exc
     finally:
@@ -247,11 +265,8 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
         print(f"Found {total} imports")
         '''
     """
-    from punie.agent.monty_runner import (
-        CodeExecutionError,
-        ExternalFunctions,
-        run_code,
-    )
+    from punie.agent.monty_runner import CodeExecutionError, ExternalFunctions
+    from punie.agent.sandbox_pool import get_sandbox_pool
 
     logger.info(f"🔧 TOOL: execute_code({len(code)} chars)")
     tool_call_id = "execute_code"
@@ -268,29 +283,49 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
         # functions need to call async ACP tools. We use run_coroutine_threadsafe
         # to bridge from the sync sandbox back to the async event loop.
         import asyncio
+        import concurrent.futures
 
         loop = asyncio.get_running_loop()
-
-        def sync_read_file(path: str) -> str:
+        scope = ctx.deps.cancel_scope
+
+        def _call_async(coro):
+            """Run a coroutine on the event loop and wait for its result.
+
+            The future is registered with the prompt's cancel scope so that
+            cancel() abandons in-flight bridge calls instead of waiting them out.
+            """
+            if scope is not None and scope.cancelled:
+                coro.close()
+                scope.check()
+            future = asyncio.run_coroutine_threadsafe(coro, loop)
+            if scope is None:
+                return future.result(timeout=30)
+            scope.track_future(future)
+            try:
+                return future.result(timeout=30)
+            except concurrent.futures.CancelledError:
+                scope.check()
+                raise
+
+        def sync_read_file(
+            path: str, line: int | None = None, limit: int | None = None
+        ) -> str:
             """Bridge from sync sandbox to async read_text_file ACP tool."""
-            future = asyncio.run_coroutine_threadsafe(
+            response = _call_async(
                 ctx.deps.client_conn.read_text_file(
-                    session_id=ctx.deps.session_id, path=path
-                ),
-                loop,
+                    session_id=ctx.deps.session_id, path=path, line=line, limit=limit
+                )
             )
-            response = future.result(timeout=30)
             return response.content
 
         def sync_write_file(path: str, content: str) -> str:
             """Bridge from sync sandbox to async write_text_file ACP tool."""
-            future = asyncio.run_coroutine_threadsafe(
+            _call_async(
                 ctx.deps.client_conn.write_text_file(
                     session_id=ctx.deps.session_id, path=path, content=content
-                ),
-                loop,
+                )
             )
-            future.result(timeout=30)
+            _invalidate_results(ctx, path)
             return "success"  # write_text_file returns None, return success marker
 
         def sync_run_command(
@@ -316,8 +351,7 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
                 )
                 return output_resp.output
 
-            future = asyncio.run_coroutine_threadsafe(_run_terminal(), loop)
-            return future.result(timeout=30)
+            return _call_async(_run_terminal())
 
         def sync_typecheck(path: str):
             """Bridge from sync sandbox to async ty type checker via terminal."""
@@ -343,8 +377,9 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
                 # Parse JSON output into TypeCheckResult
                 return parse_ty_output(output_resp.output)
 
-            future = asyncio.run_coroutine_threadsafe(_run_typecheck(), loop)
-            return future.result(timeout=30)
+            return _call_async(
+                _cached_result(ctx, "typecheck", (path,), path, _run_typecheck)
+            )
 
         def sync_ruff_check(path: str):
             """Bridge from sync sandbox to async ruff linter via terminal."""
@@ -354,7 +389,7 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
             async def _run_ruff() -> RuffResult:
                 term = await ctx.deps.client_conn.create_terminal(
                     command="ruff",
-                    args=["check", path],
+                    args=["check", path, "--output-format", "json-lines"],
                     cwd=None,
                     session_id=ctx.deps.session_id,
                 )
@@ -367,39 +402,41 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
                 await ctx.deps.client_conn.release_terminal(
                     session_id=ctx.deps.session_id, terminal_id=term.terminal_id
                 )
-                # Parse text output into RuffResult
-                return parse_ruff_output(output_resp.output)
+                return parse_ruff_output(
+                    output_resp.output,
+                    root=ctx.deps.workspace_root,
+                    json_lines=True,
+                )
 
-            future = asyncio.run_coroutine_threadsafe(_run_ruff(), loop)
-            return future.result(timeout=30)
+            return _call_async(
+                _cached_result(ctx, "ruff_check", (path,), path, _run_ruff)
+            )
 
         def sync_goto_definition(file_path: str, line: int, column: int, symbol: str):
             """Bridge from sync sandbox to async LSP goto_definition."""
-            from punie.agent.lsp_client import get_lsp_client
+            from punie.agent.lsp_client import lsp_lease
             from punie.agent.typed_tools import parse_definition_response
 
             # Use LSP client to query ty server
             async def _goto_definition():
-                client = await get_lsp_client()
-                response = await client.goto_definition(file_path, line, column)
+                async with lsp_lease(ctx.deps.workspace_root) as client:
+                    response = await client.goto_definition(file_path, line, column)
                 return parse_definition_response(response, symbol)
 
-            future = asyncio.run_coroutine_threadsafe(_goto_definition(), loop)
-            return future.result(timeout=30)
+            return _call_async(_goto_definition())
 
         def sync_find_references(file_path: str, line: int, column: int, symbol: str):
             """Bridge from sync sandbox to async LSP find_references."""
-            from punie.agent.lsp_client import get_lsp_client
+            from punie.agent.lsp_client import lsp_lease
             from punie.agent.typed_tools import parse_references_response
 
             # Use LSP client to query ty server
             async def _find_references():
-                client = await get_lsp_client()
-                response = await client.find_references(file_path, line, column)
+                async with lsp_lease(ctx.deps.workspace_root) as client:
+                    response = await client.find_references(file_path, line, column)
                 return parse_references_response(response, symbol)
 
-            future = asyncio.run_coroutine_threadsafe(_find_references(), loop)
-            return future.result(timeout=30)
+            return _call_async(_find_references())
 
         def sync_pytest_run(path: str):
             """Bridge from sync sandbox to async pytest via terminal."""
@@ -425,50 +462,39 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
                 # Parse verbose output into TestResult
                 return parse_pytest_output(output_resp.output)
 
-            future = asyncio.run_coroutine_threadsafe(_run_pytest(), loop)
-            return future.result(timeout=30)
+            return _call_async(
+                _cached_result(ctx, "pytest_run", (path,), path, _run_pytest)
+            )
 
         def sync_hover(file_path: str, line: int, column: int, symbol: str):
             """Bridge from sync sandbox to async LSP hover."""
-            from punie.agent.lsp_client import get_lsp_client
+            from punie.agent.lsp_client import lsp_lease
             from punie.agent.typed_tools import parse_hover_response
 
             # Use LSP client to query ty server
             async def _hover():
-                client = await get_lsp_client()
-                response = await client.hover(file_path, line, column)
+                async with lsp_lease(ctx.deps.workspace_root) as client:
+                    response = await client.hover(file_path, line, column)
                 return parse_hover_response(response, symbol)
 
-            future = asyncio.run_coroutine_threadsafe(_hover(), loop)
-            return future.result(timeout=30)
+            return _call_async(_hover())
 
         def sync_document_symbols(file_path: str):
             """Bridge from sync sandbox to async LSP document symbols."""
-            from punie.agent.lsp_client import get_lsp_client
+            from punie.agent.lsp_client import lsp_lease
             from punie.agent.typed_tools import parse_document_symbols_response
 
             # Use LSP client to query ty server
             async def _document_symbols():
-                client = await get_lsp_client()
-                response = await client.document_symbols(file_path)
+                async with lsp_lease(ctx.deps.workspace_root) as client:
+                    response = await client.document_symbols(file_path)
                 return parse_document_symbols_response(response, file_path)
 
-            future = asyncio.run_coroutine_threadsafe(_document_symbols(), loop)
-            return future.result(timeout=30)
+            return _call_async(_document_symbols())
 
         def sync_workspace_symbols(query: str):
-            """Bridge from sync sandbox to async LSP workspace symbols."""
-            from punie.agent.lsp_client import get_lsp_client
-            from punie.agent.typed_tools import parse_workspace_symbols_response
-
-            # Use LSP client to query ty server
-            async def _workspace_symbols():
-                client = await get_lsp_client()
-                response = await client.workspace_symbols(query)
-                return parse_workspace_symbols_response(response, query)
-
-            future = asyncio.run_coroutine_threadsafe(_workspace_symbols(), loop)
-            return future.result(timeout=30)
+            """Bridge from sync sandbox to the symbol index (LSP on a miss)."""
+            return _call_async(_search_workspace_symbols(ctx.deps.workspace_root, query))
 
         def sync_git_status(path: str):
             """Bridge from sync sandbox to async git status via terminal."""
@@ -494,8 +520,9 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
                 # Parse porcelain output into GitStatusResult
                 return parse_git_status_output(output_resp.output)
 
-            future = asyncio.run_coroutine_threadsafe(_run_git_status(), loop)
-            return future.result(timeout=30)
+            return _call_async(
+                _cached_result(ctx, "git_status", (path,), path, _run_git_status)
+            )
 
         def sync_git_diff(path: str, staged: bool = False):
             """Bridge from sync sandbox to async git diff via terminal."""
@@ -525,8 +552,9 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
                 # Parse diff output into GitDiffResult
                 return parse_git_diff_output(output_resp.output)
 
-            future = asyncio.run_coroutine_threadsafe(_run_git_diff(), loop)
-            return future.result(timeout=30)
+            return _call_async(
+                _cached_result(ctx, "git_diff", (path, staged), path, _run_git_diff)
+            )
 
         def sync_git_log(path: str, count: int = 10):
             """Bridge from sync sandbox to async git log via terminal."""
@@ -552,8 +580,9 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
                 # Parse formatted output into GitLogResult
                 return parse_git_log_output(output_resp.output)
 
-            future = asyncio.run_coroutine_threadsafe(_run_git_log(), loop)
-            return future.result(timeout=30)
+            return _call_async(
+                _cached_result(ctx, "git_log", (path, count), path, _run_git_log)
+            )
 
         def sync_cst_find_pattern(file_path: str, pattern: str):
             """Bridge from sync sandbox to local LibCST cst_find_pattern."""
@@ -615,7 +644,22 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
             from punie.cst.validators.tdom_svcs import validate_route_pattern
             return validate_route_pattern(file_path)
 
-        # Execute code in sandbox (runs in thread pool to not block event loop)
+        def sync_validate_all(file_path: str, checks: list[str] | None = None):
+            """Bridge from sync sandbox to the single-pass validate_all engine."""
+            from punie.cst.validators.engine import validate_all
+            return validate_all(file_path, checks)
+
+        def sync_scan_pattern(path: str, pattern: str):
+            """Bridge from sync sandbox to the workspace-wide pattern scan."""
+            from punie.cst.scan import scan_pattern
+            return scan_pattern(path, pattern)
+
+        def sync_scan_validate(path: str, checks: list[str] | None = None):
+            """Bridge from sync sandbox to the workspace-wide validator scan."""
+            from punie.cst.scan import scan_validate
+            return scan_validate(path, checks)
+
+        # Execute code on the dedicated sandbox pool (not the loop's default executor)
         external_functions = ExternalFunctions(
             read_file=sync_read_file,
             write_file=sync_write_file,
@@ -643,8 +687,17 @@ async def execute_code(ctx: RunContext[ACPDeps], code: str) -> str:
             validate_middleware_chain=sync_validate_middleware_chain,
             check_di_template_binding=sync_check_di_template_binding,
             validate_route_pattern=sync_validate_route_pattern,
+            validate_all=sync_validate_all,
+            scan_pattern=sync_scan_pattern,
+            scan_validate=sync_scan_validate,
+        )
+        run = await get_sandbox_pool().run(
+            code,
+            external_functions,
+            ctx.deps.parallel_limit or ctx.deps.max_parallel_calls,
+            scope,
         )
-        output = await loop.run_in_executor(None, run_code, code, external_functions)
+        output = _page_output(ctx, "execute_code", run.output)
 
         # Report completion
         progress = ctx.deps.tracker.progress(
@@ -744,6 +797,31 @@ async def kill_terminal(ctx: RunContext[ACPDeps], terminal_id: str) -> str:
         raise ModelRetry(f"Failed to kill terminal {terminal_id}: {exc}") from exc
 
 
+async def read_more(ctx: RunContext[ACPDeps], handle: str, offset: int = 0) -> str:
+    """Read the next page of a tool output that was too large to return at once.
+
+    Large outputs end with a footer naming their handle and the offset of
+    the next page; pass both here.
+
+    Args:
+        ctx: Run context with ACPDeps
+        handle: Output handle from the truncation footer, e.g. "read_file-1"
+        offset: Byte offset to continue from, as given in the footer
+
+    Returns:
+        The page of output starting at offset, with a footer for the next one
+    """
+    logger.info(f"🔧 TOOL: read_more(handle={handle}, offset={offset})")
+    store = ctx.deps.result_store
+    if store is None:
+        raise ModelRetry("No stored outputs in this session")
+    try:
+        return store.read_more(handle, offset)
+    except (KeyError, ValueError) as exc:
+        # KeyError's str() quotes its message
+        raise ModelRetry(exc.args[0]) from exc
+
+
 # ============================================================================
 # Direct Code Tools (Phase 38) - For zero-shot models like Devstral
 # ============================================================================
@@ -802,6 +880,96 @@ def _format_typed_result(result: Any) -> str:
     return result.model_dump_json(indent=2)
 
 
+def _page_output(ctx: RunContext[ACPDeps], tool: str, text: str) -> str:
+    """Bound a model-facing output to the tool's page budget.
+
+    Oversized output is kept in the session's result store; the model gets
+    the first page and a footer telling it how to call read_more.
+    """
+    if ctx.deps.result_store is None:
+        return text
+    return ctx.deps.result_store.page(tool, text)
+
+
+def _workspace_path(ctx: RunContext[ACPDeps], path: str) -> tuple[Path, Path]:
+    """Resolve a tool path against the session's workspace root."""
+    root = (ctx.deps.workspace_root or Path.cwd()).resolve()
+    return (root / path).resolve(), root
+
+
+async def _cached_result(
+    ctx: RunContext[ACPDeps],
+    tool: str,
+    args: tuple[Any, ...],
+    path: str,
+    run: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Run a subprocess-backed typed tool through the session's result cache.
+
+    A hit is reported to the IDE as an already completed tool call whose
+    title says the result was cached, so repeated calls stay visible.
+    """
+    cache = ctx.deps.result_cache
+    if cache is None:
+        return await run()
+    target, root = _workspace_path(ctx, path)
+    key = await asyncio.to_thread(cache.key, tool, args, target, root)
+    cached = cache.get(key)
+    if cached is None:
+        result = await run()
+        cache.put(key, result)
+        return result
+
+    logger.info(f"♻️ Cache hit: {tool}{args}")
+    tool_call_id = f"cached_{tool}_{'_'.join(map(str, args))}"
+    start = ctx.deps.tracker.start(
+        tool_call_id,
+        title=f"{tool}({', '.join(map(repr, args))}) (cached)",
+        kind="execute",
+        status="completed",
+        raw_output={"cached": True},
+    )
+    try:
+        await ctx.deps.client_conn.session_update(ctx.deps.session_id, start)
+    finally:
+        ctx.deps.tracker.forget(tool_call_id)
+    # Callers may mutate what they get back; keep the cached copy pristine
+    return cached.model_copy(deep=True)
+
+
+def _invalidate_results(ctx: RunContext[ACPDeps], path: str) -> None:
+    """Drop cached tool results that a write to path makes stale."""
+    if ctx.deps.result_cache is not None:
+        target, _ = _workspace_path(ctx, path)
+        ctx.deps.result_cache.invalidate(target)
+
+
+async def _search_workspace_symbols(workspace_root: Path | None, query: str):
+    """Answer a workspace symbol query from the persistent index.
+
+    Falls back to ty server's workspace/symbol when the index has no match,
+    cannot be used, or is still being built (a cold build of a large
+    workspace would not fit in one tool call).
+    """
+    from punie.agent.lsp_client import lsp_lease
+    from punie.agent.symbol_index import get_symbol_index
+    from punie.agent.typed_tools import parse_workspace_symbols_response
+
+    try:
+        index = get_symbol_index(workspace_root)
+        if index.ready:
+            result = await asyncio.to_thread(index.search, query)
+            if result.success:
+                return result
+        else:
+            index.start_build()
+    except Exception as exc:
+        logger.warning(f"Symbol index lookup failed, asking the LSP server: {exc}")
+    async with lsp_lease(workspace_root) as client:
+        response = await client.workspace_symbols(query)
+    return parse_workspace_symbols_response(response, query)
+
+
 async def typecheck_direct(ctx: RunContext[ACPDeps], path: str) -> str:
     """Run ty type checker on a file or directory.
 
@@ -817,11 +985,14 @@ async def typecheck_direct(ctx: RunContext[ACPDeps], path: str) -> str:
     from punie.agent.typed_tools import parse_ty_output
 
     logger.info(f"🔧 TOOL: typecheck_direct(path={path})")
-    try:
+    async def run():
         output = await _run_terminal(
             ctx, "ty", ["check", path, "--output-format", "json"]
         )
-        result = parse_ty_output(output)
+        return parse_ty_output(output)
+
+    try:
+        result = await _cached_result(ctx, "typecheck", (path,), path, run)
         return _format_typed_result(result)
     except Exception as exc:
         raise ModelRetry(f"Failed to run typecheck on {path}: {exc}") from exc
@@ -842,9 +1013,16 @@ async def ruff_check_direct(ctx: RunContext[ACPDeps], path: str) -> str:
     from punie.agent.typed_tools import parse_ruff_output
 
     logger.info(f"🔧 TOOL: ruff_check_direct(path={path})")
+    async def run():
+        output = await _run_terminal(
+            ctx, "ruff", ["check", path, "--output-format", "json-lines"]
+        )
+        return parse_ruff_output(
+            output, root=ctx.deps.workspace_root, json_lines=True
+        )
+
     try:
-        output = await _run_terminal(ctx, "ruff", ["check", path])
-        result = parse_ruff_output(output)
+        result = await _cached_result(ctx, "ruff_check", (path,), path, run)
         return _format_typed_result(result)
     except Exception as exc:
         raise ModelRetry(f"Failed to run ruff check on {path}: {exc}") from exc
@@ -865,9 +1043,12 @@ async def pytest_run_direct(ctx: RunContext[ACPDeps], path: str) -> str:
     from punie.agent.typed_tools import parse_pytest_output
 
     logger.info(f"🔧 TOOL: pytest_run_direct(path={path})")
-    try:
+    async def run():
         output = await _run_terminal(ctx, "pytest", [path, "-v", "--tb=short"])
-        result = parse_pytest_output(output)
+        return parse_pytest_output(output)
+
+    try:
+        result = await _cached_result(ctx, "pytest_run", (path,), path, run)
         return _format_typed_result(result)
     except Exception as exc:
         raise ModelRetry(f"Failed to run pytest on {path}: {exc}") from exc
@@ -888,11 +1069,14 @@ async def git_status_direct(ctx: RunContext[ACPDeps], path: str = ".") -> str:
     from punie.agent.typed_tools import parse_git_status_output
 
     logger.info(f"🔧 TOOL: git_status_direct(path={path})")
-    try:
+    async def run():
         output = await _run_terminal(
             ctx, "git", ["status", "--porcelain"], cwd=path if path != "." else None
         )
-        result = parse_git_status_output(output)
+        return parse_git_status_output(output)
+
+    try:
+        result = await _cached_result(ctx, "git_status", (path,), path, run)
         return _format_typed_result(result)
     except Exception as exc:
         raise ModelRetry(f"Failed to get git status for {path}: {exc}") from exc
@@ -916,14 +1100,17 @@ async def git_diff_direct(
     from punie.agent.typed_tools import parse_git_diff_output
 
     logger.info(f"🔧 TOOL: git_diff_direct(path={path}, staged={staged})")
-    try:
+    async def run():
         args = ["diff"]
         if staged:
             args.append("--staged")
 
         output = await _run_terminal(ctx, "git", args, cwd=path if path != "." else None)
-        result = parse_git_diff_output(output)
-        return _format_typed_result(result)
+        return parse_git_diff_output(output)
+
+    try:
+        result = await _cached_result(ctx, "git_diff", (path, staged), path, run)
+        return _page_output(ctx, "git_diff", _format_typed_result(result))
     except Exception as exc:
         raise ModelRetry(f"Failed to get git diff for {path}: {exc}") from exc
 
@@ -946,14 +1133,17 @@ async def git_log_direct(
     from punie.agent.typed_tools import parse_git_log_output
 
     logger.info(f"🔧 TOOL: git_log_direct(path={path}, count={count})")
-    try:
+    async def run():
         output = await _run_terminal(
             ctx,
             "git",
             ["log", "--format=%h|%an|%ad|%s", f"-n{count}"],
             cwd=path if path != "." else None,
         )
-        result = parse_git_log_output(output)
+        return parse_git_log_output(output)
+
+    try:
+        result = await _cached_result(ctx, "git_log", (path, count), path, run)
         return _format_typed_result(result)
     except Exception as exc:
         raise ModelRetry(f"Failed to get git log for {path}: {exc}") from exc
@@ -976,13 +1166,13 @@ async def goto_definition_direct(
     Returns:
         Formatted GotoDefinitionResult with locations
     """
-    from punie.agent.lsp_client import get_lsp_client
+    from punie.agent.lsp_client import lsp_lease
     from punie.agent.typed_tools import parse_definition_response
 
     logger.info(f"🔧 TOOL: goto_definition_direct(file_path={file_path}, line={line}, column={column}, symbol={symbol})")
     try:
-        client = await get_lsp_client()
-        response = await client.goto_definition(file_path, line, column)
+        async with lsp_lease(ctx.deps.workspace_root) as client:
+            response = await client.goto_definition(file_path, line, column)
         result = parse_definition_response(response, symbol)
         return _format_typed_result(result)
     except Exception as exc:
@@ -1006,15 +1196,15 @@ async def find_references_direct(
     Returns:
         Formatted FindReferencesResult with reference list
     """
-    from punie.agent.lsp_client import get_lsp_client
+    from punie.agent.lsp_client import lsp_lease
     from punie.agent.typed_tools import parse_references_response
 
     logger.info(f"🔧 TOOL: find_references_direct(file_path={file_path}, line={line}, column={column}, symbol={symbol})")
     try:
-        client = await get_lsp_client()
-        response = await client.find_references(file_path, line, column)
+        async with lsp_lease(ctx.deps.workspace_root) as client:
+            response = await client.find_references(file_path, line, column)
         result = parse_references_response(response, symbol)
-        return _format_typed_result(result)
+        return _page_output(ctx, "find_references", _format_typed_result(result))
     except Exception as exc:
         raise ModelRetry(f"Failed to find references for {symbol} at {file_path}:{line}:{column}: {exc}") from exc
 
@@ -1036,13 +1226,13 @@ async def hover_direct(
     Returns:
         Formatted HoverResult with type info and docs
     """
-    from punie.agent.lsp_client import get_lsp_client
+    from punie.agent.lsp_client import lsp_lease
     from punie.agent.typed_tools import parse_hover_response
 
     logger.info(f"🔧 TOOL: hover_direct(file_path={file_path}, line={line}, column={column}, symbol={symbol})")
     try:
-        client = await get_lsp_client()
-        response = await client.hover(file_path, line, column)
+        async with lsp_lease(ctx.deps.workspace_root) as client:
+            response = await client.hover(file_path, line, column)
         result = parse_hover_response(response, symbol)
         return _format_typed_result(result)
     except Exception as exc:
@@ -1061,13 +1251,13 @@ async def document_symbols_direct(ctx: RunContext[ACPDeps], file_path: str) -> s
     Returns:
         Formatted DocumentSymbolsResult with symbol hierarchy
     """
-    from punie.agent.lsp_client import get_lsp_client
+    from punie.agent.lsp_client import lsp_lease
     from punie.agent.typed_tools import parse_document_symbols_response
 
     logger.info(f"🔧 TOOL: document_symbols_direct(file_path={file_path})")
     try:
-        client = await get_lsp_client()
-        response = await client.document_symbols(file_path)
+        async with lsp_lease(ctx.deps.workspace_root) as client:
+            response = await client.document_symbols(file_path)
         result = parse_document_symbols_response(response, file_path)
         return _format_typed_result(result)
     except Exception as exc:
@@ -1075,9 +1265,11 @@ async def document_symbols_direct(ctx: RunContext[ACPDeps], file_path: str) -> s
 
 
 async def workspace_symbols_direct(ctx: RunContext[ACPDeps], query: str) -> str:
-    """Search for symbols across the workspace using LSP.
+    """Search for symbols across the workspace.
 
-    Returns structured results with matching symbols.
+    Answered from the persistent symbol index; the LSP server is asked only
+    when the index has no match. Returns structured results with matching
+    symbols.
 
     Args:
         ctx: Run context with ACPDeps
@@ -1086,14 +1278,9 @@ async def workspace_symbols_direct(ctx: RunContext[ACPDeps], query: str) -> str:
     Returns:
         Formatted WorkspaceSymbolsResult with matching symbols
     """
-    from punie.agent.lsp_client import get_lsp_client
-    from punie.agent.typed_tools import parse_workspace_symbols_response
-
     logger.info(f"🔧 TOOL: workspace_symbols_direct(query={query})")
     try:
-        client = await get_lsp_client()
-        response = await client.workspace_symbols(query)
-        result = parse_workspace_symbols_response(response, query)
+        result = await _search_workspace_symbols(ctx.deps.workspace_root, query)
         return _format_typed_result(result)
     except Exception as exc:
         raise ModelRetry(f"Failed to search workspace symbols for '{query}': {exc}") from exc
@@ -1376,6 +1563,36 @@ async def validate_route_pattern_direct(ctx: RunContext[ACPDeps], file_path: str
         raise ModelRetry(f"Failed to validate route patterns in {file_path}: {exc}") from exc
 
 
+async def validate_all_direct(
+    ctx: RunContext[ACPDeps], file_path: str, checks: list[str] | None = None
+) -> str:
+    """Run several domain validators on a file in a single pass.
+
+    Cheaper than calling the validators one by one: the file is parsed and
+    walked once.
+
+    Args:
+        ctx: Run context with ACPDeps
+        file_path: Path to Python file to analyze
+        checks: Validator names (e.g. "validate_component") or domains
+            ("tdom", "svcs", "tdom-svcs"); omit to run all nine
+
+    Returns:
+        JSON object mapping each validator name to its DomainValidationResult
+    """
+    from punie.cst.validators.engine import validate_all
+
+    logger.info(f"🔧 TOOL: validate_all_direct(file_path={file_path}, checks={checks})")
+    try:
+        results = validate_all(file_path, checks)
+        return json.dumps(
+            {name: result.model_dump(mode="json") for name, result in results.items()},
+            indent=2,
+        )
+    except Exception as exc:
+        raise ModelRetry(f"Failed to validate {file_path}: {exc}") from exc
+
+
 def create_direct_toolset() -> FunctionToolset[ACPDeps]:
     """Create toolset for zero-shot models with direct tool calling.
 
@@ -1384,8 +1601,8 @@ def create_direct_toolset() -> FunctionToolset[ACPDeps]:
     eliminating the execute_code indirection.
 
     Returns:
-        FunctionToolset with 26 tools:
-        - 3 base tools: read_file, write_file, run_command
+        FunctionToolset with 28 tools:
+        - 4 base tools: read_file, write_file, run_command, read_more
         - 11 Code Tools: typecheck_direct, ruff_check_direct, pytest_run_direct,
           git_status_direct, git_diff_direct, git_log_direct, goto_definition_direct,
           find_references_direct, hover_direct, document_symbols_direct,
@@ -1397,6 +1614,7 @@ def create_direct_toolset() -> FunctionToolset[ACPDeps]:
           check_dependency_graph_direct, validate_injection_site_direct,
           validate_middleware_chain_direct, check_di_template_binding_direct,
           validate_route_pattern_direct
+        - validate_all_direct: any subset of the validators in one pass
 
     Note:
         execute_code and terminal management tools are excluded since zero-shot
@@ -1408,6 +1626,7 @@ def create_direct_toolset() -> FunctionToolset[ACPDeps]:
             read_file,
             write_file,
             run_command,
+            read_more,
             # Direct Code Tools (typed tools promoted to PydanticAI tools)
             typecheck_direct,
             ruff_check_direct,
@@ -1434,6 +1653,7 @@ def create_direct_toolset() -> FunctionToolset[ACPDeps]:
             validate_middleware_chain_direct,
             check_di_template_binding_direct,
             validate_route_pattern_direct,
+            validate_all_direct,
         ]
     )
 
@@ -1447,6 +1667,7 @@ def create_toolset() -> FunctionToolset[ACPDeps]:
     - write_file (with permission)
     - run_command (with permission)
     - execute_code (Code Mode for multi-step operations)
+    - read_more (next page of a large output)
     - get_terminal_output
     - release_terminal
     - wait_for_terminal_exit
@@ -1462,6 +1683,7 @@ def create_toolset() -> FunctionToolset[ACPDeps]:
             write_file,
             run_command,
             execute_code,
+            read_more,
             get_terminal_output,
             release_terminal,
             wait_for_terminal_exit,
@@ -1476,7 +1698,8 @@ def create_toolset_from_capabilities(
     """Create toolset from client capabilities (Tier 2 fallback).
 
     Builds a toolset based on what the client declares it can do via
-    ClientCapabilities. Only includes tools the client supports.
+    ClientCapabilities. Only includes tools the client supports, plus
+    read_more whenever a tool that can page its output is included.
 
     Args:
         caps: Client capabilities from initialize()
@@ -1490,8 +1713,8 @@ def create_toolset_from_capabilities(
     ...     terminal=False
     ... )
     >>> toolset = create_toolset_from_capabilities(caps)
-    >>> len(toolset.tools)
-    1
+    >>> sorted(toolset.tools)
+    ['read_file', 'read_more']
     """
     tools = []
 
@@ -1512,10 +1735,16 @@ def create_toolset_from_capabilities(
                 kill_terminal,
             ]
         )
+    if read_file in tools or run_command in tools:
+        tools.append(read_more)
 
     return FunctionToolset[ACPDeps](tools=tools)
 
 
+# Known tools whose output may be paged through read_more
+_PAGED_TOOLS = frozenset({"read_file", "run_command", "execute_code"})
+
+
 def _create_generic_bridge(descriptor: ToolDescriptor):
     """Create a generic bridge function for unknown IDE tools.
 
@@ -1549,7 +1778,10 @@ def create_toolset_from_catalog(catalog: ToolCatalog) -> FunctionToolset[ACPDeps
     """Create toolset from tool catalog (Tier 1, dynamic discovery).
 
     Builds a toolset from the IDE's advertised capabilities via discover_tools().
-    Matches known tools by name, creates generic bridges for unknowns.
+    Matches known tools by name, creates generic bridges for unknowns, and
+    adds read_more when a known tool can page its output. Tools are ordered
+    by name, so the same catalog always yields the same tool schema (and a
+    prompt prefix the model server can reuse) whatever order it arrived in.
 
     Args:
         catalog: Tool catalog from discover_tools() response
@@ -1566,8 +1798,8 @@ def create_toolset_from_catalog(catalog: ToolCatalog) -> FunctionToolset[ACPDeps
     ... )
     >>> catalog = ToolCatalog(tools=(descriptor,))
     >>> toolset = create_toolset_from_catalog(catalog)
-    >>> len(toolset.tools)
-    1
+    >>> sorted(toolset.tools)
+    ['read_file', 'read_more']
     """
     # Known tools mapping
     known_tools = {
@@ -1582,13 +1814,15 @@ def create_toolset_from_catalog(catalog: ToolCatalog) -> FunctionToolset[ACPDeps
     }
 
     tools = []
-    for descriptor in catalog.tools:
+    for descriptor in sorted(catalog.tools, key=lambda d: d.name):
         if descriptor.name in known_tools:
             # Use known implementation
             tools.append(known_tools[descriptor.name])
         else:
             # Create generic bridge for IDE-provided tool
             tools.append(_create_generic_bridge(descriptor))
+    if any(descriptor.name in _PAGED_TOOLS for descriptor in catalog.tools):
+        tools.append(read_more)
 
     return FunctionToolset[ACPDeps](tools=tools)
 
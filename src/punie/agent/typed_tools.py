@@ -8,7 +8,9 @@ instead of raw text. Currently supports:
 - LSP navigation (goto_definition, find_references) → GotoDefinitionResult, FindReferencesResult
 """
 
+import io
 import json
+import os
 import re
 
 from pydantic import BaseModel
@@ -139,12 +141,19 @@ class RuffViolation(BaseModel):
 class RuffResult(BaseModel):
     """Result of running ruff check.
 
+    Counts always cover every violation; the violations list is a bounded
+    sample (see parse_ruff_output) so large lint runs stay compact.
+
     Attributes:
         success: True if no violations found, False otherwise
         violation_count: Total number of violations found
         fixable_count: Number of violations that can be auto-fixed
-        violations: List of all violations
+        violations: Violations, at most a few per rule and per file
         parse_error: Error message if output parsing failed, None otherwise
+        rule_counts: Violations per rule code, most frequent first
+        file_counts: Violations per file for the most affected files
+        file_count: Number of files with at least one violation
+        truncated: True if violations omits some of the violations counted
     """
 
     success: bool
@@ -152,76 +161,184 @@ class RuffResult(BaseModel):
     fixable_count: int
     violations: list[RuffViolation]
     parse_error: str | None = None
+    rule_counts: dict[str, int] = {}
+    file_counts: dict[str, int] = {}
+    file_count: int = 0
+    truncated: bool = False
+
+
+# Bounds on the violations sample in a RuffResult
+DEFAULT_RUFF_MAX_VIOLATIONS = 50
+DEFAULT_RUFF_MAX_PER_RULE = 10
+DEFAULT_RUFF_MAX_PER_FILE = 10
+DEFAULT_RUFF_TOP_FILES = 20
+
+_RUFF_TEXT_PATTERN = re.compile(r"^(.+?):(\d+):(\d+):\s+([A-Z]+\d+)\s+(\[\*\]\s+)?(.+)$")
+
+
+class _RuffSummary:
+    """Accumulates violations one at a time, keeping counts and a bounded sample."""
+
+    def __init__(
+        self, max_violations: int, max_per_rule: int, max_per_file: int, top_files: int
+    ) -> None:
+        self.max_violations = max_violations
+        self.max_per_rule = max_per_rule
+        self.max_per_file = max_per_file
+        self.top_files = top_files
+        self.violations: list[RuffViolation] = []
+        self.total = 0
+        self.fixable = 0
+        self.rule_counts: dict[str, int] = {}
+        self.file_counts: dict[str, int] = {}
+
+    def add(self, violation: RuffViolation) -> None:
+        self.total += 1
+        self.fixable += violation.fixable
+        per_rule = self.rule_counts[violation.code] = self.rule_counts.get(violation.code, 0) + 1
+        per_file = self.file_counts[violation.file] = self.file_counts.get(violation.file, 0) + 1
+        if (
+            len(self.violations) < self.max_violations
+            and per_rule <= self.max_per_rule
+            and per_file <= self.max_per_file
+        ):
+            self.violations.append(violation)
+
+    def result(self, parse_error: str | None = None) -> RuffResult:
+        def by_count(counts: dict[str, int]) -> list[tuple[str, int]]:
+            return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
 
+        return RuffResult(
+            success=self.total == 0,
+            violation_count=self.total,
+            fixable_count=self.fixable,
+            violations=self.violations,
+            parse_error=parse_error,
+            rule_counts=dict(by_count(self.rule_counts)),
+            file_counts=dict(by_count(self.file_counts)[: self.top_files]),
+            file_count=len(self.file_counts),
+            truncated=len(self.violations) < self.total,
+        )
 
-def parse_ruff_output(output: str) -> RuffResult:
-    """Parse ruff check output into RuffResult.
 
-    Args:
-        output: Raw output from ruff check command (text format)
+def _ruff_json_violation(item: dict, root: str | None) -> RuffViolation:
+    """Convert one ruff JSON diagnostic into a RuffViolation."""
+    filename = item["filename"]
+    if root and filename.startswith(root + os.sep):
+        filename = filename[len(root) + 1 :]
+    fix = item.get("fix")
+    location = item.get("location") or {}
+    return RuffViolation(
+        file=filename,
+        line=location.get("row", 0),
+        column=location.get("column", 0),
+        # Syntax errors have no rule code
+        code=item.get("code") or "syntax-error",
+        message=item["message"],
+        # Only safe fixes are applied by a plain `ruff check --fix`
+        fixable=bool(fix) and fix.get("applicability", "safe") == "safe",
+    )
 
-    Returns:
-        RuffResult with parsed violations
 
-    Note:
-        Parses default ruff text output format:
-        path/to/file.py:10:5: E501 Line too long (89 > 88 characters)
-        path/to/file.py:15:1: F401 [*] `os` imported but unused
+def parse_ruff_output(
+    output: str,
+    *,
+    root: str | os.PathLike[str] | None = None,
+    json_lines: bool = False,
+    max_violations: int = DEFAULT_RUFF_MAX_VIOLATIONS,
+    max_per_rule: int = DEFAULT_RUFF_MAX_PER_RULE,
+    max_per_file: int = DEFAULT_RUFF_MAX_PER_FILE,
+    top_files: int = DEFAULT_RUFF_TOP_FILES,
+) -> RuffResult:
+    """Parse ruff check output into a compact RuffResult.
+
+    Accepts ``--output-format json-lines`` (what the tools request), a JSON
+    array (``--output-format json``) or the default text format. JSON
+    diagnostics carry absolute paths, which are made relative to root. Lines are
+    parsed one at a time and only a bounded sample is kept: at most
+    max_violations in total, max_per_rule per rule and max_per_file per
+    file. Counts per rule and for the top_files most affected files are
+    reported in full, so the result stays small however many violations
+    ruff finds.
+
+    Args:
+        output: Raw output from ruff check
+        root: Workspace root ruff ran in (JSON paths under it are made relative)
+        json_lines: Output was requested as json-lines, so lines that are not
+            diagnostics (e.g. warnings on stderr) are skipped rather than
+            parsed as text
+        max_violations: Cap on the violations list
+        max_per_rule: Cap on listed violations sharing a rule code
+        max_per_file: Cap on listed violations in one file
+        top_files: Number of files included in file_counts
 
-        [*] indicates fixable violations
+    Returns:
+        RuffResult with counts, a violations sample, and parse_error if the
+        output could not be parsed
+
+    Example:
+        >>> line = (
+        ...     '{"code": "F401", "filename": "app.py", "location": {"row": 1, "column": 8},'
+        ...     ' "message": "`os` imported but unused", "fix": {"applicability": "safe"}}'
+        ... )
+        >>> result = parse_ruff_output(line + "\\n" + line.replace("F401", "E501"))
+        >>> result.violation_count, result.fixable_count, result.rule_counts
+        (2, 2, {'E501': 1, 'F401': 1})
     """
+    stripped = output.strip()
     # Handle empty output (no violations)
-    if not output or output.strip() == "":
+    if not stripped:
         return RuffResult(
             success=True, violation_count=0, fixable_count=0, violations=[]
         )
 
-    violations = []
-    fixable_count = 0
-
-    # Pattern: file.py:line:col: CODE message
-    # [*] prefix indicates fixable
-    pattern = r"^(.+?):(\d+):(\d+):\s+([A-Z]\d+)\s+(\[\*\]\s+)?(.+)$"
-
-    for line in output.strip().split("\n"):
+    summary = _RuffSummary(max_violations, max_per_rule, max_per_file, top_files)
+    root = os.path.abspath(root) if root else None
+
+    if stripped.startswith("["):
+        try:
+            for item in json.loads(stripped):
+                summary.add(_ruff_json_violation(item, root))
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            return summary.result(f"Failed to parse ruff JSON output: {e}")
+        return summary.result()
+
+    if json_lines or stripped.startswith("{"):
+        for line in io.StringIO(stripped):
+            if not line.lstrip().startswith("{"):
+                continue
+            try:
+                summary.add(_ruff_json_violation(json.loads(line), root))
+            except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+                return summary.result(f"Failed to parse ruff JSON output: {e}")
+        return summary.result()
+
+    # Text format: file.py:line:col: CODE [*] message ([*] marks fixable)
+    for line in io.StringIO(stripped):
         line = line.strip()
         if not line or line.startswith("Found ") or line.startswith("No "):
             continue
 
-        match = re.match(pattern, line)
+        match = _RUFF_TEXT_PATTERN.match(line)
         if match:
             file_path, line_no, col_no, code, fixable_marker, message = match.groups()
-            is_fixable = fixable_marker is not None
-
-            violation = RuffViolation(
-                file=file_path,
-                line=int(line_no),
-                column=int(col_no),
-                code=code,
-                message=message.strip(),
-                fixable=is_fixable,
+            summary.add(
+                RuffViolation(
+                    file=file_path,
+                    line=int(line_no),
+                    column=int(col_no),
+                    code=code,
+                    message=message.strip(),
+                    fixable=fixable_marker is not None,
+                )
             )
-            violations.append(violation)
 
-            if is_fixable:
-                fixable_count += 1
-
-    success = len(violations) == 0
     parse_error = None
+    # Non-empty output with no violations parsed suggests a format change
+    if not summary.total and ":" in stripped and any(char.isdigit() for char in stripped):
+        parse_error = "Non-empty output with no violations parsed - possible format change"
 
-    # If we have non-empty output but found no violations, warn about possible format change
-    if output.strip() and not violations:
-        # Check if output looks like actual violations (has colons and line numbers)
-        if ":" in output and any(char.isdigit() for char in output):
-            parse_error = "Non-empty output with no violations parsed - possible format change"
-
-    return RuffResult(
-        success=success,
-        violation_count=len(violations),
-        fixable_count=fixable_count,
-        violations=violations,
-        parse_error=parse_error,
-    )
+    return summary.result(parse_error)
 
 
 # Pytest models
@@ -1305,12 +1422,14 @@ class CstMatch(BaseModel):
         column: Column number in source file (0-based)
         code_snippet: First line of the matched node's source code
         node_type: LibCST node class name (e.g., "FunctionDef", "Call")
+        file: File containing the match (set by workspace scans)
     """
 
     line: int
     column: int
     code_snippet: str
     node_type: str
+    file: str | None = None
 
 
 class CstFindResult(BaseModel):
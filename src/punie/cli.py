@@ -2,6 +2,11 @@
 
 Critical constraint: stdout is reserved for ACP JSON-RPC. All logging
 goes to files (~/.punie/logs/punie.log). Version info prints to stderr.
+
+Startup cost matters here: every invocation, including quick ones like
+``punie ask`` and ``punie stop-all``, imports this module. Heavy
+dependencies (the agent and pydantic_ai, the ACP runtime, starlette and
+uvicorn) are imported inside the commands that use them.
 """
 
 import asyncio
@@ -17,13 +22,6 @@ from pathlib import Path
 import typer
 
 from punie import __version__
-from punie.acp import run_agent
-from punie.acp.contrib.tool_calls import ToolCallTracker
-from punie.agent import PunieAgent
-from punie.agent.deps import ACPDeps
-from punie.agent.factory import create_local_agent
-from punie.http.app import create_app
-from punie.http.runner import run_http
 from punie.http.types import Host, Port
 
 app = typer.Typer(
@@ -186,6 +184,9 @@ async def run_acp_agent(model: str, name: str) -> None:
         model: Model name for agent
         name: Agent name for identification
     """
+    from punie.acp import run_agent
+    from punie.agent.adapter import PunieAgent
+
     logger = logging.getLogger(__name__)
     try:
         logger.info("=== run_acp_agent() starting ===")
@@ -257,7 +258,10 @@ async def run_serve_agent(
     Creates a single PunieAgent instance that handles WebSocket connections
     from multiple clients (PyCharm, punie ask, Toad frontend, etc.).
 
-    When model is "local", auto-detects and manages the MLX server.
+    When model is "local", auto-detects and manages the MLX server. For local
+    models the agent sends each new toolset's prompt prefix to the model
+    server in the background when the first session using it starts, so
+    that session's first prompt finds it already cached.
 
     Args:
         model: Model name for agent
@@ -267,12 +271,18 @@ async def run_serve_agent(
         log_level: Logging level for HTTP server
         mlx_port: Port for managed MLX server (only used when model="local")
     """
+    from punie.agent.adapter import PunieAgent
+    from punie.http.app import create_app
+    from punie.http.client_pool import get_http_pool
+    from punie.http.runner import run_http
+
     managed_server = None
     try:
         if model == "local":
             model, managed_server = await _maybe_start_mlx_server(mlx_port)
 
-        # Create agent (handles WebSocket connections)
+        # Create agent (handles WebSocket connections); it prewarms the prompt
+        # prefix of each new toolset when the first session using it starts
         agent = PunieAgent(model=model, name=name)
 
         # Create HTTP app with agent reference (for WebSocket endpoint)
@@ -289,6 +299,7 @@ async def run_serve_agent(
     finally:
         if managed_server is not None:
             await managed_server.stop()
+        await get_http_pool().aclose()
 
 
 @app.callback(invoke_without_command=True)
@@ -520,6 +531,9 @@ async def _test_tool_calling(model: str, prompt: str, workspace: Path) -> bool:
     Returns:
         True if tool calls were detected, False otherwise
     """
+    from punie.acp.contrib.tool_calls import ToolCallTracker
+    from punie.agent.deps import ACPDeps
+    from punie.agent.factory import create_local_agent
     from punie.training.tool_call_parser import parse_tool_calls
 
     typer.echo(f"\n{'=' * 80}")
@@ -5,4 +5,5 @@ Provides:
 - code_tools: cst_find_pattern, cst_rename, cst_add_import
 - domain_models: ComponentSpec, ServiceRegistration, MiddlewareSpec, DomainValidationResult
 - validators: tdom, svcs, tdom_svcs domain validators
+- scan: scan_pattern, scan_validate over directories and globs
 """
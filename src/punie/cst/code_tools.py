@@ -10,9 +10,10 @@ from __future__ import annotations
 
 import libcst as cst
 import libcst.matchers as m
-from libcst.metadata import MetadataWrapper, PositionProvider
+from libcst.metadata import PositionProvider
 
 from punie.agent.typed_tools import CstAddImportResult, CstFindResult, CstMatch, CstRenameResult
+from punie.cst.core import get_parse_cache, read_source
 
 
 def _pattern_to_matcher(pattern: str) -> object:
@@ -65,7 +66,7 @@ def _pattern_to_matcher(pattern: str) -> object:
         raise ValueError(f"Unknown pattern: {pattern!r}. Use 'FunctionDef', 'ClassDef', 'Call', 'Decorator', 'ImportFrom', 'call:name', 'decorator:name', 'import:name'")
 
 
-def cst_find_pattern(file_path: str, pattern: str) -> CstFindResult:
+def cst_find_pattern(file_path: str, pattern: str, source: str | None = None) -> CstFindResult:
     """Find all nodes matching a pattern in a Python file.
 
     Uses LibCST to parse the file and find nodes matching the given
@@ -82,14 +83,15 @@ def cst_find_pattern(file_path: str, pattern: str) -> CstFindResult:
             - "call:name" — calls to function named "name"
             - "decorator:name" — uses of decorator named "name"
             - "import:name" — imports from module named "name"
+        source: The file's text, if already read (default: read file_path)
 
     Returns:
         CstFindResult with matches list (line, column, code_snippet, node_type)
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        if source is None:
+            source = read_source(file_path)
+        wrapper = get_parse_cache().wrapper(source)
     except Exception as e:
         return CstFindResult(
             success=False, match_count=0, matches=[], parse_error=str(e)
@@ -103,7 +105,6 @@ def cst_find_pattern(file_path: str, pattern: str) -> CstFindResult:
         )
 
     try:
-        wrapper = MetadataWrapper(module)
         positions = wrapper.resolve(PositionProvider)
         matches = m.findall(wrapper.module, matcher)
 
@@ -171,9 +172,7 @@ def cst_rename(file_path: str, old_name: str, new_name: str) -> CstRenameResult:
         CstRenameResult with rename_count and modified_source
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = get_parse_cache().parse(read_source(file_path))
     except Exception as e:
         return CstRenameResult(
             success=False, rename_count=0, parse_error=str(e)
@@ -182,6 +181,8 @@ def cst_rename(file_path: str, old_name: str, new_name: str) -> CstRenameResult:
     try:
         transformer = _RenameTransformer(old_name, new_name)
         new_module = module.visit(transformer)
+        # The caller usually writes modified_source back; keep its parse
+        get_parse_cache().add(new_module)
         return CstRenameResult(
             success=True,
             rename_count=transformer.rename_count,
@@ -240,9 +241,8 @@ def cst_add_import(file_path: str, import_stmt: str) -> CstAddImportResult:
         CstAddImportResult with import_added flag and modified_source
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        source = read_source(file_path)
+        wrapper = get_parse_cache().wrapper(source)
     except Exception as e:
         return CstAddImportResult(
             success=False, import_added=False, parse_error=str(e)
@@ -265,10 +265,11 @@ def cst_add_import(file_path: str, import_stmt: str) -> CstAddImportResult:
                 else:
                     AddImportsVisitor.add_needed_import(context, module_name, name_part)
 
-        wrapper = MetadataWrapper(module)
         new_module = wrapper.visit(AddImportsVisitor(context))
         new_source = new_module.code
         import_added = new_source != source
+        if import_added:
+            get_parse_cache().add(new_module)
         return CstAddImportResult(
             success=True,
             import_added=import_added,
@@ -2,14 +2,217 @@
 
 Provides parse_file and parse_source as the entry points for all
 CST-based analysis in the punie.cst package.
+
+Parsing is the expensive part of every CST tool, and a Code Mode script
+typically runs several validators over the same file. Parsed modules are
+therefore kept in a process-wide ParsedModuleCache keyed by a hash of the
+source text: any tool that sees the same content reuses the same Module
+(and MetadataWrapper), while an edited file hashes differently and is
+parsed afresh. LibCST trees are immutable, so sharing them is safe.
 """
 
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
 import libcst as cst
+from libcst.metadata import MetadataWrapper
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # Source bytes, a proxy for tree size
+
+# Process-wide cache used by parse_file()
+_cache: ParsedModuleCache | None = None
+
+
+@dataclass(frozen=True)
+class ParseCacheStats:
+    """Snapshot of ParsedModuleCache counters."""
+
+    hits: int
+    """Lookups answered from the cache."""
+
+    misses: int
+    """Lookups that had to parse."""
+
+    evictions: int
+    """Entries dropped to respect the size limits."""
+
+    entries: int
+    """Modules currently cached."""
+
+    source_bytes: int
+    """Total size of the cached sources."""
+
+
+class _Entry:
+    """One cached parse; the wrapper is created on first use."""
+
+    __slots__ = ("module", "seeded", "size", "wrapper")
+
+    def __init__(self, module: cst.Module, size: int, seeded: bool = False) -> None:
+        self.module = module
+        self.size = size
+        self.seeded = seeded
+        self.wrapper: MetadataWrapper | None = None
+
+
+class ParsedModuleCache:
+    """LRU cache of parsed modules keyed by source content hash.
+
+    Mutable by design: counters and entries change on every lookup. Thread
+    safe, since sandbox scripts call CST tools from parallel() workers.
+
+    >>> cache = ParsedModuleCache(max_entries=2)
+    >>> first = cache.parse("x = 1\\n")
+    >>> cache.parse("x = 1\\n") is first
+    True
+    >>> cache.stats
+    ParseCacheStats(hits=1, misses=1, evictions=0, entries=1, source_bytes=6)
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def stats(self) -> ParseCacheStats:
+        """Current cache counters."""
+        with self._lock:
+            return ParseCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                source_bytes=self._bytes,
+            )
+
+    def parse(self, source: str) -> cst.Module:
+        """Return the parsed Module for source, parsing only on a miss.
+
+        Raises:
+            libcst.ParserSyntaxError: If the source cannot be parsed
+        """
+        return self._entry(source).module
+
+    def wrapper(self, source: str) -> MetadataWrapper:
+        """Return a shared MetadataWrapper for source.
+
+        Resolved metadata (positions, scopes) is cached inside the wrapper,
+        so it is also computed once per source.
+        """
+        entry = self._entry(source)
+        with self._lock:
+            if entry.wrapper is None:
+                # A parsed module is never mutated, so it needs no defensive
+                # copy. A transformer's output can share node instances with
+                # its input tree, which would confuse metadata lookups, so
+                # seeded modules are copied.
+                entry.wrapper = MetadataWrapper(entry.module, unsafe_skip_copy=not entry.seeded)
+            return entry.wrapper
+
+    def add(self, module: cst.Module) -> None:
+        """Seed the cache with a module produced by a transformation.
+
+        Lets a tool that rewrites a file hand its result to the next tool
+        that reads the rewritten file, without parsing it again.
+        """
+        source = module.code
+        with self._lock:
+            self._store(_digest(source), _Entry(module, len(source), seeded=True))
+
+    def clear(self) -> None:
+        """Drop every cached module (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _entry(self, source: str) -> _Entry:
+        key = _digest(source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+        # Parse outside the lock; a concurrent miss on the same source just
+        # parses twice and the later result wins
+        entry = _Entry(cst.parse_module(source), len(source))
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def _store(self, key: bytes, entry: _Entry) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._evictions += 1
+
+
+def _digest(source: str) -> bytes:
+    return hashlib.blake2b(source.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def get_parse_cache() -> ParsedModuleCache:
+    """Return the process-wide parse cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = ParsedModuleCache()
+    return _cache
+
+
+def set_parse_cache(cache: ParsedModuleCache | None) -> ParsedModuleCache | None:
+    """Replace the process-wide cache (e.g. to change limits), returning the old one."""
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
+
+
+def read_source(path: str) -> str:
+    """Read a Python source file as text.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with open(path, "rb") as f:
+        return decode_source(f.read())
+
+
+def decode_source(data: bytes) -> str:
+    """Decode file contents exactly as read_source() would.
+
+    Text-mode open() semantics: locale encoding and universal newlines.
+
+    >>> decode_source(b"x = 1\\r\\n")
+    'x = 1\\n'
+    """
+    return io.TextIOWrapper(io.BytesIO(data)).read()
 
 
 def parse_file(path: str) -> cst.Module:
     """Parse a Python source file into a LibCST Module.
 
+    The file is read on every call; the parse is shared through the
+    process-wide cache when the content is unchanged.
+
     Args:
         path: Absolute or relative path to a Python file
 
@@ -20,9 +223,7 @@ def parse_file(path: str) -> cst.Module:
         FileNotFoundError: If the file does not exist
         libcst.ParserSyntaxError: If the file cannot be parsed
     """
-    with open(path) as f:
-        source = f.read()
-    return cst.parse_module(source)
+    return get_parse_cache().parse(read_source(path))
 
 
 def parse_source(code: str) -> cst.Module:
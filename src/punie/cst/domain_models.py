@@ -87,6 +87,7 @@ class ValidationIssue(BaseModel):
         message: Human-readable description of the issue
         line: Line number in source file (1-based, optional)
         suggestion: Suggested fix (optional)
+        file: File the issue was found in (set by workspace scans)
     """
 
     rule: str
@@ -94,6 +95,7 @@ class ValidationIssue(BaseModel):
     message: str
     line: int | None = None
     suggestion: str | None = None
+    file: str | None = None
 
 
 class DomainValidationResult(BaseModel):
@@ -0,0 +1,468 @@
+"""Workspace-wide CST scans over directories and globs.
+
+cst_find_pattern and the domain validators analyze a single file. The
+functions here run them over every Python file under a directory or
+matching a glob, spreading the work across a ProcessPoolExecutor (LibCST
+parsing is CPU bound, so threads would serialize on the GIL).
+
+Results are streamed back in completion order by iter_find_pattern() and
+iter_validate(); scan_pattern() and scan_validate() collect them into the
+usual CstFindResult / DomainValidationResult, with each match or issue
+tagged with its file.
+
+A persisted ScanIndex remembers each file's mtime, size and content hash
+together with its last result, so a rescan only parses files that changed.
+It keeps the results of the most recently used tasks (patterns or check
+sets) up to max_tasks and max_entries, so ad-hoc patterns don't grow it
+without bound.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from punie.agent.typed_tools import CstFindResult
+from punie.cst.code_tools import _pattern_to_matcher, cst_find_pattern
+from punie.cst.core import decode_source
+from punie.cst.domain_models import DomainValidationResult, ValidationIssue
+from punie.cst.validators.engine import CHECKS, resolve_checks, validate_all
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path.home() / ".punie" / "cache" / "cst-scan.json"
+DEFAULT_CHUNK_SIZE = 16  # Files per worker task, to amortize IPC
+DEFAULT_MIN_PARALLEL_FILES = 32  # Below this, scanning in-process is faster
+DEFAULT_EXCLUDED_DIRS = frozenset({"__pycache__", "node_modules", "venv", "build", "dist"})
+DEFAULT_MAX_INDEX_TASKS = 16  # Patterns / check sets whose results are kept
+DEFAULT_MAX_INDEX_ENTRIES = 50_000  # File results across all tasks
+
+# Bump when tool output changes so stale index entries are ignored
+INDEX_VERSION = 1
+
+# Process-wide scanner used by scan_pattern()/scan_validate()
+_scanner: CstScanner | None = None
+
+
+@dataclass(frozen=True)
+class _Task:
+    """One analysis to run on every file of a scan."""
+
+    kind: str
+    """Either "find" or "validate"."""
+
+    arg: str | tuple[str, ...]
+    """Pattern for "find", resolved validator names for "validate"."""
+
+    @property
+    def key(self) -> str:
+        """Index namespace, so different tasks never share results."""
+        arg = self.arg if isinstance(self.arg, str) else ",".join(self.arg)
+        return f"{self.kind}:{arg}"
+
+
+@dataclass(frozen=True)
+class _FileState:
+    """What the index knows about a file, to decide whether to rescan it."""
+
+    mtime_ns: int
+    size: int
+    digest: str | None = None
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _analyze(path: str, task: _Task) -> tuple[str | None, dict[str, Any]]:
+    """Run a task on one file, returning the content hash and a JSON-able result.
+
+    The file is read once; the hash describes exactly the text analyzed.
+    Unreadable or undecodable files get no hash, and the tool reports the
+    error in its result.
+    """
+    digest: str | None = None
+    source: str | None = None
+    try:
+        data = Path(path).read_bytes()
+        source = decode_source(data)
+        digest = _digest(data)
+    except (OSError, UnicodeDecodeError):
+        pass
+    if task.kind == "find":
+        result = cst_find_pattern(path, task.arg, source).model_dump(mode="json")  # type: ignore[arg-type]
+    else:
+        results = validate_all(path, list(task.arg), source)
+        result = {name: r.model_dump(mode="json") for name, r in results.items()}
+    return digest, result
+
+
+def _analyze_chunk(
+    paths: Sequence[str], task: _Task
+) -> list[tuple[str, str | None, dict[str, Any]]]:
+    """Worker entry point: analyze a chunk of files in a pool process."""
+    return [(path, *_analyze(path, task)) for path in paths]
+
+
+class ScanIndex:
+    """Persisted per-file results keyed by task, path, mtime and content hash.
+
+    A file whose mtime and size match its entry is not read at all. If only
+    the mtime moved (a checkout or touch), the content hash decides. Saved
+    as JSON with an atomic replace; a missing or corrupt file starts empty.
+
+    Tasks are kept least recently used first (also on disk). Beyond
+    max_tasks tasks or max_entries file results, whole tasks are dropped,
+    oldest first; the task in use is never dropped.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = DEFAULT_INDEX_PATH,
+        max_tasks: int = DEFAULT_MAX_INDEX_TASKS,
+        max_entries: int = DEFAULT_MAX_INDEX_ENTRIES,
+    ) -> None:
+        self.path = path
+        self.max_tasks = max_tasks
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: dict[str, dict[str, dict[str, Any]]] = self._load()
+        self._size = sum(len(files) for files in self._entries.values())
+        with self._lock:
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        """File results currently indexed, across all tasks."""
+        return self._size
+
+    @property
+    def task_keys(self) -> list[str]:
+        """Indexed tasks, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def lookup(self, task_key: str, path: str, state: _FileState) -> dict[str, Any] | None:
+        """Return the cached result for path if the file is unchanged."""
+        with self._lock:
+            files = self._touch(task_key)
+            entry = files.get(path) if files is not None else None
+        if entry is None:
+            return None
+        if entry["mtime_ns"] == state.mtime_ns and entry["size"] == state.size:
+            return entry["result"]
+        if entry["size"] != state.size or entry["digest"] is None:
+            return None
+        try:
+            digest = _digest(Path(path).read_bytes())
+        except OSError:
+            return None
+        if digest != entry["digest"]:
+            return None
+        self.store(task_key, path, _FileState(state.mtime_ns, state.size, digest), entry["result"])
+        return entry["result"]
+
+    def store(self, task_key: str, path: str, state: _FileState, result: dict[str, Any]) -> None:
+        """Record the result for a file in the given state."""
+        with self._lock:
+            files = self._touch(task_key)
+            if files is None:
+                files = self._entries[task_key] = {}
+            self._size += path not in files
+            files[path] = {
+                "mtime_ns": state.mtime_ns,
+                "size": state.size,
+                "digest": state.digest,
+                "result": result,
+            }
+            self._dirty = True
+            self._evict(keep=task_key)
+
+    def save(self) -> None:
+        """Write the index to disk if anything changed since the last save."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"version": INDEX_VERSION, "entries": self._entries})
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(data)
+            tmp.replace(self.path)
+        except OSError as exc:
+            logger.warning(f"Could not save CST scan index {self.path}: {exc}")
+
+    def _touch(self, task_key: str) -> dict[str, dict[str, Any]] | None:
+        """Mark a task most recently used, returning its file results."""
+        files = self._entries.pop(task_key, None)
+        if files is not None:
+            self._entries[task_key] = files
+        return files
+
+    def _evict(self, keep: str | None = None) -> None:
+        while len(self._entries) > self.max_tasks or self._size > self.max_entries:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._size -= len(self._entries.pop(oldest))
+            self._dirty = True
+
+    def _load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable CST scan index {self.path}: {exc}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("entries", {})
+
+
+def expand_paths(
+    target: str, excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS
+) -> list[str]:
+    """Expand a file, directory or glob into a sorted list of Python files.
+
+    Directories are walked recursively, skipping hidden directories and
+    excluded_dirs. Globs use glob.glob(recursive=True), so "src/**/*.py"
+    works.
+    """
+    if any(char in target for char in "*?["):
+        return sorted(p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+    if os.path.isfile(target):
+        return [target]
+    excluded = set(excluded_dirs)
+    paths: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(target):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in excluded]
+        paths.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".py"))
+    return sorted(paths)
+
+
+class CstScanner:
+    """Runs CST tasks over many files with a process pool and a ScanIndex.
+
+    The pool is created on first use and reused across scans. Scans with
+    fewer than min_parallel_files files to (re)analyze run in-process,
+    where process start-up and pickling would cost more than they save.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        index: ScanIndex | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_parallel_files: int = DEFAULT_MIN_PARALLEL_FILES,
+    ) -> None:
+        self.max_workers = max_workers
+        self.index = index if index is not None else ScanIndex()
+        self.chunk_size = chunk_size
+        self.min_parallel_files = min_parallel_files
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def iter_results(
+        self, paths: Sequence[str], task: _Task
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (path, result) as each file finishes; unchanged files come first."""
+        pending: list[tuple[str, _FileState | None]] = []
+        for path in paths:
+            state = _stat(path)
+            cached = (
+                self.index.lookup(task.key, os.path.abspath(path), state)
+                if state is not None
+                else None
+            )
+            if cached is not None:
+                yield path, cached
+            else:
+                pending.append((path, state))
+
+        states = dict(pending)
+        try:
+            for path, digest, result in self._run(list(states), task):
+                state = states[path]
+                if state is not None and digest is not None:
+                    self.index.store(
+                        task.key,
+                        os.path.abspath(path),
+                        _FileState(state.mtime_ns, state.size, digest),
+                        result,
+                    )
+                yield path, result
+        finally:
+            self.index.save()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(
+        self, paths: list[str], task: _Task
+    ) -> Iterator[tuple[str, str | None, dict[str, Any]]]:
+        if len(paths) < max(self.min_parallel_files, 1):
+            for path in paths:
+                yield (path, *_analyze(path, task))
+            return
+        chunks = [paths[i : i + self.chunk_size] for i in range(0, len(paths), self.chunk_size)]
+        executor = self._get_executor()
+        futures = [executor.submit(_analyze_chunk, chunk, task) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+
+def _stat(path: str) -> _FileState | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _FileState(st.st_mtime_ns, st.st_size)
+
+
+def get_scanner() -> CstScanner:
+    """Return the process-wide scanner, creating it on first use."""
+    global _scanner
+    if _scanner is None:
+        _scanner = CstScanner()
+    return _scanner
+
+
+def set_scanner(scanner: CstScanner | None) -> CstScanner | None:
+    """Replace the process-wide scanner, returning the old one."""
+    global _scanner
+    previous, _scanner = _scanner, scanner
+    return previous
+
+
+def iter_find_pattern(
+    target: str, pattern: str, scanner: CstScanner | None = None
+) -> Iterator[tuple[str, CstFindResult]]:
+    """Stream cst_find_pattern results for every Python file in target.
+
+    Raises:
+        ValueError: If pattern is not recognized
+    """
+    _pattern_to_matcher(pattern)
+    scanner = scanner or get_scanner()
+    for path, result in scanner.iter_results(expand_paths(target), _Task("find", pattern)):
+        yield path, CstFindResult.model_validate(result)
+
+
+def iter_validate(
+    target: str, checks: Sequence[str] | None = None, scanner: CstScanner | None = None
+) -> Iterator[tuple[str, dict[str, DomainValidationResult]]]:
+    """Stream validate_all results for every Python file in target.
+
+    Raises:
+        ValueError: If a check name is not recognized
+    """
+    task = _Task("validate", tuple(resolve_checks(checks)))
+    scanner = scanner or get_scanner()
+    for path, results in scanner.iter_results(expand_paths(target), task):
+        yield path, {
+            name: DomainValidationResult.model_validate(r) for name, r in results.items()
+        }
+
+
+def _summarize_errors(errors: list[str]) -> str | None:
+    if not errors:
+        return None
+    shown = "; ".join(sorted(errors)[:5])
+    more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+    return f"{len(errors)} file(s) failed: {shown}{more}"
+
+
+def scan_pattern(target: str, pattern: str) -> CstFindResult:
+    """Find nodes matching a pattern in every Python file under a directory or glob.
+
+    Args:
+        target: A file, a directory (searched recursively) or a glob
+            such as "src/**/*.py"
+        pattern: Any pattern accepted by cst_find_pattern
+
+    Returns:
+        CstFindResult whose matches carry their file, ordered by file and
+        line. success is False if any file failed; parse_error lists them.
+    """
+    try:
+        results = sorted(iter_find_pattern(target, pattern), key=lambda item: item[0])
+    except ValueError as e:
+        return CstFindResult(success=False, match_count=0, matches=[], parse_error=str(e))
+    matches = []
+    errors = []
+    for path, result in results:
+        if result.parse_error is not None:
+            errors.append(f"{path}: {result.parse_error}")
+        matches.extend(match.model_copy(update={"file": path}) for match in result.matches)
+    return CstFindResult(
+        success=not errors,
+        match_count=len(matches),
+        matches=matches,
+        parse_error=_summarize_errors(errors),
+    )
+
+
+def scan_validate(
+    target: str, checks: Sequence[str] | None = None
+) -> dict[str, DomainValidationResult]:
+    """Run domain validators over every Python file under a directory or glob.
+
+    Each file is parsed and walked once (see validate_all) in a worker
+    process; unchanged files reuse their indexed results.
+
+    Args:
+        target: A file, a directory (searched recursively) or a glob
+        checks: Validator or domain names, as for validate_all
+
+    Returns:
+        Mapping of validator name to one DomainValidationResult covering
+        all files, with each issue tagged with its file
+
+    Raises:
+        ValueError: If a check name is not recognized
+    """
+    names = resolve_checks(checks)
+    issues: dict[str, list[ValidationIssue]] = {name: [] for name in names}
+    errors: dict[str, list[str]] = {name: [] for name in names}
+    for path, results in sorted(iter_validate(target, names), key=lambda item: item[0]):
+        for name, result in results.items():
+            if result.parse_error is not None:
+                errors[name].append(f"{path}: {result.parse_error}")
+            issues[name].extend(issue.model_copy(update={"file": path}) for issue in result.issues)
+    return {
+        name: DomainValidationResult(
+            valid=not errors[name] and all(i.severity != "error" for i in issues[name]),
+            domain=CHECKS[name].domain,
+            issues=issues[name],
+            parse_error=_summarize_errors(errors[name]),
+        )
+        for name in names
+    }
@@ -4,6 +4,7 @@ Exposes the validator dispatcher and all individual validators.
 """
 
 from punie.cst.domain_models import DomainValidationResult
+from punie.cst.validators.engine import validate_all
 from punie.cst.validators.svcs import (
     check_dependency_graph,
     validate_injection_site,
@@ -30,5 +31,6 @@ __all__ = [
     "validate_injection_site",
     "validate_middleware_chain",
     "validate_route_pattern",
+    "validate_all",
     "validate_service_registration",
 ]
@@ -0,0 +1,165 @@
+"""Single-pass engine that runs several domain validators over one tree.
+
+Each domain validator has its own CSTVisitor and, called on its own, walks
+the whole module. validate_all() parses the file once (through the shared
+parse cache) and drives every requested visitor from a single traversal,
+returning one DomainValidationResult per check.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+
+import libcst as cst
+
+from punie.cst.core import get_parse_cache, read_source
+from punie.cst.domain_models import DomainValidationResult, ValidationIssue
+from punie.cst.validators.svcs import (
+    _DependencyGraphVisitor,
+    _InjectionSiteVisitor,
+    _ServiceRegistrationVisitor,
+)
+from punie.cst.validators.tdom import (
+    _ComponentVisitor,
+    _EscapeContextVisitor,
+    _RenderTreeVisitor,
+)
+from punie.cst.validators.tdom_svcs import (
+    _DITemplateBindingVisitor,
+    _MiddlewareChainVisitor,
+    _RoutePatternVisitor,
+)
+
+
+@dataclass(frozen=True)
+class _Check:
+    """How to run one validator inside the combined traversal."""
+
+    domain: str
+    """Validator family reported in the result."""
+
+    visitor: Callable[[], cst.CSTVisitor]
+    """Factory for a fresh visitor."""
+
+
+# Keyed by the name of the standalone validator function
+CHECKS: dict[str, _Check] = {
+    "validate_component": _Check("tdom", _ComponentVisitor),
+    "check_render_tree": _Check("tdom", _RenderTreeVisitor),
+    "validate_escape_context": _Check("tdom", _EscapeContextVisitor),
+    "validate_service_registration": _Check("svcs", _ServiceRegistrationVisitor),
+    "check_dependency_graph": _Check("svcs", _DependencyGraphVisitor),
+    "validate_injection_site": _Check("svcs", _InjectionSiteVisitor),
+    "validate_middleware_chain": _Check("tdom-svcs", _MiddlewareChainVisitor),
+    "check_di_template_binding": _Check("tdom-svcs", _DITemplateBindingVisitor),
+    "validate_route_pattern": _Check("tdom-svcs", _RoutePatternVisitor),
+}
+
+
+class _CombinedVisitor(cst.CSTVisitor):
+    """Fans each visit/leave event out to several visitors.
+
+    A visitor that returns False from visit_X skips that node's children,
+    exactly as it would when walking the tree on its own; the others still
+    descend.
+    """
+
+    def __init__(self, visitors: Sequence[cst.CSTVisitor]) -> None:
+        super().__init__()
+        self._visitors = visitors
+        self._skipping: dict[int, cst.CSTNode] = {}
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        for index, visitor in enumerate(self._visitors):
+            if index in self._skipping:
+                continue
+            if not visitor.on_visit(node):
+                self._skipping[index] = node
+        return True
+
+    def on_leave(self, original_node: cst.CSTNode) -> None:
+        for index, visitor in enumerate(self._visitors):
+            skipped = self._skipping.get(index)
+            if skipped is not None:
+                if skipped is not original_node:
+                    continue
+                del self._skipping[index]
+            visitor.on_leave(original_node)
+
+
+def resolve_checks(checks: Iterable[str] | None = None) -> list[str]:
+    """Expand check names and domain names into validator names.
+
+    >>> resolve_checks(["svcs", "validate_route_pattern"])
+    ['validate_service_registration', 'check_dependency_graph', 'validate_injection_site', 'validate_route_pattern']
+
+    Raises:
+        ValueError: If a name is neither a validator nor a domain
+    """
+    if checks is None:
+        return list(CHECKS)
+    if isinstance(checks, str):
+        checks = [checks]
+    names: list[str] = []
+    for check in checks:
+        if check in CHECKS:
+            expanded = [check]
+        else:
+            expanded = [name for name, spec in CHECKS.items() if spec.domain == check]
+            if not expanded:
+                valid = ", ".join([*CHECKS, "tdom", "svcs", "tdom-svcs"])
+                raise ValueError(f"Unknown check: {check!r}. Use one of: {valid}")
+        names.extend(name for name in expanded if name not in names)
+    return names
+
+
+def _issues(visitor: cst.CSTVisitor) -> list[ValidationIssue]:
+    get_issues = getattr(visitor, "get_issues", None)
+    return get_issues() if get_issues is not None else visitor.issues  # type: ignore[attr-defined]
+
+
+def validate_all(
+    file_path: str, checks: Sequence[str] | None = None, source: str | None = None
+) -> dict[str, DomainValidationResult]:
+    """Run several domain validators on a file with one parse and one walk.
+
+    Args:
+        file_path: Path to Python file to analyze
+        checks: Validator names (e.g. "validate_component") or domain names
+            ("tdom", "svcs", "tdom-svcs"); None runs all nine validators
+        source: The file's text, if already read (default: read file_path)
+
+    Returns:
+        Mapping of validator name to its DomainValidationResult, in the
+        order the checks were requested
+
+    Raises:
+        ValueError: If a check name is not recognized
+    """
+    names = resolve_checks(checks)
+    try:
+        if source is None:
+            source = read_source(file_path)
+        module = get_parse_cache().parse(source)
+    except Exception as e:
+        return {
+            name: DomainValidationResult(
+                valid=False, domain=CHECKS[name].domain, issues=[], parse_error=str(e)
+            )
+            for name in names
+        }
+
+    visitors = [CHECKS[name].visitor() for name in names]
+    module.visit(_CombinedVisitor(visitors))
+
+    results: dict[str, DomainValidationResult] = {}
+    for name, visitor in zip(names, visitors, strict=True):
+        issues = _issues(visitor)
+        errors = [i for i in issues if i.severity == "error"]
+        results[name] = DomainValidationResult(
+            valid=len(errors) == 0,
+            domain=CHECKS[name].domain,
+            issues=issues,
+        )
+    return results
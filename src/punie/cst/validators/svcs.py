@@ -11,6 +11,7 @@ from __future__ import annotations
 import libcst as cst
 import libcst.matchers as m
 
+from punie.cst.core import parse_file
 from punie.cst.domain_models import DomainValidationResult, ValidationIssue
 
 
@@ -136,9 +137,7 @@ def validate_service_registration(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
@@ -231,9 +230,7 @@ def check_dependency_graph(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
@@ -320,9 +317,7 @@ def validate_injection_site(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
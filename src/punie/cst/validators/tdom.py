@@ -13,6 +13,7 @@ from typing import Any
 import libcst as cst
 import libcst.matchers as m
 
+from punie.cst.core import parse_file
 from punie.cst.domain_models import DomainValidationResult, ValidationIssue
 
 
@@ -156,9 +157,7 @@ def validate_component(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
@@ -229,9 +228,7 @@ def check_render_tree(file_path: str) -> DomainValidationResult:
         a future phase.
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
@@ -289,9 +286,7 @@ def validate_escape_context(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
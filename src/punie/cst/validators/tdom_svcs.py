@@ -11,6 +11,7 @@ from __future__ import annotations
 import libcst as cst
 import libcst.matchers as m
 
+from punie.cst.core import parse_file
 from punie.cst.domain_models import DomainValidationResult, ValidationIssue
 
 
@@ -142,9 +143,7 @@ def validate_middleware_chain(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
@@ -241,9 +240,7 @@ def check_di_template_binding(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
@@ -321,9 +318,7 @@ def validate_route_pattern(file_path: str) -> DomainValidationResult:
         DomainValidationResult with issues list
     """
     try:
-        with open(file_path) as f:
-            source = f.read()
-        module = cst.parse_module(source)
+        module = parse_file(file_path)
     except Exception as e:
         return DomainValidationResult(
             valid=False,
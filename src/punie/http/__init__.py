@@ -2,10 +2,26 @@
 
 This package provides HTTP server functionality to run alongside ACP stdio,
 enabling dual-protocol operation for IDE integration and web access.
+
+The app and runner (starlette, uvicorn) are imported on first access.
 """
 
-from punie.http.app import create_app
-from punie.http.runner import run_dual, run_http
+from typing import TYPE_CHECKING
+
+from punie._lazy import lazy_exports
 from punie.http.types import Host, HttpAppFactory, Port
 
+if TYPE_CHECKING:
+    from punie.http.app import create_app
+    from punie.http.runner import run_dual, run_http
+
+# Export name → module that defines it
+_LAZY_EXPORTS = {
+    "create_app": "punie.http.app",
+    "run_dual": "punie.http.runner",
+    "run_http": "punie.http.runner",
+}
+
 __all__ = ["create_app", "run_dual", "run_http", "HttpAppFactory", "Host", "Port"]
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
@@ -0,0 +1,274 @@
+"""Process-wide outgoing HTTP client for model providers and health checks.
+
+Model providers (local OpenAI-compatible servers, mlx_lm.server, Ollama)
+and server health checks all talk to a few localhost ports. HttpClientPool
+gives them one httpx.AsyncClient with a pooled, keep-alive transport and
+configurable limits, so requests to localhost:1234, :8080 or :11434 reuse
+open connections. HTTP/2 is used when the optional h2 package is installed;
+httpx negotiates it over TLS, and plain-http local servers keep using
+HTTP/1.1 keep-alive. The transport counts requests, errors and time per
+host (HttpPoolStats).
+
+Connections belong to the event loop that opened them, so client() hands
+out one client per running event loop and drops those of closed loops
+(e.g. between asyncio.run() calls or test cases). Model providers outlive
+event loops: agents are pooled across sessions. They are built on
+provider_client(), which sends each request through client() of the loop
+it runs on.
+
+Example:
+    pool = get_http_pool()
+    response = await pool.client().get("http://localhost:8080/v1/models")
+    print(pool.stats().requests)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0  # Seconds an idle connection stays open
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 600.0  # Long generations on local models
+
+# Process-wide pool used by model providers and server health checks
+_pool: HttpClientPool | None = None
+
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    """Limits and protocol settings of the shared HTTP client.
+
+    >>> HttpPoolConfig(http2=False).use_http2
+    False
+    """
+
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    """Open connections across all hosts."""
+
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    """Idle connections kept for reuse."""
+
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+    """Seconds before an idle connection is closed."""
+
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    """Seconds to establish a connection."""
+
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+    """Seconds to wait for response data (and for writes and a free connection)."""
+
+    http2: bool | None = None
+    """Enable HTTP/2 (None: whenever the h2 package is installed)."""
+
+    @property
+    def use_http2(self) -> bool:
+        """Whether the transport is built with HTTP/2 support."""
+        if self.http2 is None:
+            return importlib.util.find_spec("h2") is not None
+        return self.http2
+
+
+@dataclass(frozen=True)
+class HttpPoolStats:
+    """Snapshot of HttpClientPool counters."""
+
+    requests: int
+    """Requests sent, including failed ones."""
+
+    errors: int
+    """Requests that failed without a response (connect errors, timeouts)."""
+
+    seconds: float
+    """Total time until response headers arrived, over all requests."""
+
+    clients: int
+    """httpx clients created (one per event loop used, plus replacements of closed ones)."""
+
+    open_connections: int
+    """Connections currently held by the pool (open or idle)."""
+
+    requests_by_host: dict[str, int] = field(default_factory=dict)
+    """Requests per host (with the port when it is not the scheme's default)."""
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Pooled transport that records request metrics."""
+
+    def __init__(self, pool: HttpClientPool, transport: httpx.AsyncHTTPTransport) -> None:
+        self._pool = pool
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = await self._transport.handle_async_request(request)
+            failed = False
+            return response
+        finally:
+            self._pool._record(request.url, time.perf_counter() - start, failed)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    @property
+    def connection_count(self) -> int:
+        # httpcore's pool is not public API; report 0 if it changes shape
+        connections = getattr(getattr(self._transport, "_pool", None), "connections", ())
+        return len(connections)
+
+
+class _ProviderClient(httpx.AsyncClient):
+    """Client that sends every request through its pool's client for the running loop."""
+
+    def __init__(self, pool: HttpClientPool) -> None:
+        # Requests are built here (with the pool's timeouts) but never sent here
+        super().__init__(transport=httpx.AsyncBaseTransport(), timeout=pool.timeout)
+        self._pool = pool
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        return await self._pool.client().send(request, **kwargs)
+
+    async def aclose(self) -> None:
+        """Leave the pool's clients open: the pool owns them, not the provider."""
+
+
+class HttpClientPool:
+    """Shared keep-alive httpx.AsyncClients (one per event loop) plus their metrics."""
+
+    def __init__(self, config: HttpPoolConfig | None = None) -> None:
+        self.config = config or HttpPoolConfig()
+        # Event loop (None: no running loop) → its client and transport
+        self._clients: dict[
+            asyncio.AbstractEventLoop | None, tuple[httpx.AsyncClient, _CountingTransport]
+        ] = {}
+        self._provider_client: _ProviderClient | None = None
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._seconds = 0.0
+        self._created = 0
+        self._by_host: Counter[str] = Counter()
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        """Request timeouts from the config."""
+        return httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout)
+
+    def client(self) -> httpx.AsyncClient:
+        """Return the running event loop's client, creating it on first use or after aclose().
+
+        A client created outside an event loop is taken over by the first
+        loop that asks for one. Clients of closed loops are dropped.
+        """
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            for stale in [
+                key
+                for key, (client, _) in self._clients.items()
+                if client.is_closed or (key is not None and key.is_closed())
+            ]:
+                del self._clients[stale]
+            entry = self._clients.get(loop)
+            if entry is None and loop is not None:
+                entry = self._clients.pop(None, None)
+            if entry is None:
+                entry = self._create_client()
+            self._clients[loop] = entry
+            return entry[0]
+
+    def provider_client(self) -> httpx.AsyncClient:
+        """Client for objects that outlive event loops, such as model providers.
+
+        Each request goes through client() of the loop it is sent from, so
+        a provider built once keeps working after the pool replaces a client
+        and when its agent is used from another event loop. Closing it
+        leaves the pool's clients open.
+        """
+        with self._lock:
+            if self._provider_client is None:
+                self._provider_client = _ProviderClient(self)
+            return self._provider_client
+
+    async def aclose(self) -> None:
+        """Close the clients and their connections (the next client() makes a new one).
+
+        Only clients of the running loop (or of none) are closed; the
+        connections of other loops can't be closed from here and are dropped.
+        """
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            clients = [
+                client for key, (client, _) in self._clients.items() if key in (loop, None)
+            ]
+            self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def stats(self) -> HttpPoolStats:
+        """Current counters."""
+        with self._lock:
+            return HttpPoolStats(
+                requests=self._requests,
+                errors=self._errors,
+                seconds=self._seconds,
+                clients=self._created,
+                open_connections=sum(
+                    transport.connection_count for _, transport in self._clients.values()
+                ),
+                requests_by_host=dict(self._by_host),
+            )
+
+    def _create_client(self) -> tuple[httpx.AsyncClient, _CountingTransport]:
+        config = self.config
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        transport = _CountingTransport(
+            self, httpx.AsyncHTTPTransport(limits=limits, http2=config.use_http2)
+        )
+        self._created += 1
+        return httpx.AsyncClient(transport=transport, timeout=self.timeout), transport
+
+    def _record(self, url: httpx.URL, seconds: float, failed: bool) -> None:
+        with self._lock:
+            self._requests += 1
+            self._errors += failed
+            self._seconds += seconds
+            self._by_host[url.netloc.decode("ascii")] += 1
+
+
+def get_http_pool() -> HttpClientPool:
+    """Return the process-wide HTTP client pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = HttpClientPool()
+    return _pool
+
+
+def set_http_pool(pool: HttpClientPool | None) -> HttpClientPool | None:
+    """Replace the process-wide pool (e.g. to change limits), returning the old one.
+
+    The caller is responsible for closing the previous pool.
+    """
+    global _pool
+    previous, _pool = _pool, pool
+    return previous
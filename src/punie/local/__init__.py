@@ -1,6 +1,15 @@
 """Local client implementation for standalone agent execution."""
 
 from punie.local.client import LocalClient
+from punie.local.line_index import LineIndex, read_lines
 from punie.local.safety import WorkspaceBoundaryError, resolve_workspace_path
+from punie.local.terminal_buffer import TerminalBuffer
 
-__all__ = ["LocalClient", "WorkspaceBoundaryError", "resolve_workspace_path"]
+__all__ = [
+    "LineIndex",
+    "LocalClient",
+    "TerminalBuffer",
+    "WorkspaceBoundaryError",
+    "read_lines",
+    "resolve_workspace_path",
+]
@@ -1,6 +1,7 @@
 """Local client implementation using real filesystem and subprocess operations."""
 
 import asyncio
+import signal
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -21,6 +22,7 @@ from punie.acp.schema import (
     ReleaseTerminalResponse,
     RequestPermissionResponse,
     SessionInfoUpdate,
+    TerminalExitStatus,
     TerminalOutputResponse,
     ToolCallProgress,
     ToolCallStart,
@@ -29,10 +31,14 @@ from punie.acp.schema import (
     WaitForTerminalExitResponse,
     WriteTextFileResponse,
 )
+from punie.local.line_index import read_lines
 from punie.local.safety import resolve_workspace_path
+from punie.local.terminal_buffer import TerminalBuffer
 
 __all__ = ["LocalClient"]
 
+READ_CHUNK_SIZE = 64 * 1024  # Bytes per read from a terminal's stdout
+
 
 @dataclass
 class LocalClient:
@@ -50,7 +56,8 @@ class LocalClient:
     _terminals: dict[str, asyncio.subprocess.Process] = field(
         default_factory=dict, init=False
     )
-    _terminal_outputs: dict[str, str] = field(default_factory=dict, init=False)
+    _terminal_outputs: dict[str, TerminalBuffer] = field(default_factory=dict, init=False)
+    _terminal_readers: dict[str, asyncio.Task[None]] = field(default_factory=dict, init=False)
     _agent: Any | None = field(default=None, init=False)
 
     def _resolve_path(self, path: str) -> Path:
@@ -84,6 +91,10 @@ class LocalClient:
             line: Starting line number (1-indexed)
             **kwargs: Additional parameters (unused)
 
+        Line ranges are served from a cached mmap-backed line index, so
+        only the requested lines are decoded. File IO runs in a worker
+        thread to keep the event loop responsive on very large files.
+
         Returns:
             ReadTextFileResponse with file content
 
@@ -91,14 +102,7 @@ class LocalClient:
             FileNotFoundError: If file doesn't exist
         """
         full_path = self._resolve_path(path)
-        content = full_path.read_text()
-
-        # Handle line/limit parameters
-        if line is not None or limit is not None:
-            lines = content.splitlines(keepends=True)
-            start = (line - 1) if line else 0
-            end = start + limit if limit else None
-            content = "".join(lines[start:end])
+        content = await asyncio.to_thread(read_lines, full_path, line, limit)
 
         return ReadTextFileResponse(content=content)
 
@@ -113,12 +117,14 @@ class LocalClient:
             session_id: Session ID (unused in local mode)
             **kwargs: Additional parameters (unused)
 
+        File IO runs in a worker thread, like read_text_file(), so large
+        writes don't stall the event loop.
+
         Returns:
             WriteTextFileResponse on success
         """
         full_path = self._resolve_path(path)
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(content)
+        await asyncio.to_thread(_write_file, full_path, content)
         return WriteTextFileResponse()
 
     async def request_permission(
@@ -195,9 +201,13 @@ class LocalClient:
             args: Command arguments
             cwd: Working directory for command
             env: Environment variables
-            output_byte_limit: Maximum output bytes (unused)
+            output_byte_limit: Maximum output bytes to retain; older output is
+                dropped beyond it (default: DEFAULT_OUTPUT_BYTE_LIMIT)
             **kwargs: Additional parameters (unused)
 
+        Output is streamed into a bounded buffer by a background reader
+        while the command runs.
+
         Returns:
             CreateTerminalResponse with terminal_id
         """
@@ -224,22 +234,28 @@ class LocalClient:
         # Generate terminal ID and store process
         terminal_id = f"term-{id(process)}"
         self._terminals[terminal_id] = process
-        self._terminal_outputs[terminal_id] = ""
+        buffer = self._terminal_outputs[terminal_id] = TerminalBuffer(output_byte_limit)
+        self._terminal_readers[terminal_id] = asyncio.create_task(
+            _read_output(process, buffer), name=f"punie-{terminal_id}-output"
+        )
 
         return CreateTerminalResponse(terminal_id=terminal_id)
 
     async def terminal_output(
-        self, session_id: str, terminal_id: str, **kwargs: Any
+        self, session_id: str, terminal_id: str, offset: int = 0, **kwargs: Any
     ) -> TerminalOutputResponse:
-        """Get output from subprocess.
+        """Get output captured so far, without blocking.
 
         Args:
             session_id: Session ID (unused in local mode)
             terminal_id: Terminal ID from create_terminal
+            offset: Only return output after this absolute byte offset; pass
+                the previous response's _meta["offset"] to poll incrementally
             **kwargs: Additional parameters (unused)
 
         Returns:
-            TerminalOutputResponse with output content
+            TerminalOutputResponse with output content, exit status once the
+            command has finished, and _meta["offset"] (bytes produced so far)
 
         Raises:
             KeyError: If terminal_id not found
@@ -248,22 +264,17 @@ class LocalClient:
             raise KeyError(f"Terminal {terminal_id} not found")
 
         process = self._terminals[terminal_id]
-
-        # Read available output without blocking
-        if process.stdout:
-            try:
-                # Try to read available data
-                data = await asyncio.wait_for(
-                    process.stdout.read(8192), timeout=0.1
-                )
-                if data:
-                    output = data.decode("utf-8", errors="replace")
-                    self._terminal_outputs[terminal_id] += output
-            except asyncio.TimeoutError:
-                pass
+        buffer = self._terminal_outputs[terminal_id]
+        reader = self._terminal_readers[terminal_id]
+        exit_status = None
+        if process.returncode is not None and reader.done():
+            exit_status = _exit_status(process.returncode)
 
         return TerminalOutputResponse(
-            output=self._terminal_outputs[terminal_id], truncated=False
+            output=buffer.text(offset),
+            truncated=buffer.truncated,
+            exit_status=exit_status,
+            field_meta={"offset": buffer.total},
         )
 
     async def release_terminal(
@@ -279,10 +290,12 @@ class LocalClient:
         Returns:
             ReleaseTerminalResponse on success
         """
-        if terminal_id in self._terminals:
-            del self._terminals[terminal_id]
-        if terminal_id in self._terminal_outputs:
-            del self._terminal_outputs[terminal_id]
+        process = self._terminals.pop(terminal_id, None)
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+        await self._stop_reader(terminal_id)
+        self._terminal_outputs.pop(terminal_id, None)
         return ReleaseTerminalResponse()
 
     async def wait_for_terminal_exit(
@@ -306,15 +319,9 @@ class LocalClient:
 
         process = self._terminals[terminal_id]
 
-        # Read any remaining output before waiting
-        if process.stdout:
-            remaining = await process.stdout.read()
-            if remaining:
-                output = remaining.decode("utf-8", errors="replace")
-                self._terminal_outputs[terminal_id] += output
-
-        # Wait for process to complete
+        # Wait for the process, then for the reader to drain its last output
         exit_code = await process.wait()
+        await asyncio.shield(self._terminal_readers[terminal_id])
 
         return WaitForTerminalExitResponse(exit_code=exit_code)
 
@@ -343,11 +350,21 @@ class LocalClient:
 
         # Clean up
         del self._terminals[terminal_id]
-        if terminal_id in self._terminal_outputs:
-            del self._terminal_outputs[terminal_id]
+        await self._stop_reader(terminal_id)
+        self._terminal_outputs.pop(terminal_id, None)
 
         return KillTerminalCommandResponse()
 
+    async def _stop_reader(self, terminal_id: str) -> None:
+        """Cancel a terminal's output reader and wait for it to finish."""
+        reader = self._terminal_readers.pop(terminal_id, None)
+        if reader is not None and not reader.done():
+            reader.cancel()
+            try:
+                await reader
+            except asyncio.CancelledError:
+                pass
+
     async def discover_tools(self, session_id: str, **kwargs: Any) -> dict[str, Any]:
         """Return empty tool catalog (no IDE discovery in local mode).
 
@@ -392,3 +409,28 @@ class LocalClient:
             conn: Agent connection
         """
         self._agent = conn
+
+
+async def _read_output(process: asyncio.subprocess.Process, buffer: TerminalBuffer) -> None:
+    """Stream a terminal's stdout into its buffer until EOF."""
+    if process.stdout is None:
+        return
+    while data := await process.stdout.read(READ_CHUNK_SIZE):
+        buffer.write(data)
+
+
+def _write_file(path: Path, content: str) -> None:
+    """Write content to path, creating parent directories as needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _exit_status(returncode: int) -> TerminalExitStatus:
+    """ACP exit status for a finished process (negative codes are signals)."""
+    if returncode < 0:
+        try:
+            name = signal.Signals(-returncode).name
+        except ValueError:
+            name = str(-returncode)
+        return TerminalExitStatus(exit_code=None, signal=name)
+    return TerminalExitStatus(exit_code=returncode, signal=None)
@@ -0,0 +1,162 @@
+"""Line-range reads of large files through a cached, mmap-backed line index.
+
+LineIndex scans a file once through mmap and keeps a sparse index: the
+number of newlines before every BLOCK_SIZE bytes. A range read finds the
+block holding its first line, walks the few newlines left inside that block,
+and decodes only the requested bytes, so reading a few lines of a log in the
+hundreds of MB costs about as much as reading them from a small file. The
+index costs 8 bytes per block, so memory stays flat however large the file.
+Indexes are cached per path and rebuilt when the file's mtime or size
+changes, including when it changes between the cache check and the read.
+
+Text is decoded the same way for ranged and whole-file reads (read_lines):
+UTF-8 with undecodable bytes replaced, and "\\r\\n" line endings returned
+as "\\n". Lines are split on "\\n" only.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+
+BLOCK_SIZE = 1 << 20  # Bytes per index entry
+DEFAULT_MAX_INDEXES = 64
+
+_indexes: OrderedDict[Path, LineIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+class StaleIndexError(OSError):
+    """The file changed after its line index was built."""
+
+
+def decode_text(data: bytes) -> str:
+    """Decode file bytes the way every read_lines() result is decoded.
+
+    >>> decode_text(b"one\\r\\ntwo \\xff\\n")
+    'one\\ntwo \\ufffd\\n'
+    """
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+
+class LineIndex:
+    """Sparse newline index of one file, valid while its mtime and size hold.
+
+    >>> import tempfile
+    >>> with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as f:
+    ...     _ = f.write("one\\ntwo\\nthree\\nfour\\n")
+    >>> index = LineIndex(Path(f.name), block_size=4)
+    >>> index.line_count
+    4
+    >>> index.read(2, 2)
+    'two\\nthree\\n'
+    >>> os.unlink(f.name)
+    """
+
+    def __init__(self, path: Path, *, block_size: int = BLOCK_SIZE) -> None:
+        self.path = path
+        self.block_size = block_size
+        # newlines[i]: number of newlines before byte i * block_size
+        self._newlines = array("Q", [0])
+        self._total = 0
+        self._partial_last_line = False
+        with path.open("rb") as f:
+            # Stat the open file so the index and its mtime/size describe the same bytes
+            st = os.fstat(f.fileno())
+            self.mtime_ns = st.st_mtime_ns
+            self.size = st.st_size
+            if self.size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for start in range(0, self.size, block_size):
+                        self._total += mm[start : start + block_size].count(b"\n")
+                        self._newlines.append(self._total)
+                    self._partial_last_line = mm[self.size - 1] != ord("\n")
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counting a final line without a newline."""
+        return self._total + self._partial_last_line
+
+    def is_current(self, st: os.stat_result) -> bool:
+        """True if the file still has the mtime and size the index was built from."""
+        return st.st_mtime_ns == self.mtime_ns and st.st_size == self.size
+
+    def read(self, line: int | None = None, limit: int | None = None) -> str:
+        """Return limit lines starting at 1-based line (all remaining if limit is falsy).
+
+        Lines past the end of the file read as empty.
+
+        Raises:
+            StaleIndexError: If the file no longer has the indexed mtime and size
+        """
+        skip = max((line or 1) - 1, 0)
+        with self.path.open("rb") as f:
+            if not self.is_current(os.fstat(f.fileno())):
+                raise StaleIndexError(f"{self.path} changed since it was indexed")
+            if not self.size:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = self._offset(mm, skip)
+                end = self._offset(mm, skip + limit) if limit else self.size
+                return decode_text(mm[start:end])
+
+    def _offset(self, mm: mmap.mmap, newlines: int) -> int:
+        """Byte offset just after the given number of newlines (EOF if there are fewer)."""
+        if newlines == 0:
+            return 0
+        if newlines > self._total:
+            return self.size
+        # Last block that starts before the target newline
+        block = bisect_left(self._newlines, newlines) - 1
+        pos = block * self.block_size
+        for _ in range(newlines - self._newlines[block]):
+            pos = mm.find(b"\n", pos) + 1
+            if not pos:
+                raise StaleIndexError(f"{self.path} changed since it was indexed")
+        return pos
+
+
+def get_line_index(path: Path) -> LineIndex:
+    """Return the cached index for path, rebuilding it if the file changed.
+
+    Raises:
+        OSError: If the file cannot be stat'ed or read
+    """
+    st = path.stat()
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is not None and index.is_current(st):
+            _indexes.move_to_end(path)
+            return index
+    index = LineIndex(path)
+    with _indexes_lock:
+        _indexes[path] = index
+        _indexes.move_to_end(path)
+        while len(_indexes) > DEFAULT_MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def read_lines(path: Path, line: int | None = None, limit: int | None = None) -> str:
+    """Read a line range from path using its cached line index.
+
+    Without line or limit the whole file is read directly, decoded the same
+    way (see decode_text).
+
+    Args:
+        path: File to read
+        line: First line to return (1-based; default 1)
+        limit: Number of lines to return (default: to the end of the file)
+    """
+    if line is None and limit is None:
+        return decode_text(path.read_bytes())
+    try:
+        return get_line_index(path).read(line, limit)
+    except StaleIndexError:
+        # Changed between get_line_index()'s stat and the read: index it again
+        return get_line_index(path).read(line, limit)
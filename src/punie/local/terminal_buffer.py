@@ -0,0 +1,77 @@
+"""Bounded output buffer for LocalClient terminals.
+
+A background reader streams each subprocess's stdout into a TerminalBuffer
+as the command runs, instead of reading everything at exit into one
+ever-growing string (quadratic for chatty commands like ``pytest -v``).
+
+The buffer is a list of chunks capped at output_byte_limit bytes, following
+ACP's outputByteLimit semantics: once the limit is exceeded the oldest output
+is dropped, the cut lands on a UTF-8 character boundary, and truncated is
+reported. Every byte has an absolute offset (counted from the start of the
+command, truncated bytes included), so pollers can ask for just the output
+after the offset they last saw.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+# Retained when the creator of a terminal sets no outputByteLimit
+DEFAULT_OUTPUT_BYTE_LIMIT = 16 * 1024 * 1024
+
+
+class TerminalBuffer:
+    """Most recent output of one terminal, at most byte_limit bytes.
+
+    >>> buffer = TerminalBuffer(byte_limit=8)
+    >>> buffer.write(b"hello ")
+    >>> buffer.write(b"world\\n")
+    >>> buffer.text(), buffer.truncated, buffer.total
+    ('o world\\n', True, 12)
+    >>> buffer.text(offset=10)
+    'd\\n'
+    """
+
+    def __init__(self, byte_limit: int | None = None) -> None:
+        self.byte_limit = DEFAULT_OUTPUT_BYTE_LIMIT if byte_limit is None else byte_limit
+        self.total = 0
+        """Bytes written since the terminal started, including dropped ones."""
+        self.truncated = False
+        self._chunks: deque[bytes] = deque()
+        self._size = 0
+
+    @property
+    def start(self) -> int:
+        """Absolute offset of the oldest byte still retained."""
+        return self.total - self._size
+
+    def write(self, data: bytes) -> None:
+        """Append output, dropping the oldest bytes beyond byte_limit."""
+        if not data:
+            return
+        self._chunks.append(data)
+        self._size += len(data)
+        self.total += len(data)
+        excess = self._size - self.byte_limit
+        while excess > 0:
+            self.truncated = True
+            first = self._chunks[0]
+            if len(first) <= excess:
+                self._chunks.popleft()
+                self._size -= len(first)
+                excess -= len(first)
+                continue
+            # Cut inside the chunk, then skip continuation bytes (0b10xxxxxx)
+            # so the retained output starts on a character boundary
+            cut = excess
+            while cut < len(first) and first[cut] & 0xC0 == 0x80:
+                cut += 1
+            self._chunks[0] = first[cut:]
+            self._size -= cut
+            excess = 0
+
+    def text(self, offset: int = 0) -> str:
+        """Retained output from absolute offset onwards (from start if already dropped)."""
+        skip = max(offset - self.start, 0)
+        data = b"".join(self._chunks)[skip:]
+        return data.decode("utf-8", errors="replace")
@@ -27,6 +27,7 @@ class PromptTiming:
     model_name: str
     backend: Literal["local", "ide"]
     tool_timings: tuple[ToolTiming, ...]
+    time_to_first_token_ms: float | None = None
 
 
 class PerformanceCollector:
@@ -40,6 +41,7 @@ class PerformanceCollector:
         self._prompt_info: tuple[str, Literal["local", "ide"]] | None = (
             None  # (model_name, backend)
         )
+        self._time_to_first_token_ms: float | None = None
 
     def start_tool(self, name: str) -> None:
         """Record the start time of a tool call."""
@@ -67,6 +69,11 @@ class PerformanceCollector:
         """Record the start time of prompt execution."""
         self._prompt_start = time.monotonic()
         self._prompt_info = (model_name, backend)
+        self._time_to_first_token_ms = None
+
+    def record_first_token(self, ttft_ms: float) -> None:
+        """Record time-to-first-token for a streamed prompt."""
+        self._time_to_first_token_ms = ttft_ms
 
     def end_prompt(self) -> None:
         """Record the end time of prompt execution."""
@@ -92,4 +99,5 @@ class PerformanceCollector:
             model_name=model_name,
             backend=backend,
             tool_timings=tuple(self._tool_timings),
+            time_to_first_token_ms=self._time_to_first_token_ms,
         )
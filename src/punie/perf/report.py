@@ -23,6 +23,11 @@ def generate_html_report(timing: PromptTiming) -> str:
         (total_tool_time / timing.duration_ms * 100) if timing.duration_ms > 0 else 0
     )
     model_percentage = 100 - tool_percentage
+    ttft_text = (
+        f"{timing.time_to_first_token_ms:.2f} ms"
+        if timing.time_to_first_token_ms is not None
+        else "—"
+    )
 
     # Build tool rows
     tool_rows = ""
@@ -273,6 +278,10 @@ def generate_html_report(timing: PromptTiming) -> str:
                     <label>Model Think Time</label>
                     <div class="value">{model_think_time:.2f} ms</div>
                 </div>
+                <div class="summary-card">
+                    <label>Time to First Token</label>
+                    <div class="value">{ttft_text}</div>
+                </div>
             </div>
         </div>
 
@@ -185,6 +185,11 @@ class FakeClient:
         **kwargs: Any,
     ) -> ReadTextFileResponse:
         content = self.files.get(str(path), self.default_file_content)
+        if line is not None or limit is not None:
+            lines = content.splitlines(keepends=True)
+            start = (line - 1) if line else 0
+            end = start + limit if limit else None
+            content = "".join(lines[start:end])
         return ReadTextFileResponse(content=content)
 
     async def session_update(
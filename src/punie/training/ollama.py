@@ -9,6 +9,8 @@ from types import TracebackType
 
 import httpx
 
+from punie.http.client_pool import get_http_pool
+
 
 @dataclass
 class OllamaProcess:
@@ -38,15 +40,15 @@ class OllamaProcess:
     async def health_check(self) -> bool:
         """Check if ollama server is healthy by querying /api/tags endpoint.
 
-        Returns True if server responds successfully, False otherwise.
+        Returns True if server responds successfully, False otherwise. Polls
+        reuse the shared HTTP client's keep-alive connection.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/tags",
-                    timeout=5.0,
-                )
-                return response.status_code == 200
+            response = await get_http_pool().client().get(
+                f"{self.base_url}/api/tags",
+                timeout=5.0,
+            )
+            return response.status_code == 200
         except (httpx.ConnectError, httpx.TimeoutException):
             return False
 
@@ -9,6 +9,7 @@ from types import TracebackType
 
 import httpx
 
+from punie.http.client_pool import get_http_pool
 from punie.training.server_config import ServerConfig
 
 
@@ -77,15 +78,15 @@ class ServerProcess:
     async def health_check(self) -> bool:
         """Check if server is healthy by querying /v1/models endpoint.
 
-        Returns True if server responds successfully, False otherwise.
+        Returns True if server responds successfully, False otherwise. Polls
+        reuse the shared HTTP client's keep-alive connection.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.config.base_url}/models",
-                    timeout=5.0,
-                )
-                return response.status_code == 200
+            response = await get_http_pool().client().get(
+                f"{self.config.base_url}/models",
+                timeout=5.0,
+            )
+            return response.status_code == 200
         except (httpx.ConnectError, httpx.TimeoutException):
             return False
 
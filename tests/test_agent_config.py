@@ -33,6 +33,16 @@ def test_agent_config_defaults_to_acp_mode():
     assert config.validate_python_syntax is False
 
 
+def test_instructions_are_built_once_and_cached():
+    """Code Mode instructions are built on first use and reused after that."""
+    from punie.agent.config import punie_instructions, punie_local_instructions
+
+    assert punie_instructions() is punie_instructions()
+    assert punie_instructions() is PUNIE_INSTRUCTIONS
+    assert "def read_file(" in punie_local_instructions()
+    assert "{stubs}" not in punie_local_instructions()
+
+
 def test_agent_config_custom_values():
     """AgentConfig should accept custom values."""
     config = AgentConfig(
@@ -211,12 +221,12 @@ def test_create_local_agent_with_ollama_has_no_stop_sequences():
 
 
 def test_create_direct_toolset_returns_correct_count():
-    """create_direct_toolset should return 26 tools (3 base + 11 Code Tools + 12 Phase 32)."""
+    """create_direct_toolset should return 28 tools (4 base + 11 Code Tools + 13 Phase 32)."""
     from punie.agent.toolset import create_direct_toolset
 
     toolset = create_direct_toolset()
     assert toolset is not None
-    # 3 base: read_file, write_file, run_command
+    # 4 base: read_file, write_file, run_command, read_more
     # 11 Code Tools: typecheck_direct, ruff_check_direct, pytest_run_direct,
     #   git_status_direct, git_diff_direct, git_log_direct,
     #   goto_definition_direct, find_references_direct, hover_direct,
@@ -227,7 +237,8 @@ def test_create_direct_toolset_returns_correct_count():
     #   check_dependency_graph_direct, validate_injection_site_direct,
     #   validate_middleware_chain_direct, check_di_template_binding_direct,
     #   validate_route_pattern_direct
-    assert len(toolset.tools) == 26
+    # 1 combined validator: validate_all_direct
+    assert len(toolset.tools) == 28
 
 
 @pytest.mark.skip(reason="ollama_model removed in current phase")
@@ -242,10 +253,10 @@ def test_create_local_agent_ollama_uses_direct_toolset():
     assert client is not None
 
     # PydanticAI wraps toolsets, so check the actual FunctionToolset (last in list)
-    # Direct toolset has 26 tools vs Code Mode toolset has 8 tools
+    # Direct toolset has 28 tools vs Code Mode toolset has 9 tools
     assert len(agent.toolsets) > 0
     function_toolset = agent.toolsets[-1]  # Last toolset is the one we provided
-    assert len(function_toolset.tools) == 26
+    assert len(function_toolset.tools) == 28
 
 
 def test_create_local_agent_local_uses_code_mode_toolset():
@@ -259,7 +270,7 @@ def test_create_local_agent_local_uses_code_mode_toolset():
     assert client is not None
 
     # PydanticAI wraps toolsets, so check the actual FunctionToolset (last in list)
-    # Code Mode toolset has 8 tools: read/write/run_command/execute_code + 4 terminal
+    # Code Mode toolset has 9 tools: read/write/run_command/execute_code/read_more + 4 terminal
     assert len(agent.toolsets) > 0
     function_toolset = agent.toolsets[-1]  # Last toolset is the one we provided
-    assert len(function_toolset.tools) == 8
+    assert len(function_toolset.tools) == 9
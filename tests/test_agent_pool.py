@@ -0,0 +1,113 @@
+"""Tests for sharing Pydantic AI agents across sessions (punie.agent.agent_pool)."""
+
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from punie.acp import text_block
+from punie.agent import PunieAgent
+from punie.agent.agent_pool import AgentKey, AgentPool
+from punie.testing import FakeClient
+
+
+def _tool(name: str) -> dict:
+    return {"name": name, "kind": "read", "description": name, "parameters": {"type": "object"}}
+
+
+async def _agent_for(client: FakeClient, agent: PunieAgent):
+    agent.on_connect(client)
+    await agent.initialize(protocol_version=1)
+    response = await agent.new_session(cwd="/tmp", mcp_servers=[])
+    return agent._sessions[response.session_id].agent
+
+
+async def test_sessions_with_the_same_catalog_share_an_agent():
+    """Equal catalogs (in any order) reuse one agent; other catalogs get their own."""
+    agent = PunieAgent(model="test")
+
+    first = await _agent_for(FakeClient(tool_catalog=[_tool("read_file"), _tool("git")]), agent)
+    second = await _agent_for(FakeClient(tool_catalog=[_tool("git"), _tool("read_file")]), agent)
+    other = await _agent_for(FakeClient(tool_catalog=[_tool("read_file")]), agent)
+
+    assert second is first
+    assert other is not first
+    assert agent._agent_pool.stats().misses == 2
+
+
+async def test_pooled_agents_still_run_prompts_per_session():
+    """A shared agent serves prompts of several sessions."""
+    agent = PunieAgent(model="test")
+    client = FakeClient(tool_catalog=[_tool("read_file")])
+    agent.on_connect(client)
+    await agent.initialize(protocol_version=1)
+    sessions = [(await agent.new_session(cwd="/tmp", mcp_servers=[])).session_id for _ in range(3)]
+
+    responses = await asyncio.gather(
+        *(agent.prompt(prompt=[text_block("hi")], session_id=sid) for sid in sessions)
+    )
+
+    assert {r.stop_reason for r in responses} == {"end_turn"}
+    assert len({id(agent._sessions[sid].agent) for sid in sessions}) == 1
+
+
+async def test_lazy_registration_does_not_hold_the_state_lock_during_discovery():
+    """Other sessions can use shared state while one session is being discovered."""
+    entered = asyncio.Event()
+    gate = asyncio.Event()
+
+    class SlowClient(FakeClient):
+        async def discover_tools(self, session_id, **kwargs):
+            entered.set()
+            await gate.wait()
+            return await super().discover_tools(session_id, **kwargs)
+
+    agent = PunieAgent(model="test")
+    agent.on_connect(SlowClient(tool_catalog=[_tool("read_file")]))
+    await agent.initialize(protocol_version=1)
+
+    pending = asyncio.create_task(agent.prompt(prompt=[text_block("hi")], session_id="lazy-1"))
+    await asyncio.wait_for(entered.wait(), timeout=1)
+    await asyncio.wait_for(agent._state_lock.acquire(), timeout=1)
+    agent._state_lock.release()
+    gate.set()
+
+    assert (await pending).stop_reason == "end_turn"
+
+
+def test_pool_evicts_least_recently_used_agents():
+    """Beyond max_agents the least recently used agent is rebuilt on next use."""
+    pool = AgentPool(max_agents=2)
+    keys = [AgentKey(model="test", discovery_tier=1, tools=str(n)) for n in range(3)]
+    agents = [pool.get_or_create(key, object) for key in keys]
+
+    assert pool.get_or_create(keys[2], object) is agents[2]
+    assert pool.get_or_create(keys[0], object) is not agents[0]
+    assert pool.stats().agents == 2
+
+
+def test_build_errors_are_not_pooled():
+    """A failing build propagates and the next session tries again."""
+    pool = AgentPool()
+    key = AgentKey(model="local", discovery_tier=3)
+
+    def fail():
+        raise RuntimeError("server down")
+
+    with pytest.raises(RuntimeError):
+        pool.get_or_create(key, fail)
+    assert pool.get_or_create(key, object) is not None
+    assert pool.stats().agents == 1
+
+
+async def test_sessions_of_a_model_instance_share_an_agent():
+    """Model instances (unhashable dataclasses) are pooled by identity."""
+    model = FunctionModel(lambda messages, info: ModelResponse(parts=[TextPart("ok")]))
+    agent = PunieAgent(model=model)
+
+    first = await _agent_for(FakeClient(tool_catalog=[_tool("read_file")]), agent)
+    second = await _agent_for(FakeClient(tool_catalog=[_tool("read_file")]), agent)
+
+    assert second is first
+    assert first.model is model
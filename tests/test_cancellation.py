@@ -0,0 +1,143 @@
+"""Tests for prompt cancellation (PunieAgent.cancel() and PromptScope).
+
+Covers cancelling an in-flight prompt end to end (stop reason and terminal
+cleanup), abandoning sandbox bridge futures, and interrupting the execute_code
+sandbox thread.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+from pydantic_ai.models.test import TestModel
+
+from punie.acp import text_block
+from punie.agent import PunieAgent, create_pydantic_agent
+from punie.agent.cancellation import PromptScope, SandboxCancelled, ScopedClient
+from punie.agent.toolset import create_toolset
+from punie.testing import FakeClient
+
+
+class HangingTerminalClient(FakeClient):
+    """FakeClient whose terminals never exit until killed."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.waiting = asyncio.Event()
+        self.killed: list[str] = []
+
+    async def wait_for_terminal_exit(self, session_id, terminal_id=None, **kwargs):
+        self.waiting.set()
+        await asyncio.Event().wait()
+
+    async def kill_terminal(self, session_id, terminal_id=None, **kwargs):
+        self.killed.append(terminal_id)
+        return await super().kill_terminal(session_id, terminal_id, **kwargs)
+
+
+async def test_cancel_stops_prompt_and_kills_terminals():
+    """cancel() ends the prompt with stop_reason="cancelled" and kills its terminal."""
+    pydantic_agent = create_pydantic_agent(
+        model=TestModel(call_tools=["run_command"]), toolset=create_toolset()
+    )
+    agent = PunieAgent(pydantic_agent, name="test-agent")
+    client = HangingTerminalClient()
+    client.queue_permission_selected("allow")
+    agent.on_connect(client)
+
+    prompt_task = asyncio.create_task(
+        agent.prompt(prompt=[text_block("run it")], session_id="s-1")
+    )
+    await asyncio.wait_for(client.waiting.wait(), timeout=5)
+    await agent.cancel(session_id="s-1")
+    response = await asyncio.wait_for(prompt_task, timeout=5)
+
+    assert response.stop_reason == "cancelled"
+    assert client.killed == ["term-0"]
+    assert client.terminals == {}
+    assert agent._active_prompts == {}
+
+
+async def test_cancel_without_active_prompt_is_noop():
+    """cancel() for an idle session does nothing."""
+    agent = PunieAgent("test", name="test-agent")
+    agent.on_connect(FakeClient())
+
+    await agent.cancel(session_id="idle")
+
+    assert agent._active_prompts == {}
+
+
+async def test_scoped_client_tracks_and_releases_terminals():
+    """ScopedClient records created terminals and forgets released ones."""
+    client = FakeClient()
+    scope = PromptScope("s-1")
+    scoped = ScopedClient(client, scope)
+
+    first = await scoped.create_terminal(command="ls", session_id="s-1")
+    second = await scoped.create_terminal(command="pwd", session_id="s-1")
+    await scoped.release_terminal(session_id="s-1", terminal_id=first.terminal_id)
+
+    assert scope.terminal_ids == {second.terminal_id}
+
+
+async def test_scoped_client_refuses_terminals_after_cancel():
+    """No new terminal is created once the prompt is cancelled."""
+    client = FakeClient()
+    scope = PromptScope("s-1")
+    scope.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await ScopedClient(client, scope).create_terminal(
+            command="ls", session_id="s-1"
+        )
+    assert client.terminals == {}
+
+
+def test_scope_cancels_tracked_futures():
+    """Bridge futures are cancelled by cancel(), and immediately afterwards."""
+    scope = PromptScope("s-1")
+    pending: concurrent.futures.Future[str] = concurrent.futures.Future()
+    scope.track_future(pending)
+
+    scope.cancel()
+
+    assert pending.cancelled()
+    late: concurrent.futures.Future[str] = concurrent.futures.Future()
+    scope.track_future(late)
+    assert late.cancelled()
+
+
+def test_scope_interrupts_sandbox_thread():
+    """cancel() raises SandboxCancelled inside a busy sandbox thread."""
+    scope = PromptScope("s-1")
+    started = threading.Event()
+    outcome: list[BaseException] = []
+
+    def sandbox() -> None:
+        try:
+            with scope.sandbox_thread():
+                started.set()
+                while True:
+                    pass
+        except SandboxCancelled as exc:
+            outcome.append(exc)
+
+    thread = threading.Thread(target=sandbox)
+    thread.start()
+    assert started.wait(timeout=5)
+    scope.cancel()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert len(outcome) == 1
+
+
+def test_scope_rejects_sandbox_after_cancel():
+    """A sandbox started after cancellation fails before running any code."""
+    scope = PromptScope("s-1")
+    scope.cancel()
+
+    with pytest.raises(SandboxCancelled), scope.sandbox_thread():
+        pass
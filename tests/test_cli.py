@@ -8,6 +8,8 @@ Tests are organized into groups:
 import json
 import logging
 import shutil
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -317,8 +319,9 @@ async def test_run_serve_agent_creates_agent(monkeypatch):
         assert port == Port(8000)
         assert log_level == "info"
 
-    monkeypatch.setattr("punie.cli.PunieAgent", MockAgent)
-    monkeypatch.setattr("punie.cli.run_http", mock_run_http)
+    # The CLI imports these inside run_serve_agent, so patch their home modules
+    monkeypatch.setattr("punie.agent.adapter.PunieAgent", MockAgent)
+    monkeypatch.setattr("punie.http.runner.run_http", mock_run_http)
 
     await run_serve_agent("test", "test-agent", "127.0.0.1", 8000, "info")
 
@@ -396,3 +399,18 @@ def test_serve_model_flag_overrides_env(monkeypatch):
     runner.invoke(app, ["serve", "--model", "claude-haiku-3"])
 
     assert resolved_model == "claude-haiku-3"
+
+
+def test_cli_import_defers_heavy_dependencies():
+    """Importing the CLI loads none of the agent/server stacks (fast startup)."""
+    probe = (
+        "import sys, punie.cli, punie.client.ask_client; "
+        "print(','.join(m for m in ('pydantic_ai', 'libcst', 'starlette', 'uvicorn', 'httpx') "
+        "if m in sys.modules))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
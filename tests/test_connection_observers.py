@@ -0,0 +1,104 @@
+"""Tests for acp.Connection stream observers (read-only views, method filters)."""
+
+import asyncio
+import json
+
+import pytest
+
+from punie.acp.connection import Connection, StreamDirection, StreamEvent
+
+
+async def _echo_handler(method, params, is_notification):
+    if is_notification:
+        return None
+    return {"echo": params}
+
+
+async def _connect(server) -> tuple[Connection, Connection]:
+    responder = Connection(_echo_handler, server.server_writer, server.server_reader)
+    caller = Connection(_echo_handler, server.client_writer, server.client_reader)
+    return responder, caller
+
+
+@pytest.mark.thread_unsafe
+async def test_observer_receives_read_only_views(server):
+    """Observers get views of the live message, which cannot be mutated."""
+    responder, caller = await _connect(server)
+    events: list[StreamEvent] = []
+    caller.add_observer(events.append)
+
+    result = await caller.send_request("fs/read_text_file", {"content": ["a", "b"]})
+
+    assert result == {"echo": {"content": ["a", "b"]}}
+    outgoing, incoming = events
+    assert outgoing.direction is StreamDirection.OUTGOING
+    assert incoming.message["result"]["echo"]["content"] == ["a", "b"]
+    assert outgoing.message["params"]["content"][1] == "b"
+    with pytest.raises(TypeError):
+        outgoing.message["params"]["content"][0] = "changed"  # ty: ignore[invalid-assignment]
+    with pytest.raises(TypeError):
+        outgoing.message["method"] = "other"  # ty: ignore[invalid-assignment]
+    await responder.close()
+    await caller.close()
+
+
+@pytest.mark.thread_unsafe
+async def test_observer_events_expose_bytes_and_copies(server):
+    """Incoming events carry the wire bytes; to_dict() is a private copy."""
+    responder, caller = await _connect(server)
+    events: list[StreamEvent] = []
+    responder.add_observer(events.append)
+
+    await caller.send_notification("session/update", {"chunk": "hello"})
+    await asyncio.sleep(0.05)
+
+    (event,) = events
+    assert event.direction is StreamDirection.INCOMING
+    assert event.raw is not None
+    assert json.loads(event.serialized()) == {
+        "jsonrpc": "2.0",
+        "method": "session/update",
+        "params": {"chunk": "hello"},
+    }
+    copy = event.to_dict()
+    copy["params"]["chunk"] = "changed"
+    assert event.message["params"]["chunk"] == "hello"
+    await responder.close()
+    await caller.close()
+
+
+@pytest.mark.thread_unsafe
+async def test_observer_method_filter_includes_responses(server):
+    """A filtered observer sees its methods' requests and their responses only."""
+    responder, caller = await _connect(server)
+    events: list[StreamEvent] = []
+    caller.add_observer(events.append, methods=["session/prompt"])
+
+    await caller.send_notification("session/update", {"chunk": "skipped"})
+    await caller.send_request("fs/read_text_file", {"path": "skipped"})
+    await caller.send_request("session/prompt", {"prompt": "kept"})
+
+    assert [(e.direction, e.method) for e in events] == [
+        (StreamDirection.OUTGOING, "session/prompt"),
+        (StreamDirection.INCOMING, "session/prompt"),
+    ]
+    assert events[1].message["result"] == {"echo": {"prompt": "kept"}}
+    await responder.close()
+    await caller.close()
+
+
+@pytest.mark.thread_unsafe
+async def test_responder_side_response_carries_request_method(server):
+    """Responses sent by the handler side are tagged with the request method."""
+    responder, caller = await _connect(server)
+    events: list[StreamEvent] = []
+    responder.add_observer(events.append, methods=["terminal/output"])
+
+    await caller.send_request("terminal/output", {"terminalId": "t-1"})
+
+    assert [(e.direction, e.method) for e in events] == [
+        (StreamDirection.INCOMING, "terminal/output"),
+        (StreamDirection.OUTGOING, "terminal/output"),
+    ]
+    await responder.close()
+    await caller.close()
@@ -6,7 +6,18 @@ import pytest
 
 libcst = pytest.importorskip("libcst")
 
-from punie.cst.core import parse_file, parse_source  # noqa: E402
+from punie.cst.code_tools import cst_find_pattern, cst_rename  # noqa: E402
+from punie.cst.core import (  # noqa: E402
+    ParsedModuleCache,
+    parse_file,
+    parse_source,
+    set_parse_cache,
+)
+from punie.cst.validators.tdom import (  # noqa: E402
+    check_render_tree,
+    validate_component,
+    validate_escape_context,
+)
 
 FIXTURES = Path(__file__).parent / "fixtures" / "cst"
 
@@ -65,3 +76,97 @@ def test_parse_file_invalid_component():
     module = parse_file(str(FIXTURES / "invalid_component.py"))
     assert module is not None
     assert "BadGreeting" in module.code
+
+
+@pytest.fixture
+def parse_cache():
+    """Install a fresh process-wide parse cache for one test."""
+    cache = ParsedModuleCache()
+    previous = set_parse_cache(cache)
+    yield cache
+    set_parse_cache(previous)
+
+
+def test_validators_share_one_parse(parse_cache):
+    """Several validators on the same file parse it only once."""
+    path = str(FIXTURES / "valid_component.py")
+
+    validate_component(path)
+    check_render_tree(path)
+    validate_escape_context(path)
+    cst_find_pattern(path, "ClassDef")
+
+    stats = parse_cache.stats
+    assert (stats.misses, stats.hits, stats.entries) == (1, 3, 1)
+
+
+def test_edited_file_is_parsed_again(parse_cache, tmp_path):
+    """The cache is keyed by content, so an edited file is never stale."""
+    path = tmp_path / "module.py"
+    path.write_text("x = 1\n")
+    first = parse_file(str(path))
+    path.write_text("x = 2\n")
+
+    second = parse_file(str(path))
+
+    assert second.code == "x = 2\n"
+    assert second is not first
+    assert parse_cache.stats.misses == 2
+
+
+def test_rename_result_is_cached_for_write_back(parse_cache, tmp_path):
+    """Writing cst_rename's output back to disk does not cost another parse."""
+    path = tmp_path / "module.py"
+    path.write_text("old = 1\nprint(old)\n")
+
+    result = cst_rename(str(path), "old", "new")
+    path.write_text(result.modified_source or "")
+    module = parse_file(str(path))
+
+    assert module.code == "new = 1\nprint(new)\n"
+    assert parse_cache.stats.misses == 1
+
+
+def test_cache_evicts_by_entries_and_bytes():
+    """Least recently used modules go first once a limit is exceeded."""
+    by_count = ParsedModuleCache(max_entries=2)
+    a = by_count.parse("a = 1\n")
+    by_count.parse("b = 1\n")
+    by_count.parse("a = 1\n")  # a becomes most recently used
+    by_count.parse("c = 1\n")
+
+    assert by_count.parse("a = 1\n") is a
+    assert by_count.stats.evictions == 1
+
+    by_size = ParsedModuleCache(max_bytes=10)
+    by_size.parse("x = 1\n")
+    by_size.parse("y = 1\n")
+
+    assert by_size.stats.entries == 1
+    assert by_size.stats.source_bytes == 6
+
+
+def test_cache_shares_metadata_wrapper():
+    """The MetadataWrapper (and its resolved metadata) is reused."""
+    cache = ParsedModuleCache()
+
+    wrapper = cache.wrapper("def f():\n    pass\n")
+
+    assert cache.wrapper("def f():\n    pass\n") is wrapper
+    assert wrapper.module is cache.parse("def f():\n    pass\n")
+
+
+def test_seeded_modules_get_their_own_metadata_tree():
+    """A transformer's output that reuses nodes still resolves per-node metadata."""
+    from libcst.metadata import PositionProvider
+
+    cache = ParsedModuleCache()
+    statement = cache.parse("x = 1\n").body[0]
+    seeded = libcst.Module(body=[statement, statement])
+    cache.add(seeded)
+
+    wrapper = cache.wrapper(seeded.code)
+    positions = wrapper.resolve(PositionProvider)
+
+    assert wrapper.module is not seeded
+    assert [positions[node].start.line for node in wrapper.module.body] == [1, 2]
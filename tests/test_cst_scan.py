@@ -0,0 +1,206 @@
+"""Tests for workspace-wide CST scans (punie.cst.scan)."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+libcst = pytest.importorskip("libcst")
+
+from punie.cst import scan  # noqa: E402
+from punie.cst.code_tools import cst_find_pattern  # noqa: E402
+from punie.cst.scan import (  # noqa: E402
+    CstScanner,
+    ScanIndex,
+    expand_paths,
+    iter_validate,
+    scan_pattern,
+    scan_validate,
+    set_scanner,
+)
+from punie.cst.validators import validate_escape_context  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures" / "cst"
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """A copy of the CST fixtures with a nested package and ignored dirs."""
+    root = tmp_path / "ws"
+    shutil.copytree(FIXTURES, root / "pkg", ignore=shutil.ignore_patterns("__pycache__"))
+    (root / "pkg" / "sub").mkdir()
+    (root / "pkg" / "sub" / "views.py").write_text('html(f"<p>{name}</p>")\n')
+    (root / ".venv").mkdir()
+    (root / ".venv" / "hidden.py").write_text("x = 1\n")
+    (root / "__pycache__").mkdir()
+    (root / "__pycache__" / "cached.py").write_text("x = 1\n")
+    return root
+
+
+@pytest.fixture
+def scanner(tmp_path):
+    """Process-wide scanner that works in-process with a temporary index."""
+    current = CstScanner(index=ScanIndex(tmp_path / "index.json"), min_parallel_files=1000)
+    previous = set_scanner(current)
+    yield current
+    set_scanner(previous)
+    current.shutdown()
+
+
+def _count_analyses(monkeypatch) -> list[str]:
+    analyzed: list[str] = []
+    original = scan._analyze
+
+    def counting(path, task):
+        analyzed.append(Path(path).name)
+        return original(path, task)
+
+    monkeypatch.setattr(scan, "_analyze", counting)
+    return analyzed
+
+
+def test_expand_paths_walks_directories_and_globs(workspace):
+    """Directories recurse past hidden and cache dirs; globs are recursive."""
+    walked = expand_paths(str(workspace))
+    globbed = expand_paths(str(workspace / "pkg" / "**" / "*.py"))
+
+    assert str(workspace / "pkg" / "sub" / "views.py") in walked
+    assert not any(".venv" in p or "__pycache__" in p for p in walked)
+    assert set(globbed) == set(walked)
+    assert expand_paths(str(workspace / "pkg" / "route_file.py")) == [
+        str(workspace / "pkg" / "route_file.py")
+    ]
+
+
+def test_scan_validate_aggregates_per_file_results(scanner, workspace):
+    """Issues from every file are collected and tagged with their file."""
+    results = scan_validate(str(workspace), ["validate_escape_context"])
+
+    result = results["validate_escape_context"]
+    expected = [
+        issue.model_copy(update={"file": path})
+        for path in expand_paths(str(workspace))
+        for issue in validate_escape_context(path).issues
+    ]
+    assert result.issues == expected
+    assert str(workspace / "pkg" / "sub" / "views.py") in {i.file for i in result.issues}
+    assert result.valid is False
+    assert result.domain == "tdom"
+
+
+def test_scan_pattern_tags_matches_with_files(scanner, workspace):
+    """scan_pattern returns one CstFindResult covering all files."""
+    result = scan_pattern(str(workspace / "pkg"), "ClassDef")
+
+    per_file = {
+        path: cst_find_pattern(path, "ClassDef").match_count
+        for path in expand_paths(str(workspace / "pkg"))
+    }
+    assert result.success is True
+    assert result.match_count == sum(per_file.values())
+    assert {m.file for m in result.matches} == {p for p, n in per_file.items() if n}
+
+
+def test_scan_pattern_reports_unknown_pattern(scanner, workspace):
+    """An unknown pattern fails the scan without touching any file."""
+    result = scan_pattern(str(workspace), "NotANode")
+
+    assert result.success is False
+    assert "Unknown pattern" in result.parse_error
+
+
+def test_scan_reports_unparseable_files(scanner, workspace):
+    """A broken file fails its check but the other files still report."""
+    (workspace / "pkg" / "broken.py").write_text("class (:\n")
+
+    result = scan_validate(str(workspace / "pkg"), ["validate_escape_context"])[
+        "validate_escape_context"
+    ]
+
+    assert result.valid is False
+    assert "1 file(s) failed" in result.parse_error
+    assert "broken.py" in result.parse_error
+    assert result.issues
+
+
+def test_index_skips_unchanged_files(scanner, workspace, monkeypatch, tmp_path):
+    """Only new or edited files are analyzed again, even across processes."""
+    target = str(workspace / "pkg")
+    first = scan_validate(target, ["tdom"])
+    analyzed = _count_analyses(monkeypatch)
+
+    assert scan_validate(target, ["tdom"]) == first
+    assert analyzed == []
+
+    views = workspace / "pkg" / "sub" / "views.py"
+    stat = views.stat()
+    os.utime(views, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    scan_validate(target, ["tdom"])
+    assert analyzed == []  # Same content, new mtime: the hash decides
+
+    views.write_text('html(t"<p>{name}</p>")\n')
+    scan_validate(target, ["tdom"])
+    assert analyzed == ["views.py"]
+
+    # A fresh index loaded from disk still knows every file
+    set_scanner(CstScanner(index=ScanIndex(tmp_path / "index.json"), min_parallel_files=1000))
+    scan_validate(target, ["tdom"])
+    assert analyzed == ["views.py"]
+
+
+def test_index_keeps_tasks_apart(scanner, workspace, monkeypatch):
+    """Results for one check are never reused for another."""
+    target = str(workspace / "pkg" / "sub")
+    scan_validate(target, ["validate_escape_context"])
+    analyzed = _count_analyses(monkeypatch)
+
+    scan_validate(target, ["validate_component"])
+
+    assert analyzed == ["views.py"]
+
+
+def test_index_drops_least_recently_used_tasks(workspace, tmp_path):
+    """Beyond max_tasks or max_entries, the oldest tasks' results go, also on disk."""
+    index = ScanIndex(tmp_path / "index.json", max_tasks=2)
+    scanner = CstScanner(index=index, min_parallel_files=1000)
+    target = str(workspace / "pkg" / "sub")
+    for pattern in ("FunctionDef", "ClassDef", "Call"):
+        list(scan.iter_find_pattern(target, pattern, scanner=scanner))
+
+    assert index.task_keys == ["find:ClassDef", "find:Call"]
+    assert ScanIndex(tmp_path / "index.json").task_keys == index.task_keys
+
+    small = ScanIndex(tmp_path / "index.json", max_entries=1)
+    assert small.task_keys == ["find:Call"]
+    assert small.size == 1
+
+
+def test_index_hash_describes_the_analyzed_text(workspace, monkeypatch):
+    """A file is read once per analysis; its hash is of the bytes the tool parsed."""
+    views = workspace / "pkg" / "sub" / "views.py"
+
+    def fail(path):
+        raise AssertionError("read the file a second time")
+
+    monkeypatch.setattr("punie.cst.code_tools.read_source", fail)
+    digest, result = scan._analyze(str(views), scan._Task("find", "Call"))
+
+    assert digest == scan._digest(views.read_bytes())
+    assert result["match_count"] == 1
+
+
+def test_process_pool_matches_in_process_results(workspace, tmp_path):
+    """Worker processes stream the same results the in-process path produces."""
+    pooled = CstScanner(
+        max_workers=2, index=ScanIndex(None), chunk_size=2, min_parallel_files=0
+    )
+    inline = CstScanner(index=ScanIndex(None), min_parallel_files=1000)
+    try:
+        streamed = dict(iter_validate(str(workspace), ["tdom"], scanner=pooled))
+        expected = dict(iter_validate(str(workspace), ["tdom"], scanner=inline))
+    finally:
+        pooled.shutdown()
+
+    assert streamed == expected
+    assert set(streamed) == set(expand_paths(str(workspace)))
@@ -157,10 +157,12 @@ def test_create_toolset_from_catalog_known_tools():
     catalog = ToolCatalog(tools=tuple(descriptors))
     toolset = create_toolset_from_catalog(catalog)
 
-    assert len(toolset.tools) == 2
+    # read_more comes along to page read_file output
+    assert len(toolset.tools) == 3
     # Known tools are matched by name (tools is a dict)
     assert "read_file" in toolset.tools
     assert "write_file" in toolset.tools
+    assert "read_more" in toolset.tools
 
 
 def test_create_toolset_from_catalog_unknown_tools():
@@ -192,8 +194,8 @@ def test_create_toolset_from_capabilities_fs_only():
     )
     toolset = create_toolset_from_capabilities(caps)
 
-    # Should have read_file and write_file, no terminal tools
-    assert len(toolset.tools) == 2
+    # Should have read_file, write_file and read_more, no terminal tools
+    assert len(toolset.tools) == 3
     assert "read_file" in toolset.tools
     assert "write_file" in toolset.tools
     assert "run_command" not in toolset.tools
@@ -207,8 +209,8 @@ def test_create_toolset_from_capabilities_all():
     )
     toolset = create_toolset_from_capabilities(caps)
 
-    # Should have 2 file tools + 5 terminal tools = 7 total
-    assert len(toolset.tools) == 7
+    # Should have 2 file tools + 5 terminal tools + read_more = 8 total
+    assert len(toolset.tools) == 8
     assert "read_file" in toolset.tools
     assert "write_file" in toolset.tools
     assert "run_command" in toolset.tools
@@ -325,10 +327,10 @@ async def test_fake_client_discover_tools():
     assert result["tools"] == catalog_data
 
 
-def test_default_toolset_has_all_8_tools():
-    """create_toolset() returns all 8 static tools (Tier 3 fallback)."""
+def test_default_toolset_has_all_9_tools():
+    """create_toolset() returns all 9 static tools (Tier 3 fallback)."""
     toolset = create_toolset()
-    assert len(toolset.tools) == 8
+    assert len(toolset.tools) == 9
 
     assert "read_file" in toolset.tools
     assert "write_file" in toolset.tools
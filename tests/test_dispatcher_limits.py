@@ -0,0 +1,108 @@
+"""Tests for request concurrency limits in DefaultMessageDispatcher."""
+
+import asyncio
+
+import pytest
+
+from punie.acp.connection import Connection
+from punie.acp.exceptions import RequestError
+from punie.acp.task import DispatchLimits
+
+
+class BlockingHandler:
+    """Method handler whose requests wait until released."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.started: list[str] = []
+        self.notifications: list[str] = []
+
+    async def __call__(self, method, params, is_notification):
+        if is_notification:
+            self.notifications.append(method)
+            return None
+        self.started.append(method)
+        await self.release.wait()
+        return {"method": method}
+
+
+async def _connect(server, limits: DispatchLimits) -> tuple[Connection, Connection, BlockingHandler]:
+    handler = BlockingHandler()
+    responder = Connection(
+        handler, server.server_writer, server.server_reader, limits=limits
+    )
+    caller = Connection(handler, server.client_writer, server.client_reader)
+    return responder, caller, handler
+
+
+async def _wait_until(predicate) -> None:
+    for _ in range(200):
+        if predicate():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.thread_unsafe
+async def test_method_limit_queues_extra_requests(server):
+    """Requests over a per-method limit wait for a slot, then run."""
+    limits = DispatchLimits(method_limits={"session/prompt": 1})
+    responder, caller, handler = await _connect(server, limits)
+
+    calls = [
+        asyncio.create_task(caller.send_request("session/prompt", {"n": n}))
+        for n in range(3)
+    ]
+    other = asyncio.create_task(caller.send_request("fs/read_text_file", {}))
+    await _wait_until(lambda: responder.dispatch_stats.queued == 2)
+
+    stats = responder.dispatch_stats
+    assert stats.in_flight_by_method == {"session/prompt": 1, "fs/read_text_file": 1}
+    assert handler.started.count("session/prompt") == 1
+
+    handler.release.set()
+    results = await asyncio.wait_for(asyncio.gather(*calls, other), timeout=5)
+
+    assert [r["method"] for r in results] == ["session/prompt"] * 3 + ["fs/read_text_file"]
+    assert responder.dispatch_stats.in_flight == 0
+    await responder.close()
+    await caller.close()
+
+
+@pytest.mark.thread_unsafe
+async def test_requests_beyond_queue_get_server_busy(server):
+    """Once the wait queue is full, requests fail fast with "Server busy"."""
+    limits = DispatchLimits(max_concurrent=1, max_queued=1)
+    responder, caller, handler = await _connect(server, limits)
+
+    running = asyncio.create_task(caller.send_request("session/prompt", {}))
+    queued = asyncio.create_task(caller.send_request("session/prompt", {}))
+    await _wait_until(lambda: responder.dispatch_stats.queued == 1)
+
+    with pytest.raises(RequestError) as exc_info:
+        await asyncio.wait_for(caller.send_request("session/load", {}), timeout=5)
+
+    assert exc_info.value.code == -32001
+    assert exc_info.value.data["method"] == "session/load"
+    assert responder.dispatch_stats.rejected == 1
+    handler.release.set()
+    await asyncio.wait_for(asyncio.gather(running, queued), timeout=5)
+    await responder.close()
+    await caller.close()
+
+
+@pytest.mark.thread_unsafe
+async def test_notifications_bypass_limits(server):
+    """Notifications such as session/cancel run even when requests are saturated."""
+    limits = DispatchLimits(max_concurrent=1, max_queued=0)
+    responder, caller, handler = await _connect(server, limits)
+
+    running = asyncio.create_task(caller.send_request("session/prompt", {}))
+    await _wait_until(lambda: responder.dispatch_stats.in_flight == 1)
+    await caller.send_notification("session/cancel", {"sessionId": "s-1"})
+    await _wait_until(lambda: handler.notifications == ["session/cancel"])
+
+    handler.release.set()
+    await asyncio.wait_for(running, timeout=5)
+    await responder.close()
+    await caller.close()
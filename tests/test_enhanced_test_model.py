@@ -104,7 +104,8 @@ async def test_model_with_call_tools_all_would_attempt_tool_calls():
 
     This test shows why we use call_tools=[] instead. With call_tools='all',
     the model attempts to call ALL available tools, which can cause failures
-    when tools receive invalid input (like execute_code getting 'a' as code).
+    when tools receive invalid input (like read_more getting 'a' as a handle,
+    or execute_code getting 'a' as code).
 
     In a real ACP scenario with actual tool execution, this would either
     deadlock or cause tool execution errors.
@@ -125,13 +126,14 @@ async def test_model_with_call_tools_all_would_attempt_tool_calls():
         tracker=ToolCallTracker(),
     )
 
-    # Run the agent - it will attempt to call tools and fail
-    # because TestModel passes 'a' as code to execute_code, causing NameError
+    # Run the agent - it will attempt to call tools and fail. read_more fails
+    # first: this session has no result store, so handle 'a' can't exist
+    # (execute_code fails too, but only after running 'a' in the sandbox)
     with pytest.raises(UnexpectedModelBehavior) as exc_info:
         await agent.run("Do something", deps=deps)
 
-    # Verify it failed due to execute_code being called with invalid input
-    assert "execute_code" in str(exc_info.value)
+    # Verify it failed due to read_more being called with invalid input
+    assert "read_more" in str(exc_info.value)
 
 
 def test_call_tools_empty_vs_none():
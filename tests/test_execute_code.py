@@ -112,6 +112,9 @@ def test_execute_code_runs_simple_python():
     def fake_domain(fp: str) -> DomainValidationResult:
         return DomainValidationResult(valid=True, domain="test", issues=[])
 
+    def fake_validate_all(fp: str, checks: list[str] | None = None):
+        return {"validate_component": fake_domain(fp)}
+
     external_functions = ExternalFunctions(
         read_file=fake_read,
         write_file=fake_write,
@@ -139,6 +142,9 @@ def test_execute_code_runs_simple_python():
         validate_middleware_chain=fake_domain,
         check_di_template_binding=fake_domain,
         validate_route_pattern=fake_domain,
+        validate_all=fake_validate_all,
+        scan_pattern=fake_cst_find,
+        scan_validate=fake_validate_all,
     )
 
     code = """
@@ -244,7 +250,7 @@ print(f"Command: {result}")
 
     # Verify async ACP methods were called through the bridge
     mock_client.read_text_file.assert_called_once_with(
-        session_id="test-session", path="test.txt"
+        session_id="test-session", path="test.txt", line=None, limit=None
     )
     mock_client.write_text_file.assert_called_once_with(
         session_id="test-session", path="output.txt", content="new content"
@@ -0,0 +1,138 @@
+"""Tests for the shared outgoing HTTP client (punie.http.client_pool)."""
+
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+from punie.http.client_pool import (
+    HttpClientPool,
+    HttpPoolConfig,
+    get_http_pool,
+    set_http_pool,
+)
+from punie.training.server import ServerProcess
+from punie.training.server_config import ServerConfig
+
+
+@pytest.fixture
+async def keepalive_server():
+    """Minimal HTTP/1.1 keep-alive server that counts accepted connections."""
+    connections: list[int] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(1)
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                body = b'{"data": []}'
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield port, connections
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.fixture
+def pool():
+    """A fresh process-wide pool, restored afterwards."""
+    pool = HttpClientPool(HttpPoolConfig(http2=False))
+    previous = set_http_pool(pool)
+    yield pool
+    set_http_pool(previous)
+
+
+def _unused_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def test_requests_reuse_one_keepalive_connection(pool, keepalive_server):
+    """Sequential requests share a connection and are counted per host."""
+    port, connections = keepalive_server
+
+    for _ in range(5):
+        response = await pool.client().get(f"http://127.0.0.1:{port}/v1/models")
+        assert response.status_code == 200
+
+    stats = pool.stats()
+    assert len(connections) == 1
+    assert stats.requests == 5
+    assert stats.requests_by_host == {f"127.0.0.1:{port}": 5}
+    assert stats.open_connections == 1
+    await pool.aclose()
+
+
+async def test_failed_requests_are_counted_and_closed_clients_replaced(pool):
+    """Connect errors count as errors; aclose() makes the next client() a new one."""
+    first = pool.client()
+    with pytest.raises(httpx.ConnectError):
+        await first.get(f"http://127.0.0.1:{_unused_port()}/")
+    await pool.aclose()
+
+    assert pool.client() is not first
+    assert pool.stats().errors == 1
+    assert pool.stats().clients == 2
+    await pool.aclose()
+
+
+async def test_health_checks_share_the_pooled_connection(pool, keepalive_server):
+    """Polling health_check does not open a connection per poll."""
+    port, connections = keepalive_server
+    server = ServerProcess(ServerConfig(model_path="m", port=port))
+
+    assert all([await server.health_check() for _ in range(3)])
+    assert len(connections) == 1
+    assert pool.stats().requests == 3
+    await pool.aclose()
+
+
+async def test_provider_client_follows_replaced_clients(pool, keepalive_server):
+    """A provider's client keeps working after the pool's client is closed and replaced."""
+    port, connections = keepalive_server
+    provider_client = pool.provider_client()
+
+    assert (await provider_client.get(f"http://127.0.0.1:{port}/")).status_code == 200
+    await pool.aclose()
+    await provider_client.aclose()  # Providers closing their client leave the pool alone
+    assert (await provider_client.get(f"http://127.0.0.1:{port}/")).status_code == 200
+
+    assert len(connections) == 2
+    assert pool.stats().clients == 2
+    assert pool.stats().requests == 2
+    await pool.aclose()
+
+
+async def test_each_event_loop_gets_its_own_client(pool):
+    """A client is never handed to a loop other than the one it was created on."""
+    async def client_of_new_loop() -> httpx.AsyncClient:
+        return pool.client()
+
+    mine = pool.client()
+    other = await asyncio.to_thread(asyncio.run, client_of_new_loop())
+
+    assert other is not mine
+    assert pool.client() is mine
+    await pool.aclose()
+
+
+def test_local_models_use_the_shared_client(pool):
+    """Every local-model provider is built on the process-wide provider client."""
+    from punie.agent.factory import _create_local_model, create_server_model
+
+    first = _create_local_model("model-a")
+    second = create_server_model(ServerConfig(model_path="model-b"))
+
+    assert first.client._client is get_http_pool().provider_client()
+    assert second.client._client is first.client._client
@@ -0,0 +1,98 @@
+"""Tests for mmap-backed line-range reads (punie.local.line_index)."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from punie.local import line_index
+from punie.local.line_index import LineIndex, get_line_index, read_lines
+
+
+@pytest.fixture
+def numbered(tmp_path: Path) -> tuple[Path, list[str]]:
+    """A file whose lines have varied lengths and some multibyte text."""
+    lines = [f"{n}: {'é' * (n % 7)}{'x' * (n % 13)}\n" for n in range(1, 2001)]
+    path = tmp_path / "numbered.log"
+    path.write_text("".join(lines), encoding="utf-8")
+    return path, lines
+
+
+@pytest.mark.parametrize(("line", "limit"), [(1, 1), (1, 5), (37, 100), (1999, 10), (2000, 1)])
+def test_ranges_match_splitlines_across_blocks(numbered, line, limit):
+    """Ranges agree with slicing the split file, including across block edges."""
+    path, lines = numbered
+    index = LineIndex(path, block_size=97)
+
+    assert index.read(line, limit) == "".join(lines[line - 1 : line - 1 + limit])
+
+
+def test_open_ended_and_out_of_range_reads(numbered):
+    """No limit reads to EOF; ranges past the end read as empty."""
+    path, lines = numbered
+    index = LineIndex(path, block_size=64)
+
+    assert index.read(1995) == "".join(lines[1994:])
+    assert index.read(None, 2) == "".join(lines[:2])
+    assert index.read(5000, 3) == ""
+    assert index.line_count == 2000
+
+
+def test_final_line_without_newline(tmp_path: Path):
+    """A trailing partial line is a line of its own."""
+    path = tmp_path / "tail.txt"
+    path.write_text("a\nb\nc")
+    index = LineIndex(path, block_size=2)
+
+    assert index.line_count == 3
+    assert index.read(3, 5) == "c"
+
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+    assert LineIndex(empty).read(1, 1) == ""
+    assert LineIndex(empty).line_count == 0
+
+
+def test_index_is_cached_until_the_file_changes(tmp_path: Path, monkeypatch):
+    """The cached index is reused until mtime or size moves, then rebuilt."""
+    monkeypatch.setattr(line_index, "_indexes", type(line_index._indexes)())
+    path = tmp_path / "data.txt"
+    path.write_text("one\ntwo\n")
+
+    first = get_line_index(path)
+    assert get_line_index(path) is first
+
+    path.write_text("uno\ndos\ntres\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert get_line_index(path) is not first
+    assert read_lines(path, 3, 1) == "tres\n"
+
+
+def test_read_detects_a_file_changed_after_the_cache_check(tmp_path: Path, monkeypatch):
+    """A file shrunk between get_line_index() and the read is indexed again."""
+    monkeypatch.setattr(line_index, "_indexes", type(line_index._indexes)())
+    path = tmp_path / "data.txt"
+    path.write_text("".join(f"line {n}\n" for n in range(1, 101)))
+    stale = LineIndex(path, block_size=16)
+    path.write_text("a\nb\nc\n")
+
+    with pytest.raises(line_index.StaleIndexError):
+        stale.read(50, 2)
+
+    indexes = iter([stale, LineIndex(path)])
+    monkeypatch.setattr(line_index, "get_line_index", lambda _: next(indexes))
+    assert read_lines(path, 2, 1) == "b\n"
+
+
+def test_ranged_and_whole_file_reads_decode_alike(tmp_path: Path):
+    """CRLF endings and invalid UTF-8 read the same with or without a range."""
+    path = tmp_path / "mixed.txt"
+    path.write_bytes(b"one\r\ntwo \xff\r\nthree\n")
+
+    whole = read_lines(path)
+
+    assert whole == "one\ntwo �\nthree\n"
+    assert read_lines(path, 1, 3) == whole
+    assert read_lines(path, 2, 1) == "two �\n"
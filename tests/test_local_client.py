@@ -1,5 +1,6 @@
 """Tests for LocalClient with real filesystem and subprocess operations."""
 
+import threading
 from pathlib import Path
 
 import pytest
@@ -69,6 +70,27 @@ async def test_read_text_file_with_line_and_limit(tmp_path: Path):
     assert response.content == "line2\nline3\n"
 
 
+async def test_read_file_tool_reads_line_range(tmp_path: Path):
+    """The read_file tool passes line/limit through to a ranged read."""
+    from unittest.mock import MagicMock
+
+    from pydantic_ai import RunContext
+
+    from punie.agent.toolset import read_file
+
+    (tmp_path / "big.log").write_text("".join(f"entry {n}\n" for n in range(1, 10_001)))
+    deps = ACPDeps(
+        client_conn=LocalClient(workspace=tmp_path),
+        session_id="test-session",
+        tracker=ToolCallTracker(),
+    )
+    ctx = RunContext(deps=deps, retry=0, tool_name="t", model=MagicMock(), usage=MagicMock())
+
+    content = await read_file(ctx, "big.log", line=5000, limit=3)
+
+    assert content == "entry 5000\nentry 5001\nentry 5002\n"
+
+
 async def test_write_text_file_creates_file(tmp_path: Path):
     """Write file to local filesystem."""
     client = LocalClient(workspace=tmp_path)
@@ -114,6 +136,23 @@ async def test_write_text_file_creates_parent_dirs(tmp_path: Path):
     assert (tmp_path / "subdir" / "nested" / "file.txt").read_text() == "nested content"
 
 
+async def test_write_text_file_runs_off_the_event_loop(tmp_path: Path, monkeypatch):
+    """Write file does its IO in a worker thread, not on the loop's thread."""
+    client = LocalClient(workspace=tmp_path)
+    loop_thread = threading.current_thread()
+    writer_threads: list[threading.Thread] = []
+    write_text = Path.write_text
+
+    def recording_write_text(self: Path, *args, **kwargs):
+        writer_threads.append(threading.current_thread())
+        return write_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "write_text", recording_write_text)
+    await client.write_text_file(content="x", path="f.txt", session_id="test-session")
+
+    assert writer_threads and writer_threads[0] is not loop_thread
+
+
 async def test_request_permission_auto_approves(tmp_path: Path):
     """Auto-approve permission by selecting first option."""
     client = LocalClient(workspace=tmp_path)
@@ -204,6 +243,59 @@ async def test_terminal_output_returns_stdout(tmp_path: Path):
     assert "hello world" in output_response.output
 
 
+async def test_terminal_output_streams_while_running(tmp_path: Path):
+    """Output is available before exit and can be polled from an offset."""
+    import asyncio
+
+    client = LocalClient(workspace=tmp_path)
+    terminal_id = (
+        await client.create_terminal(
+            command="sh",
+            args=["-c", "echo first; while [ ! -e go ]; do sleep 0.01; done; echo second"],
+            session_id="test-session",
+        )
+    ).terminal_id
+
+    first = await client.terminal_output(session_id="test-session", terminal_id=terminal_id)
+    for _ in range(100):
+        if first.output:
+            break
+        await asyncio.sleep(0.02)
+        first = await client.terminal_output(session_id="test-session", terminal_id=terminal_id)
+    assert first.output == "first\n"
+    assert first.exit_status is None
+
+    (tmp_path / "go").touch()
+    await client.wait_for_terminal_exit(session_id="test-session", terminal_id=terminal_id)
+    rest = await client.terminal_output(
+        session_id="test-session", terminal_id=terminal_id, offset=first.field_meta["offset"]
+    )
+
+    assert rest.output == "second\n"
+    assert rest.field_meta["offset"] == len("first\nsecond\n")
+    assert rest.exit_status.exit_code == 0
+
+
+async def test_terminal_output_respects_output_byte_limit(tmp_path: Path):
+    """Only the last outputByteLimit bytes are kept, cut on a character boundary."""
+    client = LocalClient(workspace=tmp_path)
+    terminal_id = (
+        await client.create_terminal(
+            command="python3",
+            args=["-c", "print('é' * 5000, end=''); print('END')"],
+            session_id="test-session",
+            output_byte_limit=101,
+        )
+    ).terminal_id
+
+    await client.wait_for_terminal_exit(session_id="test-session", terminal_id=terminal_id)
+    response = await client.terminal_output(session_id="test-session", terminal_id=terminal_id)
+
+    assert response.truncated is True
+    assert response.output == "é" * 48 + "END\n"
+    assert response.field_meta["offset"] == 10_004
+
+
 async def test_wait_for_terminal_exit_returns_code(tmp_path: Path):
     """Wait for subprocess to complete and return exit code."""
     client = LocalClient(workspace=tmp_path)
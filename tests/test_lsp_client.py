@@ -3,6 +3,9 @@
 Following Agent OS standard: use fakes over mocks for testability.
 """
 
+import asyncio
+import json
+import os
 from pathlib import Path
 
 import pytest
@@ -316,29 +319,6 @@ async def test_send_notification():
     assert '"id"' not in content
 
 
-def test_opened_documents_tracking():
-    """Should track opened documents to avoid duplicate didOpen."""
-    client = LSPClient()
-
-    uri1 = "file:///path/to/file1.py"
-    uri2 = "file:///path/to/file2.py"
-
-    # Initially empty
-    assert len(client.opened_documents) == 0
-
-    # Add documents
-    client.opened_documents.add(uri1)
-    client.opened_documents.add(uri2)
-
-    assert uri1 in client.opened_documents
-    assert uri2 in client.opened_documents
-    assert len(client.opened_documents) == 2
-
-    # Adding same document again should not duplicate
-    client.opened_documents.add(uri1)
-    assert len(client.opened_documents) == 2
-
-
 def test_lsp_client_initialization():
     """Should initialize LSP client with correct defaults."""
     client = LSPClient()
@@ -348,3 +328,283 @@ def test_lsp_client_initialization():
     assert client.root_uri.startswith("file:///")
     assert len(client.opened_documents) == 0
     assert client._initialized is False
+
+
+class FakeLSPServer:
+    """Fake ty server process backed by a real asyncio.StreamReader.
+
+    Messages written by the client are decoded into `received`; tests push
+    server messages with send().
+    """
+
+    def __init__(self):
+        self.stdout = asyncio.StreamReader()
+        self.stdin = self
+        self.pid = 123
+        self.received: list[dict] = []
+        self.got_message = asyncio.Event()
+
+    def write(self, data: bytes) -> None:
+        body = data.decode("utf-8").split("\r\n\r\n", 1)[1]
+        self.received.append(json.loads(body))
+        self.got_message.set()
+
+    async def drain(self) -> None:
+        pass
+
+    def send(self, message: dict) -> None:
+        body = json.dumps(message)
+        self.stdout.feed_data(f"Content-Length: {len(body)}\r\n\r\n{body}".encode())
+
+    async def wait_for_requests(self, count: int) -> list[dict]:
+        """Wait until `count` requests (messages with a method and id) arrived."""
+        while True:
+            requests = [m for m in self.received if "id" in m and "method" in m]
+            if len(requests) >= count:
+                return requests
+            self.got_message.clear()
+            await asyncio.wait_for(self.got_message.wait(), timeout=5)
+
+
+def _client_with_server(**kwargs) -> tuple[LSPClient, FakeLSPServer]:
+    client = LSPClient(**kwargs)
+    server = FakeLSPServer()
+    client.process = server  # ty: ignore[invalid-assignment]
+    return client, server
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_demultiplexed():
+    """Responses arriving out of order reach the request that sent them."""
+    client, server = _client_with_server()
+
+    first = asyncio.create_task(client._send_request("textDocument/hover", {"n": 1}))
+    second = asyncio.create_task(client._send_request("textDocument/hover", {"n": 2}))
+    requests = await server.wait_for_requests(2)
+    assert client.in_flight == 2
+
+    # Answer in reverse order
+    for request in reversed(requests):
+        server.send({"jsonrpc": "2.0", "id": request["id"], "result": request["params"]})
+
+    assert (await first)["result"] == {"n": 1}
+    assert (await second)["result"] == {"n": 2}
+    assert client.in_flight == 0
+    await client._stop_reader()
+
+
+@pytest.mark.asyncio
+async def test_notifications_go_to_subscribers_without_failing_requests():
+    """A burst of diagnostics is delivered to subscribers; the request still succeeds."""
+    client, server = _client_with_server()
+    diagnostics: list[dict] = []
+    unsubscribe = client.subscribe("textDocument/publishDiagnostics", diagnostics.append)
+
+    request = asyncio.create_task(client._send_request("workspace/symbol", {}))
+    (sent,) = await server.wait_for_requests(1)
+    for i in range(25):
+        server.send(
+            create_lsp_notification(
+                "textDocument/publishDiagnostics", {"uri": f"file:///f{i}.py"}
+            )
+        )
+    server.send({"jsonrpc": "2.0", "id": sent["id"], "result": []})
+
+    assert (await request)["result"] == []
+    assert len(diagnostics) == 25
+
+    unsubscribe()
+    server.send(create_lsp_notification("textDocument/publishDiagnostics", {}))
+    await asyncio.sleep(0.01)
+    assert len(diagnostics) == 25
+    await client._stop_reader()
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_sends_cancel_request():
+    """A request without a response times out and is withdrawn from the server."""
+    client, server = _client_with_server(request_timeout=0.05)
+
+    with pytest.raises(LSPError, match="timed out"):
+        await client._send_request("textDocument/references", {})
+
+    cancel = server.received[-1]
+    assert cancel["method"] == "$/cancelRequest"
+    assert cancel["params"] == {"id": server.received[0]["id"]}
+    assert client.in_flight == 0
+    await client._stop_reader()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_sends_cancel_request():
+    """Cancelling the awaiting task withdraws the request and drops the late response."""
+    client, server = _client_with_server()
+
+    task = asyncio.create_task(client._send_request("textDocument/definition", {}))
+    (sent,) = await server.wait_for_requests(1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert server.received[-1] == {
+        "jsonrpc": "2.0",
+        "method": "$/cancelRequest",
+        "params": {"id": sent["id"]},
+    }
+    # A late response is ignored and the client keeps working
+    server.send({"jsonrpc": "2.0", "id": sent["id"], "result": None})
+    follow_up = asyncio.create_task(client._send_request("workspace/symbol", {}))
+    requests = await server.wait_for_requests(2)
+    server.send({"jsonrpc": "2.0", "id": requests[-1]["id"], "result": []})
+    assert (await follow_up)["result"] == []
+    await client._stop_reader()
+
+
+@pytest.mark.asyncio
+async def test_server_exit_fails_pending_requests():
+    """When the server closes stdout, waiting requests fail with LSPError."""
+    client, server = _client_with_server()
+
+    request = asyncio.create_task(client._send_request("textDocument/hover", {}))
+    await server.wait_for_requests(1)
+    server.stdout.feed_eof()
+
+    with pytest.raises(LSPError, match="closed"):
+        await request
+    assert client.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_server_requests_are_answered():
+    """Server → client requests get a reply so the server never blocks on them."""
+    client, server = _client_with_server()
+    client._ensure_reader()
+
+    server.send(
+        {"jsonrpc": "2.0", "id": 99, "method": "window/workDoneProgress/create", "params": {}}
+    )
+    server.send({"jsonrpc": "2.0", "id": 100, "method": "unknown/thing", "params": {}})
+    while len(server.received) < 2:
+        server.got_message.clear()
+        await asyncio.wait_for(server.got_message.wait(), timeout=5)
+
+    assert server.received[0] == {"jsonrpc": "2.0", "id": 99, "result": None}
+    assert server.received[1]["id"] == 100
+    assert server.received[1]["error"]["code"] == -32601
+    await client._stop_reader()
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _document_notifications(server: FakeLSPServer) -> list[dict]:
+    return [m for m in server.received if m["method"].startswith("textDocument/did")]
+
+
+@pytest.mark.asyncio
+async def test_open_document_sends_did_open_once(tmp_path):
+    """Repeated access to an unchanged file sends a single didOpen."""
+    client, server = _client_with_server()
+    source = tmp_path / "app.py"
+    source.write_text("x = 1\n")
+
+    await client.open_document(str(source))
+    await client.open_document(str(source))
+
+    (did_open,) = _document_notifications(server)
+    assert did_open["method"] == "textDocument/didOpen"
+    assert did_open["params"]["textDocument"]["version"] == 1
+    assert client.opened_documents[source.resolve().as_uri()].version == 1
+
+
+@pytest.mark.asyncio
+async def test_open_document_sends_did_change_after_edit(tmp_path):
+    """An edited file is synced with didChange and an increasing version."""
+    client, server = _client_with_server()
+    source = tmp_path / "app.py"
+    source.write_text("x = 1\n")
+    await client.open_document(str(source))
+
+    source.write_text("x = 22\n")
+    _bump_mtime(source)
+    await client.open_document(str(source))
+    source.write_text("x = 333\n")
+    _bump_mtime(source)
+    await client.open_document(str(source))
+
+    changes = _document_notifications(server)[1:]
+    assert [c["method"] for c in changes] == ["textDocument/didChange"] * 2
+    assert [c["params"]["textDocument"]["version"] for c in changes] == [2, 3]
+    assert changes[-1]["params"]["contentChanges"] == [{"text": "x = 333\n"}]
+
+
+@pytest.mark.asyncio
+async def test_open_document_sends_incremental_change(tmp_path):
+    """With incremental sync only the edited range is sent."""
+    client, server = _client_with_server()
+    client._sync_kind = 2
+    source = tmp_path / "app.py"
+    source.write_text("def f():\n    return 1\n")
+    await client.open_document(str(source))
+
+    source.write_text("def f():\n    return 42\n")
+    _bump_mtime(source)
+    await client.open_document(str(source))
+
+    change = _document_notifications(server)[-1]["params"]["contentChanges"][0]
+    assert change == {
+        "range": {
+            "start": {"line": 1, "character": 11},
+            "end": {"line": 1, "character": 12},
+        },
+        "text": "42",
+    }
+
+
+@pytest.mark.asyncio
+async def test_open_document_skips_touch_without_changes(tmp_path):
+    """A new mtime with identical content does not send didChange."""
+    client, server = _client_with_server()
+    source = tmp_path / "app.py"
+    source.write_text("x = 1\n")
+    await client.open_document(str(source))
+
+    _bump_mtime(source)
+    await client.open_document(str(source))
+
+    assert len(_document_notifications(server)) == 1
+
+
+@pytest.mark.asyncio
+async def test_open_document_evicts_least_recently_used(tmp_path):
+    """Beyond max_open_documents the least recently used file is closed."""
+    client, server = _client_with_server(max_open_documents=2)
+    paths = []
+    for name in ("a.py", "b.py", "c.py"):
+        path = tmp_path / name
+        path.write_text(f"# {name}\n")
+        paths.append(path)
+
+    await client.open_document(str(paths[0]))
+    await client.open_document(str(paths[1]))
+    await client.open_document(str(paths[0]))  # a.py is now most recently used
+    await client.open_document(str(paths[2]))
+
+    did_close = _document_notifications(server)[-1]
+    assert did_close["method"] == "textDocument/didClose"
+    assert did_close["params"]["textDocument"]["uri"] == paths[1].resolve().as_uri()
+    assert list(client.opened_documents) == [
+        paths[0].resolve().as_uri(),
+        paths[2].resolve().as_uri(),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_open_document_missing_file(tmp_path):
+    """Opening a file that does not exist raises FileNotFoundError."""
+    client, _ = _client_with_server()
+
+    with pytest.raises(FileNotFoundError):
+        await client.open_document(str(tmp_path / "missing.py"))
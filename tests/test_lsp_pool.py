@@ -0,0 +1,239 @@
+"""Tests for LSPServerPool using fake clients (no ty server processes)."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from punie.agent.lsp_client import LSPClient, LSPError
+from punie.agent.lsp_pool import LSPServerPool, get_lsp_pool, set_lsp_pool
+
+
+class FakePoolClient:
+    """Stands in for LSPClient: records lifecycle calls, no subprocess."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.process = None
+        self.is_alive = False
+        self.in_flight = 0
+        self.shut_down = False
+
+    async def start(self) -> None:
+        await asyncio.sleep(0)
+        self.is_alive = True
+
+    async def shutdown(self) -> None:
+        self.is_alive = False
+        self.shut_down = True
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pool(**kwargs) -> LSPServerPool:
+    kwargs.setdefault("maintenance_interval", None)
+    return LSPServerPool(client_factory=FakePoolClient, **kwargs)  # ty: ignore[invalid-argument-type]
+
+
+async def test_pool_reuses_client_per_root(tmp_path):
+    """Same root returns the same client; a different root gets its own."""
+    pool = _pool()
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    first = await pool.get(tmp_path / "a")
+    again = await pool.get(str(tmp_path / "a"))
+    other = await pool.get(tmp_path / "b")
+
+    assert first is again
+    assert other is not first
+    assert first.root == (tmp_path / "a").resolve()
+    stats = pool.stats
+    assert (stats.size, stats.spawns, stats.hits) == (2, 2, 1)
+
+
+async def test_pool_starts_one_server_for_concurrent_requests(tmp_path):
+    """Concurrent first requests for one root share a single server."""
+    pool = _pool()
+
+    clients = await asyncio.gather(*(pool.get(tmp_path) for _ in range(5)))
+
+    assert len({id(c) for c in clients}) == 1
+    assert pool.stats.spawns == 1
+    assert pool.stats.hits == 4
+
+
+async def test_pool_evicts_least_recently_used_over_max_size(tmp_path):
+    """Starting a server beyond max_size shuts down the LRU one."""
+    pool = _pool(max_size=2)
+    roots = [tmp_path / name for name in ("a", "b", "c")]
+    for root in roots:
+        root.mkdir()
+
+    a = await pool.get(roots[0])
+    b = await pool.get(roots[1])
+    await pool.get(roots[0])  # a becomes most recently used
+    await pool.get(roots[2])
+
+    assert b.shut_down
+    assert not a.shut_down
+    assert pool.roots == [roots[0].resolve(), roots[2].resolve()]
+    assert pool.stats.evictions == 1
+
+
+async def test_pool_keeps_busy_servers_over_max_size(tmp_path):
+    """A server with requests in flight is not evicted."""
+    pool = _pool(max_size=1)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    busy = await pool.get(tmp_path / "a")
+    busy.in_flight = 1
+    await pool.get(tmp_path / "b")
+
+    assert not busy.shut_down
+    assert pool.stats.size == 2
+
+
+async def test_pool_evicts_idle_servers(tmp_path):
+    """Servers unused for idle_timeout are shut down on the next request."""
+    clock = FakeClock()
+    pool = _pool(idle_timeout=60.0, clock=clock)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    idle = await pool.get(tmp_path / "a")
+    clock.now = 120.0
+    await pool.get(tmp_path / "b")
+
+    assert idle.shut_down
+    assert pool.roots == [(tmp_path / "b").resolve()]
+
+
+async def test_pool_restarts_crashed_server(tmp_path):
+    """A dead server is replaced on the next request for its root."""
+    pool = _pool()
+    crashed = await pool.get(tmp_path)
+    crashed.is_alive = False
+
+    replacement = await pool.get(tmp_path)
+
+    assert replacement is not crashed
+    assert replacement.is_alive
+    stats = pool.stats
+    assert (stats.spawns, stats.restarts, stats.size) == (2, 1, 1)
+
+
+async def test_check_health_removes_dead_servers(tmp_path):
+    """check_health() drops crashed servers so they restart lazily."""
+    pool = _pool()
+    client = await pool.get(tmp_path)
+    client.is_alive = False
+
+    dead = await pool.check_health()
+
+    assert dead == [tmp_path.resolve()]
+    assert pool.stats.size == 0
+    assert pool.stats.restarts == 1
+
+
+async def test_pool_failed_start_is_not_cached(tmp_path):
+    """A server that fails to start leaves no entry behind."""
+
+    class FailingClient(FakePoolClient):
+        async def start(self) -> None:
+            raise LSPError("ty not installed")
+
+    pool = LSPServerPool(client_factory=FailingClient, maintenance_interval=None)  # ty: ignore[invalid-argument-type]
+
+    with pytest.raises(LSPError):
+        await pool.get(tmp_path)
+    assert pool.stats.size == 0
+
+
+async def test_pool_shutdown_closes_all(tmp_path):
+    """shutdown() stops every server."""
+    pool = _pool()
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    clients = [await pool.get(tmp_path / "a"), await pool.get(tmp_path / "b")]
+
+    await pool.shutdown()
+
+    assert all(c.shut_down for c in clients)
+    assert pool.stats.size == 0
+
+
+def test_lsp_client_resolves_relative_paths_against_root(tmp_path):
+    """Relative file paths are relative to the client's workspace root."""
+    client = LSPClient(root=tmp_path)
+
+    assert client.root_uri == tmp_path.resolve().as_uri()
+    assert client._file_uri("src/app.py") == (tmp_path / "src/app.py").resolve().as_uri()
+
+
+async def test_leased_servers_are_not_evicted(tmp_path):
+    """A leased idle server survives another root's request at max_size."""
+    pool = _pool(max_size=1)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    async with pool.lease(tmp_path / "a") as leased:
+        await pool.get(tmp_path / "b")
+        assert not leased.shut_down
+    await pool.get(tmp_path / "b")
+
+    assert leased.shut_down
+    assert pool.roots == [(tmp_path / "b").resolve()]
+
+
+async def test_concurrent_requests_evict_each_server_once(tmp_path):
+    """Requests racing to make room never close the same server twice."""
+    pool = _pool(max_size=1)
+    roots = [tmp_path / name for name in ("a", "b", "c", "d")]
+    for root in roots:
+        root.mkdir()
+    await pool.get(roots[0])
+
+    await asyncio.gather(*(pool.get(root) for root in roots[1:]))
+
+    assert pool.stats.size == 1
+    assert pool.stats.evictions == 3
+
+
+async def test_maintenance_removes_crashed_and_idle_servers(tmp_path):
+    """The maintenance task notices dead and idle servers without new requests."""
+    clock = FakeClock()
+    pool = _pool(idle_timeout=60.0, clock=clock, maintenance_interval=0.01)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    crashed = await pool.get(tmp_path / "a")
+    idle = await pool.get(tmp_path / "b")
+    crashed.is_alive = False
+    clock.now = 120.0
+
+    await asyncio.sleep(0.05)
+
+    assert crashed.shut_down and idle.shut_down
+    assert pool.stats.size == 0
+    await pool.shutdown()
+
+
+def test_process_pool_limits_come_from_the_environment(monkeypatch):
+    """PUNIE_LSP_MAX_SERVERS and PUNIE_LSP_IDLE_TIMEOUT configure the shared pool."""
+    monkeypatch.setenv("PUNIE_LSP_MAX_SERVERS", "2")
+    monkeypatch.setenv("PUNIE_LSP_IDLE_TIMEOUT", "30")
+    previous = set_lsp_pool(None)
+    try:
+        pool = get_lsp_pool()
+        assert (pool.max_size, pool.idle_timeout) == (2, 30.0)
+    finally:
+        set_lsp_pool(previous)
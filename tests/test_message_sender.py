@@ -0,0 +1,123 @@
+"""Tests for the batching acp MessageSender (write coalescing and backpressure)."""
+
+import asyncio
+import json
+
+import pytest
+
+from punie.acp.task import MessageSender, TaskSupervisor
+
+
+class FakeWriter:
+    """StreamWriter stand-in that records each writelines() call.
+
+    drain() blocks while ``gate`` is clear, simulating a slow peer.
+    """
+
+    def __init__(self) -> None:
+        self.flushes: list[list[bytes]] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.fail_with: Exception | None = None
+
+    def writelines(self, frames) -> None:
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.flushes.append(list(frames))
+
+    async def drain(self) -> None:
+        await self.gate.wait()
+
+    def messages(self) -> list[dict]:
+        return [json.loads(frame) for flush in self.flushes for frame in flush]
+
+
+@pytest.fixture
+async def supervisor():
+    tasks = TaskSupervisor(source="test")
+    yield tasks
+    await tasks.shutdown()
+
+
+def _sender(writer: FakeWriter, supervisor: TaskSupervisor, **kwargs) -> MessageSender:
+    return MessageSender(writer, supervisor, **kwargs)  # ty: ignore[invalid-argument-type]
+
+
+async def test_send_waits_for_write(supervisor):
+    """send() returns after the frame is written, newline-delimited."""
+    writer = FakeWriter()
+    sender = _sender(writer, supervisor)
+
+    await sender.send({"id": 1, "result": None})
+
+    assert writer.flushes == [[b'{"id":1,"result":null}\n']]
+    await sender.close()
+
+
+async def test_queued_frames_are_coalesced(supervisor):
+    """Frames queued during a slow drain go out in one writelines() call."""
+    writer = FakeWriter()
+    sender = _sender(writer, supervisor)
+    await sender.send({"n": 0})
+    writer.gate.clear()
+
+    await sender.send({"n": 1}, wait=False)  # Flushed alone, then stuck in drain
+    await asyncio.sleep(0)
+    for n in range(2, 6):
+        await sender.send({"n": n}, wait=False)
+    assert sender.stats.queue_depth == 4
+    writer.gate.set()
+    await sender.send({"n": 6})
+
+    assert [len(flush) for flush in writer.flushes] == [1, 1, 5]
+    assert [m["n"] for m in writer.messages()] == list(range(7))
+    stats = sender.stats
+    assert (stats.flushes, stats.messages_sent, stats.queue_depth) == (3, 7, 0)
+    assert stats.bytes_per_flush == stats.bytes_sent / 3
+    await sender.close()
+
+
+async def test_backpressure_blocks_above_high_water(supervisor):
+    """Senders block at high_water and resume once flushed below low_water."""
+    writer = FakeWriter()
+    writer.gate.clear()
+    sender = _sender(writer, supervisor, high_water=40, low_water=0)
+
+    await sender.send({"data": "x" * 10}, wait=False)
+    await asyncio.sleep(0)  # First frame is now stuck in drain
+    await sender.send({"data": "y" * 30}, wait=False)  # Crosses high_water
+    blocked = asyncio.create_task(sender.send({"data": "z"}, wait=False))
+    await asyncio.sleep(0.01)
+
+    assert not blocked.done()
+    writer.gate.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await sender.close()
+    assert len(writer.messages()) == 3
+
+
+async def test_close_flushes_fire_and_forget_frames(supervisor):
+    """close() writes everything still queued."""
+    writer = FakeWriter()
+    sender = _sender(writer, supervisor)
+
+    for n in range(3):
+        await sender.send({"n": n}, wait=False)
+    await sender.close()
+
+    assert [m["n"] for m in writer.messages()] == [0, 1, 2]
+    with pytest.raises(ConnectionError):
+        await sender.send({"n": 3})
+
+
+async def test_write_error_fails_waiting_senders(supervisor):
+    """A write error reaches waiting senders and rejects later sends."""
+    writer = FakeWriter()
+    writer.fail_with = BrokenPipeError("peer went away")
+    sender = _sender(writer, supervisor)
+
+    with pytest.raises(BrokenPipeError):
+        await sender.send({"n": 0})
+    with pytest.raises(ConnectionError):
+        await sender.send({"n": 1})
+    await sender.close()
@@ -1,10 +1,15 @@
 """Tests for Python code execution sandbox."""
 
+import dataclasses
+import threading
+import time
+
 import pytest
 
 from punie.agent.monty_runner import (
     CodeExecutionError,
     ExternalFunctions,
+    ParallelLimit,
     run_code,
     run_code_async,
 )
@@ -222,6 +227,11 @@ def fake_domain_validator(file_path: str) -> DomainValidationResult:
     return DomainValidationResult(valid=True, domain="test", issues=[])
 
 
+def fake_validate_all(file_path: str, checks: list[str] | None = None):
+    """Fake validate_all for testing."""
+    return {name: fake_domain_validator(file_path) for name in checks or ["validate_component"]}
+
+
 @pytest.fixture
 def external_functions():
     """Fixture providing external functions registry."""
@@ -252,6 +262,9 @@ def external_functions():
         validate_middleware_chain=fake_domain_validator,
         check_di_template_binding=fake_domain_validator,
         validate_route_pattern=fake_domain_validator,
+        validate_all=fake_validate_all,
+        scan_pattern=fake_cst_find_pattern,
+        scan_validate=fake_validate_all,
     )
 
 
@@ -535,3 +548,109 @@ for i in range(5):
     assert len(lines) == 5
     assert lines[0] == "Line 0"
     assert lines[4] == "Line 4"
+
+
+# parallel() helper
+
+
+def _with_typecheck(external_functions, typecheck):
+    return dataclasses.replace(external_functions, typecheck=typecheck)
+
+
+def test_parallel_overlaps_blocking_calls(external_functions):
+    """Calls passed to parallel() run at the same time, not one after another."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def blocking_typecheck(path: str) -> TypeCheckResult:
+        barrier.wait()  # only passes once all three calls are running
+        return fake_typecheck(path)
+
+    funcs = _with_typecheck(external_functions, blocking_typecheck)
+    code = """
+results = parallel((typecheck, "a.py"), (typecheck, "b.py"), (typecheck, "c.py"))
+print(len(results), [r.success for r in results])
+"""
+    assert run_code(code, funcs).strip() == "3 [True, True, True]"
+
+
+def test_parallel_respects_max_parallel(external_functions):
+    """No more than max_parallel calls run at once."""
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def counting_typecheck(path: str) -> TypeCheckResult:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return fake_typecheck(path)
+
+    funcs = _with_typecheck(external_functions, counting_typecheck)
+    code = 'parallel(*[(typecheck, f"{i}.py") for i in range(8)])'
+    run_code(code, funcs, max_parallel=2)
+
+    assert peak == 2
+
+
+def test_parallel_limit_is_shared_by_nested_and_concurrent_calls(external_functions):
+    """Scripts sharing a ParallelLimit stay within it, even with nested parallel()."""
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def counting_typecheck(path: str) -> TypeCheckResult:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return fake_typecheck(path)
+
+    funcs = _with_typecheck(external_functions, counting_typecheck)
+    code = """
+inner = lambda: parallel((typecheck, "x.py"), (typecheck, "y.py"))
+parallel(inner, inner, (typecheck, "z.py"))
+"""
+    limit = ParallelLimit(2)
+    scripts = [threading.Thread(target=run_code, args=(code, funcs, limit)) for _ in range(3)]
+    for script in scripts:
+        script.start()
+    for script in scripts:
+        script.join(timeout=5)
+
+    assert peak == 2
+
+
+def test_parallel_returns_results_in_call_order(external_functions):
+    """Results line up with calls; lambdas and tuples can be mixed."""
+    code = """
+results = parallel(lambda: read_file("test.txt"), (len, "abcd"), lambda: 6 * 7)
+print(results)
+"""
+    result = run_code(code, external_functions)
+    assert result.strip() == "['test content', 4, 42]"
+
+
+def test_parallel_propagates_errors(external_functions):
+    """An exception in one call surfaces as a CodeExecutionError."""
+
+    def failing_typecheck(path: str) -> TypeCheckResult:
+        raise ValueError(f"cannot check {path}")
+
+    funcs = _with_typecheck(external_functions, failing_typecheck)
+    code = 'parallel((read_file, "test.txt"), (typecheck, "b.py"))'
+
+    with pytest.raises(CodeExecutionError, match="cannot check b.py"):
+        run_code(code, funcs)
+
+
+def test_parallel_rejects_non_callables(external_functions):
+    """Non-callable arguments are a clear error rather than a silent no-op."""
+    with pytest.raises(CodeExecutionError, match="parallel\\(\\) takes callables"):
+        run_code('parallel("a.py")', external_functions)
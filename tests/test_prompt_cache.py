@@ -0,0 +1,120 @@
+"""Tests for prompt-prefix caching: stable prefixes, cache hints, prewarm and prefill reports."""
+
+import asyncio
+
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from punie.acp import text_block
+from punie.acp.schema import ClientCapabilities, FileSystemCapability
+from punie.agent import PunieAgent, adapter, create_pydantic_agent, factory
+from punie.agent.config import PUNIE_INSTRUCTIONS
+from punie.agent.discovery import ToolCatalog, ToolDescriptor
+from punie.agent.factory import tool_definitions
+from punie.agent.prompt_cache import prefix_cache_key, prewarm
+from punie.agent.toolset import create_toolset, create_toolset_from_catalog
+from punie.testing import FakeClient
+
+
+def _catalog(*names: str) -> ToolCatalog:
+    return ToolCatalog(
+        tools=tuple(
+            ToolDescriptor(name=name, kind="other", description=name, parameters={})
+            for name in names
+        )
+    )
+
+
+def test_catalog_order_does_not_change_the_prefix():
+    """The same tools advertised in any order give one schema and cache key."""
+    first = tool_definitions(create_toolset_from_catalog(_catalog("read_file", "refactor", "git")))
+    second = tool_definitions(create_toolset_from_catalog(_catalog("git", "read_file", "refactor")))
+
+    assert [tool.name for tool in first] == [tool.name for tool in second]
+    assert prefix_cache_key(PUNIE_INSTRUCTIONS, first) == prefix_cache_key(
+        PUNIE_INSTRUCTIONS, second
+    )
+    assert prefix_cache_key(PUNIE_INSTRUCTIONS, first) != prefix_cache_key(
+        PUNIE_INSTRUCTIONS, first[:1]
+    )
+
+
+def test_local_agents_send_prompt_cache_hints():
+    """Only local-server agents get the cache key and cache_prompt settings."""
+    local = create_pydantic_agent(model="local:my-model")
+    remote = create_pydantic_agent(model="test")
+
+    expected_key = prefix_cache_key(PUNIE_INSTRUCTIONS, tool_definitions(create_toolset()))
+    assert local.model_settings["openai_prompt_cache_key"] == expected_key
+    assert local.model_settings["extra_body"] == {"cache_prompt": True}
+    assert "openai_prompt_cache_key" not in remote.model_settings
+
+
+async def test_prewarm_sends_the_session_prefix_for_one_token():
+    """prewarm() sends the instructions and tools exactly once, asking for one token."""
+    seen: list[AgentInfo] = []
+
+    def reply(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        seen.append(info)
+        return ModelResponse(parts=[TextPart("ok")])
+
+    tools = tool_definitions(create_toolset())
+
+    sample = await prewarm(FunctionModel(reply), PUNIE_INSTRUCTIONS, tools)
+
+    assert len(seen) == 1
+    assert seen[0].instructions == PUNIE_INSTRUCTIONS
+    assert [tool.name for tool in seen[0].function_tools] == [tool.name for tool in tools]
+    assert seen[0].model_settings["max_tokens"] == 1
+    assert sample.input_tokens > 0
+    assert sample.prefill_ms is not None
+
+
+async def test_prewarm_skips_non_local_models():
+    """PunieAgent.prewarm() only talks to local model servers."""
+    assert await PunieAgent(model="test").prewarm() is None
+
+
+async def test_new_session_prewarms_the_prefix_its_first_request_uses(monkeypatch):
+    """Building a session's agent prewarms the exact prefix its first request sends."""
+    monkeypatch.setattr(factory, "is_local_model", lambda model: True)
+    monkeypatch.setattr(adapter, "is_local_model", lambda model: True)
+    requests: list[tuple[int | None, str]] = []
+
+    def reply(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        settings = info.model_settings or {}
+        requests.append((settings.get("max_tokens"), settings["openai_prompt_cache_key"]))
+        return ModelResponse(parts=[TextPart("ok")])
+
+    # Tier 2 session, as `punie serve` WebSocket clients get
+    capabilities = ClientCapabilities(
+        fs=FileSystemCapability(read_text_file=True, write_text_file=True)
+    )
+    agent = PunieAgent(model=FunctionModel(reply), name="test-agent", streaming=False)
+    agent.on_connect(FakeClient(tool_catalog=[], capabilities=capabilities))
+    await agent.initialize(protocol_version=1, client_capabilities=capabilities)
+    session_id = (await agent.new_session(cwd="/tmp", mcp_servers=[])).session_id
+    await asyncio.gather(*agent._prewarm_tasks)
+
+    await agent.prompt(prompt=[text_block("hi")], session_id=session_id)
+
+    (prewarm_tokens, prewarm_key), (_, first_key) = requests
+    assert agent._sessions[session_id].discovery_tier == 2
+    assert prewarm_tokens == 1
+    assert first_key == prewarm_key
+
+
+async def test_streamed_prompt_reports_prefill_per_request():
+    """Each model request's prefill time and cached tokens land in field_meta."""
+    pydantic_agent = create_pydantic_agent(model=TestModel(custom_output_text="done", call_tools=[]))
+    agent = PunieAgent(pydantic_agent, name="test-agent")
+    agent.on_connect(FakeClient())
+
+    response = await agent.prompt(prompt=[text_block("hi")], session_id="s-1")
+
+    assert response.field_meta is not None
+    [sample] = response.field_meta["prefill"]
+    assert sample["input_tokens"] > 0
+    assert sample["cached_tokens"] == 0
+    assert sample["prefill_ms"] >= 0
@@ -1,8 +1,30 @@
 """Basic tests for the punie package."""
 
+import pytest
+
 
 def test_punie_module_has_correct_name():
     """Test that punie module can be imported and has correct __name__."""
     import punie
 
     assert punie.__name__ == "punie"
+
+
+def test_punie_exports_resolve_lazily():
+    """Package exports are importable even though they load on first access."""
+    import punie
+    from punie.agent.adapter import PunieAgent
+
+    assert punie.PunieAgent is PunieAgent
+    assert set(punie.__all__) <= set(dir(punie)) | set(punie._LAZY_EXPORTS)
+
+
+def test_lazy_export_is_cached_and_unknown_names_raise():
+    """A resolved export lands in the package namespace; unknown names still fail."""
+    import punie.http
+    from punie.http.runner import run_http
+
+    assert punie.http.run_http is run_http
+    assert vars(punie.http)["run_http"] is run_http
+    with pytest.raises(AttributeError, match="module punie.http has no attribute nope"):
+        punie.http.nope  # noqa: B018
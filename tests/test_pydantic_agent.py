@@ -201,19 +201,20 @@ async def test_fake_client_kill_terminal():
     assert terminal_id not in fake_client.terminals
 
 
-def test_toolset_has_all_eight_tools():
-    """create_toolset() should return toolset with all 8 tools."""
+def test_toolset_has_all_nine_tools():
+    """create_toolset() should return toolset with all 9 tools."""
     toolset = create_toolset()
 
     # toolset.tools is a dict mapping tool names to Tool objects
     tool_names = set(toolset.tools.keys())
 
-    # Verify all 8 tools are present
+    # Verify all 9 tools are present
     expected_tools = {
         "read_file",
         "write_file",
         "run_command",
         "execute_code",
+        "read_more",
         "get_terminal_output",
         "release_terminal",
         "wait_for_terminal_exit",
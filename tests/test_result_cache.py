@@ -0,0 +1,187 @@
+"""Tests for the session-scoped typed tool result cache."""
+
+import os
+from unittest.mock import MagicMock
+
+from pydantic_ai import RunContext
+
+from punie.acp.contrib.tool_calls import ToolCallTracker
+from punie.agent.deps import ACPDeps
+from punie.agent.result_cache import CacheKey, ToolResultCache, cache_key
+from punie.agent.toolset import ruff_check_direct, write_file
+from punie.testing import FakeClient
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _touch(path, content: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is visible."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def _git_repo(root):
+    git = root / ".git"
+    (git / "refs" / "heads").mkdir(parents=True)
+    (git / "HEAD").write_text("ref: refs/heads/main\n")
+    (git / "refs" / "heads" / "main").write_text("a" * 40 + "\n")
+    (git / "index").write_bytes(b"DIRC")
+    return git
+
+
+def _ctx(client: FakeClient, root, cache: ToolResultCache) -> RunContext[ACPDeps]:
+    deps = ACPDeps(
+        client_conn=client,
+        session_id="s-1",
+        tracker=ToolCallTracker(),
+        workspace_root=root,
+        result_cache=cache,
+    )
+    return RunContext(deps=deps, retry=0, tool_name="t", model=MagicMock(), usage=MagicMock())
+
+
+def test_ruff_key_tracks_target_and_config_only(tmp_path):
+    """Lint keys change with the target or ruff config, not with other files."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("x = 1\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_app.py").write_text("")
+    (tmp_path / "pyproject.toml").write_text("")
+    target = tmp_path / "src"
+
+    first = cache_key("ruff_check", ("src",), target, tmp_path)
+    _touch(tmp_path / "tests" / "test_app.py", "assert True\n")
+    assert cache_key("ruff_check", ("src",), target, tmp_path) == first
+
+    _touch(tmp_path / "src" / "app.py", "x = 2\n")
+    second = cache_key("ruff_check", ("src",), target, tmp_path)
+    assert second != first
+
+    _touch(tmp_path / "pyproject.toml", "[tool.ruff]\n")
+    assert cache_key("ruff_check", ("src",), target, tmp_path) != second
+
+
+def test_typecheck_key_tracks_whole_workspace(tmp_path):
+    """Type results depend on imports anywhere in the workspace."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "lib.py").write_text("")
+    first = cache_key("typecheck", ("src",), tmp_path / "src", tmp_path)
+
+    _touch(tmp_path / "lib.py", "def f() -> int: ...\n")
+
+    assert cache_key("typecheck", ("src",), tmp_path / "src", tmp_path) != first
+    assert first.scope == tmp_path
+
+
+def test_cache_reuses_workspace_walks_until_ttl_or_write(tmp_path, monkeypatch):
+    """Workspace keys walk the tree once per fingerprint_ttl, or again after a write."""
+    from punie.agent import result_cache
+
+    walks: list = []
+    walk = result_cache.workspace_fingerprint
+    monkeypatch.setattr(
+        result_cache, "workspace_fingerprint", lambda root: walks.append(root) or walk(root)
+    )
+    (tmp_path / "lib.py").write_text("")
+    clock = FakeClock()
+    cache = ToolResultCache(clock=clock, fingerprint_ttl=2.0)
+
+    first = cache.key("typecheck", (".",), tmp_path, tmp_path)
+    assert cache.key("pytest_run", (".",), tmp_path, tmp_path) != first
+    assert cache.key("typecheck", (".",), tmp_path, tmp_path) == first
+    assert len(walks) == 1
+
+    _touch(tmp_path / "lib.py", "x = 1\n")
+    cache.invalidate(tmp_path / "lib.py")
+    assert cache.key("typecheck", (".",), tmp_path, tmp_path) != first
+    clock.now = 2.0
+    cache.key("typecheck", (".",), tmp_path, tmp_path)
+    assert len(walks) == 3
+
+
+def test_git_log_key_tracks_head_not_worktree(tmp_path):
+    """git_log only changes when HEAD moves; edits to files don't matter."""
+    git = _git_repo(tmp_path)
+    (tmp_path / "app.py").write_text("")
+    first = cache_key("git_log", (".", 10), tmp_path, tmp_path)
+
+    _touch(tmp_path / "app.py", "x = 1\n")
+    assert cache_key("git_log", (".", 10), tmp_path, tmp_path) == first
+    assert first.scope is None
+
+    _touch(git / "refs" / "heads" / "main", "b" * 40 + "\n")
+    assert cache_key("git_log", (".", 10), tmp_path, tmp_path) != first
+    assert cache_key("git_status", (".",), tmp_path, tmp_path).scope == tmp_path
+
+
+def test_entries_expire_and_evict_least_recently_used():
+    """Entries age out after ttl; the least recently used goes first when full."""
+    clock = FakeClock()
+    cache = ToolResultCache(max_entries=2, ttl=10.0, clock=clock)
+    a, b, c = (CacheKey("git_log", (n,), "f", None) for n in "abc")
+    cache.put(a, "A")
+    cache.put(b, "B")
+    cache.get(a)
+    cache.put(c, "C")
+
+    assert cache.get(b) is None
+    assert cache.get(a) == "A"
+    clock.now = 10.0
+    assert cache.get(c) is None
+    assert cache.stats.evictions == 2
+
+
+def test_invalidate_drops_entries_whose_scope_contains_path(tmp_path):
+    """A write invalidates results scoped to the file or a parent directory."""
+    cache = ToolResultCache()
+    src = CacheKey("ruff_check", ("src",), "f", tmp_path / "src")
+    docs = CacheKey("ruff_check", ("docs",), "f", tmp_path / "docs")
+    log = CacheKey("git_log", (".", 10), "f", None)
+    for key in (src, docs, log):
+        cache.put(key, key.tool)
+
+    assert cache.invalidate(tmp_path / "src" / "app.py") == 1
+    assert cache.get(src) is None
+    assert cache.get(docs) == "ruff_check"
+    assert cache.get(log) == "git_log"
+
+
+async def test_repeated_tool_call_is_served_from_cache(tmp_path):
+    """A second identical call reuses the result and reports the hit."""
+    (tmp_path / "app.py").write_text("import os\n")
+    client = FakeClient()
+    cache = ToolResultCache()
+    ctx = _ctx(client, tmp_path, cache)
+
+    first = await ruff_check_direct(ctx, "app.py")
+    second = await ruff_check_direct(ctx, "app.py")
+
+    assert second == first
+    assert client._next_terminal_id == 1
+    assert cache.stats.hits == 1
+    titles = [n.update.title for n in client.notifications]
+    assert titles == ["ruff_check('app.py') (cached)"]
+    assert client.notifications[0].update.raw_output == {"cached": True}
+
+
+async def test_write_file_invalidates_cached_results(tmp_path):
+    """write_file drops results that the written file could change."""
+    (tmp_path / "app.py").write_text("import os\n")
+    client = FakeClient()
+    client.queue_permission_selected("allow-once")
+    cache = ToolResultCache()
+    ctx = _ctx(client, tmp_path, cache)
+
+    await ruff_check_direct(ctx, "app.py")
+    await write_file(ctx, "app.py", "import sys\n")
+    await ruff_check_direct(ctx, "app.py")
+
+    assert client._next_terminal_id == 2
+    assert cache.stats.invalidations == 1
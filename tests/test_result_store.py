@@ -0,0 +1,138 @@
+"""Tests for paging oversized tool outputs through the session result store."""
+
+import re
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic_ai import ModelRetry, RunContext
+
+from punie.acp.contrib.tool_calls import ToolCallTracker
+from punie.agent.deps import ACPDeps
+from punie.agent.result_store import PageBudget, ResultStore
+from punie.agent.toolset import read_file, read_more
+from punie.testing import FakeClient
+
+_NEXT = re.compile(r'read_more\("([\w-]+)", (\d+)\)')
+
+
+def _read_all(store: ResultStore, first_page: str) -> str:
+    """Follow read_more footers from a first page to the end of the output."""
+    pages = []
+    page = first_page
+    while match := _NEXT.search(page):
+        pages.append(page.rsplit("\n[", 1)[0])
+        page = store.read_more(match.group(1), int(match.group(2)))
+    pages.append(page.rsplit("\n[", 1)[0])
+    return "".join(pages)
+
+
+def _ctx(client: FakeClient, store: ResultStore | None) -> RunContext[ACPDeps]:
+    deps = ACPDeps(
+        client_conn=client,
+        session_id="s-1",
+        tracker=ToolCallTracker(),
+        result_store=store,
+    )
+    return RunContext(deps=deps, retry=0, tool_name="t", model=MagicMock(), usage=MagicMock())
+
+
+def test_small_outputs_pass_through_unchanged():
+    """Outputs within budget are returned as-is and nothing is stored."""
+    store = ResultStore({"read_file": PageBudget(max_bytes=100)})
+
+    assert store.page("read_file", "x" * 100) == "x" * 100
+    with pytest.raises(KeyError):
+        store.read_more("read_file-1")
+
+
+def test_pages_cover_the_whole_output_on_line_boundaries():
+    """Following the footers reassembles the output; pages end at newlines."""
+    store = ResultStore({"git_diff": PageBudget(max_bytes=64)})
+    text = "".join(f"+ line {n}\n" for n in range(200))
+
+    first = store.page("git_diff", text)
+
+    assert first.startswith("+ line 0\n")
+    assert first.split("\n[")[0].endswith("\n")
+    assert 'read_more("git_diff-1", ' in first
+    assert _read_all(store, first) == text
+
+
+def test_pages_never_split_multibyte_characters():
+    """Byte budgets cut before a UTF-8 sequence, not through it."""
+    store = ResultStore({"read_file": PageBudget(max_bytes=10)})
+    text = "é" * 25  # 50 bytes, no newlines
+
+    first = store.page("read_file", text)
+
+    assert "�" not in first
+    assert _read_all(store, first) == text
+
+
+def test_token_budget_tightens_the_page():
+    """max_tokens caps the page even when max_bytes would allow more."""
+    store = ResultStore({"execute_code": PageBudget(max_bytes=10_000, max_tokens=5)})
+
+    page = store.page("execute_code", "a" * 100)
+
+    assert page.startswith("a" * 20 + "\n[Output truncated: bytes 0-20 of 100.")
+
+
+def test_large_outputs_spill_to_disk_and_are_removed_on_close(tmp_path):
+    """Outputs over spill_bytes live in files that close() deletes."""
+    store = ResultStore(
+        {"read_file": PageBudget(max_bytes=16)}, spill_bytes=32, directory=tmp_path / "spill"
+    )
+    (tmp_path / "spill").mkdir()
+    text = "0123456789abcdef" * 8
+
+    first = store.page("read_file", text)
+    store.page("read_file", "small output ..")  # Fits the budget, never stored
+
+    assert [p.name for p in (tmp_path / "spill").iterdir()] == ["read_file-1"]
+    assert _read_all(store, first) == text
+    store.close()
+    assert list((tmp_path / "spill").iterdir()) == []
+    with pytest.raises(KeyError):
+        store.read_more("read_file-1")
+
+
+def test_least_recently_read_outputs_are_evicted(tmp_path):
+    """Beyond max_results the oldest handles expire and their spill files go."""
+    store = ResultStore(
+        {"run_command": PageBudget(max_bytes=4)}, max_results=2, spill_bytes=0, directory=tmp_path
+    )
+    for n in range(3):
+        store.page("run_command", f"output {n}")
+
+    with pytest.raises(KeyError, match="expired"):
+        store.read_more("run_command-1")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run_command-2", "run_command-3"]
+    with pytest.raises(ValueError, match="outside"):
+        store.read_more("run_command-2", 99)
+
+
+async def test_read_file_returns_first_page_to_model_and_ide():
+    """A large file is paged for the model and for the IDE echo alike."""
+    content = "".join(f"line {n}\n" for n in range(1000))
+    client = FakeClient(files={"/big.py": content})
+    store = ResultStore({"read_file": PageBudget(max_bytes=200)})
+    ctx = _ctx(client, store)
+
+    page = await read_file(ctx, "/big.py")
+    rest = await read_more(ctx, "read_file-1", int(_NEXT.search(page).group(2)))
+
+    assert len(page.encode()) < 300
+    assert client.notifications[-1].update.content[0].content.text == page
+    assert rest.startswith(content[len(page.split("\n[")[0]) :][:20])
+    assert _read_all(store, page) == content
+
+
+async def test_read_more_reports_bad_handles_to_the_model():
+    """Unknown handles and sessions without a store ask the model to retry."""
+    ctx = _ctx(FakeClient(), ResultStore())
+
+    with pytest.raises(ModelRetry, match="No stored output"):
+        await read_more(ctx, "read_file-9")
+    with pytest.raises(ModelRetry, match="No stored outputs"):
+        await read_more(_ctx(FakeClient(), None), "read_file-1")
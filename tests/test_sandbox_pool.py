@@ -0,0 +1,227 @@
+"""Tests for SandboxPool: dedicated threads, compile cache, and resource limits."""
+
+import asyncio
+import dataclasses
+import logging
+import threading
+import time
+
+import pytest
+
+from punie.agent import sandbox_pool
+from punie.agent.cancellation import PromptScope, SandboxCancelled
+from punie.agent.monty_runner import (
+    CodeExecutionError,
+    ExternalFunctions,
+    run_code_timed,
+)
+from punie.agent.sandbox_pool import SandboxLimits, SandboxPool
+
+
+def _unavailable(*args, **kwargs):
+    raise RuntimeError("not available in this test")
+
+
+def _external_functions(**overrides) -> ExternalFunctions:
+    """ExternalFunctions where every function not overridden raises."""
+    functions = {f.name: _unavailable for f in dataclasses.fields(ExternalFunctions)}
+    return ExternalFunctions(**(functions | overrides))
+
+
+@pytest.fixture
+def pool():
+    sandbox_pool = SandboxPool(max_workers=2, poll_interval=0.01)
+    yield sandbox_pool
+    sandbox_pool.shutdown()
+
+
+async def test_pool_runs_code_and_reports_timing(pool):
+    """run() returns the output together with wall and CPU time."""
+    run = await pool.run("print(sum(range(10)))", _external_functions())
+
+    assert run.output == "45\n"
+    assert run.wall_ms >= 0
+    assert run.cpu_ms >= 0
+    assert pool.active == 0
+
+
+async def test_pool_uses_its_own_threads(pool):
+    """Scripts run on punie-sandbox threads, not the loop's default executor."""
+    seen: list[str] = []
+
+    def record_thread(path: str) -> str:
+        seen.append(threading.current_thread().name)
+        return ""
+
+    await pool.run("read_file('x')", _external_functions(read_file=record_thread))
+
+    assert seen[0].startswith("punie-sandbox")
+
+
+def test_compile_cache_hit_on_repeated_code():
+    """The same source is compiled once and reused."""
+    code = "print('cached' + ' once')"
+    functions = _external_functions()
+
+    run_code_timed(code, functions)
+    second = run_code_timed(code, functions)
+
+    assert second.compile_cache_hit
+    assert second.output == "cached once\n"
+
+
+async def test_pool_reports_syntax_errors(pool):
+    """Syntax errors surface as CodeExecutionError."""
+    with pytest.raises(CodeExecutionError, match="Syntax error"):
+        await pool.run("def broken(:", _external_functions())
+
+
+async def test_cpu_limit_stops_runaway_script():
+    """A busy loop is interrupted once it exceeds the CPU budget."""
+    pool = SandboxPool(limits=SandboxLimits(cpu_seconds=0.2), poll_interval=0.01)
+    try:
+        with pytest.raises(CodeExecutionError, match="limit of 0.2s exceeded"):
+            await asyncio.wait_for(
+                pool.run("while True:\n    pass", _external_functions()), timeout=10
+            )
+        # The worker thread is reusable afterwards
+        run = await pool.run("print('ok')", _external_functions())
+        assert run.output == "ok\n"
+    finally:
+        pool.shutdown()
+
+
+async def test_cpu_limit_cannot_be_swallowed_by_script():
+    """The limit exception is not caught by the script's except Exception."""
+    pool = SandboxPool(limits=SandboxLimits(cpu_seconds=0.2), poll_interval=0.01)
+    code = (
+        "while True:\n"
+        "    try:\n"
+        "        while True:\n"
+        "            pass\n"
+        "    except Exception:\n"
+        "        pass\n"
+    )
+    try:
+        with pytest.raises(CodeExecutionError, match="Execution stopped"):
+            await asyncio.wait_for(pool.run(code, _external_functions()), timeout=10)
+    finally:
+        pool.shutdown()
+
+
+async def test_cpu_limit_ignores_time_blocked_on_tools():
+    """Waiting on a slow tool call does not count against the CPU budget."""
+    pool = SandboxPool(limits=SandboxLimits(cpu_seconds=0.2), poll_interval=0.01)
+
+    def slow_read(path: str) -> str:
+        time.sleep(0.5)
+        return "done"
+
+    try:
+        run = await pool.run(
+            "print(read_file('x'))", _external_functions(read_file=slow_read)
+        )
+        assert run.output == "done\n"
+    finally:
+        pool.shutdown()
+
+
+async def test_cpu_limit_disabled_without_thread_clock(monkeypatch, caplog):
+    """Without a per-thread CPU clock the limit is skipped (and logged), not run on wall time."""
+    monkeypatch.setattr(sandbox_pool, "_thread_cpu_clock", lambda thread_id: None)
+    monkeypatch.setattr(sandbox_pool, "_cpu_clock_warned", False)
+    pool = SandboxPool(limits=SandboxLimits(cpu_seconds=0.2), poll_interval=0.01)
+
+    def slow_read(path: str) -> str:
+        time.sleep(0.5)
+        return "done"
+
+    try:
+        with caplog.at_level(logging.WARNING, logger="punie.agent.sandbox_pool"):
+            run = await pool.run(
+                "print(read_file('x'))", _external_functions(read_file=slow_read)
+            )
+        assert run.output == "done\n"
+        assert "CPU limit is disabled" in caplog.text
+    finally:
+        pool.shutdown()
+
+
+async def test_scope_cancel_interrupts_pooled_run(pool):
+    """PromptScope.cancel() still interrupts a script running on the pool."""
+    scope = PromptScope("s-1")
+    started = threading.Event()
+
+    def signal_started(path: str) -> str:
+        started.set()
+        return ""
+
+    task = asyncio.create_task(
+        pool.run(
+            "read_file('x')\nwhile True:\n    pass",
+            _external_functions(read_file=signal_started),
+            scope=scope,
+        )
+    )
+    assert await asyncio.to_thread(started.wait, 5)
+    scope.cancel()
+
+    with pytest.raises(SandboxCancelled):
+        await asyncio.wait_for(task, timeout=10)
+
+
+async def test_cpu_limit_covers_parallel_workers():
+    """Busy parallel() workers count against the run's CPU budget and are stopped."""
+    pool = SandboxPool(limits=SandboxLimits(cpu_seconds=0.2), poll_interval=0.01)
+    code = "def spin():\n    while True:\n        pass\nparallel(spin, spin)"
+    try:
+        with pytest.raises(CodeExecutionError, match="CPU limit of 0.2s exceeded"):
+            await asyncio.wait_for(pool.run(code, _external_functions()), timeout=10)
+        assert not [t for t in threading.enumerate() if t.name.startswith("punie-parallel")]
+    finally:
+        pool.shutdown()
+
+
+async def test_scope_cancel_interrupts_parallel_workers(pool):
+    """PromptScope.cancel() reaches calls running on parallel() workers."""
+    scope = PromptScope("s-1")
+    started = threading.Semaphore(0)
+
+    def spin(path: str) -> str:
+        started.release()
+        while True:
+            time.sleep(0.01)
+
+    task = asyncio.create_task(
+        pool.run(
+            "parallel((read_file, 'a'), (read_file, 'b'))",
+            _external_functions(read_file=spin),
+            scope=scope,
+        )
+    )
+    for _ in range(2):
+        assert await asyncio.to_thread(started.acquire, True, 5)
+    scope.cancel()
+
+    with pytest.raises(SandboxCancelled):
+        await asyncio.wait_for(task, timeout=10)
+    assert not [t for t in threading.enumerate() if t.name.startswith("punie-parallel")]
+
+
+async def test_parallel_waits_for_running_calls_after_a_failure(pool):
+    """A failing call does not leave its siblings running after the script ends."""
+    finished = threading.Event()
+
+    def read(path: str) -> str:
+        if path == "bad":
+            raise RuntimeError("boom")
+        time.sleep(0.2)
+        finished.set()
+        return "ok"
+
+    with pytest.raises(CodeExecutionError, match="boom"):
+        await pool.run(
+            "parallel((read_file, 'bad'), (read_file, 'slow'))",
+            _external_functions(read_file=read),
+        )
+    assert finished.is_set()
@@ -164,6 +164,14 @@ def fake_domain_validator(file_path: str) -> DomainValidationResult:  # noqa: AR
     return DomainValidationResult(valid=True, domain="test", issues=[])
 
 
+def fake_validate_all(
+    file_path: str, checks: list[str] | None = None
+) -> dict[str, DomainValidationResult]:
+    """Fake validate_all that reports each requested check as valid."""
+    names = checks or ["validate_component", "validate_route_pattern"]
+    return {name: fake_domain_validator(file_path) for name in names}
+
+
 @pytest.fixture
 def external_functions():
     """Fixture with all external functions including typed tools."""
@@ -194,6 +202,9 @@ def external_functions():
         validate_middleware_chain=fake_domain_validator,
         check_di_template_binding=fake_domain_validator,
         validate_route_pattern=fake_domain_validator,
+        validate_all=fake_validate_all,
+        scan_pattern=fake_cst_find_pattern,
+        scan_validate=fake_validate_all,
     )
 
 
@@ -317,3 +328,14 @@ print(f"Renames: {result.rename_count}")
     output = run_code(code, external_functions)
     assert "Success: True" in output
     assert "Renames: 0" in output
+
+
+def test_run_code_calls_validate_all(external_functions):
+    """validate_all is accessible through the sandbox and returns one result per check."""
+    code = """
+results = validate_all("src/views.py", ["validate_component"])
+for name, result in results.items():
+    print(f"{name}: {result.valid}")
+"""
+    output = run_code(code, external_functions)
+    assert "validate_component: True" in output
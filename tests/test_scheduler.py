@@ -0,0 +1,245 @@
+"""Tests for scheduling local model requests (punie.agent.scheduler)."""
+
+import asyncio
+
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from punie.acp import text_block
+from punie.acp.contrib.tool_calls import ToolCallTracker
+from punie.agent import PunieAgent, adapter
+from punie.agent.deps import ACPDeps
+from punie.agent.factory import create_pydantic_agent
+from punie.agent.scheduler import (
+    PREWARM_SESSION,
+    ModelScheduler,
+    Priority,
+    ScheduledModel,
+    get_model_scheduler,
+    scheduled_as,
+    set_model_scheduler,
+)
+from punie.agent.streaming import run_streaming
+from punie.testing import FakeClient
+
+
+@pytest.fixture
+def scheduler():
+    """A fresh process-wide scheduler, restored afterwards."""
+    scheduler = ModelScheduler()
+    previous = set_model_scheduler(scheduler)
+    yield scheduler
+    set_model_scheduler(previous)
+
+
+async def _run_in_order(
+    scheduler: ModelScheduler, requests: list[tuple[str, Priority]]
+) -> list[str]:
+    """Queue requests behind a held slot and return the order they are granted."""
+    order: list[str] = []
+    hold = asyncio.Event()
+
+    async def holder():
+        async with scheduler.slot("holder"):
+            await hold.wait()
+
+    async def request(name: str, priority: Priority):
+        async with scheduler.slot(name.split("/")[0], priority):
+            order.append(name)
+
+    held = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    tasks = []
+    for name, priority in requests:
+        tasks.append(asyncio.create_task(request(name, priority)))
+        await asyncio.sleep(0)
+    hold.set()
+    await asyncio.gather(held, *tasks)
+    return order
+
+
+def _recording(scheduler: ModelScheduler) -> list[tuple[str, Priority]]:
+    """Record the session and priority of every slot the scheduler grants."""
+    seen: list[tuple[str, Priority]] = []
+    slot = scheduler.slot
+
+    def recording_slot(session_id, priority=Priority.INTERACTIVE):
+        seen.append((session_id, priority))
+        return slot(session_id, priority)
+
+    scheduler.slot = recording_slot
+    return seen
+
+
+async def test_interactive_requests_go_before_batch_requests():
+    """Queued interactive requests are granted before earlier batch requests."""
+    order = await _run_in_order(
+        ModelScheduler(),
+        [
+            ("eval/1", Priority.BATCH),
+            ("ide/1", Priority.INTERACTIVE),
+            ("eval/2", Priority.BATCH),
+        ],
+    )
+
+    assert order == ["ide/1", "eval/1", "eval/2"]
+
+
+async def test_sessions_take_turns_within_a_priority():
+    """A session with many queued requests does not starve the others."""
+    order = await _run_in_order(
+        ModelScheduler(),
+        [
+            ("a/1", Priority.INTERACTIVE),
+            ("a/2", Priority.INTERACTIVE),
+            ("a/3", Priority.INTERACTIVE),
+            ("b/1", Priority.INTERACTIVE),
+            ("c/1", Priority.INTERACTIVE),
+        ],
+    )
+
+    assert order == ["a/1", "b/1", "c/1", "a/2", "a/3"]
+
+
+async def test_at_most_max_concurrent_generations_run():
+    """Requests beyond max_concurrent wait, and their waits are recorded."""
+    scheduler = ModelScheduler(max_concurrent=2)
+    running = peak = 0
+
+    async def generate(session_id: str):
+        nonlocal running, peak
+        async with scheduler.slot(session_id, Priority.BATCH):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(generate(f"s-{n}") for n in range(5)))
+
+    stats = scheduler.stats()
+    assert peak == 2
+    assert stats.running == 0
+    assert stats.by_priority[Priority.BATCH].granted == 5
+    assert stats.by_priority[Priority.BATCH].max_wait_seconds > 0
+    assert stats.by_priority[Priority.INTERACTIVE].granted == 0
+
+
+async def test_cancelled_waiters_leave_the_queue():
+    """Cancelling a queued request neither leaks a slot nor blocks later ones."""
+    scheduler = ModelScheduler()
+
+    async def wait_for_slot():
+        async with scheduler.slot("s-2"):
+            pass
+
+    async with scheduler.slot("s-1"):
+        waiter = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0)
+        assert scheduler.stats().by_priority[Priority.INTERACTIVE].waiting == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert scheduler.stats().by_priority[Priority.INTERACTIVE].waiting == 0
+    async with asyncio.timeout(1), scheduler.slot("s-3"):
+        assert scheduler.stats().running == 1
+
+
+async def test_scheduled_model_requests_hold_a_slot_for_their_session():
+    """Agent runs on a ScheduledModel are granted slots with the scheduled priority."""
+    scheduler = ModelScheduler()
+    agent = create_pydantic_agent(
+        model=ScheduledModel(TestModel(call_tools=[]), scheduler)
+    )
+
+    with scheduled_as("eval", Priority.BATCH):
+        await agent.run("hi", deps=None)
+    async with agent.run_stream("hi", deps=None) as result:
+        await result.get_output()
+
+    stats = scheduler.stats()
+    assert stats.by_priority[Priority.BATCH].granted >= 1
+    assert stats.by_priority[Priority.INTERACTIVE].granted >= 1
+    assert stats.running == 0
+
+
+def test_only_local_models_are_scheduled(scheduler):
+    """Local servers share the process-wide scheduler; other models are not wrapped."""
+    local = create_pydantic_agent(model="local:my-model")
+
+    assert isinstance(local.model, ScheduledModel)
+    assert local.model.scheduler is get_model_scheduler()
+    assert not isinstance(create_pydantic_agent(model="test").model, ScheduledModel)
+
+
+async def test_prompt_priority_comes_from_request_meta(scheduler):
+    """A prompt with priority "batch" is scheduled as batch work for its session."""
+    seen = _recording(scheduler)
+    agent = PunieAgent(
+        model=create_pydantic_agent(model=ScheduledModel(TestModel(call_tools=[])))
+    )
+    agent.on_connect(FakeClient())
+    await agent.initialize(protocol_version=1)
+    session_id = (await agent.new_session(cwd="/tmp", mcp_servers=[])).session_id
+
+    await agent.prompt(
+        prompt=[text_block("hi")], session_id=session_id, priority="batch"
+    )
+
+    assert seen and set(seen) == {(session_id, Priority.BATCH)}
+
+
+async def test_streamed_prefill_does_not_count_the_queue_wait():
+    """Time spent waiting for a slot is reported as queued_ms, not as prefill."""
+    scheduler = ModelScheduler()
+    agent = create_pydantic_agent(
+        model=ScheduledModel(TestModel(call_tools=[]), scheduler)
+    )
+    deps = ACPDeps(client_conn=FakeClient(), session_id="s-1", tracker=ToolCallTracker())
+
+    async def hold_slot():
+        async with scheduler.slot("other"):
+            await asyncio.sleep(0.2)
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    run = await run_streaming(agent, "hi", deps)
+    await holder
+
+    [sample] = run.prefill
+    assert sample.queued_ms >= 150
+    assert sample.prefill_ms is not None and sample.prefill_ms < 100
+
+
+async def test_prewarm_waits_for_a_batch_slot(scheduler, monkeypatch):
+    """PunieAgent.prewarm() goes through the scheduler as batch work."""
+    monkeypatch.setattr(adapter, "is_local_model", lambda model: True)
+    seen = _recording(scheduler)
+
+    def reply(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[TextPart("ok")])
+
+    sample = await PunieAgent(model=FunctionModel(reply)).prewarm()
+
+    assert sample is not None
+    assert seen == [(PREWARM_SESSION, Priority.BATCH)]
+
+
+async def test_prewarm_yields_to_interactive_requests(scheduler, monkeypatch):
+    """PunieAgent.prewarm() is skipped while a person's request holds the slot."""
+    monkeypatch.setattr(adapter, "is_local_model", lambda model: True)
+    seen = _recording(scheduler)
+
+    def reply(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[TextPart("ok")])
+
+    agent = PunieAgent(model=FunctionModel(reply))
+    async with scheduler.slot("s-1", Priority.INTERACTIVE):
+        assert scheduler.stats().by_priority[Priority.INTERACTIVE].running == 1
+        sample = await asyncio.wait_for(agent.prewarm(), timeout=1)
+
+    assert sample is None
+    assert seen == [("s-1", Priority.INTERACTIVE)]  # Only the held slot
+    assert scheduler.stats().by_priority[Priority.INTERACTIVE].running == 0
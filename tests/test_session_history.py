@@ -0,0 +1,191 @@
+"""Tests for per-session conversation history and its compaction."""
+
+import asyncio
+
+import pytest
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from punie.acp import text_block
+from punie.agent import PunieAgent, create_pydantic_agent
+from punie.agent.history import SessionHistory, token_counter_for
+from punie.testing import FakeClient
+
+
+def _turn(n: int, output: str) -> list[ModelMessage]:
+    """One prompt that read a file: user prompt, tool call, tool output, answer."""
+    return [
+        ModelRequest(parts=[UserPromptPart(f"question {n}")]),
+        ModelResponse(parts=[ToolCallPart("read_file", {"path": f"/f{n}.py"}, f"call-{n}")]),
+        ModelRequest(parts=[ToolReturnPart("read_file", output, f"call-{n}")]),
+        ModelResponse(parts=[TextPart(f"answer {n}")]),
+    ]
+
+
+def _tool_outputs(history: SessionHistory) -> list[str]:
+    return [
+        part.content
+        for message in history.messages
+        for part in message.parts
+        if isinstance(part, ToolReturnPart)
+    ]
+
+
+def test_history_within_budget_is_kept_verbatim():
+    """Nothing is compacted while the history fits its budget."""
+    history = SessionHistory(max_tokens=1_000)
+    messages = _turn(1, "x" * 400) + _turn(2, "y" * 400)
+
+    history.extend(messages)
+
+    assert history.messages == messages
+    assert history.tokens <= 1_000
+
+
+def test_old_tool_outputs_are_elided_before_turns_are_dropped():
+    """Earlier turns lose their tool outputs first; calls and ids survive."""
+    history = SessionHistory(max_tokens=300)
+    history.extend(_turn(1, "x" * 800))
+    history.extend(_turn(2, "y" * 800))
+
+    outputs = _tool_outputs(history)
+
+    assert len(history.messages) == 8
+    assert outputs[0].startswith("[Output of read_file omitted from history (800 chars)")
+    assert outputs[1] == "y" * 800
+    assert history.tokens <= 300
+    assert [
+        part.tool_call_id
+        for message in history.messages
+        for part in message.parts
+        if isinstance(part, ToolReturnPart)
+    ] == ["call-1", "call-2"]
+
+
+def test_oldest_turns_are_dropped_whole_and_system_prompt_stays_first():
+    """Dropping turns keeps whole exchanges and moves system prompts forward."""
+    history = SessionHistory(max_tokens=30)
+    first = _turn(1, "x" * 40)
+    first[0] = ModelRequest(parts=[SystemPromptPart("You are Punie."), UserPromptPart("question 1")])
+    history.extend(first)
+    for n in range(2, 6):
+        history.extend(_turn(n, "z" * 40))
+
+    messages = history.messages
+
+    assert history.tokens <= 30
+    assert isinstance(messages[0], ModelRequest)
+    assert [type(part) for part in messages[0].parts] == [SystemPromptPart, UserPromptPart]
+    assert messages[0].parts[1].content == "question 5"
+    assert len(messages) == 4
+
+
+def test_latest_turn_is_never_dropped():
+    """A single oversized turn is elided, not removed."""
+    history = SessionHistory(max_tokens=10)
+
+    history.extend(_turn(1, "x" * 10_000))
+
+    assert len(history.messages) == 4
+    assert _tool_outputs(history)[0].startswith("[Output of read_file omitted")
+
+
+def test_custom_token_counter_drives_the_budget():
+    """The budget is measured with the counter the history was given."""
+    history = SessionHistory(max_tokens=5, count_tokens=lambda text: len(text.split()))
+
+    history.extend(_turn(1, " ".join(["word"] * 200)))
+
+    note = _tool_outputs(history)[0]
+    assert note.startswith("[Output of read_file omitted")
+    assert history.tokens == 2 + 1 + len(note.split()) + 2  # Prompt, call, note, answer
+
+
+def test_remote_models_estimate_tokens(tmp_path):
+    """Only local models with a model directory on disk use a tokenizer."""
+    counter = token_counter_for("openai:gpt-4o")
+
+    assert counter("x" * 400) == 100
+    assert token_counter_for(f"local:{tmp_path / 'missing'}") is counter
+
+
+def _recording_model(seen: list[int]) -> FunctionModel:
+    """Model that records how many messages each request carries."""
+
+    def reply(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        seen.append(len(messages))
+        return ModelResponse(parts=[TextPart(f"reply {len(seen)}")])
+
+    async def stream_reply(messages: list[ModelMessage], info: AgentInfo):
+        seen.append(len(messages))
+        yield f"reply {len(seen)}"
+
+    return FunctionModel(reply, stream_function=stream_reply)
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+async def test_prompts_in_a_session_continue_the_conversation(streaming):
+    """The second prompt carries the first exchange; other sessions start cold."""
+    seen: list[int] = []
+    agent = PunieAgent(
+        create_pydantic_agent(model=_recording_model(seen)),
+        name="test-agent",
+        streaming=streaming,
+    )
+    agent.on_connect(FakeClient())
+
+    await agent.prompt(prompt=[text_block("first")], session_id="s-1")
+    await agent.prompt(prompt=[text_block("second")], session_id="s-1")
+    await agent.prompt(prompt=[text_block("other")], session_id="s-2")
+
+    assert seen == [1, 3, 1]
+
+
+async def test_concurrent_prompts_in_a_session_take_turns():
+    """Overlapping prompts run one after another, each seeing the one before."""
+    seen: list[int] = []
+
+    async def slow_reply(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        seen.append(len(messages))
+        await asyncio.sleep(0.01)
+        return ModelResponse(parts=[TextPart(f"reply {len(seen)}")])
+
+    agent = PunieAgent(
+        create_pydantic_agent(model=FunctionModel(slow_reply)),
+        name="test-agent",
+        streaming=False,
+    )
+    agent.on_connect(FakeClient())
+
+    await asyncio.gather(
+        *(agent.prompt(prompt=[text_block(f"q{n}")], session_id="s-1") for n in range(3))
+    )
+
+    assert seen == [1, 3, 5]
+    kinds = [type(m) for m in agent._histories["s-1"].messages]
+    assert kinds == [ModelRequest, ModelResponse] * 3
+
+
+async def test_history_can_be_disabled():
+    """history_tokens=0 runs every prompt without message history."""
+    seen: list[int] = []
+    agent = PunieAgent(
+        create_pydantic_agent(model=_recording_model(seen)),
+        name="test-agent",
+        history_tokens=0,
+    )
+    agent.on_connect(FakeClient())
+
+    await agent.prompt(prompt=[text_block("first")], session_id="s-1")
+    await agent.prompt(prompt=[text_block("second")], session_id="s-1")
+
+    assert seen == [1, 1]
@@ -12,8 +12,16 @@ Covers:
 import pytest
 
 from punie.acp.schema import ClientCapabilities, FileSystemCapability, TextContentBlock
-from punie.agent import PunieAgent, SessionState
+from punie.agent import (
+    PunieAgent,
+    SessionState,
+    adapter,
+    create_toolset_from_capabilities,
+)
 from punie.agent.discovery import ToolCatalog
+from punie.agent.monty_runner import ParallelLimit
+from punie.agent.result_cache import ToolResultCache
+from punie.agent.result_store import ResultStore
 from punie.testing import FakeClient
 
 
@@ -145,6 +153,28 @@ async def test_new_session_tier_2_fallback():
     assert state.catalog is None
 
 
+@pytest.mark.asyncio
+async def test_new_session_tier_2_builds_toolset_once(monkeypatch):
+    """A Tier 2 pool miss reuses the toolset built to key the pool."""
+    built = []
+
+    def counting_create(caps):
+        toolset = create_toolset_from_capabilities(caps)
+        built.append(toolset)
+        return toolset
+
+    monkeypatch.setattr(adapter, "create_toolset_from_capabilities", counting_create)
+    caps = ClientCapabilities(fs=FileSystemCapability(read_text_file=True))
+    agent = PunieAgent(model="test")
+    agent.on_connect(FakeClient(tool_catalog=[], capabilities=caps))
+    await agent.initialize(protocol_version=1, client_capabilities=caps)
+
+    response = await agent.new_session(cwd="/tmp", mcp_servers=[])
+
+    assert agent._sessions[response.session_id].discovery_tier == 2
+    assert len(built) == 1
+
+
 @pytest.mark.asyncio
 async def test_new_session_tier_3_fallback():
     """new_session() uses Tier 3 (default) when no catalog or capabilities."""
@@ -399,3 +429,38 @@ async def test_fake_client_tracks_discover_calls():
     await fake.discover_tools(session_id="session-1")  # Repeat
 
     assert fake.discover_tools_calls == ["session-1", "session-2", "session-1"]
+
+
+@pytest.mark.asyncio
+async def test_resume_forgets_previous_owners_other_sessions():
+    """Resuming one session drops every trace of the old owner's other sessions."""
+    agent = PunieAgent(model="test")
+    old_client = await agent.register_client(FakeClient())
+    kept = (await agent.new_session(cwd="/tmp", mcp_servers=[], client_id=old_client)).session_id
+    dropped = (await agent.new_session(cwd="/tmp", mcp_servers=[], client_id=old_client)).session_id
+    token = agent._session_tokens[kept]
+    agent._session_history(dropped)
+    agent._parallel_limits[dropped] = ParallelLimit(2)
+    agent._result_caches[dropped] = ToolResultCache()
+    agent._result_stores[dropped] = ResultStore()
+    await agent.unregister_client(old_client, allow_reconnect=True)
+
+    new_client = await agent.register_client(FakeClient())
+    await agent.resume_session(
+        cwd="/tmp", session_id=kept, client_id=new_client, resume_token=token
+    )
+
+    assert kept in agent._sessions
+    for per_session in (
+        agent._sessions,
+        agent._greeted_sessions,
+        agent._session_roots,
+        agent._histories,
+        agent._parallel_limits,
+        agent._result_caches,
+        agent._result_stores,
+        agent._session_tokens,
+        agent._session_owners,
+    ):
+        assert dropped not in per_session
+    await agent.shutdown()
@@ -0,0 +1,137 @@
+"""Tests for token streaming in PunieAgent.prompt().
+
+Covers ChunkCoalescer flush behavior and end-to-end streaming through the
+adapter with TestModel.
+"""
+
+from pydantic_ai.models.test import TestModel
+
+from punie.acp import text_block
+from punie.acp.schema import AgentMessageChunk
+from punie.agent import PunieAgent, create_pydantic_agent
+from punie.agent.streaming import ChunkCoalescer
+from punie.testing import FakeClient
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _message_texts(client: FakeClient) -> list[str]:
+    return [
+        n.update.content.text
+        for n in client.notifications
+        if isinstance(n.update, AgentMessageChunk)
+    ]
+
+
+async def test_coalescer_batches_until_min_chars():
+    """Small pushes are buffered until the character threshold is reached."""
+    sent: list[tuple[str, str]] = []
+
+    async def send(kind, text):
+        sent.append((kind, text))
+
+    clock = FakeClock()
+    coalescer = ChunkCoalescer(send, min_chars=10, max_delay=60.0, clock=clock)
+    for token in ["ab", "cd", "ef", "gh"]:
+        await coalescer.push("message", token)
+    assert sent == []
+
+    await coalescer.push("message", "ij")
+    assert sent == [("message", "abcdefghij")]
+
+
+async def test_coalescer_flushes_after_max_delay():
+    """A push after max_delay seconds flushes even a small buffer."""
+    sent: list[tuple[str, str]] = []
+
+    async def send(kind, text):
+        sent.append((kind, text))
+
+    clock = FakeClock()
+    coalescer = ChunkCoalescer(send, min_chars=1000, max_delay=0.05, clock=clock)
+    await coalescer.push("message", "a")
+    assert sent == []
+
+    clock.now = 0.1
+    await coalescer.push("message", "b")
+    assert sent == [("message", "ab")]
+
+
+async def test_coalescer_flushes_on_kind_switch():
+    """Switching between thought and message never merges the two kinds."""
+    sent: list[tuple[str, str]] = []
+
+    async def send(kind, text):
+        sent.append((kind, text))
+
+    coalescer = ChunkCoalescer(send, min_chars=1000, max_delay=60.0, clock=FakeClock())
+    await coalescer.push("thought", "thinking")
+    await coalescer.push("message", "answer")
+    await coalescer.flush()
+
+    assert sent == [("thought", "thinking"), ("message", "answer")]
+    assert coalescer.message_chars_sent == len("answer")
+
+
+async def test_coalescer_records_time_to_first_token():
+    """time_to_first_token_ms measures construction → first non-empty push."""
+
+    async def send(kind, text):
+        pass
+
+    clock = FakeClock()
+    coalescer = ChunkCoalescer(send, clock=clock)
+    assert coalescer.time_to_first_token_ms is None
+
+    clock.now = 0.25
+    await coalescer.push("message", "")  # empty pushes don't count
+    assert coalescer.time_to_first_token_ms is None
+
+    await coalescer.push("message", "x")
+    assert coalescer.time_to_first_token_ms == 250.0
+
+
+async def test_prompt_streams_chunks_matching_output():
+    """Streaming mode sends chunks whose concatenation is the full response."""
+    output = "Streaming works. " * 20
+    pydantic_agent = create_pydantic_agent(
+        model=TestModel(custom_output_text=output, call_tools=[])
+    )
+    agent = PunieAgent(pydantic_agent, name="test-agent")
+    fake_client = FakeClient()
+    agent.on_connect(fake_client)
+
+    response = await agent.prompt(prompt=[text_block("hi")], session_id="s-1")
+
+    assert response.stop_reason == "end_turn"
+    assert response.field_meta is not None
+    assert "time_to_first_token_ms" in response.field_meta
+    # First message is the greeting; the rest is the streamed response
+    texts = _message_texts(fake_client)
+    assert "".join(texts[1:]) == output
+    # Coalesced: far fewer frames than tokens, but more than one
+    assert 1 < len(texts[1:]) < len(output.split())
+
+
+async def test_prompt_non_streaming_sends_single_message():
+    """streaming=False keeps the single final agent_message behavior."""
+    output = "One shot response."
+    pydantic_agent = create_pydantic_agent(
+        model=TestModel(custom_output_text=output, call_tools=[])
+    )
+    agent = PunieAgent(pydantic_agent, name="test-agent", streaming=False)
+    fake_client = FakeClient()
+    agent.on_connect(fake_client)
+
+    response = await agent.prompt(prompt=[text_block("hi")], session_id="s-1")
+
+    assert response.field_meta is None
+    assert _message_texts(fake_client)[1:] == [output]
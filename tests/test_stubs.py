@@ -21,7 +21,10 @@ def test_generate_stubs_includes_all_core_functions():
     """Stubs include all three core functions from toolset."""
     stubs = generate_stubs()
 
-    assert "def read_file(path: str) -> str:" in stubs
+    assert (
+        "def read_file(path: str, line: int | None = None, limit: int | None = None) -> str:"
+        in stubs
+    )
     assert "def write_file(path: str, content: str) -> str:" in stubs
     assert "def run_command(command: str" in stubs
 
@@ -0,0 +1,211 @@
+"""Tests for the persistent workspace symbol index."""
+
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+from punie.agent import lsp_client, symbol_index
+from punie.agent.symbol_index import (
+    KIND_CLASS,
+    KIND_FUNCTION,
+    KIND_METHOD,
+    SymbolIndex,
+    extract_symbols,
+    set_symbol_index,
+    start_symbol_index,
+)
+from punie.agent.toolset import _search_workspace_symbols
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLSPClient:
+    """Stands in for LSPClient.workspace_symbols, recording queries."""
+
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    async def workspace_symbols(self, query: str) -> dict:
+        self.queries.append(query)
+        return {
+            "result": [
+                {
+                    "name": "FromServer",
+                    "kind": KIND_CLASS,
+                    "location": {
+                        "uri": "file:///ext/lib.py",
+                        "range": {"start": {"line": 9, "character": 0}},
+                    },
+                }
+            ]
+        }
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "ws"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "client.py").write_text(
+        "class LSPClient:\n"
+        "    async def workspace_symbols(self, query): ...\n"
+        "\n"
+        "def get_lsp_client(root): ...\n"
+    )
+    (root / "pkg" / "pool.py").write_text("class LSPServerPool: ...\nclass Client: ...\n")
+    return root
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def index(workspace, tmp_path, clock):
+    index = SymbolIndex(workspace, tmp_path / "symbols.sqlite3", clock=clock)
+    yield index
+    index.close()
+
+
+def test_extract_symbols_nested_and_async():
+    """Nested classes keep their container; async defs count as functions."""
+    source = "class Outer:\n    class Inner:\n        def m(self): ...\nasync def main(): ...\n"
+
+    assert extract_symbols(source) == [
+        ("Outer", KIND_CLASS, 1, None),
+        ("Inner", KIND_CLASS, 2, "Outer"),
+        ("m", KIND_METHOD, 3, "Inner"),
+        ("main", KIND_FUNCTION, 4, None),
+    ]
+
+
+def test_search_ranks_exact_prefix_then_substring(index, workspace):
+    """Case-insensitive matches come back exact first, then prefix, then substring."""
+    result = index.search("client")
+
+    assert [s.name for s in result.symbols] == ["Client", "LSPClient", "get_lsp_client"]
+    assert result.symbol_count == 3
+    method = index.search("workspace_symbols").symbols[0]
+    assert method.kind == KIND_METHOD
+    assert method.container_name == "LSPClient"
+    assert method.file == str(workspace / "pkg" / "client.py")
+    assert method.line == 2
+
+
+def test_search_falls_back_to_fuzzy_matching(index):
+    """Subsequence matching finds symbols when nothing contains the query."""
+    result = index.search("lspsp")
+
+    assert [s.name for s in result.symbols] == ["LSPServerPool"]
+    assert index.search("zzz").success is False
+
+
+def test_refresh_only_reindexes_changed_files(index, workspace):
+    """Unchanged files are skipped; edits and deletions are picked up."""
+    assert index.refresh(force=True) == 2
+    assert index.refresh(force=True) == 0
+
+    client = workspace / "pkg" / "client.py"
+    client.write_text("def renamed(): ...\n")
+    stat = client.stat()
+    os.utime(client, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (workspace / "pkg" / "pool.py").unlink()
+
+    assert index.refresh(force=True) == 2
+    assert index.search("LSPClient").success is False
+    assert [s.name for s in index.search("renamed").symbols] == ["renamed"]
+    assert index.search("LSPServerPool").success is False
+
+
+def test_refresh_is_throttled_between_queries(index, workspace, clock):
+    """Queries within refresh_interval reuse the last sweep."""
+    index.search("Client")
+    (workspace / "pkg" / "new.py").write_text("class Fresh: ...\n")
+
+    assert index.search("Fresh").success is False
+    clock.now += index.refresh_interval
+    assert index.search("Fresh").success is True
+
+
+def test_index_persists_across_instances(index, workspace, tmp_path):
+    """A reopened index only re-parses files changed since it was written."""
+    index.refresh(force=True)
+    index.close()
+
+    reopened = SymbolIndex(workspace, tmp_path / "symbols.sqlite3")
+    try:
+        assert reopened.refresh() == 0
+        assert reopened.search("LSPServerPool").symbol_count == 1
+    finally:
+        reopened.close()
+
+
+async def test_tool_answers_from_index_without_lsp(index, workspace, monkeypatch):
+    """A hit never reaches the LSP server; a miss falls back to it."""
+    fake = FakeLSPClient()
+
+    @asynccontextmanager
+    async def fake_lsp_lease(root=None):
+        yield fake
+
+    monkeypatch.setattr(lsp_client, "lsp_lease", fake_lsp_lease)
+    index.refresh(force=True)
+    previous = set_symbol_index(workspace, index)
+    try:
+        hit = await _search_workspace_symbols(workspace, "LSPClient")
+        miss = await _search_workspace_symbols(workspace, "FromServer")
+    finally:
+        set_symbol_index(workspace, previous)
+
+    assert hit.symbols[0].name == "LSPClient"
+    assert fake.queries == ["FromServer"]
+    assert miss.symbols[0].file == "/ext/lib.py"
+    assert miss.symbols[0].line == 10
+
+
+async def test_cold_index_builds_in_background_while_lsp_answers(
+    index, workspace, monkeypatch
+):
+    """The first query does not wait for the build; later ones use the index."""
+    fake = FakeLSPClient()
+
+    @asynccontextmanager
+    async def fake_lsp_lease(root=None):
+        yield fake
+
+    monkeypatch.setattr(lsp_client, "lsp_lease", fake_lsp_lease)
+    previous = set_symbol_index(workspace, index)
+    try:
+        cold = await _search_workspace_symbols(workspace, "LSPClient")
+        assert index.wait_ready(timeout=5)
+        warm = await _search_workspace_symbols(workspace, "LSPClient")
+    finally:
+        set_symbol_index(workspace, previous)
+
+    assert fake.queries == ["LSPClient"]
+    assert cold.symbols[0].name == "FromServer"
+    assert warm.symbols[0].name == "LSPClient"
+
+
+def test_sessions_start_indexing_only_project_roots(workspace, tmp_path, monkeypatch):
+    """start_symbol_index builds project roots in the background and skips others."""
+    monkeypatch.setattr(symbol_index, "DEFAULT_INDEX_DIR", tmp_path / "cache")
+    (workspace / "pyproject.toml").write_text("[project]\nname = 'ws'\n")
+
+    assert start_symbol_index(tmp_path / "cache") is None
+    index = start_symbol_index(workspace)
+    try:
+        assert index is not None
+        assert index.wait_ready(timeout=5)
+        assert index.search("LSPServerPool").success
+    finally:
+        set_symbol_index(workspace, None)
+        if index is not None:
+            index.close()
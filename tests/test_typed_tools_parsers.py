@@ -187,6 +187,93 @@ def test_parse_ruff_output_no_error_on_valid_empty():
     assert result.parse_error is None
 
 
+def _ruff_json(code, filename, row, applicability="safe"):
+    return {
+        "code": code,
+        "filename": filename,
+        "location": {"row": row, "column": 1},
+        "message": f"{code} message",
+        "fix": {"applicability": applicability} if applicability else None,
+    }
+
+
+def test_parse_ruff_output_json_lines():
+    """parse_ruff_output parses --output-format json-lines diagnostics."""
+    records = [
+        _ruff_json("F401", "src/app.py", 1),
+        _ruff_json("E501", "src/app.py", 7, applicability=None),
+        _ruff_json(None, "src/broken.py", 2, applicability=None),
+        _ruff_json("F841", "src/app.py", 9, applicability="unsafe"),
+    ]
+    output = "\n".join(json.dumps(r) for r in records) + "\n"
+
+    result = parse_ruff_output(output)
+
+    assert result.success is False
+    assert result.violation_count == 4
+    assert result.fixable_count == 1
+    assert [v.code for v in result.violations] == ["F401", "E501", "syntax-error", "F841"]
+    assert result.violations[0].file == "src/app.py"
+    assert result.violations[1].line == 7
+    assert result.file_counts == {"src/app.py": 3, "src/broken.py": 1}
+    assert result.file_count == 2
+    assert result.truncated is False
+    assert result.parse_error is None
+
+
+def test_parse_ruff_output_json_lines_relative_to_root_skipping_other_lines(tmp_path):
+    """json-lines output keeps paths relative to root and skips non-diagnostic lines."""
+    record = _ruff_json("F401", str(tmp_path / "src" / "app.py"), 1)
+    output = "warning: `ruff` config is deprecated\n" + json.dumps(record) + "\n"
+
+    result = parse_ruff_output(output, root=tmp_path, json_lines=True)
+
+    assert result.violation_count == 1
+    assert result.violations[0].file == "src/app.py"
+    assert result.parse_error is None
+
+
+def test_parse_ruff_output_json_array():
+    """parse_ruff_output also accepts ruff's --output-format json array."""
+    output = json.dumps([_ruff_json("F401", "a.py", 1), _ruff_json("F401", "b.py", 3)])
+
+    result = parse_ruff_output(output)
+
+    assert result.violation_count == 2
+    assert result.rule_counts == {"F401": 2}
+    assert [v.file for v in result.violations] == ["a.py", "b.py"]
+
+
+def test_parse_ruff_output_bounds_large_runs():
+    """Large runs keep full counts but only a bounded sample of violations."""
+    records = [_ruff_json("E501", f"f{i % 30}.py", i) for i in range(300)]
+    records += [_ruff_json("F401", "g.py", i) for i in range(5)]
+    output = "\n".join(json.dumps(r) for r in records)
+
+    result = parse_ruff_output(output, max_violations=20, max_per_rule=15, max_per_file=3)
+
+    assert result.violation_count == 305
+    assert result.rule_counts == {"E501": 300, "F401": 5}
+    assert result.file_count == 31
+    assert result.file_counts["f0.py"] == 10
+    assert len(result.file_counts) == 20
+    assert sum(v.code == "E501" for v in result.violations) == 15
+    assert sum(v.code == "F401" for v in result.violations) == 3
+    assert all(sum(v.file == f for v in result.violations) <= 3 for f in result.file_counts)
+    assert result.truncated is True
+
+
+def test_parse_ruff_output_malformed_json_lines():
+    """A corrupt json-lines record is reported without losing earlier ones."""
+    output = json.dumps(_ruff_json("F401", "a.py", 1)) + "\n{not json\n"
+
+    result = parse_ruff_output(output)
+
+    assert result.violation_count == 1
+    assert result.parse_error is not None
+    assert "json" in result.parse_error.lower()
+
+
 # Pytest parsers
 
 
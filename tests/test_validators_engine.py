@@ -0,0 +1,109 @@
+"""Tests for the single-pass validate_all engine."""
+
+from pathlib import Path
+
+import pytest
+
+libcst = pytest.importorskip("libcst")
+
+from punie.cst import validators  # noqa: E402
+from punie.cst.core import ParsedModuleCache, set_parse_cache  # noqa: E402
+from punie.cst.validators import validate_all  # noqa: E402
+from punie.cst.validators.engine import CHECKS, resolve_checks  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures" / "cst"
+
+
+@pytest.mark.parametrize(
+    "fixture", sorted(p.name for p in FIXTURES.glob("*.py") if p.name != "__init__.py")
+)
+def test_validate_all_matches_individual_validators(fixture):
+    """Each combined result equals running that validator on its own."""
+    path = str(FIXTURES / fixture)
+
+    results = validate_all(path)
+
+    assert list(results) == list(CHECKS)
+    for name, result in results.items():
+        assert result == getattr(validators, name)(path), name
+
+
+def test_validate_all_walks_tree_once(monkeypatch):
+    """One parse and one traversal serve every requested check."""
+    cache = ParsedModuleCache()
+    previous = set_parse_cache(cache)
+    visits = 0
+    original_visit = libcst.Module.visit
+
+    def counting_visit(self, visitor):
+        nonlocal visits
+        visits += 1
+        return original_visit(self, visitor)
+
+    monkeypatch.setattr(libcst.Module, "visit", counting_visit)
+    try:
+        validate_all(str(FIXTURES / "invalid_component.py"))
+    finally:
+        set_parse_cache(previous)
+
+    assert visits == 1
+    assert cache.stats.misses == 1
+
+
+def test_validate_all_selects_checks_by_name_and_domain():
+    """checks= accepts validator names and domain names, in request order."""
+    results = validate_all(
+        str(FIXTURES / "route_file.py"), checks=["validate_route_pattern", "svcs"]
+    )
+
+    assert list(results) == [
+        "validate_route_pattern",
+        "validate_service_registration",
+        "check_dependency_graph",
+        "validate_injection_site",
+    ]
+
+
+def test_validate_all_reports_parse_errors_per_check(tmp_path):
+    """A file that cannot be parsed yields a parse_error result for each check."""
+    broken = tmp_path / "broken.py"
+    broken.write_text("class (:\n")
+
+    results = validate_all(str(broken), checks=["tdom"])
+
+    assert len(results) == 3
+    assert all(r.parse_error and not r.valid for r in results.values())
+
+
+def test_resolve_checks_rejects_unknown_names():
+    """Unknown check names raise ValueError listing the valid ones."""
+    with pytest.raises(ValueError, match="validate_component"):
+        resolve_checks(["validate_everything"])
+
+
+def test_skipped_children_only_affect_one_visitor():
+    """A visitor returning False from visit_X skips children just for itself."""
+    from punie.cst.validators.engine import _CombinedVisitor
+
+    class Skipper(libcst.CSTVisitor):
+        def __init__(self):
+            super().__init__()
+            self.names: list[str] = []
+
+        def visit_ClassDef(self, node):
+            return False
+
+        def visit_Name(self, node):
+            self.names.append(node.value)
+
+    class Collector(Skipper):
+        def visit_ClassDef(self, node):
+            return None
+
+    skipper, collector = Skipper(), Collector()
+    module = libcst.parse_module("class A:\n    x = b\ny = c\n")
+
+    module.visit(_CombinedVisitor([skipper, collector]))
+
+    assert skipper.names == ["y", "c"]
+    assert collector.names == ["A", "x", "b", "y", "c"]